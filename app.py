@@ -13,14 +13,6 @@ try:
 except ImportError:
     pass
 
-# Log Challonge
-if os.environ.get('CHALLONGE_API_KEY') and os.environ.get('CHALLONGE_USERNAME'):
-    print("[CHALLONGE] API key + username carregados (v1).")
-elif os.environ.get('CHALLONGE_API_KEY'):
-    print("[CHALLONGE] API key carregada (configure CHALLONGE_USERNAME para evitar 401).")
-else:
-    print("[CHALLONGE] Configure CHALLONGE_API_KEY e CHALLONGE_USERNAME no .env")
-
 # Adicionar o diretório atual ao path para que 'src' seja reconhecido como pacote
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
@@ -30,50 +22,108 @@ src_dir = os.path.join(current_dir, 'src')
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for
-from flask.json.provider import DefaultJSONProvider
+from flask import Flask, g, render_template, jsonify, request, session, redirect, url_for
 from src.api import APIGranpix
 from functools import wraps
 import json
 from pathlib import Path
 from datetime import datetime
 import uuid
-from decimal import Decimal
 from src.models import Carro, Peca
-from werkzeug.security import generate_password_hash, check_password_hash
+from src.json_provider import GranpixJSONProvider, resposta_json_stream
+from src.db_metrics import configurar_metricas, agregado as metricas_db
+from src.http_cache import (
+    configurar_cache_http, definir_ultima_modificacao, politica_cache, CONDICIONAL, SEM_ARMAZENAMENTO,
+)
+from src.paginacao import decodificar_cursor, ler_limite, montar_pagina
+from src.dashboard import CarregadorPainel, formatar_item_historico, ler_secoes
+from src.log import configurar_logging, obter_logger, log_amostrado
+from src.jobs import ExecutorJobs, WORKERS_PADRAO
+from src.backup import ultimo_backup
+from src.arquivamento import LOTE_PADRAO as LOTE_PADRAO_ARQUIVAMENTO, RETENCAO_PADRAO_DIAS, ler_retencao
+from src.expiracao_pix import (
+    LOTE_PADRAO as LOTE_PADRAO_PIX, TTL_PADRAO_MINUTOS as TTL_PADRAO_PIX_MINUTOS, criar_cliente_status,
+    varrer_pendentes,
+)
+from src.senhas import SenhasSaturadas, gerar_hash, verificar_senha
 
+# Logging por módulo (GRANPIX_LOG_LEVEL / GRANPIX_LOG_NIVEIS); debug desligado por padrão
+configurar_logging()
+logger = obter_logger('app')
 
-class CustomJSONProvider(DefaultJSONProvider):
-    """Serializa Decimal (ex.: do banco) como float."""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
+# Log Challonge
+if os.environ.get('CHALLONGE_API_KEY') and os.environ.get('CHALLONGE_USERNAME'):
+    logger.info('[CHALLONGE] API key + username carregados (v1).')
+elif os.environ.get('CHALLONGE_API_KEY'):
+    logger.info('[CHALLONGE] API key carregada (configure CHALLONGE_USERNAME para evitar 401).')
+else:
+    logger.info('[CHALLONGE] Configure CHALLONGE_API_KEY e CHALLONGE_USERNAME no .env')
 
 
 app = Flask(__name__)
-app.json = CustomJSONProvider(app)
+# JSON via orjson quando disponível (Decimal, datetime, date e TIME/timedelta do MariaDB nativos)
+app.json = GranpixJSONProvider(app)
 app.secret_key = 'GRANPIX_SUPER_SECRET_2026'
 app.config['JSON_SORT_KEYS'] = False
 
-# Desabilitar cache HTTP para garantir dados frescos
-@app.after_request
-def disable_cache(response):
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, max-age=0'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
-    return response
+# Instrumentação de consultas por requisição (header Server-Timing, /api/admin/metrics)
+configurar_metricas(app)
+# Política de cache HTTP por rota (assets versionados, ETag/304, no-store em saldo/login, gzip/br)
+configurar_cache_http(app)
+
+
+@app.errorhandler(SenhasSaturadas)
+def senhas_saturadas(e):
+    """Pool de hash de senha cheio (pico de logins): 429 em vez de prender a thread"""
+    logger.warning('[LOGIN] Pool de senhas saturado: %s', e)
+    resposta = jsonify({'sucesso': False, 'erro': str(e)})
+    resposta.status_code = 429
+    resposta.headers['Retry-After'] = '2'
+    return resposta
 
 # Configuração MySQL (variável de ambiente no Docker; fallback para desenvolvimento local)
+# sqlite:///data/granpix.db usa o backend SQLite (um servidor só, sem MariaDB; ver src/dialeto.py)
 MYSQL_CONFIG = os.environ.get(
     "MYSQL_CONFIG",
     "mysql://root:@127.0.0.1:3306/granpix"
 )
 
-# Inicializar API com MySQL (sempre; driver PyMySQL para compatibilidade com MariaDB)
-print("[APP] Conectando ao banco (PyMySQL)...", flush=True)
+# Inicializar API (MariaDB via PyMySQL, ou SQLite)
+logger.info('[APP] Conectando ao banco (%s)...', 'SQLite' if MYSQL_CONFIG.startswith('sqlite:') else 'PyMySQL')
 api = APIGranpix(MYSQL_CONFIG)
-print("[APP] Banco inicializado.", flush=True)
+logger.info('[APP] Banco inicializado.')
+
+# Backups NDJSON (POST /api/admin/backup)
+PASTA_BACKUPS = os.environ.get('GRANPIX_PASTA_BACKUPS', os.path.join('data', 'backups'))
+
+# Arquivamento de solicitações/PIX/comissões finalizadas (job 'arquivamento'; 0 = só manual)
+ARQUIVAMENTO_INTERVALO = float(os.environ.get('GRANPIX_ARQUIVAMENTO_INTERVALO', '3600'))
+ARQUIVAMENTO_PARAMETROS = {
+    'retencao': {
+        'solicitacoes': int(os.environ.get('GRANPIX_ARQUIVAMENTO_SOLICITACOES_DIAS',
+                                           RETENCAO_PADRAO_DIAS['solicitacoes'])),
+        'financeiro': int(os.environ.get('GRANPIX_ARQUIVAMENTO_FINANCEIRO_DIAS', RETENCAO_PADRAO_DIAS['financeiro'])),
+    },
+    'lote': int(os.environ.get('GRANPIX_ARQUIVAMENTO_LOTE', LOTE_PADRAO_ARQUIVAMENTO)),
+}
+
+# Varredura de PIX pendentes abandonados (job 'expirar_pix'; 0 = só manual)
+PIX_VARREDURA_INTERVALO = float(os.environ.get('GRANPIX_PIX_VARREDURA_INTERVALO', '300'))
+PIX_VARREDURA_PARAMETROS = {
+    'ttl_minutos': int(os.environ.get('GRANPIX_PIX_TTL_MINUTOS', TTL_PADRAO_PIX_MINUTOS)),
+    'lote': int(os.environ.get('GRANPIX_PIX_VARREDURA_LOTE', LOTE_PADRAO_PIX)),
+}
+# Quem responde o status dos pagamentos: mercado_pago (API) ou local (stub, sem internet)
+pix_status_cliente = criar_cliente_status(os.environ.get('GRANPIX_PIX_STATUS_CLIENTE', 'mercado_pago'))
+
+# Tarefas longas do admin (exportações, Challonge, migrações) rodam fora da requisição;
+# os tipos são registrados junto das rotas e o executor é iniciado no fim do módulo
+jobs = ExecutorJobs(api.db, max_workers=int(os.environ.get('GRANPIX_JOBS_WORKERS', WORKERS_PADRAO)))
+
+@app.teardown_appcontext
+def liberar_conexao_db(exc):
+    """Fecha a conexão compartilhada pelos métodos do DatabaseManager nesta requisição"""
+    api.db.liberar_conexao_requisicao()
 
 # Credenciais
 SENHA_ADMIN = "admin123"
@@ -82,14 +132,10 @@ SENHA_ADMIN = "admin123"
 
 def obter_equipe_id_request():
     """Obtém equipe_id da sessão ou header"""
-    print(f"[AUTH] Verificando autenticação...")
-    print(f"[AUTH] session.equipe_id: {session.get('equipe_id', 'VAZIO')}")
-    print(f"[AUTH] X-Equipe-ID header: {request.headers.get('X-Equipe-ID', 'VAZIO')}")
     if 'equipe_id' in session:
-        print(f"[AUTH] Usando session: {session['equipe_id']}")
         return session['equipe_id']
     header_id = request.headers.get('X-Equipe-ID')
-    print(f"[AUTH] Usando header: {header_id}")
+    log_amostrado(logger, 'auth.header', '[AUTH] equipe_id via header X-Equipe-ID: %s', header_id)
     return header_id
 
 def requer_login(f):
@@ -116,6 +162,33 @@ def requer_admin(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def pagina_admin_solicitada(nome):
+    """Resposta paginada da listagem admin se ?limite ou ?cursor veio na URL
+
+    Sem esses parâmetros devolve None e a rota mantém o formato antigo (lista
+    completa), ainda usado pelos contadores de várias telas.
+    """
+    if 'limite' not in request.args and 'cursor' not in request.args:
+        return None
+    try:
+        return jsonify(api.db.listar_pagina_admin(nome, request.args))
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
+
+def responder_job(tipo, parametros=None):
+    """Enfileira o job e responde 202 com o id (acompanhar em /api/admin/jobs/<id>)"""
+    try:
+        job_id = jobs.enfileirar(tipo, parametros, criado_por='admin')
+    except Exception as e:
+        logger.error('[JOBS] Erro ao enfileirar %s: %s', tipo, e)
+        return jsonify({'sucesso': False, 'erro': str(e)}), 500
+    return jsonify({
+        'sucesso': True,
+        'job_id': job_id,
+        'status': 'pendente',
+        'acompanhar': url_for('obter_job', job_id=job_id),
+    }), 202
+
 # ============ ROTAS AUTENTICAÇÃO =============
 
 @app.route('/')
@@ -125,13 +198,14 @@ def index():
     return redirect(url_for('login'))
 
 @app.route('/login', methods=['GET', 'POST'])
+@politica_cache(SEM_ARMAZENAMENTO)
 def login():
     if request.method == 'POST':
         dados = request.json
         tipo_login = dados.get('tipo')
         
-        print(f"\n🔐 LOGIN ATTEMPT - Tipo: {tipo_login}")
-        print(f"   Dados recebidos: {dados}")
+        # Nunca logar o corpo da requisição: contém a senha
+        logger.debug('[LOGIN] Tentativa - tipo: %s', tipo_login)
         
         if tipo_login == 'admin':
             senha = dados.get('senha', '')
@@ -149,58 +223,51 @@ def login():
             equipe_id = dados.get('equipe_id')
             senha = dados.get('senha', '')
             
-            print(f"   Equipe ID: {equipe_id} (tipo: {type(equipe_id)})")
-            print(f"   Senha: {senha}")
-            
             try:
-                # Obter equipe pelo índice ou ID
-                equipe = api.gerenciador.obter_equipe(str(equipe_id))
-                
-                print(f"   Equipe encontrada: {equipe}")
+                # Só id, nome e hash da senha (sem carregar carros e peças)
+                equipe = api.db.obter_credenciais_equipe(str(equipe_id))
                 
                 if equipe:
-                    print(f"   Equipe nome: {equipe.nome}")
-                    print(f"   Equipe senha: {equipe.senha} (tipo: {type(equipe.senha)})")
-                    
-                    if check_password_hash(equipe.senha, senha):
-                        session['equipe_id'] = equipe.id  # Armazenar UUID real
-                        session['equipe_nome'] = equipe.nome
+                    ok, novo_hash = verificar_senha(equipe['senha'] or '', senha)
+                    if ok:
+                        if novo_hash:
+                            api.db.atualizar_senha_equipe(equipe['id'], novo_hash)
+                        session['equipe_id'] = equipe['id']  # Armazenar UUID real
+                        session['equipe_nome'] = equipe['nome']
                         session['tipo'] = 'equipe'
-                        print(f"   ✓ LOGIN SUCESSO!")
+                        logger.info('[LOGIN] Equipe autenticada: %s', equipe['id'])
                         return jsonify({
                             'sucesso': True, 
                             'tipo': 'equipe',
-                            'uuid': equipe.id,  # UUID real
-                            'nome': equipe.nome
+                            'uuid': equipe['id'],  # UUID real
+                            'nome': equipe['nome']
                         })
                     else:
-                        print(f"   ✗ SENHA INCORRETA")
+                        logger.warning('[LOGIN] Senha incorreta para equipe %s', equipe['id'])
                         return jsonify({'sucesso': False, 'erro': 'Equipe ou senha incorreta'}), 401
                 else:
-                    print(f"   ✗ EQUIPE NÃO ENCONTRADA")
+                    logger.warning('[LOGIN] Equipe não encontrada: %s', equipe_id)
                     return jsonify({'sucesso': False, 'erro': 'Equipe não encontrada'}), 404
                     
+            except SenhasSaturadas:
+                raise
             except Exception as e:
-                print(f"   ✗ ERRO: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception('[LOGIN] Erro ao autenticar equipe: %s', e)
                 return jsonify({'sucesso': False, 'erro': f'Erro: {str(e)}'}), 400
         
         elif tipo_login == 'piloto':
             nome = dados.get('nome', '').strip()
             senha = dados.get('senha', '')
             
-            print(f"   Piloto: {nome}")
-            
             resultado = api.db.autenticar_piloto(nome, senha)
             if resultado['sucesso']:
                 session['piloto_id'] = resultado['piloto_id']
                 session['piloto_nome'] = resultado['nome']
                 session['tipo'] = 'piloto'
-                print(f"   ✓ LOGIN PILOTO SUCESSO!")
+                logger.info('[LOGIN] Piloto autenticado: %s', resultado['piloto_id'])
                 return jsonify(resultado)
             else:
-                print(f"   ✗ PILOTO LOGIN FALHOU: {resultado['erro']}")
+                logger.warning('[LOGIN] Falha no login de piloto: %s', resultado['erro'])
                 return jsonify(resultado), 401
         
         return jsonify({'sucesso': False, 'erro': 'Tipo de login inválido'}), 400
@@ -208,6 +275,7 @@ def login():
     return render_template('login.html')
 
 @app.route('/logout')
+@politica_cache(SEM_ARMAZENAMENTO)
 def logout():
     session.clear()
     return redirect(url_for('login'))
@@ -280,6 +348,7 @@ def campeonato():
 # ============ ROTAS API - PILOTOS =============
 
 @app.route('/api/pilotos/cadastrar', methods=['POST'])
+@politica_cache(SEM_ARMAZENAMENTO)
 def cadastrar_piloto():
     """Cadastra um novo piloto"""
     try:
@@ -299,8 +368,10 @@ def cadastrar_piloto():
             return jsonify(resultado)
         else:
             return jsonify(resultado), 400
+    except SenhasSaturadas:
+        raise
     except Exception as e:
-        print(f"[ERRO] Cadastro de piloto: {e}")
+        logger.error('[ERRO] Cadastro de piloto: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 # ============ ROTAS API - EQUIPES =============
@@ -322,6 +393,7 @@ def get_equipes():
     return jsonify(dados)
 
 @app.route('/api/equipes/<equipe_id>')
+@politica_cache(SEM_ARMAZENAMENTO)
 @requer_login_api
 def get_equipe_detalhes(equipe_id):
     """Retorna detalhes de uma equipe"""
@@ -351,15 +423,15 @@ def get_equipe_detalhes(equipe_id):
                 pecas_pendentes.append({
                     'id': sol['id'],
                     'peca_nome': sol.get('peca_nome', ''),
-                    'peca_tipo': sol.get('tipo_peca', ''),
+                    'peca_tipo': sol.get('peca_tipo', ''),
                     'preco': sol.get('preco', 0),
                     'timestamp': sol.get('data_solicitacao', '')
                 })
-                print(f"[PENDENTE] Encontrada peça: {sol.get('peca_nome', '')} para equipe {equipe_id}")
+                log_amostrado(logger, 'get_equipe_detalhes', '[PENDENTE] Encontrada peça: %s para equipe %s', sol.get('peca_nome', ''), equipe_id)
     except Exception as e:
-        print(f"[ERRO PENDENTE] {str(e)}")
+        logger.error('[ERRO PENDENTE] %s', str(e))
     
-    print(f"[EQUIPE {equipe_id}] Peças pendentes: {len(pecas_pendentes)}")
+    logger.debug('[EQUIPE %s] Peças pendentes: %s', equipe_id, len(pecas_pendentes))
     
     # Encontrar carro ativo (status='ativo') no banco de dados
     carro_ativo = None
@@ -396,6 +468,7 @@ def get_equipe_detalhes(equipe_id):
     })
 
 @app.route('/api/equipes/<equipe_id>/saldo-pix')
+@politica_cache(SEM_ARMAZENAMENTO)
 @requer_login_api
 def get_saldo_pix(equipe_id):
     """Retorna o saldo PIX da equipe"""
@@ -419,7 +492,7 @@ def get_saldo_pix(equipe_id):
             'pode_participar': saldo >= -20.0
         })
     except Exception as e:
-        print(f"[ERRO] Erro ao obter saldo PIX: {e}")
+        logger.error('[ERRO] Erro ao obter saldo PIX: %s', e)
         return jsonify({'erro': str(e)}), 500
 
 @app.route('/api/equipes/<equipe_id>/carro-ativo')
@@ -453,9 +526,45 @@ def get_carro_ativo(equipe_id):
         
         return jsonify(carro_ativo)
     except Exception as e:
-        print(f"[ERRO] Erro ao buscar carro ativo: {e}")
+        logger.error('[ERRO] Erro ao buscar carro ativo: %s', e)
         return jsonify({'id': None, 'erro': str(e)}), 500
 
+def carregador_painel(equipe_id):
+    """CarregadorPainel da equipe para a requisição atual (compartilhado via flask.g)"""
+    carregadores = g.setdefault('_carregadores_painel', {})
+    if equipe_id not in carregadores:
+        carregadores[equipe_id] = CarregadorPainel(api.db, equipe_id, api.loja_carros.modelos)
+    return carregadores[equipe_id]
+
+@app.route('/api/equipes/<equipe_id>/dashboard')
+@politica_cache(SEM_ARMAZENAMENTO)
+@requer_login_api
+def get_painel_equipe(equipe_id):
+    """Seções do dashboard da equipe numa só resposta (ver src/dashboard.py)
+
+    ?fields=equipe,saldo_pix,carro_ativo,garagem,armazem,aguardando_pecas,
+    aguardando_carros,etapas,historico (padrão: todas).
+    """
+    auth_equipe_id = obter_equipe_id_request()
+    if not auth_equipe_id:
+        return jsonify({'erro': 'Não autenticado'}), 401
+    if str(auth_equipe_id) != str(equipe_id):
+        return jsonify({'erro': 'Acesso negado'}), 403
+    
+    try:
+        secoes = ler_secoes(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
+    
+    try:
+        painel = carregador_painel(equipe_id).montar(secoes)
+    except Exception as e:
+        logger.exception('[ERRO PAINEL] %s', str(e))
+        return jsonify({'erro': 'Erro ao carregar painel da equipe'}), 500
+    if painel is None:
+        return jsonify({'erro': 'Equipe não encontrada'}), 404
+    return jsonify(painel)
+
 @app.route('/api/garagem/<equipe_id>')
 @requer_login_api
 def get_garagem(equipe_id):
@@ -478,7 +587,7 @@ def get_garagem(equipe_id):
         
         # Processar todos os carros da equipe
         for carro in equipe.carros:
-            print(f"[DEBUG] Processando carro: {carro.marca} {carro.modelo}")
+            log_amostrado(logger, 'get_garagem', '[DEBUG] Processando carro: %s %s', carro.marca, carro.modelo)
             
             # Determinar status baseado no status do carro no banco (não apenas em memória)
             carro_status_banco = getattr(carro, 'status', 'repouso')  # 'ativo' ou 'repouso'
@@ -504,9 +613,7 @@ def get_garagem(equipe_id):
         
         return jsonify({'carros': carros})
     except Exception as e:
-        print(f"[ERRO GARAGEM] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO GARAGEM] %s', str(e))
         return jsonify({'erro': f'Erro ao carregar garagem'}), 500
     try:
         # Verificar autenticação
@@ -524,7 +631,7 @@ def get_garagem(equipe_id):
             # Admin pode acessar qualquer equipe
             equipe_id_buscar = str(equipe_id)
         
-        print(f"[ARMAZÉM] Buscando peças para equipe: {equipe_id_buscar}")
+        logger.debug('[ARMAZÉM] Buscando peças para equipe: %s', equipe_id_buscar)
         
         # Buscar todas as solicitações com status 'guardada' desta equipe do banco
         pecas_guardadas = []
@@ -541,21 +648,19 @@ def get_garagem(equipe_id):
                         'processado_em': sol.get('processado_em', '')
                     })
         except Exception as e:
-            print(f"[ERRO ARMAZÉM] Erro ao carregar solicitações: {str(e)}")
+            logger.error('[ERRO ARMAZÉM] Erro ao carregar solicitações: %s', str(e))
         
         # Ordenar por data (mais recentes primeiro)
         pecas_guardadas.sort(key=lambda x: x.get('data_compra', ''), reverse=True)
         
-        print(f"[ARMAZÉM] Encontradas {len(pecas_guardadas)} peças para equipe {equipe_id_buscar}")
+        logger.debug('[ARMAZÉM] Encontradas %s peças para equipe %s', len(pecas_guardadas), equipe_id_buscar)
         
         return jsonify({
             'pecas_guardadas': pecas_guardadas,
             'total': len(pecas_guardadas)
         })
     except Exception as e:
-        print(f"[ERRO ARMAZÉM] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO ARMAZÉM] %s', str(e))
         return jsonify({'erro': str(e)}), 500
 
 @app.route('/api/garagem/solicitar-instalacao-armazem', methods=['POST'])
@@ -603,7 +708,7 @@ def solicitar_instalacao_armazem():
         # Validar compatibilidade
         compativel, msg = api.db.validar_compatibilidade_peca_carro(peca_loja.id, carro_id)
         if not compativel:
-            print(f"[INSTALAÇÃO ARMAZÉM] Incompatibilidade: {msg}")
+            logger.debug('[INSTALAÇÃO ARMAZÉM] Incompatibilidade: %s', msg)
             return jsonify({'sucesso': False, 'erro': msg}), 400
         
         # Usar o valor configurado para instalação de peça do warehouse
@@ -611,11 +716,11 @@ def solicitar_instalacao_armazem():
         taxa = valor_item * 0.01
         valor_total = valor_item + taxa
         
-        print(f"[INSTALAÇÃO ARMAZÉM] Criando transação PIX:")
-        print(f"  - Peça: {peca_nome} ({peca_tipo})")
-        print(f"  - Valor (configurado): R$ {valor_item:.2f}")
-        print(f"  - Taxa (1%): R$ {taxa:.2f}")
-        print(f"  - Total: R$ {valor_total:.2f}")
+        logger.debug('[INSTALAÇÃO ARMAZÉM] Criando transação PIX:')
+        logger.debug('- Peça: %s (%s)', peca_nome, peca_tipo)
+        logger.debug('- Valor (configurado): R$ %.2f', valor_item)
+        logger.debug('- Taxa (1%%): R$ %.2f', taxa)
+        logger.debug('- Total: R$ %.2f', valor_total)
         
         # Criar transação PIX para a instalação
         from src.mercado_pago_client import mp_client
@@ -656,7 +761,7 @@ def solicitar_instalacao_armazem():
             qr_code_url=qr_code_url
         )
         
-        print(f"[INSTALAÇÃO ARMAZÉM] Transação {transacao_id} criada com sucesso")
+        logger.info('[INSTALAÇÃO ARMAZÉM] Transação %s criada com sucesso', transacao_id)
         
         return jsonify({
             'sucesso': True,
@@ -669,9 +774,7 @@ def solicitar_instalacao_armazem():
         })
         
     except Exception as e:
-        print(f"[ERRO INSTALAÇÃO ARMAZÉM] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO INSTALAÇÃO ARMAZÉM] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/garagem/instalar-peca-armazem', methods=['POST'])
@@ -719,7 +822,7 @@ def instalar_peca_armazem():
         # Validar compatibilidade ANTES de criar solicitação
         compativel, msg = api.db.validar_compatibilidade_peca_carro(peca_loja.id, carro_id)
         if not compativel:
-            print(f"[SOLICITAÇÃO ARMAZÉM] Incompatibilidade: {msg}")
+            logger.debug('[SOLICITAÇÃO ARMAZÉM] Incompatibilidade: %s', msg)
             return jsonify({'erro': msg}), 400
         
         # Criar solicitação de instalação
@@ -735,16 +838,14 @@ def instalar_peca_armazem():
             carro_id=carro_id
         )
         
-        print(f"[SOLICITAÇÃO ARMAZÉM] Solicitação {solicitacao_id} criada para peça {peca_nome} no carro {carro_id}")
+        logger.debug('[SOLICITAÇÃO ARMAZÉM] Solicitação %s criada para peça %s no carro %s', solicitacao_id, peca_nome, carro_id)
         return jsonify({
             'sucesso': True,
             'mensagem': f'Solicitação de instalação de {peca_nome} criada com sucesso! Aguardando aprovação.'
         })
             
     except Exception as e:
-        print(f"[ERRO SOLICITAÇÃO ARMAZÉM] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO SOLICITAÇÃO ARMAZÉM] %s', str(e))
         return jsonify({'erro': str(e)}), 500
 
 @app.route('/api/garagem/instalar-multiplas-pecas-armazem', methods=['POST'])
@@ -769,6 +870,12 @@ def instalar_multiplas_pecas_armazem():
         # Carregar peças do armazém e loja uma vez
         pecas_armazem = api.db.carregar_pecas_armazem_equipe(equipe_id_str)
         pecas_loja = api.db.carregar_pecas_loja()
+        # Modelo do carro uma vez; a compatibilidade de cada peça vem do índice em memória
+        modelo_id = api.db.obter_modelo_id_carro(carro_id)
+        if modelo_id is False:
+            return jsonify({'sucesso': False, 'erro': 'Carro não encontrado'}), 404
+        
+        valor_item = float(api.db.obter_configuracao('preco_instalacao_warehouse') or '50')
         
         # Processar cada peça e validar
         pecas_validadas = []
@@ -791,7 +898,7 @@ def instalar_multiplas_pecas_armazem():
             
             # IMPORTANTE: Só contar peças SEM pix_id (não pagas) no valor total
             if peca_armazem.get('pix_id'):
-                print(f"[INSTALAR MÚLTIPLAS] Peça {peca_nome} já foi paga (pix_id: {peca_armazem.get('pix_id')}), ignorando na soma")
+                logger.debug('[INSTALAR MÚLTIPLAS] Peça %s já foi paga (pix_id: %s), ignorando na soma', peca_nome, peca_armazem.get('pix_id'))
                 continue
             
             # Buscar peça na loja para ID
@@ -805,13 +912,12 @@ def instalar_multiplas_pecas_armazem():
                 return jsonify({'sucesso': False, 'erro': f'Peça {peca_nome} não encontrada no banco'}), 404
             
             # Validar compatibilidade
-            compativel, msg = api.db.validar_compatibilidade_peca_carro(peca_loja.id, carro_id)
+            compativel, msg = api.db.validar_compatibilidade_peca_carro(peca_loja.id, carro_id, modelo_id=modelo_id)
             if not compativel:
-                print(f"[INSTALAR MÚLTIPLAS] Incompatibilidade: {msg}")
+                logger.debug('[INSTALAR MÚLTIPLAS] Incompatibilidade: %s', msg)
                 return jsonify({'sucesso': False, 'erro': msg}), 400
             
             # Adicionar à lista validada com preço de instalação
-            valor_item = float(api.db.obter_configuracao('preco_instalacao_warehouse') or '50')
             valor_total_itens += valor_item * quantidade
             
             pecas_validadas.append({
@@ -825,16 +931,14 @@ def instalar_multiplas_pecas_armazem():
         if len(pecas_validadas) == 0:
             return jsonify({'sucesso': False, 'erro': 'Nenhuma peça válida para instalar (todas já foram pagas)'}), 400
         
-        print(f"[INSTALAR MÚLTIPLAS] Processando {len(pecas_validadas)} peça(s) para carro {carro_id}")
-        print(f"[INSTALAR MÚLTIPLAS] Valor total de peças SEM pix_id: R$ {valor_total_itens:.2f}")
+        logger.debug('[INSTALAR MÚLTIPLAS] Processando %s peça(s) para carro %s', len(pecas_validadas), carro_id)
+        logger.debug('[INSTALAR MÚLTIPLAS] Valor total de peças SEM pix_id: R$ %.2f', valor_total_itens)
         
         # Calcular taxa
         taxa = valor_total_itens * 0.01
         valor_total = valor_total_itens + taxa
         
-        # Obter equipe para nome
-        equipe = api.gerenciador.obter_equipe(equipe_id)
-        equipe_nome = equipe.nome if equipe else 'Desconhecido'
+        equipe_nome = api.db.obter_nome_equipe(equipe_id_str) or 'Desconhecido'
         
         # Criar transação PIX
         from src.mercado_pago_client import mp_client
@@ -875,7 +979,7 @@ def instalar_multiplas_pecas_armazem():
             qr_code_url=qr_code_url
         )
         
-        print(f"[INSTALAR MÚLTIPLAS] Transação {transacao_id} criada com sucesso")
+        logger.info('[INSTALAR MÚLTIPLAS] Transação %s criada com sucesso', transacao_id)
         
         return jsonify({
             'sucesso': True,
@@ -888,9 +992,7 @@ def instalar_multiplas_pecas_armazem():
         })
         
     except Exception as e:
-        print(f"[ERRO INSTALAR MÚLTIPLAS] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO INSTALAR MÚLTIPLAS] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/garagem/instalar-multiplas-pecas-armazem-repouso', methods=['POST'])
@@ -929,7 +1031,7 @@ def instalar_multiplas_pecas_armazem_repouso():
                     break
             
             if not peca_armazem:
-                print(f"[REPOUSO] Peça {peca_nome} não encontrada no armazém")
+                logger.debug('[REPOUSO] Peça %s não encontrada no armazém', peca_nome)
                 continue
             
             # Instalar no carro - apenas atualizar a peça do armazém
@@ -957,11 +1059,9 @@ def instalar_multiplas_pecas_armazem_repouso():
                 conn.close()
                 
                 pecas_instaladas += 1
-                print(f"[REPOUSO] Peça {peca_nome} instalada no carro {carro_nome}")
+                logger.debug('[REPOUSO] Peça %s instalada no carro %s', peca_nome, carro_nome)
             except Exception as e:
-                print(f"[REPOUSO] Erro ao instalar peça {peca_nome}: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception('[REPOUSO] Erro ao instalar peça %s: %s', peca_nome, e)
                 continue
         
         return jsonify({
@@ -970,47 +1070,45 @@ def instalar_multiplas_pecas_armazem_repouso():
         })
         
     except Exception as e:
-        print(f"[ERRO REPOUSO] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO REPOUSO] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/garagem/instalar-multiplas-pecas-armazem-ativo', methods=['POST'])
 def instalar_multiplas_pecas_armazem_ativo():
     """Cria transação PIX para instalar múltiplas peças do armazém no carro ativo via modal"""
     try:
-        print("[ATIVO MODAL PIX] ===== ROTA ATIVADA =====")
+        logger.debug('[ATIVO MODAL PIX] ===== ROTA ATIVADA =====')
         
         # Auth check
         if 'equipe_id' not in session and not request.headers.get('X-Equipe-ID'):
-            print("[ATIVO MODAL PIX] Erro: Não autenticado")
+            logger.error('[ATIVO MODAL PIX] Erro: Não autenticado')
             return jsonify({'erro': 'Não autenticado'}), 401
             
         dados = request.json
-        print(f"[ATIVO MODAL PIX] Dados recebidos: {dados}")
+        logger.debug('[ATIVO MODAL PIX] Dados recebidos: %s', dados)
         
         carro_id = dados.get('carro_id')
         pecas = dados.get('pecas', [])
         
         if not carro_id or not pecas or len(pecas) == 0:
-            print("[ATIVO MODAL PIX] Erro: Dados inválidos")
+            logger.error('[ATIVO MODAL PIX] Erro: Dados inválidos')
             return jsonify({'sucesso': False, 'erro': 'Dados inválidos'}), 400
         
         equipe_id = obter_equipe_id_request()
         if not equipe_id:
-            print("[ATIVO MODAL PIX] Erro: Equipe não encontrada")
+            logger.error('[ATIVO MODAL PIX] Erro: Equipe não encontrada')
             return jsonify({'sucesso': False, 'erro': 'Não autenticado'}), 401
         
         equipe_id_str = str(equipe_id)
         
-        print(f"[ATIVO MODAL PIX] Criando PIX para {len(pecas)} peça(s), equipe_id={equipe_id_str}")
+        logger.debug('[ATIVO MODAL PIX] Criando PIX para %s peça(s), equipe_id=%s', len(pecas), equipe_id_str)
         
         # Carregar peças do armazém
-        print(f"[ATIVO MODAL PIX] Carregando peças do armazém...")
+        logger.debug('[ATIVO MODAL PIX] Carregando peças do armazém...')
         pecas_armazem = api.db.carregar_pecas_armazem_equipe(equipe_id_str)
-        print(f"[ATIVO MODAL PIX] Peças do armazém carregadas: {len(pecas_armazem)}")
+        logger.debug('[ATIVO MODAL PIX] Peças do armazém carregadas: %s', len(pecas_armazem))
         pecas_loja = api.db.carregar_pecas_loja()
-        print(f"[ATIVO MODAL PIX] Peças da loja carregadas: {len(pecas_loja)}")
+        logger.debug('[ATIVO MODAL PIX] Peças da loja carregadas: %s', len(pecas_loja))
         
         # Validar que todas as peças existem na loja (não no armazém!)
         for peca_req in pecas:
@@ -1026,7 +1124,7 @@ def instalar_multiplas_pecas_armazem_ativo():
                     break
             
             if not encontrada:
-                print(f"[ATIVO MODAL PIX] Peça não encontrada: {peca_nome} ({peca_tipo})")
+                logger.debug('[ATIVO MODAL PIX] Peça não encontrada: %s (%s)', peca_nome, peca_tipo)
                 return jsonify({'sucesso': False, 'erro': f'Peça {peca_nome} não disponível na loja'}), 404
         
         # Calcular valor do PIX (uma instalação por peça)
@@ -1035,7 +1133,7 @@ def instalar_multiplas_pecas_armazem_ativo():
         taxa = valor_total_itens * 0.01
         valor_total = valor_total_itens + taxa
         
-        print(f"[ATIVO MODAL PIX] Valor: R$ {valor_total_itens:.2f} + R$ {taxa:.2f} taxa = R$ {valor_total:.2f}")
+        logger.debug('[ATIVO MODAL PIX] Valor: R$ %.2f + R$ %.2f taxa = R$ %.2f', valor_total_itens, taxa, valor_total)
         
         # Criar transação PIX
         from src.mercado_pago_client import mp_client
@@ -1082,7 +1180,7 @@ def instalar_multiplas_pecas_armazem_ativo():
             qr_code_url=qr_code_url
         )
         
-        print(f"[ATIVO MODAL PIX] ✅ PIX gerado com sucesso. pix_id={pix_id_pecas}")
+        logger.info('[ATIVO MODAL PIX] ✅ PIX gerado com sucesso. pix_id=%s', pix_id_pecas)
         
         return jsonify({
             'sucesso': True,
@@ -1096,9 +1194,7 @@ def instalar_multiplas_pecas_armazem_ativo():
         })
         
     except Exception as e:
-        print(f"[ERRO ATIVO MODAL PIX] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO ATIVO MODAL PIX] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/garagem/criar-multiplas-solicitacoes-armazem', methods=['POST'])
@@ -1107,16 +1203,16 @@ def criar_multiplas_solicitacoes_armazem():
     """Cria múltiplas solicitações de instalação do armazém"""
     try:
         dados = request.json
-        print(f"[SOLICITAÇÕES] Dados recebidos: {dados}")
+        logger.debug('[SOLICITAÇÕES] Dados recebidos: %s', dados)
         
         carro_id = dados.get('carro_id')
         pecas = dados.get('pecas', [])
         com_pix = dados.get('com_pix', False)
         
-        print(f"[SOLICITAÇÕES] carro_id={carro_id}, pecas={len(pecas)}, com_pix={com_pix}")
+        logger.debug('[SOLICITAÇÕES] carro_id=%s, pecas=%s, com_pix=%s', carro_id, len(pecas), com_pix)
         
         if not carro_id or not pecas:
-            print(f"[SOLICITAÇÕES] Dados inválidos: carro_id={carro_id}, pecas={pecas}")
+            logger.debug('[SOLICITAÇÕES] Dados inválidos: carro_id=%s, pecas=%s', carro_id, pecas)
             return jsonify({'sucesso': False, 'erro': 'Dados inválidos'}), 400
         
         equipe_id = obter_equipe_id_request()
@@ -1129,7 +1225,7 @@ def criar_multiplas_solicitacoes_armazem():
         pecas_armazem = api.db.carregar_pecas_armazem_equipe(equipe_id_str)
         pecas_loja = api.db.carregar_pecas_loja()
         
-        print(f"[SOLICITAÇÕES] Peças armazém: {len(pecas_armazem)}, Peças loja: {len(pecas_loja)}")
+        logger.debug('[SOLICITAÇÕES] Peças armazém: %s, Peças loja: %s', len(pecas_armazem), len(pecas_loja))
         
         solicitacoes_criadas = 0
         
@@ -1138,7 +1234,7 @@ def criar_multiplas_solicitacoes_armazem():
             peca_tipo = peca_req.get('tipo')
             quantidade = peca_req.get('quantidade', 1)
             
-            print(f"[SOLICITAÇÕES] Processando: {peca_nome} ({peca_tipo}) x{quantidade}")
+            logger.debug('[SOLICITAÇÕES] Processando: %s (%s) x%s', peca_nome, peca_tipo, quantidade)
             
             # Buscar peça na loja para ID
             peca_loja = None
@@ -1148,7 +1244,7 @@ def criar_multiplas_solicitacoes_armazem():
                     break
             
             if not peca_loja:
-                print(f"[SOLICITAÇÕES] Peça {peca_nome} não encontrada na loja")
+                logger.debug('[SOLICITAÇÕES] Peça %s não encontrada na loja', peca_nome)
                 continue
             
             # Criar solicitação para cada quantidade
@@ -1163,18 +1259,16 @@ def criar_multiplas_solicitacoes_armazem():
                     carro_id=carro_id
                 )
                 solicitacoes_criadas += 1
-                print(f"[SOLICITAÇÕES] Criada solicitação para {peca_nome}")
+                logger.debug('[SOLICITAÇÕES] Criada solicitação para %s', peca_nome)
         
-        print(f"[SOLICITAÇÕES] Total criado: {solicitacoes_criadas}")
+        logger.debug('[SOLICITAÇÕES] Total criado: %s', solicitacoes_criadas)
         return jsonify({
             'sucesso': True,
             'solicitacoes_criadas': solicitacoes_criadas
         })
         
     except Exception as e:
-        print(f"[ERRO SOLICITAÇÕES] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO SOLICITAÇÕES] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/armazem/<equipe_id>')
@@ -1197,7 +1291,7 @@ def get_armazem(equipe_id):
             # Admin pode acessar qualquer equipe
             equipe_id_buscar = str(equipe_id)
         
-        print(f"[ARMAZÉM] Buscando peças para equipe: {equipe_id_buscar}")
+        logger.debug('[ARMAZÉM] Buscando peças para equipe: %s', equipe_id_buscar)
         
         # Buscar todas as peças com instalado = 0 (no armazém) desta equipe
         pecas_guardadas = api.db.carregar_pecas_armazem_equipe(equipe_id_buscar)
@@ -1205,21 +1299,20 @@ def get_armazem(equipe_id):
         # Ordenar por tipo
         pecas_guardadas.sort(key=lambda x: x.get('tipo', ''))
         
-        print(f"[ARMAZÉM] Encontradas {len(pecas_guardadas)} peças para equipe {equipe_id_buscar}")
+        logger.debug('[ARMAZÉM] Encontradas %s peças para equipe %s', len(pecas_guardadas), equipe_id_buscar)
         
         return jsonify({
             'pecas_guardadas': pecas_guardadas,
             'total': len(pecas_guardadas)
         })
     except Exception as e:
-        print(f"[ERRO ARMAZÉM] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO ARMAZÉM] %s', str(e))
         return jsonify({'erro': str(e)}), 500
 
 # ============ ROTAS API - LOJA =============
 
 @app.route('/api/loja/carros')
+@politica_cache(CONDICIONAL)
 def get_carros():
     """Retorna carros disponíveis para compra com variações"""
     carros = []
@@ -1227,16 +1320,16 @@ def get_carros():
     # Sempre recarregar modelos direto do banco para garantir sincronização
     modelos_db = api.db.carregar_modelos_loja()
     
-    print(f"\n[API LOJA CARROS] Carregando do banco: {len(modelos_db) if modelos_db else 0} modelos")
+    logger.debug('[API LOJA CARROS] Carregando do banco: %s modelos', (len(modelos_db) if modelos_db else 0))
     
     # Se não houver modelos no banco, retornar lista vazia
     if not modelos_db or len(modelos_db) == 0:
-        print(f"[API LOJA CARROS] Nenhum modelo disponível")
+        logger.debug('[API LOJA CARROS] Nenhum modelo disponível')
         return jsonify([])
     
     # Usar os dados do banco
     for carro in modelos_db:
-        print(f"[API LOJA CARROS] Processando modelo: {carro.marca} {carro.modelo}")
+        log_amostrado(logger, 'get_carros', '[API LOJA CARROS] Processando modelo: %s %s', carro.marca, carro.modelo)
         carro_dict = {
             'id': carro.id,
             'marca': carro.marca,
@@ -1250,13 +1343,13 @@ def get_carros():
         if imagem:
             carro_dict['imagem'] = imagem
             carro_dict['temImagem'] = True
-            print(f"  [{carro.modelo}] tem_imagem=True (com base64)")
+            log_amostrado(logger, 'get_carros', '[%s] tem_imagem=True (com base64)', carro.modelo)
         else:
-            print(f"  [{carro.modelo}] tem_imagem=False")
+            log_amostrado(logger, 'get_carros', '[%s] tem_imagem=False', carro.modelo)
         
         # Processar variações deste modelo
         variacoes = getattr(carro, 'variacoes', [])
-        print(f"  [{carro.modelo}] {len(variacoes)} variação(ões)")
+        log_amostrado(logger, 'get_carros', '[%s] %s variação(ões)', carro.modelo, len(variacoes))
         
         for variacao in variacoes:
             variacao_dict = {
@@ -1315,20 +1408,18 @@ def get_carros():
     return jsonify(carros)
 
 @app.route('/api/loja/pecas')
+@politica_cache(CONDICIONAL)
 def get_pecas():
     """Retorna peças disponíveis para compra (sem autenticação necessária)"""
     equipe_id = obter_equipe_id_request()
-    equipe = api.gerenciador.obter_equipe(equipe_id) if equipe_id else None
+    # Só o resumo do carro ativo (marca/modelo/modelo_id), sem carregar a equipe inteira
+    carro_ativo = api.db.obter_carro_ativo_resumo(equipe_id) if equipe_id else None
     
-    print(f"\n[LOJA PECAS] Carregando peças para equipe: {equipe_id}")
-    if equipe:
-        print(f"[LOJA PECAS] Equipe encontrada: {equipe.nome}")
-        if equipe.carro:
-            print(f"[LOJA PECAS] Carro ativo: {equipe.carro.marca} {equipe.carro.modelo}")
-        else:
-            print(f"[LOJA PECAS] Equipe sem carro ativo!")
-    else:
-        print(f"[LOJA PECAS] Equipe não encontrada!")
+    logger.debug('[LOJA PECAS] Carregando peças para equipe: %s', equipe_id)
+    if carro_ativo:
+        logger.debug('[LOJA PECAS] Carro ativo: %s %s', carro_ativo['marca'], carro_ativo['modelo'])
+    elif equipe_id:
+        logger.debug('[LOJA PECAS] Equipe sem carro ativo!')
     
     # Recarregar dados do banco para garantir sincronização
     modelos_db = api.db.carregar_modelos_loja()
@@ -1339,7 +1430,7 @@ def get_pecas():
     if pecas_db:
         api.loja_pecas.pecas = pecas_db
     
-    print(f"\n[API] Retornando peças")
+    logger.debug('[API] Retornando peças')
     pecas = []
     modelos_map = {}
     # Montar um dicionário id -> modelo para lookup rápido
@@ -1347,47 +1438,23 @@ def get_pecas():
         for modelo in api.loja_carros.modelos:
             modelos_map[str(modelo.id)] = modelo
 
+    indice = api.db.obter_indice_compatibilidade()
+    modelo_ativo = carro_ativo['modelo_id'] if carro_ativo else None
+
     if api.loja_pecas and hasattr(api.loja_pecas, 'pecas'):
         for peca in api.loja_pecas.pecas:
-            compatibilidade_peca = getattr(peca, 'compatibilidade', 'universal')
+            compatibilidades = indice.modelos(peca.id)
+            compatibilidade_peca = 'universal'
             compatibilidade_nome = 'universal'
             
-            # Debug
-            print(f"[LOJA PECAS] Peça '{peca.nome}' - compatibilidade type: {type(compatibilidade_peca).__name__}, valor: {compatibilidade_peca}")
-            
-            # Tratamento para compatibilidade como objeto JSON (string ou dict)
-            # Se for string JSON, fazer parse
-            if isinstance(compatibilidade_peca, str):
-                try:
-                    if compatibilidade_peca.startswith('{'):
-                        import json
-                        compatibilidade_peca = json.loads(compatibilidade_peca)
-                        print(f"[LOJA PECAS] '{peca.nome}' parseado como JSON: {compatibilidade_peca}")
-                except:
-                    pass  # Não é JSON válido, continuar como string
-            
-            # Se compatibilidade_peca é um dict/objeto com chave "compatibilidades", extrair a lista
-            if isinstance(compatibilidade_peca, dict) and 'compatibilidades' in compatibilidade_peca:
-                compatibilidades_list = compatibilidade_peca['compatibilidades']
-                # Se houver múltiplas compatibilidades, usar a primeira, senão usar universal
-                if compatibilidades_list and len(compatibilidades_list) > 0:
-                    compatibilidade_peca = compatibilidades_list[0]
-                    print(f"[LOJA PECAS] '{peca.nome}' - extraído compatibilidade: {compatibilidade_peca}")
-                else:
-                    compatibilidade_peca = 'universal'
-            
-            # Se compatibilidade é um UUID específico, buscar o nome do modelo
-            if compatibilidade_peca != 'universal':
-                modelo_id = str(compatibilidade_peca)
-                if modelo_id in modelos_map:
-                    modelo = modelos_map[modelo_id]
+            # Exibição usa o primeiro modelo conhecido; ids sem modelo cadastrado contam como universal
+            for modelo_id in compatibilidades:
+                modelo = modelos_map.get(str(modelo_id))
+                if modelo:
+                    compatibilidade_peca = modelo_id
                     compatibilidade_nome = f"{modelo.marca} {modelo.modelo}"
-                    print(f"[LOJA PECAS] '{peca.nome}' - modelo encontrado: {compatibilidade_nome}")
-                else:
-                    # UUID não corresponde a nenhum modelo, usar como universal
-                    print(f"[LOJA PECAS] '{peca.nome}' - UUID não encontrado, tratando como universal: {compatibilidade_peca}")
-                    compatibilidade_peca = 'universal'
-                    compatibilidade_nome = 'universal'
+                    break
+            log_amostrado(logger, 'get_pecas', "[LOJA PECAS] '%s' - compatibilidade: %s", peca.nome, compatibilidade_nome)
             
             # Retornar nome do modelo para exibição, e UUID para comparação
             peca_dict = {
@@ -1397,45 +1464,66 @@ def get_pecas():
                 'preco': peca.preco,
                 'descricao': getattr(peca, 'descricao', ''),
                 'compatibilidade': compatibilidade_peca,  # UUID para comparação
-                'compatibilidade_nome': compatibilidade_nome  # Nome do modelo para exibição
+                'compatibilidade_nome': compatibilidade_nome,  # Nome do modelo para exibição
+                'compatibilidades': compatibilidades,  # Todos os modelos (vazio = universal)
             }
+            if modelo_ativo is not None:
+                peca_dict['compativel'] = indice.compativel(peca.id, modelo_ativo)
             
             # Incluir imagem se existir
             imagem = getattr(peca, 'imagem', None)
             if imagem:
                 peca_dict['imagem'] = imagem
                 peca_dict['temImagem'] = True
-                print(f"  [{peca.nome}] tem_imagem=True (com base64)")
+                log_amostrado(logger, 'get_pecas', '[%s] tem_imagem=True (com base64)', peca.nome)
             else:
-                print(f"  [{peca.nome}] tem_imagem=False")
+                log_amostrado(logger, 'get_pecas', '[%s] tem_imagem=False', peca.nome)
             
             pecas.append(peca_dict)
-    print(f"[API] Total de peças retornadas: {len(pecas)}\n")
+    logger.debug('[API] Total de peças retornadas: %s', len(pecas))
     return jsonify(pecas)
 
+@app.route('/api/loja/pecas/compativeis')
+@requer_login_api
+@politica_cache(CONDICIONAL)
+def get_pecas_compativeis():
+    """Peças da loja compatíveis com o carro ativo da equipe (filtro no servidor, sem imagens)"""
+    equipe_id = obter_equipe_id_request()
+    carro_ativo = api.db.obter_carro_ativo_resumo(equipe_id) if equipe_id else None
+    if not carro_ativo:
+        if not equipe_id or api.db.obter_nome_equipe(equipe_id) is None:
+            return jsonify({'erro': 'Equipe não encontrada'}), 404
+        return jsonify({'erro': 'Equipe sem carro ativo', 'pecas': []}), 400
+    
+    modelo_id = carro_ativo['modelo_id']
+    pecas = api.db.listar_pecas_compativeis_modelo(modelo_id)
+    logger.debug('[LOJA PECAS] %s peça(s) compatíveis com o modelo %s', len(pecas), modelo_id)
+    return jsonify({
+        'carro_id': carro_ativo['id'],
+        'modelo_id': modelo_id,
+        'pecas': pecas,
+    })
+
 @app.route('/api/aguardando-pecas', methods=['GET'])
 def get_aguardando_pecas():
     """Retorna apenas peças aguardando instalação (não carros)"""
-    print("\n" + "="*70)
-    print("[AGUARDANDO-PECAS] ROTA ATIVADA!")
-    print(f"[AGUARDANDO-PECAS] X-Equipe-ID: {request.headers.get('X-Equipe-ID')}")
-    print(f"[AGUARDANDO-PECAS] Session equipe_id: {session.get('equipe_id')}")
+    logger.debug('[AGUARDANDO-PECAS] ROTA ATIVADA!')
+    logger.debug('[AGUARDANDO-PECAS] X-Equipe-ID: %s', request.headers.get('X-Equipe-ID'))
+    logger.debug('[AGUARDANDO-PECAS] Session equipe_id: %s', session.get('equipe_id'))
     try:
         equipe_id = obter_equipe_id_request()
-        print(f"[AGUARDANDO-PECAS] obter_equipe_id retornou: {equipe_id}")
+        logger.debug('[AGUARDANDO-PECAS] obter_equipe_id retornou: %s', equipe_id)
         if not equipe_id and 'equipe_id' in session:
             equipe_id = session['equipe_id']
-            print(f"[AGUARDANDO-PECAS] Usando session equipe_id: {equipe_id}")
+            logger.debug('[AGUARDANDO-PECAS] Usando session equipe_id: %s', equipe_id)
         if not equipe_id:
-            print(f"[AGUARDANDO-PECAS] ERRO 401: Nao autenticado")
-            print("="*70)
+            logger.error('[AGUARDANDO-PECAS] ERRO 401: Nao autenticado')
             return jsonify({'erro': 'Nao autenticado'}), 401
         
         equipe = api.gerenciador.obter_equipe(equipe_id)
-        print(f"[AGUARDANDO-PECAS] Equipe carregada: {equipe.nome if equipe else 'NULO'}")
+        logger.debug('[AGUARDANDO-PECAS] Equipe carregada: %s', (equipe.nome if equipe else 'NULO'))
         if not equipe:
-            print(f"[AGUARDANDO-PECAS] ERRO 404: Equipe nao encontrada")
-            print("="*70)
+            logger.error('[AGUARDANDO-PECAS] ERRO 404: Equipe nao encontrada')
             return jsonify({'erro': 'Equipe nao encontrada'}), 404
         
         pecas_aguardando = []
@@ -1474,45 +1562,40 @@ def get_aguardando_pecas():
                         'timestamp': sol.get('data_solicitacao', '')
                     })
         except Exception as e:
-            print(f"[AGUARDANDO-PECAS] Erro ao carregar solicitações: {str(e)}")
+            logger.error('[AGUARDANDO-PECAS] Erro ao carregar solicitações: %s', str(e))
         
         pecas_aguardando.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        print(f"[AGUARDANDO-PECAS] Retornando {len(pecas_aguardando)} peças")
-        print("="*70)
+        logger.debug('[AGUARDANDO-PECAS] Retornando %s peças', len(pecas_aguardando))
         return jsonify(pecas_aguardando)
     except Exception as e:
-        print(f"[AGUARDANDO-PECAS] ERRO: {str(e)}")
-        print("="*70)
+        logger.error('[AGUARDANDO-PECAS] ERRO: %s', str(e))
         return jsonify({'erro': str(e)}), 500
 
 @app.route('/api/aguardando-carros', methods=['GET'])
 def get_aguardando_carros():
     """Retorna apenas carros aguardando compra (não peças)"""
-    print("\n" + "="*70)
-    print("[AGUARDANDO-CARROS] ROTA ATIVADA!")
+    logger.debug('[AGUARDANDO-CARROS] ROTA ATIVADA!')
     try:
         equipe_id = obter_equipe_id_request()
         if not equipe_id and 'equipe_id' in session:
             equipe_id = session['equipe_id']
         if not equipe_id:
-            print(f"[AGUARDANDO-CARROS] ERRO 401: Nao autenticado")
-            print("="*70)
+            logger.error('[AGUARDANDO-CARROS] ERRO 401: Nao autenticado')
             return jsonify({'erro': 'Nao autenticado'}), 401
         
         equipe = api.gerenciador.obter_equipe(equipe_id)
         if not equipe:
-            print(f"[AGUARDANDO-CARROS] ERRO 404: Equipe nao encontrada")
-            print("="*70)
+            logger.error('[AGUARDANDO-CARROS] ERRO 404: Equipe nao encontrada')
             return jsonify({'erro': 'Equipe nao encontrada'}), 404
         
         carros_aguardando = []
         try:
             solicitacoes_carros = api.db.carregar_solicitacoes_carros(equipe_id)
-            print(f"[AGUARDANDO-CARROS] Total de solicitações carregadas: {len(solicitacoes_carros) if solicitacoes_carros else 0}")
+            logger.debug('[AGUARDANDO-CARROS] Total de solicitações carregadas: %s', (len(solicitacoes_carros) if solicitacoes_carros else 0))
             
             if solicitacoes_carros:
                 for sol in solicitacoes_carros:
-                    print(f"[AGUARDANDO-CARROS] Solicitação: ID={sol.get('id')}, status={sol.get('status')}, tipo_carro={sol.get('tipo_carro')}")
+                    log_amostrado(logger, 'get_aguardando_carros', '[AGUARDANDO-CARROS] Solicitação: ID=%s, status=%s, tipo_carro=%s', sol.get('id'), sol.get('status'), sol.get('tipo_carro'))
                     if sol['status'] == 'pendente':
                         # Parse tipo_carro format: "UUID|Marca|Modelo" ou UUID puro (legacy)
                         tipo_carro_str = sol.get('tipo_carro', '')
@@ -1543,7 +1626,7 @@ def get_aguardando_carros():
                                 modelo = api.db.buscar_modelo_loja_por_id(carro_id)
                         
                         if modelo:
-                            print(f"[AGUARDANDO-CARROS] Modelo encontrado: {modelo.marca} {modelo.modelo}")
+                            log_amostrado(logger, 'get_aguardando_carros', '[AGUARDANDO-CARROS] Modelo encontrado: %s %s', modelo.marca, modelo.modelo)
                             carros_aguardando.append({
                                 'id': sol.get('id'),
                                 'marca': modelo.marca,
@@ -1554,7 +1637,7 @@ def get_aguardando_carros():
                             })
                         elif marca and modelo_name:
                             # Modelo foi deletado, mas temos marca e modelo armazenados
-                            print(f"[AGUARDANDO-CARROS] Modelo deletado, mas marca/modelo recuperados: {marca} {modelo_name}")
+                            log_amostrado(logger, 'get_aguardando_carros', '[AGUARDANDO-CARROS] Modelo deletado, mas marca/modelo recuperados: %s %s', marca, modelo_name)
                             carros_aguardando.append({
                                 'id': sol.get('id'),
                                 'marca': marca,
@@ -1565,7 +1648,7 @@ def get_aguardando_carros():
                             })
                         else:
                             # Fallback: Modelo não encontrado e sem dados armazenados
-                            print(f"[AGUARDANDO-CARROS] AVISO: Modelo não encontrado para tipo_carro={tipo_carro_str}")
+                            logger.warning('[AGUARDANDO-CARROS] AVISO: Modelo não encontrado para tipo_carro=%s', tipo_carro_str)
                             carros_aguardando.append({
                                 'id': sol.get('id'),
                                 'marca': 'Modelo Deletado',
@@ -1575,29 +1658,27 @@ def get_aguardando_carros():
                                 'timestamp': sol.get('data_solicitacao', '')
                             })
         except Exception as e:
-            print(f"[AGUARDANDO-CARROS] Erro ao carregar solicitações: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception('[AGUARDANDO-CARROS] Erro ao carregar solicitações: %s', str(e))
         
         carros_aguardando.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        print(f"[AGUARDANDO-CARROS] Retornando {len(carros_aguardando)} carros")
-        print("="*70)
+        logger.debug('[AGUARDANDO-CARROS] Retornando %s carros', len(carros_aguardando))
         return jsonify(carros_aguardando)
     except Exception as e:
-        print(f"[AGUARDANDO-CARROS] ERRO: {str(e)}")
-        print("="*70)
+        logger.error('[AGUARDANDO-CARROS] ERRO: %s', str(e))
         return jsonify({'erro': str(e)}), 500
 
 # ============ ROTAS API - ETAPAS =============
 
 @app.route('/api/loja/etapas')
+@politica_cache(CONDICIONAL)
 def get_etapas():
     """Retorna todas as etapas do campeonato"""
     try:
+        definir_ultima_modificacao(api.db.obter_ultima_atualizacao('etapas'))
         etapas = api.db.listar_etapas()
         return jsonify(etapas)
     except Exception as e:
-        print(f"[ERRO] Erro ao listar etapas: {e}")
+        logger.error('[ERRO] Erro ao listar etapas: %s', e)
         return jsonify({'erro': str(e)}), 500
 
 @app.route('/api/pilotos/<piloto_id>/etapas')
@@ -1607,7 +1688,7 @@ def get_etapas_piloto(piloto_id):
         etapas = api.db.obter_etapas_piloto(piloto_id)
         return jsonify({'etapas': etapas})
     except Exception as e:
-        print(f"[ERRO] Erro ao obter etapas do piloto: {e}")
+        logger.error('[ERRO] Erro ao obter etapas do piloto: %s', e)
         return jsonify({'erro': str(e)}), 500
 
 @app.route('/api/etapas/participar', methods=['POST'])
@@ -1623,27 +1704,25 @@ def participar_etapa():
         if not etapa_id or not equipe_id or not piloto_id:
             return jsonify({'sucesso': False, 'erro': 'Etapa, equipe e piloto são obrigatórios'}), 400
         
-        print(f"[PILOTO CANDIDATO] Piloto {piloto_nome} ({piloto_id}) candidatando-se para equipe {equipe_id} na etapa {etapa_id}")
+        logger.debug('[PILOTO CANDIDATO] Piloto %s (%s) candidatando-se para equipe %s na etapa %s', piloto_nome, piloto_id, equipe_id, etapa_id)
         
         resultado = api.db.inscrever_piloto_candidato_etapa(etapa_id, equipe_id, piloto_id, piloto_nome)
         
         if resultado['sucesso']:
-            print(f"[PILOTO CANDIDATO] ✅ Piloto {piloto_nome} inscrito como candidato")
+            logger.info('[PILOTO CANDIDATO] ✅ Piloto %s inscrito como candidato', piloto_nome)
             return jsonify(resultado)
         else:
-            print(f"[PILOTO CANDIDATO] ❌ Erro: {resultado['erro']}")
+            logger.error('[PILOTO CANDIDATO] ❌ Erro: %s', resultado['erro'])
             return jsonify(resultado), 400
     except Exception as e:
-        print(f"[ERRO] Erro ao inscrever piloto em etapa: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao inscrever piloto em etapa: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/etapas/<etapa_id>/equipes-procurando-piloto', methods=['GET'])
 def obter_equipes_etapa(etapa_id):
     """Retorna equipes de uma etapa categorizadas por tipo de participação com carro e peças"""
     try:
-        print(f"[ROTA DEBUG] GET /api/etapas/{etapa_id}/equipes-procurando-piloto")
+        logger.debug('[ROTA DEBUG] GET /api/etapas/%s/equipes-procurando-piloto', etapa_id)
         # Buscar todas as equipes inscritas nesta etapa
         equipes_inscritas = api.db.obter_equipes_etapa(etapa_id)
         
@@ -1697,9 +1776,7 @@ def obter_equipes_etapa(etapa_id):
             'procurando_piloto': procurando_piloto
         })
     except Exception as e:
-        print(f"[ERRO] Erro ao buscar equipes da etapa: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao buscar equipes da etapa: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/equipes/<equipe_id>/etapas')
@@ -1709,7 +1786,7 @@ def get_etapas_equipe(equipe_id):
         etapas = api.db.obter_etapas_equipe(equipe_id)
         return jsonify({'etapas': etapas})
     except Exception as e:
-        print(f"[ERRO] Erro ao obter etapas da equipe: {e}")
+        logger.error('[ERRO] Erro ao obter etapas da equipe: %s', e)
         return jsonify({'erro': str(e)}), 500
 
 
@@ -1721,9 +1798,7 @@ def obter_candidatos_pilotos(etapa_id):
         candidatos = api.db.obter_candidatos_piloto_etapa(etapa_id)
         return jsonify({'sucesso': True, 'candidatos': candidatos})
     except Exception as e:
-        print(f"[ERRO] Erro ao obter candidatos: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao obter candidatos: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/designar-piloto-etapa', methods=['POST'])
@@ -1739,15 +1814,13 @@ def admin_designar_piloto_etapa():
         resultado = api.db.designar_piloto_etapa(candidato_id)
         
         if resultado['sucesso']:
-            print(f"[ADMIN] ✅ Piloto designado para equipe")
+            logger.info('[ADMIN] ✅ Piloto designado para equipe')
             return jsonify(resultado)
         else:
-            print(f"[ADMIN] ❌ Erro ao designar: {resultado['erro']}")
+            logger.error('[ADMIN] ❌ Erro ao designar: %s', resultado['erro'])
             return jsonify(resultado), 400
     except Exception as e:
-        print(f"[ERRO] Erro ao designar piloto: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao designar piloto: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/candidatos-piloto-etapa/cancelar', methods=['POST'])
@@ -1769,15 +1842,13 @@ def cancelar_candidatura_piloto():
         resultado = api.db.cancelar_candidatura_piloto_etapa(candidato_id, piloto_id)
         
         if resultado['sucesso']:
-            print(f"[PILOTO] ✅ Candidatura cancelada")
+            logger.info('[PILOTO] ✅ Candidatura cancelada')
             return jsonify(resultado)
         else:
-            print(f"[PILOTO] ❌ Erro ao cancelar: {resultado['erro']}")
+            logger.error('[PILOTO] ❌ Erro ao cancelar: %s', resultado['erro'])
             return jsonify(resultado), 400
     except Exception as e:
-        print(f"[ERRO] Erro ao cancelar candidatura: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao cancelar candidatura: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/etapas/<etapa_id>/pilotos-confirmacao', methods=['GET'])
@@ -1788,7 +1859,7 @@ def obter_pilotos_confirmacao(etapa_id):
         resultado = api.db.obter_pilotos_para_confirmacao(etapa_id)
         return jsonify(resultado)
     except Exception as e:
-        print(f"[API] Erro ao obter pilotos para confirmação: {e}")
+        logger.error('[API] Erro ao obter pilotos para confirmação: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/participacoes-etapas/<participacao_id>/confirmar', methods=['POST'])
@@ -1804,7 +1875,7 @@ def confirmar_participacao(participacao_id):
         resultado = api.db.confirmar_participacao_piloto(participacao_id, piloto_id)
         
         if resultado['sucesso']:
-            print(f"[PILOTO] ✅ Participação confirmada")
+            logger.info('[PILOTO] ✅ Participação confirmada')
             return jsonify(resultado)
         
         # Se não achou em participacoes_etapas, tentar confirmar como candidato
@@ -1812,15 +1883,13 @@ def confirmar_participacao(participacao_id):
         resultado = api.db.confirmar_candidatura_piloto_etapa(participacao_id, piloto_id)
         
         if resultado['sucesso']:
-            print(f"[PILOTO] ✅ Candidatura confirmada")
+            logger.info('[PILOTO] ✅ Candidatura confirmada')
             return jsonify(resultado)
         else:
-            print(f"[PILOTO] ❌ Erro ao confirmar: {resultado['erro']}")
+            logger.error('[PILOTO] ❌ Erro ao confirmar: %s', resultado['erro'])
             return jsonify(resultado), 400
     except Exception as e:
-        print(f"[API] Erro ao confirmar participação: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[API] Erro ao confirmar participação: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/participacoes-etapas/<participacao_id>/desistir', methods=['POST'])
@@ -1835,15 +1904,13 @@ def desistir_participacao(participacao_id):
         resultado = api.db.desistir_participacao_piloto(participacao_id, piloto_id)
         
         if resultado['sucesso']:
-            print(f"[PILOTO] ✅ Desistência registrada")
+            logger.info('[PILOTO] ✅ Desistência registrada')
             return jsonify(resultado)
         else:
-            print(f"[PILOTO] ❌ Erro ao desistir: {resultado['erro']}")
+            logger.error('[PILOTO] ❌ Erro ao desistir: %s', resultado['erro'])
             return jsonify(resultado), 400
     except Exception as e:
-        print(f"[API] Erro ao desistir: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[API] Erro ao desistir: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/etapas/<etapa_id>/pilotos-sem-equipe', methods=['GET'])
@@ -1854,7 +1921,7 @@ def listar_pilotos_sem_equipe(etapa_id):
         resultado = api.db.obter_pilotos_sem_equipe(etapa_id)
         return jsonify(resultado)
     except Exception as e:
-        print(f"[API] Erro ao listar pilotos sem equipe: {e}")
+        logger.error('[API] Erro ao listar pilotos sem equipe: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/etapas/<etapa_id>/equipes/<equipe_id>/alocar-proximo-piloto', methods=['POST'])
@@ -1865,15 +1932,13 @@ def alocar_proximo_piloto(etapa_id, equipe_id):
         resultado = api.db.alocar_proximo_piloto_candidato(etapa_id, equipe_id)
         
         if resultado['sucesso']:
-            print(f"[ADMIN] ✅ Piloto alocado")
+            logger.info('[ADMIN] ✅ Piloto alocado')
             return jsonify(resultado)
         else:
-            print(f"[ADMIN] ❌ Erro ao alocar: {resultado['erro']}")
+            logger.error('[ADMIN] ❌ Erro ao alocar: %s', resultado['erro'])
             return jsonify(resultado), 400
     except Exception as e:
-        print(f"[API] Erro ao alocar piloto: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[API] Erro ao alocar piloto: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/etapas/<etapa_id>/equipes/<equipe_id>/alocar-piloto-reserva', methods=['POST'])
@@ -1890,15 +1955,38 @@ def alocar_piloto_reserva(etapa_id, equipe_id):
         resultado = api.db.alocar_piloto_reserva_para_equipe(etapa_id, equipe_id, piloto_id)
         
         if resultado['sucesso']:
-            print(f"[ADMIN] ✅ Piloto reserva alocado")
+            logger.info('[ADMIN] ✅ Piloto reserva alocado')
+            return jsonify(resultado)
+        else:
+            logger.error('[ADMIN] ❌ Erro ao alocar reserva: %s', resultado['erro'])
+            return jsonify(resultado), 400
+    except Exception as e:
+        logger.exception('[API] Erro ao alocar piloto reserva: %s', e)
+        return jsonify({'sucesso': False, 'erro': str(e)}), 500
+
+@app.route('/api/admin/etapas/<etapa_id>/alocar-pilotos', methods=['POST'])
+@requer_admin
+@politica_cache(SEM_ARMAZENAMENTO)
+def alocar_pilotos_etapa(etapa_id):
+    """Admin aloca pilotos para todas as equipes sem piloto da etapa
+
+    Body opcional: {"simular": true} devolve a prévia sem gravar nada.
+    """
+    try:
+        dados = request.get_json(silent=True) or {}
+        simular = bool(dados.get('simular')) or request.args.get('simular') in ('1', 'true')
+
+        resultado = api.db.alocar_pilotos_etapa(etapa_id, simular=simular)
+
+        if resultado['sucesso']:
+            logger.info('[ADMIN] Alocação automática (%s): %s pilotos', 'simulação' if simular else 'gravada',
+                        resultado['total_alocados'])
             return jsonify(resultado)
         else:
-            print(f"[ADMIN] ❌ Erro ao alocar reserva: {resultado['erro']}")
+            logger.error('[ADMIN] ❌ Erro na alocação automática: %s', resultado['erro'])
             return jsonify(resultado), 400
     except Exception as e:
-        print(f"[API] Erro ao alocar piloto reserva: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[API] Erro na alocação automática de pilotos: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/etapas/<etapa_id>/equipes-precisando-piloto')
@@ -1908,48 +1996,16 @@ def get_equipes_precisando_piloto(etapa_id):
         equipes = api.db.obter_equipes_precisando_piloto(etapa_id)
         return jsonify({'equipes': equipes})
     except Exception as e:
-        print(f"[ERRO] Erro ao obter equipes: {e}")
+        logger.error('[ERRO] Erro ao obter equipes: %s', e)
         return jsonify({'erro': str(e)}), 500
 
 @app.route('/api/etapa-em-andamento', methods=['GET'])
 def obter_etapa_em_andamento():
     """Retorna a etapa atual em andamento (independente de quando for)"""
     try:
-        conn = api.db._get_conn()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Buscar etapa em andamento
-        cursor.execute('''
-            SELECT 
-                e.id,
-                e.numero,
-                e.nome,
-                e.descricao,
-                e.data_etapa,
-                e.hora_etapa,
-                e.status,
-                c.id as campeonato_id,
-                c.nome as campeonato_nome,
-                c.serie,
-                c.numero_etapas
-            FROM etapas e
-            INNER JOIN campeonatos c ON e.campeonato_id = c.id
-            WHERE e.status = 'em_andamento'
-            ORDER BY e.data_etapa DESC
-            LIMIT 1
-        ''')
-        
-        resultado = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        resultado = api.db.calendario_etapas.em_andamento()
         
         if resultado:
-            # Converter timedelta para string HH:MM:SS
-            if resultado['hora_etapa']:
-                resultado['hora_etapa'] = str(resultado['hora_etapa'])
-            if resultado['data_etapa']:
-                resultado['data_etapa'] = resultado['data_etapa'].isoformat()
-            
             return jsonify({
                 'sucesso': True,
                 'etapa': resultado
@@ -1960,51 +2016,16 @@ def obter_etapa_em_andamento():
                 'mensagem': 'Nenhuma etapa em andamento'
             }), 404
     except Exception as e:
-        print(f'Erro ao buscar etapa em andamento: {e}')
+        logger.error('Erro ao buscar etapa em andamento: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/etapa-hoje', methods=['GET'])
 def obter_etapa_hoje():
     """Retorna o campeonato e etapa agendada para hoje"""
     try:
-        from datetime import datetime
-        hoje = datetime.now().date()
-        
-        conn = api.db._get_conn()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Buscar etapa de hoje
-        cursor.execute('''
-            SELECT 
-                e.id,
-                e.numero,
-                e.nome,
-                e.descricao,
-                e.data_etapa,
-                e.hora_etapa,
-                e.status,
-                c.id as campeonato_id,
-                c.nome as campeonato_nome,
-                c.serie,
-                c.numero_etapas
-            FROM etapas e
-            INNER JOIN campeonatos c ON e.campeonato_id = c.id
-            WHERE DATE(e.data_etapa) = %s
-            ORDER BY e.hora_etapa
-            LIMIT 1
-        ''', (hoje,))
-        
-        resultado = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        resultado = api.db.calendario_etapas.etapa_hoje()
         
         if resultado:
-            # Converter timedelta para string HH:MM:SS
-            if resultado['hora_etapa']:
-                resultado['hora_etapa'] = str(resultado['hora_etapa'])
-            if resultado['data_etapa']:
-                resultado['data_etapa'] = resultado['data_etapa'].isoformat()
-            
             return jsonify({
                 'sucesso': True,
                 'etapa': resultado
@@ -2017,12 +2038,11 @@ def obter_etapa_hoje():
                 'mensagem': 'Nenhuma etapa agendada para hoje'
             })
     except Exception as e:
-        print(f"[ERRO] Erro ao obter etapa de hoje: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao obter etapa de hoje: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/user/is-admin', methods=['GET'])
+@politica_cache(SEM_ARMAZENAMENTO)
 def is_admin():
     """Verifica se o usuário atual é admin"""
     return jsonify({
@@ -2063,7 +2083,7 @@ def fazer_etapa():
         
         participacoes = cursor.fetchall()
         
-        print(f"[FAZER ETAPA] Participações em ordem: {[(p['ordem_qualificacao'], p['equipe_id'][:8]) for p in participacoes]}")
+        logger.debug('[FAZER ETAPA] Participações em ordem: %s', [(p['ordem_qualificacao'], p['equipe_id'][:8]) for p in participacoes])
         
         # Limpar voltas anteriores (se houver)
         cursor.execute('DELETE FROM volta WHERE id_etapa COLLATE utf8mb4_unicode_ci = %s COLLATE utf8mb4_unicode_ci', (etapa_id,))
@@ -2083,7 +2103,7 @@ def fazer_etapa():
             else:
                 status = 'aguardando'  # Demais estão aguardando
             
-            print(f"[VOLTA CRIADA] idx={idx}, ordem={ordem}, status={status}, equipe={equipe_id[:8]}")
+            logger.debug('[VOLTA CRIADA] idx=%s, ordem=%s, status=%s, equipe=%s', idx, ordem, status, equipe_id[:8])
             
             cursor.execute('''
                 INSERT INTO volta (id_piloto, id_equipe, id_etapa, nota_linha, nota_angulo, nota_estilo, status)
@@ -2093,6 +2113,7 @@ def fazer_etapa():
         conn.commit()
         cursor.close()
         conn.close()
+        api.db.calendario_etapas.invalidar()
         
         # Aplicar ordenação de qualificação (por pontos do campeonato anterior ou aleatória)
         resultado_ordena = api.db.aplicar_ordenacao_qualificacao(etapa_id)
@@ -2171,15 +2192,13 @@ def obter_equipes_pilotos_etapa(etapa_id):
                 }
         
         equipes = list(equipes_dict.values())
-        print(f"[API] Total de equipes na etapa {etapa_id}: {len(equipes)}")
+        logger.debug('[API] Total de equipes na etapa %s: %s', etapa_id, len(equipes))
         for i, eq in enumerate(equipes):
-            print(f"  {i+1}. {eq['equipe_nome']} (ordem: {eq.get('ordem_qualificacao', 'N/A')})")
+            logger.debug('%s. %s (ordem: %s)', i+1, eq['equipe_nome'], eq.get('ordem_qualificacao', 'N/A'))
         
         return jsonify({'sucesso': True, 'equipes': equipes})
     except Exception as e:
-        print(f"[API] Erro ao obter equipes/pilotos da etapa: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[API] Erro ao obter equipes/pilotos da etapa: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/finalizar-qualificacao/<etapa_id>', methods=['POST'])
@@ -2219,6 +2238,7 @@ def finalizar_qualificacao(etapa_id):
         conn.commit()
         cursor.close()
         conn.close()
+        api.db.calendario_etapas.invalidar()
         
         return jsonify({'sucesso': True, 'mensagem': 'Qualificacao finalizada! Status mudado para batalhas.'})
     except Exception as e:
@@ -2392,97 +2412,108 @@ def challonge_status():
 @app.route('/api/etapas/<etapa_id>/enviar-challonge', methods=['POST'])
 @requer_admin
 def enviar_etapa_challonge(etapa_id):
-    """Cria torneio no Challonge v1 a partir do chaveamento da etapa. Basic Auth (username, api_key)."""
-    try:
-        if not CHALLONGE_API_KEY:
-            return jsonify({'sucesso': False, 'erro': 'Configure CHALLONGE_API_KEY no .env (challonge.com/settings/developer)'}), 400
-        if not CHALLONGE_USERNAME:
-            return jsonify({'sucesso': False, 'erro': 'Configure CHALLONGE_USERNAME no .env (seu usuário Challonge). Reinicie o servidor após editar .env'}), 400
-        conn = api.db._get_conn()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute('''
-            SELECT e.id, e.nome, e.numero, c.nome as campeonato_nome
-            FROM etapas e
-            JOIN campeonatos c ON e.campeonato_id = c.id
-            WHERE e.id = %s
-        ''', (etapa_id,))
-        etapa = cursor.fetchone()
-        if not etapa:
-            cursor.close()
-            conn.close()
-            return jsonify({'sucesso': False, 'erro': 'Etapa não encontrada'}), 404
-        cursor.execute('''
-            SELECT pe.equipe_id, e.nome as equipe_nome, pe.ordem_qualificacao,
-                   COALESCE(v.nota_linha,0)+COALESCE(v.nota_angulo,0)+COALESCE(v.nota_estilo,0) as total_notas
-            FROM participacoes_etapas pe
-            JOIN equipes e ON pe.equipe_id = e.id
-            LEFT JOIN volta v ON v.id_equipe = pe.equipe_id AND v.id_etapa = pe.etapa_id
-            WHERE pe.etapa_id = %s
-        ''', (etapa_id,))
-        rows = cursor.fetchall()
+    """Enfileira a criação do torneio no Challonge (job 'challonge_etapa'); responde 202 com o job_id"""
+    if not CHALLONGE_API_KEY:
+        return jsonify({'sucesso': False, 'erro': 'Configure CHALLONGE_API_KEY no .env (challonge.com/settings/developer)'}), 400
+    if not CHALLONGE_USERNAME:
+        return jsonify({'sucesso': False, 'erro': 'Configure CHALLONGE_USERNAME no .env (seu usuário Challonge). Reinicie o servidor após editar .env'}), 400
+    return responder_job('challonge_etapa', {'etapa_id': etapa_id})
+
+
+def _job_enviar_etapa_challonge(parametros, progresso):
+    """Cria torneio no Challonge v1 a partir do chaveamento da etapa. Basic Auth (username, api_key).
+
+    O resultado tem o formato da antiga resposta síncrona ({'sucesso', 'url', ...}
+    ou {'sucesso': False, 'erro'}). Erro 5xx do Challonge levanta exceção para o
+    executor repetir o job.
+    """
+    etapa_id = parametros['etapa_id']
+    conn = api.db._get_conn()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute('''
+        SELECT e.id, e.nome, e.numero, c.nome as campeonato_nome
+        FROM etapas e
+        JOIN campeonatos c ON e.campeonato_id = c.id
+        WHERE e.id = %s
+    ''', (etapa_id,))
+    etapa = cursor.fetchone()
+    if not etapa:
         cursor.close()
         conn.close()
-        participantes = sorted(rows, key=lambda x: (-(x['total_notas'] or 0), x['equipe_id']))
-        if len(participantes) < 2:
-            return jsonify({'sucesso': False, 'erro': 'Mínimo 2 participantes para criar torneio'}), 400
-        nome_torneio = f"{etapa['campeonato_nome']} - Etapa {etapa['numero']}"
-        url_slug = f"granpix_{etapa_id.replace('-', '')[:16]}"
-
-        # v1: form encoding (tournament[name], tournament[url], etc) - NÃO JSON:API
-        payload = {
-            'tournament[name]': nome_torneio,
-            'tournament[url]': url_slug,
-            'tournament[tournament_type]': 'single elimination',
-            'tournament[game_name]': 'Drift RP',
+        return {'sucesso': False, 'erro': 'Etapa não encontrada'}
+    cursor.execute('''
+        SELECT pe.equipe_id, e.nome as equipe_nome, pe.ordem_qualificacao,
+               COALESCE(v.nota_linha,0)+COALESCE(v.nota_angulo,0)+COALESCE(v.nota_estilo,0) as total_notas
+        FROM participacoes_etapas pe
+        JOIN equipes e ON pe.equipe_id = e.id
+        LEFT JOIN volta v ON v.id_equipe = pe.equipe_id AND v.id_etapa = pe.etapa_id
+        WHERE pe.etapa_id = %s
+    ''', (etapa_id,))
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    participantes = sorted(rows, key=lambda x: (-(x['total_notas'] or 0), x['equipe_id']))
+    if len(participantes) < 2:
+        return {'sucesso': False, 'erro': 'Mínimo 2 participantes para criar torneio'}
+    nome_torneio = f"{etapa['campeonato_nome']} - Etapa {etapa['numero']}"
+    url_slug = f"granpix_{etapa_id.replace('-', '')[:16]}"
+
+    # v1: form encoding (tournament[name], tournament[url], etc) - NÃO JSON:API
+    payload = {
+        'tournament[name]': nome_torneio,
+        'tournament[url]': url_slug,
+        'tournament[tournament_type]': 'single elimination',
+        'tournament[game_name]': 'Drift RP',
+    }
+    progresso(0, len(participantes) + 2, 'Criando torneio')
+    r = _challonge_request('POST', '/tournaments.json', data=payload)
+    if r.status_code not in (200, 201):
+        err_detail = r.text[:400] if r.text else str(r.status_code)
+        logger.error('[CHALLONGE] Create falhou: %s %s', r.status_code, err_detail)
+        if r.status_code == 401:
+            msg = 'Challonge: 401 Access denied. Verifique CHALLONGE_USERNAME e CHALLONGE_API_KEY no .env e reinicie o servidor.'
+        elif 500 <= r.status_code < 600:
+            raise RuntimeError(f'Challonge temporariamente indisponível (erro {r.status_code}). Tente novamente em alguns minutos.')
+        else:
+            msg = f'Challonge: {r.status_code} - {err_detail[:150]}'
+        return {'sucesso': False, 'erro': msg}
+
+    tour = r.json()
+    # v1 retorna { tournament: { id, url, full_challonge_url, ... } }
+    t = tour.get('tournament', tour)
+    tour_id = t.get('id')
+    tour_url = t.get('full_challonge_url') or f"https://challonge.com/{t.get('url', url_slug)}"
+
+    # Adicionar participantes (v1: participant[name], participant[seed])
+    for i, p in enumerate(participantes):
+        part_data = {
+            'participant[name]': p['equipe_nome'][:255],
+            'participant[seed]': i + 1,
+        }
+        pr = _challonge_request('POST', f'/tournaments/{url_slug}/participants.json', data=part_data)
+        if pr.status_code not in (200, 201):
+            logger.debug('[CHALLONGE] Aviso ao adicionar %s: %s %s', p['equipe_nome'], pr.status_code, pr.text[:100])
+        progresso(i + 2, len(participantes) + 2, p['equipe_nome'][:255])
+
+    # Iniciar torneio (v1: POST /tournaments/{url}/start.json)
+    start_r = _challonge_request('POST', f'/tournaments/{url_slug}/start.json')
+    if start_r.status_code not in (200, 201):
+        err_msg = start_r.text[:400] if start_r.text else str(start_r.status_code)
+        logger.error('[CHALLONGE] Start falhou: %s %s', start_r.status_code, start_r.text)
+        api.db.salvar_configuracao(f'challonge_etapa_{etapa_id}', tour_url, 'URL do torneio Challonge')
+        return {
+            'sucesso': True,
+            'url': tour_url,
+            'tournament_id': tour_id,
+            'bracket_pendente': True,
+            'erro': f'Torneio criado. Inicie manualmente em: {tour_url} (erro: {err_msg})'
         }
-        r = _challonge_request('POST', '/tournaments.json', data=payload)
-        if r.status_code not in (200, 201):
-            err_detail = r.text[:400] if r.text else str(r.status_code)
-            print(f"[CHALLONGE] Create falhou: {r.status_code} {err_detail}")
-            if r.status_code == 401:
-                msg = 'Challonge: 401 Access denied. Verifique CHALLONGE_USERNAME e CHALLONGE_API_KEY no .env e reinicie o servidor.'
-            elif 500 <= r.status_code < 600:
-                msg = f'Challonge temporariamente indisponível (erro {r.status_code}). Tente novamente em alguns minutos.'
-            else:
-                msg = f'Challonge: {r.status_code} - {err_detail[:150]}'
-            return jsonify({'sucesso': False, 'erro': msg}), 400
 
-        tour = r.json()
-        # v1 retorna { tournament: { id, url, full_challonge_url, ... } }
-        t = tour.get('tournament', tour)
-        tour_id = t.get('id')
-        tour_url = t.get('full_challonge_url') or f"https://challonge.com/{t.get('url', url_slug)}"
-
-        # Adicionar participantes (v1: participant[name], participant[seed])
-        for i, p in enumerate(participantes):
-            part_data = {
-                'participant[name]': p['equipe_nome'][:255],
-                'participant[seed]': i + 1,
-            }
-            pr = _challonge_request('POST', f'/tournaments/{url_slug}/participants.json', data=part_data)
-            if pr.status_code not in (200, 201):
-                print(f"[CHALLONGE] Aviso ao adicionar {p['equipe_nome']}: {pr.status_code} {pr.text[:100]}")
-
-        # Iniciar torneio (v1: POST /tournaments/{url}/start.json)
-        start_r = _challonge_request('POST', f'/tournaments/{url_slug}/start.json')
-        if start_r.status_code not in (200, 201):
-            err_msg = start_r.text[:400] if start_r.text else str(start_r.status_code)
-            print(f"[CHALLONGE] Start falhou: {start_r.status_code} {start_r.text}")
-            api.db.salvar_configuracao(f'challonge_etapa_{etapa_id}', tour_url, 'URL do torneio Challonge')
-            return jsonify({
-                'sucesso': True,
-                'url': tour_url,
-                'tournament_id': tour_id,
-                'bracket_pendente': True,
-                'erro': f'Torneio criado. Inicie manualmente em: {tour_url} (erro: {err_msg})'
-            }), 200
+    api.db.salvar_configuracao(f'challonge_etapa_{etapa_id}', tour_url, 'URL do torneio Challonge')
+    return {'sucesso': True, 'url': tour_url, 'tournament_id': tour_id}
 
-        api.db.salvar_configuracao(f'challonge_etapa_{etapa_id}', tour_url, 'URL do torneio Challonge')
-        return jsonify({'sucesso': True, 'url': tour_url, 'tournament_id': tour_id})
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({'sucesso': False, 'erro': str(e)}), 500
+
+jobs.registrar('challonge_etapa', _job_enviar_etapa_challonge, max_tentativas=3)
 
 
 def _extrair_slug_challonge(full_url):
@@ -2538,8 +2569,35 @@ def _buscar_bracket_challonge(slug):
             matches = mat_data if isinstance(mat_data, list) else []
         return part_map, matches
     except Exception as e:
-        print(f"[CHALLONGE] Erro ao buscar bracket: {e}")
+        logger.error('[CHALLONGE] Erro ao buscar bracket: %s', e)
+        return None, None
+
+
+def _equipes_da_partida_challonge(etapa_id, slug, match_id, winner_id):
+    """(vencedora_id, perdedora_id) de uma partida Challonge; (None, None) se não der para mapear
+
+    Os participantes do torneio são criados com o nome da equipe (único), então
+    o nome liga o participante Challonge à equipe inscrita na etapa.
+    """
+    part_map, matches = _buscar_bracket_challonge(slug)
+    if not part_map:
+        return None, None
+    partida = next((m.get('match', m) for m in matches or []
+                    if isinstance(m, dict) and str(m.get('match', m).get('id')) == str(match_id)), None)
+    if not partida:
         return None, None
+    jogadores = [str(partida.get('player1_id')), str(partida.get('player2_id'))]
+    if str(winner_id) not in jogadores:
+        return None, None
+    perdedor_id = jogadores[1] if jogadores[0] == str(winner_id) else jogadores[0]
+    etapa = api.db.obter_etapa_batalhas(etapa_id) or {'participantes': []}
+    por_nome = {p['equipe_nome'][:255]: p['equipe_id'] for p in etapa['participantes']}
+    vencedora = por_nome.get(part_map.get(str(winner_id), {}).get('name'))
+    perdedora = por_nome.get(part_map.get(perdedor_id, {}).get('name'))
+    if not vencedora or not perdedora:
+        logger.warning('[CHALLONGE] Partida %s da etapa %s sem equipe correspondente', match_id, etapa_id)
+        return None, None
+    return vencedora, perdedora
 
 
 @app.route('/api/etapas/<etapa_id>/bracket-challonge', methods=['GET'])
@@ -2601,8 +2659,7 @@ def obter_bracket_challonge(etapa_id):
             'challonge_url': challonge_url,
         })
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Erro inesperado")
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 
@@ -2631,7 +2688,15 @@ def challonge_match_report(etapa_id):
         if r.status_code not in (200, 201):
             err = r.text[:200] if r.text else str(r.status_code)
             return jsonify({'sucesso': False, 'erro': f'Challonge: {r.status_code} - {err}'}), 400
-        return jsonify({'sucesso': True})
+        # Placar da etapa (pontos do campeonato ao finalizar)
+        vencedora_id, perdedora_id = _equipes_da_partida_challonge(etapa_id, slug, match_id, winner_id)
+        if not vencedora_id:
+            return jsonify({'sucesso': True, 'aviso': 'Resultado enviado ao Challonge, mas as equipes da '
+                                                      'partida não foram encontradas na etapa'})
+        placar = api.registrar_batalha_etapa(etapa_id, f'challonge:{match_id}', vencedora_id, perdedora_id)
+        if not placar['sucesso']:
+            return jsonify({'sucesso': True, 'aviso': f"Resultado enviado ao Challonge; placar: {placar['erro']}"})
+        return jsonify({'sucesso': True, 'batalha_id': placar['batalha_id']})
     except Exception as e:
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
@@ -2655,6 +2720,9 @@ def challonge_match_reopen(etapa_id):
         if r.status_code not in (200, 201):
             err = r.text[:200] if r.text else str(r.status_code)
             return jsonify({'sucesso': False, 'erro': f'Challonge: {r.status_code} - {err}'}), 400
+        placar = api.desfazer_batalha_etapa(etapa_id, f'challonge:{match_id}')
+        if not placar['sucesso']:
+            return jsonify({'sucesso': True, 'aviso': f"Partida reaberta no Challonge; placar: {placar['erro']}"})
         return jsonify({'sucesso': True})
     except Exception as e:
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
@@ -2741,9 +2809,7 @@ def obter_evento_etapa(etapa_id):
         
         return jsonify({'sucesso': True, 'evento': evento_data})
     except Exception as e:
-        print(f"[API] Erro ao obter evento: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[API] Erro ao obter evento: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/etapas/<etapa_id>/notas/<equipe_id>', methods=['POST'])
@@ -2832,7 +2898,7 @@ def salvar_notas_etapa(etapa_id, equipe_id):
             tem_todas_notas = nota_linha > 0 and nota_angulo > 0 and nota_estilo > 0
             
             if tem_todas_notas:
-                print(f"[VOLTA] Todas as 3 notas preenchidas! linha={nota_linha}, angulo={nota_angulo}, estilo={nota_estilo}")
+                logger.debug('[VOLTA] Todas as 3 notas preenchidas! linha=%s, angulo=%s, estilo=%s', nota_linha, nota_angulo, nota_estilo)
                 
                 # Marcar o atual como 'finalizado'
                 cursor.execute('''
@@ -2889,9 +2955,7 @@ def salvar_notas_etapa(etapa_id, equipe_id):
         
         return jsonify({'sucesso': True, 'mensagem': 'Notas salvas com sucesso'})
     except Exception as e:
-        print(f"[API] Erro ao salvar notas: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[API] Erro ao salvar notas: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/etapas/<etapa_id>/entrar-evento', methods=['POST'])
@@ -2906,7 +2970,7 @@ def entrar_evento_etapa(etapa_id):
         if not all([usuario_tipo, usuario_id, usuario_nome]):
             return jsonify({'sucesso': False, 'erro': 'Parâmetros obrigatórios: tipo, id, nome'}), 400
         
-        print(f"[EVENTO] {usuario_tipo} ({usuario_id}) entrou no evento {etapa_id}")
+        logger.debug('[EVENTO] %s (%s) entrou no evento %s', usuario_tipo, usuario_id, etapa_id)
         
         # Aqui você poderia armazenar em cache ou banco que este usuário entrou
         # Por enquanto, apenas registra
@@ -2917,7 +2981,7 @@ def entrar_evento_etapa(etapa_id):
             'timestamp': __import__('datetime').datetime.now().isoformat()
         })
     except Exception as e:
-        print(f"[API] Erro ao entrar no evento: {e}")
+        logger.error('[API] Erro ao entrar no evento: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/etapas/<etapa_id>/entrar-qualificacao', methods=['POST'])
@@ -3019,11 +3083,11 @@ def gerar_pix_participacao():
         tipo_participacao = dados.get('tipo_participacao') or dados.get('tipo', 'dono_vai_andar')
         carro_id = dados.get('carro_id')
         
-        print(f"\n[PIX PARTICIPAÇÃO] Gerando PIX")
-        print(f"[PIX PARTICIPAÇÃO] Etapa: {etapa_id}")
-        print(f"[PIX PARTICIPAÇÃO] Equipe: {equipe_id}")
-        print(f"[PIX PARTICIPAÇÃO] Tipo: {tipo_participacao}")
-        print(f"[PIX PARTICIPAÇÃO] Carro: {carro_id}")
+        logger.debug('[PIX PARTICIPAÇÃO] Gerando PIX')
+        logger.debug('[PIX PARTICIPAÇÃO] Etapa: %s', etapa_id)
+        logger.debug('[PIX PARTICIPAÇÃO] Equipe: %s', equipe_id)
+        logger.debug('[PIX PARTICIPAÇÃO] Tipo: %s', tipo_participacao)
+        logger.debug('[PIX PARTICIPAÇÃO] Carro: %s', carro_id)
         
         if not etapa_id or not equipe_id or not carro_id:
             return jsonify({'sucesso': False, 'erro': 'Etapa, equipe e carro são obrigatórios'}), 400
@@ -3038,21 +3102,19 @@ def gerar_pix_participacao():
         
         # Verificar se precisa regularizar saldo primeiro
         if 'requer_regularizacao' in resultado and resultado['requer_regularizacao']:
-            print(f"[PIX PARTICIPAÇÃO] ⚠️ Regularização necessária: R$ {resultado['valor_necessario']:.2f}")
+            logger.warning('[PIX PARTICIPAÇÃO] ⚠️ Regularização necessária: R$ %.2f', resultado['valor_necessario'])
             return jsonify(resultado), 200  # Retorna 200 pois não é erro técnico, é situação esperada
         
         if resultado['sucesso']:
-            print(f"[PIX PARTICIPAÇÃO] ✅ PIX gerado: {resultado['transacao_id']}")
-            print(f"[PIX PARTICIPAÇÃO] Valor: R$ {resultado['valor']:.2f}")
+            logger.info('[PIX PARTICIPAÇÃO] ✅ PIX gerado: %s', resultado['transacao_id'])
+            logger.debug('[PIX PARTICIPAÇÃO] Valor: R$ %.2f', resultado['valor'])
             
             return jsonify(resultado)
         else:
-            print(f"[PIX PARTICIPAÇÃO] ❌ Erro: {resultado['erro']}")
+            logger.error('[PIX PARTICIPAÇÃO] ❌ Erro: %s', resultado['erro'])
             return jsonify(resultado), 400
     except Exception as e:
-        print(f"[ERRO] Erro ao gerar PIX de participação: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao gerar PIX de participação: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/etapas/gerar-pix-regularizacao', methods=['POST'])
@@ -3069,8 +3131,8 @@ def gerar_pix_regularizacao():
         carro_id = dados.get('carro_id')
         valor_regularizacao = dados.get('valor_regularizacao')
         
-        print(f"\n[PIX REGULARIZAÇÃO] Gerando PIX de regularização")
-        print(f"[PIX REGULARIZAÇÃO] Equipe: {equipe_id}, Valor: R$ {valor_regularizacao:.2f}")
+        logger.debug('[PIX REGULARIZAÇÃO] Gerando PIX de regularização')
+        logger.debug('[PIX REGULARIZAÇÃO] Equipe: %s, Valor: R$ %.2f', equipe_id, valor_regularizacao)
         
         if not all([etapa_id, equipe_id, carro_id, valor_regularizacao, tipo_participacao]):
             return jsonify({'sucesso': False, 'erro': 'Parâmetros obrigatórios faltando'}), 400
@@ -3121,7 +3183,7 @@ def gerar_pix_regularizacao():
             return jsonify({'sucesso': False, 'erro': 'Erro ao criar transação PIX'}), 500
         
         # Agora gerar o PIX no MercadoPago
-        print(f"[PIX REGULARIZAÇÃO] Gerando QR Code no MercadoPago...")
+        logger.debug('[PIX REGULARIZAÇÃO] Gerando QR Code no MercadoPago...')
         mp_resultado = mp_client.gerar_qr_code_pix(
             descricao=f'Regularização de saldo - {etapa_nome}',
             valor=valor_regularizacao,
@@ -3129,7 +3191,7 @@ def gerar_pix_regularizacao():
         )
         
         if mp_resultado['sucesso']:
-            print(f"[PIX REGULARIZAÇÃO] ✅ QR Code gerado: {mp_resultado['id']}")
+            logger.info('[PIX REGULARIZAÇÃO] ✅ QR Code gerado: %s', mp_resultado['id'])
             
             # Atualizar transação com dados do MercadoPago
             api.db.atualizar_transacao_pix(
@@ -3139,10 +3201,10 @@ def gerar_pix_regularizacao():
                 qr_code_url=mp_resultado.get('qr_code_url', '')
             )
         else:
-            print(f"[PIX REGULARIZAÇÃO] ⚠️ Erro ao gerar QR Code: {mp_resultado.get('erro')}")
+            logger.error('[PIX REGULARIZAÇÃO] ⚠️ Erro ao gerar QR Code: %s', mp_resultado.get('erro'))
             # Mesmo com erro no QR Code, a transação foi criada
         
-        print(f"[PIX REGULARIZAÇÃO] ✅ PIX de regularização criado: {transacao_id}")
+        logger.info('[PIX REGULARIZAÇÃO] ✅ PIX de regularização criado: %s', transacao_id)
         
         return jsonify({
             'sucesso': True,
@@ -3154,9 +3216,7 @@ def gerar_pix_regularizacao():
         })
         
     except Exception as e:
-        print(f"[ERRO] Erro ao gerar PIX de regularização: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao gerar PIX de regularização: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/etapas/equipe/gerar-pix', methods=['POST'])
@@ -3169,8 +3229,8 @@ def etapa_equipe_gerar_pix():
         carro_id = dados.get('carro_id')
         tipo_participacao = dados.get('tipo_participacao')
         
-        print(f"\n[GERAR PIX ETAPA] Validando situação da equipe")
-        print(f"[GERAR PIX ETAPA] Equipe: {equipe_id}, Etapa: {etapa_id}")
+        logger.debug('[GERAR PIX ETAPA] Validando situação da equipe')
+        logger.debug('[GERAR PIX ETAPA] Equipe: %s, Etapa: %s', equipe_id, etapa_id)
         
         # Validar dados
         resultado = api.db.gerar_pix_participacao(equipe_id, etapa_id, tipo_participacao, carro_id)
@@ -3179,9 +3239,7 @@ def etapa_equipe_gerar_pix():
         return jsonify(resultado)
         
     except Exception as e:
-        print(f"[ERRO] Erro ao validar PIX da etapa: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao validar PIX da etapa: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/etapas/gerar-pix-inscricao', methods=['POST'])
@@ -3197,8 +3255,8 @@ def gerar_pix_inscricao():
         tipo_participacao = dados.get('tipo_participacao')
         valor_inscricao = dados.get('valor_inscricao')
         
-        print(f"\n[PIX INSCRIÇÃO] Gerando PIX de inscrição")
-        print(f"[PIX INSCRIÇÃO] Equipe: {equipe_id}, Valor: R$ {valor_inscricao:.2f}")
+        logger.debug('[PIX INSCRIÇÃO] Gerando PIX de inscrição')
+        logger.debug('[PIX INSCRIÇÃO] Equipe: %s, Valor: R$ %.2f', equipe_id, valor_inscricao)
         
         if not all([etapa_id, equipe_id, carro_id, valor_inscricao, tipo_participacao]):
             return jsonify({'sucesso': False, 'erro': 'Parâmetros obrigatórios faltando'}), 400
@@ -3249,7 +3307,7 @@ def gerar_pix_inscricao():
             return jsonify({'sucesso': False, 'erro': 'Erro ao criar transação PIX'}), 500
         
         # Agora gerar o PIX no MercadoPago
-        print(f"[PIX INSCRIÇÃO] Gerando QR Code no MercadoPago...")
+        logger.debug('[PIX INSCRIÇÃO] Gerando QR Code no MercadoPago...')
         mp_resultado = mp_client.gerar_qr_code_pix(
             descricao=f'Inscrição na etapa - {etapa_nome}',
             valor=valor_inscricao,
@@ -3257,7 +3315,7 @@ def gerar_pix_inscricao():
         )
         
         if mp_resultado['sucesso']:
-            print(f"[PIX INSCRIÇÃO] ✅ QR Code gerado: {mp_resultado['id']}")
+            logger.info('[PIX INSCRIÇÃO] ✅ QR Code gerado: %s', mp_resultado['id'])
             
             # Atualizar transação com dados do MercadoPago
             api.db.atualizar_transacao_pix(
@@ -3267,9 +3325,9 @@ def gerar_pix_inscricao():
                 qr_code_url=mp_resultado.get('qr_code_url', '')
             )
         else:
-            print(f"[PIX INSCRIÇÃO] ⚠️ Erro ao gerar QR Code: {mp_resultado.get('erro')}")
+            logger.error('[PIX INSCRIÇÃO] ⚠️ Erro ao gerar QR Code: %s', mp_resultado.get('erro'))
         
-        print(f"[PIX INSCRIÇÃO] ✅ PIX de inscrição criado: {transacao_id}")
+        logger.info('[PIX INSCRIÇÃO] ✅ PIX de inscrição criado: %s', transacao_id)
         
         return jsonify({
             'sucesso': True,
@@ -3281,9 +3339,7 @@ def gerar_pix_inscricao():
         })
         
     except Exception as e:
-        print(f"[ERRO] Erro ao gerar PIX de inscrição: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao gerar PIX de inscrição: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/etapas/inscrever-com-debito', methods=['POST'])
@@ -3297,20 +3353,20 @@ def inscrever_com_debito():
         tipo_participacao = dados.get('tipo_participacao')
         valor_inscricao = dados.get('valor_inscricao')
         
-        print(f"\n[INSCRIÇÃO DÉBITO] Inscrevendo com débito")
-        print(f"[INSCRIÇÃO DÉBITO] Equipe: {equipe_id}, Valor: R$ {valor_inscricao:.2f}")
+        logger.debug('[INSCRIÇÃO DÉBITO] Inscrevendo com débito')
+        logger.debug('[INSCRIÇÃO DÉBITO] Equipe: %s, Valor: R$ %.2f', equipe_id, valor_inscricao)
         
         if not all([etapa_id, equipe_id, carro_id, valor_inscricao, tipo_participacao]):
             return jsonify({'sucesso': False, 'erro': 'Parâmetros obrigatórios faltando'}), 400
         
         # 1. Deduzir valor do saldo_pix (vai ficar negativo)
-        resultado_saldo = api.db.atualizar_saldo_pix(equipe_id, -valor_inscricao)
+        resultado_saldo = api.db.atualizar_saldo_pix(equipe_id, -valor_inscricao, 'inscricao_debito', etapa_id)
         
         if not resultado_saldo['sucesso']:
-            print(f"[INSCRIÇÃO DÉBITO] ⚠️ Erro ao atualizar saldo")
+            logger.error('[INSCRIÇÃO DÉBITO] ⚠️ Erro ao atualizar saldo')
             return jsonify({'sucesso': False, 'erro': 'Erro ao atualizar saldo'}), 400
         
-        print(f"[INSCRIÇÃO DÉBITO] ✅ Saldo atualizado: R$ {resultado_saldo['novo_saldo']:.2f}")
+        logger.info('[INSCRIÇÃO DÉBITO] ✅ Saldo atualizado: R$ %.2f', resultado_saldo['novo_saldo'])
         
         # 2. Registrar participação na etapa
         conn = api.db._get_conn()
@@ -3334,8 +3390,8 @@ def inscrever_com_debito():
         conn.commit()
         conn.close()
         
-        print(f"[INSCRIÇÃO DÉBITO] ✅ Participação registrada: {participacao_id}")
-        print(f"[INSCRIÇÃO DÉBITO] ===== INSCRIÇÃO CONCLUÍDA =====\n")
+        logger.info('[INSCRIÇÃO DÉBITO] ✅ Participação registrada: %s', participacao_id)
+        logger.debug('[INSCRIÇÃO DÉBITO] ===== INSCRIÇÃO CONCLUÍDA =====')
         
         return jsonify({
             'sucesso': True,
@@ -3345,9 +3401,7 @@ def inscrever_com_debito():
         })
         
     except Exception as e:
-        print(f"[INSCRIÇÃO DÉBITO] ❌ ERRO: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[INSCRIÇÃO DÉBITO] ❌ ERRO: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/etapas/equipe/participar', methods=['POST'])
@@ -3375,13 +3429,13 @@ def participar_etapa_equipe():
         
         # Verificar se precisa regularizar saldo primeiro
         if 'requer_regularizacao' in resultado and resultado['requer_regularizacao']:
-            print(f"[ETAPA] ⚠️ Regularização necessária: R$ {resultado['valor_necessario']:.2f}")
+            logger.warning('[ETAPA] ⚠️ Regularização necessária: R$ %.2f', resultado['valor_necessario'])
             return jsonify(resultado), 200  # Retorna 200 pois não é erro técnico, é situação esperada
         
         if resultado['sucesso']:
             valor_cobrado = resultado.get('valor_cobrado', 0)
             saldo_novo = resultado.get('saldo_novo', 0)
-            print(f"[ETAPA] Equipe inscrita em etapa ({tipo_participacao}) - Cobrado: {valor_cobrado}")
+            logger.debug('[ETAPA] Equipe inscrita em etapa (%s) - Cobrado: %s', tipo_participacao, valor_cobrado)
             
             # Adicionar mensagem amigável
             resultado['mensagem'] = f"✓ Inscrito com sucesso! Taxa cobrada: {valor_cobrado:.2f} | Saldo: {saldo_novo:.2f}"
@@ -3389,9 +3443,7 @@ def participar_etapa_equipe():
         else:
             return jsonify(resultado), 400
     except Exception as e:
-        print(f"[ERRO] Erro ao inscrever equipe em etapa: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao inscrever equipe em etapa: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/alocar-piloto-etapa', methods=['POST'])
@@ -3408,7 +3460,7 @@ def alocar_piloto_equipe_etapa():
         resultado = api.db.alocar_piloto_equipe_etapa(participacao_id, piloto_id)
         return jsonify(resultado)
     except Exception as e:
-        print(f"[ERRO] Erro ao alocar piloto: {e}")
+        logger.error('[ERRO] Erro ao alocar piloto: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/listar-pilotos')
@@ -3418,7 +3470,7 @@ def listar_pilotos():
         pilotos = api.db.listar_pilotos()
         return jsonify(pilotos)
     except Exception as e:
-        print(f"[ERRO] Erro ao listar pilotos: {e}")
+        logger.error('[ERRO] Erro ao listar pilotos: %s', e)
         return jsonify({'erro': str(e)}), 500
 
 @app.route('/api/admin/atualizar-etapa', methods=['POST'])
@@ -3442,16 +3494,14 @@ def atualizar_etapa():
                 if dt_fim < dt_inicio:
                     return jsonify({'sucesso': False, 'erro': 'Data de término não pode ser anterior à data de início'}), 400
             except Exception as e:
-                print(f"[ERRO] Erro ao validar datas: {e}")
+                logger.error('[ERRO] Erro ao validar datas: %s', e)
                 return jsonify({'sucesso': False, 'erro': 'Formato de data inválido'}), 400
         
         # Atualizar a etapa no banco
         resultado = api.db.atualizar_etapa_datas(etapa_id, data_inicio, data_fim)
         return jsonify(resultado)
     except Exception as e:
-        print(f"[ERRO] Erro ao atualizar etapa: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao atualizar etapa: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/definir-valor-participacao', methods=['POST'])
@@ -3477,7 +3527,7 @@ def definir_valor_participacao():
         resultado = api.db.definir_valor_participacao_etapa(etapa_id, valor, descricao)
         return jsonify(resultado)
     except Exception as e:
-        print(f"[ERRO] Erro ao definir valor: {e}")
+        logger.error('[ERRO] Erro ao definir valor: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/obter-valor-participacao/<etapa_id>', methods=['GET'])
@@ -3487,7 +3537,7 @@ def obter_valor_participacao(etapa_id):
         valor = api.db.obter_valor_participacao_etapa(etapa_id)
         return jsonify({'etapa_id': etapa_id, 'valor': valor})
     except Exception as e:
-        print(f"[ERRO] Erro ao obter valor: {e}")
+        logger.error('[ERRO] Erro ao obter valor: %s', e)
         return jsonify({'erro': str(e)}), 500
 
 @app.route('/api/verificar-pecas-carro', methods=['GET'])
@@ -3519,7 +3569,7 @@ def verificar_pecas_carro():
             'mensagem': '✓ Carro completo!' if completo else 'Carro incompleto'
         })
     except Exception as e:
-        print(f"[ERRO] Erro ao verificar peças: {e}")
+        logger.error('[ERRO] Erro ao verificar peças: %s', e)
         return jsonify({'completo': False, 'erro': str(e)}), 500
 
 
@@ -3538,38 +3588,38 @@ def comprar():
     variacao_id = dados.get('variacao_id')  # variacao_carro_id (novo)
     carro_id = dados.get('carro_id')  # Opcional: para peças, qual carro instalar
     
-    print(f"\n{'='*60}")
-    print(f"[COMPRA] Novo pedido")
-    print(f"  Equipe ID: {equipe_id}")
-    print(f"  Tipo: {tipo}")
-    print(f"  Item ID: {item_id}")
-    print(f"  Variação ID: {variacao_id}")
-    print(f"{'='*60}")
+    logger.debug('%s', '='*60)
+    logger.debug('[COMPRA] Novo pedido')
+    logger.debug('Equipe ID: %s', equipe_id)
+    logger.debug('Tipo: %s', tipo)
+    logger.debug('Item ID: %s', item_id)
+    logger.debug('Variação ID: %s', variacao_id)
+    logger.debug('%s', '='*60)
     
     if not all([tipo]):
         return jsonify({'erro': 'Dados incompletos'}), 400
     
     try:
-        print(f"[COMPRA] Obtendo equipe...")
+        logger.debug('[COMPRA] Obtendo equipe...')
         equipe = api.gerenciador.obter_equipe(equipe_id)
         if not equipe:
-            print(f"[COMPRA] ERRO: Equipe não encontrada!")
+            logger.error('[COMPRA] ERRO: Equipe não encontrada!')
             return jsonify({'erro': 'Equipe não encontrada'}), 404
         
-        print(f"[COMPRA] Equipe: {equipe.nome} - Saldo: {equipe.doricoins}")
+        logger.debug('[COMPRA] Equipe: %s - Saldo: %s', equipe.nome, equipe.doricoins)
         
         if tipo == 'carro':
             # Comprar carro - pode ser com variação_id (novo) ou item_id (compatibilidade)
-            print(f"[COMPRA] Comprando carro...")
+            logger.debug('[COMPRA] Comprando carro...')
             
             if variacao_id:
                 # Novo: Usar variação específica
-                print(f"[COMPRA] Usando variação {variacao_id}...")
+                logger.debug('[COMPRA] Usando variação %s...', variacao_id)
                 variacao_dict = api.db.buscar_variacao_carro_por_id(variacao_id)
-                print(f"[COMPRA] Variação encontrada: {variacao_dict}")
+                logger.debug('[COMPRA] Variação encontrada: %s', variacao_dict)
                 
                 if not variacao_dict:
-                    print(f"[COMPRA] ERRO: Variação não encontrada!")
+                    logger.error('[COMPRA] ERRO: Variação não encontrada!')
                     return jsonify({'erro': 'Variação não encontrada'}), 404
                 
                 modelo_id = variacao_dict['modelo_carro_loja_id']
@@ -3580,12 +3630,12 @@ def comprar():
                         break
                 
                 if not carro_modelo:
-                    print(f"[COMPRA] ERRO: Modelo do carro não encontrado!")
+                    logger.error('[COMPRA] ERRO: Modelo do carro não encontrado!')
                     return jsonify({'erro': 'Modelo do carro não encontrado'}), 404
             
             else:
                 # Compatibilidade: Usar modelo_id (item_id)
-                print(f"[COMPRA] Procurando modelo de carro {item_id}...")
+                logger.debug('[COMPRA] Procurando modelo de carro %s...', item_id)
                 carro_modelo = None
                 for modelo in api.loja_carros.modelos:
                     if modelo.id == item_id:
@@ -3593,41 +3643,41 @@ def comprar():
                         break
 
                 if not carro_modelo:
-                    print(f"[COMPRA] ERRO: Carro não encontrado!")
+                    logger.error('[COMPRA] ERRO: Carro não encontrado!')
                     return jsonify({'erro': 'Carro não encontrado'}), 404
                 
                 # Se há variações, usar a primeira (compatibilidade)
                 if carro_modelo.variacoes and len(carro_modelo.variacoes) > 0:
                     variacao_id = carro_modelo.variacoes[0].id
-                    print(f"[COMPRA] Usando variação padrão: {variacao_id}")
+                    logger.debug('[COMPRA] Usando variação padrão: %s', variacao_id)
                 else:
-                    print(f"[COMPRA] AVISO: Modelo não possui variações definidas!")
+                    logger.warning('[COMPRA] AVISO: Modelo não possui variações definidas!')
                     variacao_id = None
 
-            print(f"[COMPRA] Carro encontrado: {carro_modelo.marca} {carro_modelo.modelo}")
-            print(f"[COMPRA] Variação ID após processamento: {variacao_id}")
+            logger.debug('[COMPRA] Carro encontrado: %s %s', carro_modelo.marca, carro_modelo.modelo)
+            logger.debug('[COMPRA] Variação ID após processamento: %s', variacao_id)
                 
             # Buscar o valor da variação
             variacao_dict = None
             if variacao_id:
                 variacao_dict = api.db.buscar_variacao_carro_por_id(variacao_id)
                 if not variacao_dict:
-                    print(f"[COMPRA] AVISO: Variação {variacao_id} não encontrada no banco!")
+                    logger.warning('[COMPRA] AVISO: Variação %s não encontrada no banco!', variacao_id)
             
             preco_variacao = float(variacao_dict.get('valor', carro_modelo.preco)) if variacao_dict else float(carro_modelo.preco)
-            print(f"[COMPRA] Preço da variação: R${preco_variacao}")
+            logger.debug('[COMPRA] Preço da variação: R$%s', preco_variacao)
 
             # Verificar saldo com base no valor da variação
             if equipe.doricoins < preco_variacao:
-                print(f"[COMPRA] ERRO: Saldo insuficiente! Tem: {equipe.doricoins}, Precisa: {preco_variacao}")
+                logger.error('[COMPRA] ERRO: Saldo insuficiente! Tem: %s, Precisa: %s', equipe.doricoins, preco_variacao)
                 return jsonify({'erro': 'Saldo insuficiente'}), 400
 
             # Comprar carro com variação
             resultado = api.comprar_carro(equipe_id, carro_modelo.id, variacao_id)
 
             if resultado:
-                print(f"[COMPRA] Carro {carro_modelo.marca} {carro_modelo.modelo} comprado com sucesso!")
-                print(f"[COMPRA] Status: repouso (obrigatório)")
+                logger.info('[COMPRA] Carro %s %s comprado com sucesso!', carro_modelo.marca, carro_modelo.modelo)
+                logger.debug('[COMPRA] Status: repouso (obrigatório)')
                 
                 # Registrar comissão
                 try:
@@ -3639,9 +3689,9 @@ def comprar():
                         equipe_nome=equipe.nome,
                         descricao=f'Compra de {carro_modelo.marca} {carro_modelo.modelo}'
                     )
-                    print(f"[COMISSÃO] Registrada: R$ {comissao_valor} por compra de carro")
+                    logger.debug('[COMISSÃO] Registrada: R$ %s por compra de carro', comissao_valor)
                 except Exception as e:
-                    print(f"[AVISO] Erro ao registrar comissão: {e}")
+                    logger.error('[AVISO] Erro ao registrar comissão: %s', e)
                 
                 return jsonify({
                     'sucesso': True,
@@ -3649,14 +3699,14 @@ def comprar():
                     'carro_status': 'repouso'
                 })
             else:
-                print(f"[COMPRA] ERRO: Falha ao comprar carro!")
+                logger.error('[COMPRA] ERRO: Falha ao comprar carro!')
                 return jsonify({'erro': 'Falha ao processar compra do carro'}), 500
         
         elif tipo == 'peca':
             # Comprar peça - cria solicitação pendente
-            print(f"[COMPRA] Processando peça...")
-            print(f"[COMPRA] Carro ID recebido do body: {carro_id}")
-            print(f"[COMPRA] Dados completos: {dados}")
+            logger.debug('[COMPRA] Processando peça...')
+            logger.debug('[COMPRA] Carro ID recebido do body: %s', carro_id)
+            logger.debug('[COMPRA] Dados completos: %s', dados)
             peca_loja = None
             for peca in api.loja_pecas.pecas:
                 if peca.id == item_id:
@@ -3664,12 +3714,12 @@ def comprar():
                     break
             
             if not peca_loja:
-                print(f"[COMPRA] ERRO: Peça não encontrada!")
+                logger.error('[COMPRA] ERRO: Peça não encontrada!')
                 return jsonify({'erro': 'Peça não encontrada'}), 404
             
             # ===== VALIDAÇÃO DE COMPATIBILIDADE =====
             compatibilidade_peca = getattr(peca_loja, 'compatibilidade', 'universal')
-            print(f"[COMPRA] Compatibilidade da peça: {compatibilidade_peca}")
+            logger.debug('[COMPRA] Compatibilidade da peça: %s', compatibilidade_peca)
             
             # Se a peça não é universal, validar compatibilidade
             if compatibilidade_peca != 'universal':
@@ -3688,11 +3738,11 @@ def comprar():
                     carro_alvo = equipe.carro
                 
                 if not carro_alvo:
-                    print(f"[COMPRA] ERRO: Equipe não tem carro!")
+                    logger.error('[COMPRA] ERRO: Equipe não tem carro!')
                     return jsonify({'erro': 'Você precisa ter um carro para comprar peças'}), 400
                 
-                print(f"[COMPRA] Carro alvo: {carro_alvo.id} ({carro_alvo.marca} {carro_alvo.modelo})")
-                print(f"[COMPRA] Compatibilidade da peça: {compatibilidade_peca}")
+                logger.debug('[COMPRA] Carro alvo: %s (%s %s)', carro_alvo.id, carro_alvo.marca, carro_alvo.modelo)
+                logger.debug('[COMPRA] Compatibilidade da peça: %s', compatibilidade_peca)
                 
                 # Agora permitimos instalar em qualquer carro da garagem
                 # A validação de compatibilidade é mais permissiva
@@ -3702,17 +3752,17 @@ def comprar():
                 modelo_id_alvo = str(getattr(carro_alvo, 'modelo_id', ''))
                 modelo_id_compat = str(compatibilidade_peca)
                 
-                print(f"[COMPRA] Comparando modelo_id: '{modelo_id_alvo}' com compatibilidade '{modelo_id_compat}'")
+                logger.debug("[COMPRA] Comparando modelo_id: '%s' com compatibilidade '%s'", modelo_id_alvo, modelo_id_compat)
                 
                 # Se o carro tem modelo_id, fazer comparação. Se não tiver, permite mesmo assim
                 if modelo_id_alvo and modelo_id_alvo != modelo_id_compat:
                     compativel = False
-                    print(f"[COMPRA] INCOMPATÍVEL - Carro não corresponde!")
+                    logger.debug('[COMPRA] INCOMPATÍVEL - Carro não corresponde!')
                 else:
-                    print(f"[COMPRA] Compatibilidade OK - Pode instalar!")
+                    logger.debug('[COMPRA] Compatibilidade OK - Pode instalar!')
                 
                 if not compativel:
-                    print(f"[COMPRA] INCOMPATÍVEL!")
+                    logger.debug('[COMPRA] INCOMPATÍVEL!')
                     # Buscar nome do modelo esperado
                     modelo_nome_esperado = "desconhecido"
                     for modelo in api.loja_carros.modelos:
@@ -3724,30 +3774,32 @@ def comprar():
                                f'Esta peça é específica para {modelo_nome_esperado}.'
                     }), 400
                 
-                print(f"[COMPRA] Peça é compatível com o carro!")
+                logger.debug('[COMPRA] Peça é compatível com o carro!')
             else:
-                print(f"[COMPRA] Peça universal, compatível com qualquer carro")
+                logger.debug('[COMPRA] Peça universal, compatível com qualquer carro')
             
-            print(f"[COMPRA] Peça encontrada: {peca_loja.nome}")
+            logger.debug('[COMPRA] Peça encontrada: %s', peca_loja.nome)
             
             # Verificar saldo
             if equipe.doricoins < peca_loja.preco:
-                print(f"[COMPRA] ERRO: Saldo insuficiente!")
+                logger.error('[COMPRA] ERRO: Saldo insuficiente!')
                 return jsonify({'erro': 'Saldo insuficiente'}), 400
             
-            # Descontar saldo imediatamente
-            equipe.doricoins -= peca_loja.preco
-            api.db.salvar_equipe(equipe)
-            print(f"[COMPRA] Saldo descontado. Novo saldo: {equipe.doricoins}")
-            
             # Criar solicitação de compra de peça (pendente)
             solicitacao_id = str(uuid.uuid4())
             
-            print(f"[COMPRA] Solicitação criada:")
-            print(f"[COMPRA]   ID: {solicitacao_id}")
-            print(f"[COMPRA]   Peça: {peca_loja.nome}")
-            print(f"[COMPRA]   Tipo: {peca_loja.tipo}")
-            print(f"[COMPRA]   Status: pendente")
+            # Descontar saldo imediatamente (débito condicional: recusa se outro gasto chegou antes)
+            novo_saldo = api.db.movimentar_saldo(equipe.id, -peca_loja.preco, 'compra_peca', solicitacao_id)
+            if novo_saldo is None:
+                logger.error('[COMPRA] ERRO: Saldo insuficiente!')
+                return jsonify({'erro': 'Saldo insuficiente'}), 400
+            logger.debug('[COMPRA] Saldo descontado. Novo saldo: %s', novo_saldo)
+            
+            logger.debug('[COMPRA] Solicitação criada:')
+            logger.debug('[COMPRA]   ID: %s', solicitacao_id)
+            logger.debug('[COMPRA]   Peça: %s', peca_loja.nome)
+            logger.debug('[COMPRA]   Tipo: %s', peca_loja.tipo)
+            logger.debug('[COMPRA]   Status: pendente')
             
             # Obter carro_id se foi selecionado
             carro_id = dados.get('carro_id')
@@ -3772,9 +3824,9 @@ def comprar():
                     equipe_nome=equipe.nome,
                     descricao=f'Compra de {peca_loja.nome}'
                 )
-                print(f"[COMISSÃO] Registrada: R$ {comissao_valor} por compra de peça")
+                logger.debug('[COMISSÃO] Registrada: R$ %s por compra de peça', comissao_valor)
             except Exception as e:
-                print(f"[AVISO] Erro ao registrar comissão: {e}")
+                logger.error('[AVISO] Erro ao registrar comissão: %s', e)
             
             return jsonify({
                 'sucesso': True,
@@ -3786,9 +3838,7 @@ def comprar():
             return jsonify({'erro': 'Tipo de item inválido'}), 400
     
     except Exception as e:
-        print(f"[ERRO COMPRA] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO COMPRA] %s', str(e))
         return jsonify({'erro': f'Erro ao processar compra: {str(e)}'}), 500
 
 @app.route('/api/ativar-carro', methods=['POST'])
@@ -3805,44 +3855,44 @@ def ativar_carro_gerar_pix():
         dados = request.json
         carro_id = dados.get('carro_id') if dados else None
         
-        print(f"[ATIVAR CARRO] Request recebido - dados: {dados}, carro_id: {carro_id}")
+        logger.debug('[ATIVAR CARRO] Request recebido - dados: %s, carro_id: %s', dados, carro_id)
         
         if not carro_id:
-            print(f"[ATIVAR CARRO] ❌ ERRO: carro_id ausente no request")
+            logger.error('[ATIVAR CARRO] ❌ ERRO: carro_id ausente no request')
             return jsonify({'erro': 'ID do carro é obrigatório'}), 400
         
         equipe = api.gerenciador.obter_equipe(equipe_id)
-        print(f"[ATIVAR CARRO] Equipe carregada: {equipe}")
+        logger.debug('[ATIVAR CARRO] Equipe carregada: %s', equipe)
         if not equipe:
-            print(f"[ATIVAR CARRO] ❌ ERRO: Equipe não encontrada")
+            logger.error('[ATIVAR CARRO] ❌ ERRO: Equipe não encontrada')
             return jsonify({'erro': 'Equipe não encontrada'}), 404
         
         # Verificar se o carro existe e pertence à equipe
         carro = None
-        print(f"[ATIVAR CARRO] Equipe tem {len(equipe.carros) if hasattr(equipe, 'carros') else 0} carros")
+        logger.debug('[ATIVAR CARRO] Equipe tem %s carros', (len(equipe.carros) if hasattr(equipe, 'carros') else 0))
         if hasattr(equipe, 'carros') and isinstance(equipe.carros, list):
             for c in equipe.carros:
-                print(f"[ATIVAR CARRO] Verificando carro {c.id} contra {carro_id}")
+                logger.debug('[ATIVAR CARRO] Verificando carro %s contra %s', c.id, carro_id)
                 if str(c.id) == str(carro_id):
                     carro = c
                     break
         
         if not carro:
-            print(f"[ATIVAR CARRO] ❌ ERRO: Carro {carro_id} não encontrado ou não pertence à equipe")
+            logger.error('[ATIVAR CARRO] ❌ ERRO: Carro %s não encontrado ou não pertence à equipe', carro_id)
             return jsonify({'erro': 'Carro não encontrado ou não pertence a esta equipe'}), 404
         
-        print(f"[ATIVAR CARRO] ✅ Carro encontrado: {carro}")
+        logger.info('[ATIVAR CARRO] ✅ Carro encontrado: %s', carro)
         
         # Permite ativar carros incompletos - peças não são mais obrigatórias
-        print(f"[ATIVAR CARRO] Peças do carro:")
-        print(f"[ATIVAR CARRO]   motor: {carro.motor}")
-        print(f"[ATIVAR CARRO]   cambio: {carro.cambio}")
-        print(f"[ATIVAR CARRO]   suspensao: {carro.suspensao}")
-        print(f"[ATIVAR CARRO]   kit_angulo: {carro.kit_angulo}")
-        print(f"[ATIVAR CARRO]   diferenciais: {carro.diferenciais}")
+        logger.debug('[ATIVAR CARRO] Peças do carro:')
+        logger.debug('[ATIVAR CARRO]   motor: %s', carro.motor)
+        logger.debug('[ATIVAR CARRO]   cambio: %s', carro.cambio)
+        logger.debug('[ATIVAR CARRO]   suspensao: %s', carro.suspensao)
+        logger.debug('[ATIVAR CARRO]   kit_angulo: %s', carro.kit_angulo)
+        logger.debug('[ATIVAR CARRO]   diferenciais: %s', carro.diferenciais)
         
         # Procurar todas as peças do carro que NÃO têm pix_id (ainda não foram pagas)
-        print(f"[ATIVAR CARRO] 🔍 Procurando peças do carro {carro_id} da equipe {equipe_id}...")
+        logger.debug('[ATIVAR CARRO] 🔍 Procurando peças do carro %s da equipe %s...', carro_id, equipe_id)
         
         try:
             conn = api.db._get_conn()
@@ -3855,9 +3905,9 @@ def ativar_carro_gerar_pix():
             ''', (str(carro_id), str(equipe_id)))
             
             todas_pecas = cursor.fetchall()
-            print(f"[ATIVAR CARRO] 📦 TODAS as peças do carro: {len(todas_pecas)}")
+            logger.debug('[ATIVAR CARRO] 📦 TODAS as peças do carro: %s', len(todas_pecas))
             for peca_id, peca_tipo, peca_nome, pix_id_val, carr_id, inst in todas_pecas:
-                print(f"[ATIVAR CARRO]   - {peca_nome} ({peca_tipo}): instalado={inst}, pix_id={pix_id_val}")
+                logger.debug('[ATIVAR CARRO]   - %s (%s): instalado=%s, pix_id=%s', peca_nome, peca_tipo, inst, pix_id_val)
             
             # Agora procurar APENAS peças não pagas (instalado=1 e pix_id vazio)
             cursor.execute('''
@@ -3869,20 +3919,18 @@ def ativar_carro_gerar_pix():
             cursor.close()
             conn.close()
         except Exception as e:
-            print(f"[ATIVAR CARRO] ❌ Erro ao buscar peças não pagas: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception('[ATIVAR CARRO] ❌ Erro ao buscar peças não pagas: %s', e)
             pecas_nao_pagas = []
         
-        print(f"[ATIVAR CARRO] 💸 Peças NÃO pagas (instalado=1 e pix_id vazio): {len(pecas_nao_pagas)}")
+        logger.debug('[ATIVAR CARRO] 💸 Peças NÃO pagas (instalado=1 e pix_id vazio): %s', len(pecas_nao_pagas))
         
         for peca_id, peca_tipo, peca_nome, pix_id_val in pecas_nao_pagas:
-            print(f"[ATIVAR CARRO]   - {peca_nome} ({peca_tipo}) - pix_id: {pix_id_val}")
+            logger.debug('[ATIVAR CARRO]   - %s (%s) - pix_id: %s', peca_nome, peca_tipo, pix_id_val)
         
         # Calcular valor da instalação por peça
         valor_instalacao_config = api.db.obter_configuracao('valor_instalacao_peca')
         valor_instalacao = float(valor_instalacao_config) if valor_instalacao_config else 10.0
-        print(f"[ATIVAR CARRO] 💰 Valor de instalação por peça (config: {valor_instalacao_config}): R$ {valor_instalacao}")
+        logger.debug('[ATIVAR CARRO] 💰 Valor de instalação por peça (config: %s): R$ %s', valor_instalacao_config, valor_instalacao)
         
         # Calcular valor total: ativação + (quantidade de peças não pagas * valor instalação)
         valor_ativacao = float(api.db.obter_configuracao('valor_ativacao_carro') or '30')
@@ -3893,30 +3941,30 @@ def ativar_carro_gerar_pix():
         
         valor_subtotal = valor_ativacao + valor_pecas_nao_pagas
         
-        print(f"[ATIVAR CARRO] 💵 Cálculo dos valores:")
-        print(f"[ATIVAR CARRO]   - Ativação: R$ {valor_ativacao}")
-        print(f"[ATIVAR CARRO]   - Peças não pagas: {quantidade_pecas} × R$ {valor_instalacao} = R$ {valor_pecas_nao_pagas}")
-        print(f"[ATIVAR CARRO]   - Subtotal: R$ {valor_ativacao} + R$ {valor_pecas_nao_pagas} = R$ {valor_subtotal}")
+        logger.debug('[ATIVAR CARRO] 💵 Cálculo dos valores:')
+        logger.debug('[ATIVAR CARRO]   - Ativação: R$ %s', valor_ativacao)
+        logger.debug('[ATIVAR CARRO]   - Peças não pagas: %s × R$ %s = R$ %s', quantidade_pecas, valor_instalacao, valor_pecas_nao_pagas)
+        logger.debug('[ATIVAR CARRO]   - Subtotal: R$ %s + R$ %s = R$ %s', valor_ativacao, valor_pecas_nao_pagas, valor_subtotal)
         
         taxa = mp_client.calcular_taxa(valor_subtotal)
         valor_total = round(valor_subtotal + taxa, 2)
         
-        print(f"[ATIVAR CARRO] Taxa PIX: R$ {taxa}")
-        print(f"[ATIVAR CARRO] Total a pagar: R$ {valor_total}")
+        logger.debug('[ATIVAR CARRO] Taxa PIX: R$ %s', taxa)
+        logger.debug('[ATIVAR CARRO] Total a pagar: R$ %s', valor_total)
         
         # Verificar se já existe uma transação pendente para este carro
         transacoes_existentes = api.db.listar_transacoes_pix(equipe_id=equipe_id, status='pendente')
         for trans in transacoes_existentes:
             if trans['tipo_item'] == 'carro_ativacao' and str(trans['item_id']) == str(carro_id):
                 # Transação pendente já existe - retornar dados RECALCULADOS
-                print(f"[ATIVAÇÃO CARRO] Transação pendente encontrada: {trans['id']}")
-                print(f"[ATIVAÇÃO CARRO] Valores antigos: R$ {trans['valor_total']} total, R$ {trans['valor_item']} item")
-                print(f"[ATIVAÇÃO CARRO] Valores recalculados: R$ {valor_total} total, R$ {valor_subtotal} item")
-                print(f"[ATIVAÇÃO CARRO] Peças não pagas: {quantidade_pecas}")
+                logger.debug('[ATIVAÇÃO CARRO] Transação pendente encontrada: %s', trans['id'])
+                logger.debug('[ATIVAÇÃO CARRO] Valores antigos: R$ %s total, R$ %s item', trans['valor_total'], trans['valor_item'])
+                logger.debug('[ATIVAÇÃO CARRO] Valores recalculados: R$ %s total, R$ %s item', valor_total, valor_subtotal)
+                logger.debug('[ATIVAÇÃO CARRO] Peças não pagas: %s', quantidade_pecas)
                 
                 qr_code_url = trans['qr_code_url']
                 if trans['qr_code'] and not qr_code_url.startswith('data:'):
-                    print(f"[ATIVAÇÃO CARRO] Gerando imagem para código PIX existente...")
+                    logger.debug('[ATIVAÇÃO CARRO] Gerando imagem para código PIX existente...')
                     img_base64 = mp_client.gerar_qr_code_imagem_pix(trans['qr_code'])
                     if img_base64:
                         qr_code_url = f"data:image/png;base64,{img_base64}"
@@ -3973,7 +4021,7 @@ def ativar_carro_gerar_pix():
             qr_code_url=resultado_mp.get('qr_code_url', '')
         )
         
-        print(f"[ATIVAÇÃO CARRO] Gerado PIX para {carro.marca} {carro.modelo} - Valor: R$ {valor_total}")
+        logger.debug('[ATIVAÇÃO CARRO] Gerado PIX para %s %s - Valor: R$ %s', carro.marca, carro.modelo, valor_total)
         
         return jsonify({
             'sucesso': True,
@@ -3992,9 +4040,7 @@ def ativar_carro_gerar_pix():
         })
     
     except Exception as e:
-        print(f"[ERRO ATIVAÇÃO CARRO] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO ATIVAÇÃO CARRO] %s', str(e))
         return jsonify({'erro': f'Erro ao processar ativação: {str(e)}'}), 500
 
 @app.route('/api/mudar-carro', methods=['POST'])
@@ -4046,7 +4092,7 @@ def solicitar_mudanca_carro():
             datetime.now().isoformat()
         )
         
-        print(f"[MUDANÇA CARRO] Solicitação criada para equipe {equipe_id}: {novo_carro.marca} {novo_carro.modelo}")
+        logger.debug('[MUDANÇA CARRO] Solicitação criada para equipe %s: %s %s', equipe_id, novo_carro.marca, novo_carro.modelo)
         
         return jsonify({
             'sucesso': True,
@@ -4054,63 +4100,35 @@ def solicitar_mudanca_carro():
         })
     
     except Exception as e:
-        print(f"[ERRO MUDANÇA CARRO] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO MUDANÇA CARRO] %s', str(e))
         return jsonify({'erro': f'Erro ao processar solicitação: {str(e)}'}), 500
 
 @app.route('/api/historico/compras')
 @requer_login_api
 def get_historico_compras():
-    """Retorna histórico de compras (todas as solicitações + transações PIX confirmadas)"""
+    """Histórico de compras (solicitações de peças + PIX confirmados), paginado por cursor
+
+    ?limite=N (padrão 20, máx. 100) e ?cursor=<proximo_cursor da página anterior>.
+    """
     equipe_id = obter_equipe_id_request()
     if not equipe_id:
         return jsonify({'erro': 'Não autenticado'}), 401
     
-    historico = []
-    
+    limite = ler_limite(request.args.get('limite'))
     try:
-        # 1. Carregar solicitações de peças
-        solicitacoes_db = api.db.carregar_solicitacoes_pecas(equipe_id)
-        for sol in solicitacoes_db:
-            historico.append({
-                'id': sol.get('id'),
-                'tipo': 'solicitacao',
-                'peca_nome': sol.get('peca_nome', ''),
-                'peca_tipo': sol.get('tipo_peca', ''),
-                'preco': sol.get('preco', 0),
-                'status': sol.get('status', ''),
-                'timestamp': sol.get('data_solicitacao', ''),
-                'processado_em': sol.get('processado_em', sol.get('data_solicitacao', ''))
-            })
-    except Exception as e:
-        print(f"[HISTORICO COMPRAS] Erro ao carregar solicitações: {str(e)}")
+        depois_de = decodificar_cursor(request.args.get('cursor'), 3)
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
     
-    try:
-        # 2. Carregar transações PIX confirmadas (aprovadas)
-        transacoes_pix = api.db.listar_transacoes_pix(equipe_id=equipe_id, status='aprovado')
-        for trans in transacoes_pix:
-            historico.append({
-                'id': trans.get('id'),
-                'tipo': 'pix_payment',
-                'item_nome': trans.get('item_nome', ''),
-                'tipo_item': trans.get('tipo_item', ''),
-                'preco': trans.get('valor_item', 0),
-                'status': 'confirmado',
-                'timestamp': trans.get('data_criacao', ''),
-                'processado_em': trans.get('data_confirmacao', trans.get('data_criacao', '')),
-                'valor_total': trans.get('valor_total', 0)
-            })
-    except Exception as e:
-        print(f"[HISTORICO COMPRAS] Erro ao carregar transações PIX: {str(e)}")
+    linhas = api.db.listar_historico_compras(equipe_id, limite, depois_de)
+    linhas, proximo_cursor = montar_pagina(linhas, limite, lambda r: (r['ts'], r['tipo'], r['id']))
     
-    # Ordenar por data (mais recentes primeiro)
-    historico.sort(key=lambda x: x.get('processado_em', ''), reverse=True)
+    historico = [formatar_item_historico(row, api.db.HISTORICO_PIX) for row in linhas]
     
-    # Retornar últimas 20
-    return jsonify(historico[-20:])
+    return jsonify({'historico': historico, 'proximo_cursor': proximo_cursor})
 
 @app.route('/api/transferencia', methods=['POST'])
+@politica_cache(SEM_ARMAZENAMENTO)
 @requer_login_api
 def transferencia_dinheiro():
     """Transferir dinheiro entre equipes com taxa bancária fixa de 20%"""
@@ -4124,7 +4142,7 @@ def transferencia_dinheiro():
         valor = float(dados.get('valor', 0))
         taxa_bancaria = 20  # Taxa fixa de 20%
         
-        print(f"[TRANSFERÊNCIA] Origem: {equipe_id_origem}, Destino: {equipe_id_destino}, Valor: {valor}")
+        logger.debug('[TRANSFERÊNCIA] Origem: %s, Destino: %s, Valor: %s', equipe_id_origem, equipe_id_destino, valor)
         
         # Validações
         if not equipe_id_destino:
@@ -4134,18 +4152,18 @@ def transferencia_dinheiro():
         origem_str = str(equipe_id_origem).strip().lower()
         destino_str = str(equipe_id_destino).strip().lower()
         
-        print(f"[TRANSFERÊNCIA] Comparando: '{origem_str}' vs '{destino_str}'")
+        logger.debug("[TRANSFERÊNCIA] Comparando: '%s' vs '%s'", origem_str, destino_str)
         
         if origem_str == destino_str:
-            print(f"[TRANSFERÊNCIA] BLOQUEADO: Tentativa de enviar para si mesmo!")
+            logger.debug('[TRANSFERÊNCIA] BLOQUEADO: Tentativa de enviar para si mesmo!')
             return jsonify({'erro': 'Não é permitido transferir para sua própria equipe'}), 400
         
         if valor <= 0:
             return jsonify({'erro': 'Valor deve ser maior que zero'}), 400
         
-        # Obter equipes
-        equipe_origem = api.gerenciador.obter_equipe(equipe_id_origem)
-        equipe_destino = api.gerenciador.obter_equipe(equipe_id_destino)
+        # Obter equipes (só id, nome, série e saldo)
+        equipe_origem = api.db.obter_resumo_equipe(equipe_id_origem)
+        equipe_destino = api.db.obter_resumo_equipe(equipe_id_destino)
         
         if not equipe_origem:
             return jsonify({'erro': 'Equipe origem não encontrada'}), 404
@@ -4154,8 +4172,8 @@ def transferencia_dinheiro():
             return jsonify({'erro': 'Equipe destino não encontrada'}), 404
         
         # Validar saldo
-        if equipe_origem.doricoins < valor:
-            return jsonify({'erro': f'Saldo insuficiente. Você tem {equipe_origem.doricoins}'}), 400
+        if equipe_origem['doricoins'] < valor:
+            return jsonify({'erro': f"Saldo insuficiente. Você tem {equipe_origem['doricoins']}"}), 400
         
         # Calcular taxa
         taxa = valor * (taxa_bancaria / 100)
@@ -4167,17 +4185,20 @@ def transferencia_dinheiro():
         # Criar ID único da transferência
         transferencia_id = str(uuid.uuid4())
         
-        # Atualizar saldos
-        equipe_origem.doricoins -= valor
-        equipe_destino.doricoins += valor_recebido
+        # Débito condicional + crédito numa transação, com as duas linhas no extrato
+        saldo_novo = api.db.transferir_saldo(equipe_origem['id'], equipe_destino['id'], valor, valor_recebido,
+                                             'transferencia', transferencia_id)
+        if saldo_novo is None:
+            return jsonify({'erro': 'Saldo insuficiente'}), 400
+        equipe_origem['doricoins'] = saldo_novo
         
         # Registrar no histórico de transferências (usando arquivo JSON)
         transferencia_info = {
             'id': transferencia_id,
-            'equipe_origem_id': str(equipe_origem.id),
-            'equipe_origem_nome': equipe_origem.nome,
-            'equipe_destino_id': str(equipe_destino.id),
-            'equipe_destino_nome': equipe_destino.nome,
+            'equipe_origem_id': str(equipe_origem['id']),
+            'equipe_origem_nome': equipe_origem['nome'],
+            'equipe_destino_id': str(equipe_destino['id']),
+            'equipe_destino_nome': equipe_destino['nome'],
             'valor_enviado': valor,
             'taxa': taxa,
             'taxa_percentual': taxa_bancaria,
@@ -4195,11 +4216,7 @@ def transferencia_dinheiro():
         with open(caminho_transferencia, 'w', encoding='utf-8') as f:
             json.dump(transferencia_info, f, ensure_ascii=False, indent=2)
         
-        # Salvar equipes atualizadas
-        api.db.salvar_equipe(equipe_origem)
-        api.db.salvar_equipe(equipe_destino)
-        
-        print(f"[TRANSFERÊNCIA] {equipe_origem.nome} → {equipe_destino.nome}: {valor} (-{taxa})")
+        logger.debug('[TRANSFERÊNCIA] %s → %s: %s (-%s)', equipe_origem['nome'], equipe_destino['nome'], valor, taxa)
         
         return jsonify({
             'sucesso': True,
@@ -4208,16 +4225,14 @@ def transferencia_dinheiro():
                 'valor_enviado': valor,
                 'taxa': taxa,
                 'valor_recebido': valor_recebido,
-                'saldo_novo': equipe_origem.doricoins
+                'saldo_novo': equipe_origem['doricoins']
             }
         })
     
     except ValueError as e:
         return jsonify({'erro': 'Valores inválidos'}), 400
     except Exception as e:
-        print(f"[ERRO TRANSFERÊNCIA] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO TRANSFERÊNCIA] %s', str(e))
         return jsonify({'erro': f'Erro ao processar transferência: {str(e)}'}), 500
 
 @app.route('/api/transferencias/historico', methods=['GET'])
@@ -4272,7 +4287,7 @@ def historico_transferencias():
         return jsonify(historico[-50:])  # Retornar últimas 50
     
     except Exception as e:
-        print(f"[ERRO HISTÓRICO TRANSFERÊNCIAS] {str(e)}")
+        logger.error('[ERRO HISTÓRICO TRANSFERÊNCIAS] %s', str(e))
         return jsonify({'erro': str(e)}), 400
 
 @app.route('/api/equipes/<equipe_id>/nome', methods=['PUT'])
@@ -4324,7 +4339,7 @@ def gerar_codigo_convite(equipe_id):
         resultado = api.db.gerar_codigo_convite(equipe_id)
         return jsonify(resultado)
     except Exception as e:
-        print(f"[API] Erro ao gerar código: {e}")
+        logger.error('[API] Erro ao gerar código: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/pilotos/vincular-equipe', methods=['POST'])
@@ -4345,7 +4360,7 @@ def vincular_piloto_equipe():
         resultado = api.db.vincular_piloto_a_equipe(piloto_id, codigo_convite)
         return jsonify(resultado)
     except Exception as e:
-        print(f"[API] Erro ao vincular piloto: {e}")
+        logger.error('[API] Erro ao vincular piloto: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/pilotos/minhas-equipes', methods=['GET'])
@@ -4360,7 +4375,7 @@ def listar_minhas_equipes():
         resultado = api.db.listar_equipes_do_piloto(piloto_id)
         return jsonify(resultado)
     except Exception as e:
-        print(f"[API] Erro ao listar equipes: {e}")
+        logger.error('[API] Erro ao listar equipes: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e), 'equipes': []}), 500
 
 @app.route('/api/pilotos/<piloto_id>/candidatura-etapa/<etapa_id>', methods=['GET'])
@@ -4370,7 +4385,7 @@ def obter_candidatura_piloto_etapa(piloto_id, etapa_id):
         candidatura = api.db.obter_candidatura_piloto_etapa(piloto_id, etapa_id)
         return jsonify({'candidatura': candidatura})
     except Exception as e:
-        print(f"[API] Erro ao obter candidatura: {e}")
+        logger.error('[API] Erro ao obter candidatura: %s', e)
         return jsonify({'candidatura': None, 'erro': str(e)})
 
 @app.route('/api/equipes/<equipe_id>/pilotos', methods=['GET'])
@@ -4381,7 +4396,7 @@ def listar_pilotos_equipe(equipe_id):
         resultado = api.db.listar_pilotos_da_equipe(equipe_id)
         return jsonify(resultado)
     except Exception as e:
-        print(f"[API] Erro ao listar pilotos: {e}")
+        logger.error('[API] Erro ao listar pilotos: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e), 'pilotos': []}), 500
 
 @app.route('/api/pilotos/<piloto_id>/desvincular-equipe/<equipe_id>', methods=['DELETE'])
@@ -4398,7 +4413,7 @@ def desvincular_piloto_equipe(piloto_id, equipe_id):
         resultado = api.db.desincular_piloto_de_equipe(piloto_id, equipe_id)
         return jsonify(resultado)
     except Exception as e:
-        print(f"[API] Erro ao desvinc ular: {e}")
+        logger.error('[API] Erro ao desvinc ular: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/status')
@@ -4434,9 +4449,29 @@ def admin_status():
         'etapa_atual': getattr(api, 'etapa_atual', 1)
     })
 
+@app.route('/api/admin/metrics')
+@politica_cache(SEM_ARMAZENAMENTO)
+def admin_metrics():
+    """Métricas agregadas de banco/requisições por endpoint (formato texto do Prometheus)
+
+    Acesso com sessão de admin ou header "Authorization: Bearer <GRANPIX_METRICS_TOKEN>".
+    """
+    token = os.environ.get('GRANPIX_METRICS_TOKEN')
+    autorizado = session.get('admin') or (
+        token and request.headers.get('Authorization') == f'Bearer {token}'
+    )
+    if not autorizado:
+        return jsonify({'erro': 'Acesso negado'}), 403
+    return app.response_class(
+        metricas_db.prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
 @app.route('/api/admin/equipes')
 def admin_equipes():
-    """Listar equipes para admin"""
+    """Listar equipes para admin (paginado com ?limite=&cursor=&ordenar=nome|saldo|data&serie=&busca=)"""
+    pagina = pagina_admin_solicitada('equipes')
+    if pagina is not None:
+        return pagina
     try:
         equipes = api.listar_todas_equipes()
         dados = []
@@ -4453,25 +4488,23 @@ def admin_equipes():
             })
         return jsonify(dados)
     except Exception as e:
-        print(f"[ERRO ADMIN EQUIPES] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO ADMIN EQUIPES] %s', str(e))
         return jsonify({'erro': str(e)}), 400
 
 @app.route('/api/admin/carros-disponiveis')
 def carros_disponiveis():
     """Listar todos os modelos de carros disponíveis para atribuir a uma equipe"""
     try:
-        print("[CARROS DISPONIVEIS] Iniciando...")
+        logger.debug('[CARROS DISPONIVEIS] Iniciando...')
         # Retornar modelos da loja
         modelos = api.db.carregar_modelos_loja()
-        print(f"[CARROS DISPONIVEIS] Total de modelos carregados: {len(modelos)}")
+        logger.debug('[CARROS DISPONIVEIS] Total de modelos carregados: %s', len(modelos))
         
         carros_lista = []
         if modelos:
             for modelo in modelos:
                 try:
-                    print(f"[CARROS DISPONIVEIS] Processando modelo: {modelo.marca} {modelo.modelo}")
+                    log_amostrado(logger, 'carros_disponiveis', '[CARROS DISPONIVEIS] Processando modelo: %s %s', modelo.marca, modelo.modelo)
                     carros_lista.append({
                         'id': modelo.id,
                         'marca': modelo.marca,
@@ -4480,14 +4513,12 @@ def carros_disponiveis():
                         'classe': getattr(modelo, 'classe', 'N/A')
                     })
                 except Exception as e_modelo:
-                    print(f"[CARROS DISPONIVEIS] Erro ao processar modelo: {e_modelo}")
+                    logger.error('[CARROS DISPONIVEIS] Erro ao processar modelo: %s', e_modelo)
         
-        print(f"[CARROS DISPONIVEIS] Retornando {len(carros_lista)} modelos")
+        logger.debug('[CARROS DISPONIVEIS] Retornando %s modelos', len(carros_lista))
         return jsonify(carros_lista)
     except Exception as e:
-        print(f"[ERRO CARROS DISPONIVEIS] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO CARROS DISPONIVEIS] %s', str(e))
         return jsonify({'erro': str(e)}), 400
 
 @app.route('/api/admin/cadastrar-equipe', methods=['POST'])
@@ -4509,28 +4540,28 @@ def cadastrar_equipe():
         if serie not in ['A', 'B']:
             serie = 'A'
         
-        print(f"[CADASTRO EQUIPE] Nome: {nome}, Doricoins: {doricoins}, Série: {serie}, Carro ID: {carro_id!r}")
+        logger.debug('[CADASTRO EQUIPE] Nome: %s, Doricoins: %s, Série: %s, Carro ID: %r', nome, doricoins, serie, carro_id)
         
         # Criar equipe via API com a senha e série fornecidas
         equipe = api.criar_equipe_novo(nome=nome, doricoins_iniciais=doricoins, senha=senha, serie=serie)
-        print(f"[CADASTRO EQUIPE] Equipe criada: {equipe.id}, Série: {equipe.serie}")
+        logger.debug('[CADASTRO EQUIPE] Equipe criada: %s, Série: %s', equipe.id, equipe.serie)
         
         # Atribuir carro se foi selecionado um modelo
         if carro_id:
-            print(f"[CADASTRO EQUIPE] Procurando modelo com ID: {carro_id}")
+            logger.debug('[CADASTRO EQUIPE] Procurando modelo com ID: %s', carro_id)
             # Carregar o modelo (template)
             modelos = api.db.carregar_modelos_loja()
-            print(f"[CADASTRO EQUIPE] Total de modelos: {len(modelos)}")
+            logger.debug('[CADASTRO EQUIPE] Total de modelos: %s', len(modelos))
             
             modelo_encontrado = None
             for mod in modelos:
-                print(f"[CADASTRO EQUIPE] Verificando modelo: {mod.marca} {mod.modelo}, ID: {mod.id}")
+                logger.debug('[CADASTRO EQUIPE] Verificando modelo: %s %s, ID: %s', mod.marca, mod.modelo, mod.id)
                 if mod.id == carro_id:
                     modelo_encontrado = mod
                     break
             
             if modelo_encontrado:
-                print(f"[CADASTRO EQUIPE] Modelo encontrado: {modelo_encontrado.marca} {modelo_encontrado.modelo}")
+                logger.debug('[CADASTRO EQUIPE] Modelo encontrado: %s %s', modelo_encontrado.marca, modelo_encontrado.modelo)
                 # Próximo numero_carro disponível (coluna é UNIQUE na tabela carros)
                 try:
                     conn = api.db._get_conn()
@@ -4592,22 +4623,22 @@ def cadastrar_equipe():
                     pecas_instaladas=[]
                 )
                 carro_novo.modelo_id = modelo_encontrado.id  # FK carros.modelo_id -> modelos_carro_loja.id
-                print(f"[CADASTRO EQUIPE] Carro criado: {carro_novo.id}, modelo_id={carro_novo.modelo_id}")
+                logger.debug('[CADASTRO EQUIPE] Carro criado: %s, modelo_id=%s', carro_novo.id, carro_novo.modelo_id)
                 
                 # Salvar o carro no banco (numero_carro único; falha se ex.: duplicado)
                 ok_carro = api.db.salvar_carro(carro_novo, equipe.id)
                 if not ok_carro:
                     err = getattr(api.db, '_ultimo_erro_carro', None) or 'Falha ao gravar carro no banco (verifique logs)'
-                    print(f"[CADASTRO EQUIPE] ERRO: salvar_carro retornou False: {err}")
+                    logger.error('[CADASTRO EQUIPE] ERRO: salvar_carro retornou False: %s', err)
                     return jsonify({'sucesso': False, 'erro': str(err)}), 500
-                print(f"[CADASTRO EQUIPE] Carro salvo no banco")
+                logger.debug('[CADASTRO EQUIPE] Carro salvo no banco')
                 
                 # Associar à equipe
                 equipe.carro = carro_novo
                 equipe.carros = [carro_novo]
-                print(f"[CADASTRO EQUIPE] Equipe associada ao carro")
+                logger.debug('[CADASTRO EQUIPE] Equipe associada ao carro')
             else:
-                print(f"[CADASTRO EQUIPE] Modelo não encontrado!")
+                logger.debug('[CADASTRO EQUIPE] Modelo não encontrado!')
                 return jsonify({'sucesso': False, 'erro': 'Modelo de carro não encontrado'}), 400
         
         api.db.salvar_equipe(equipe)
@@ -4619,10 +4650,10 @@ def cadastrar_equipe():
                 cur.execute('UPDATE equipes SET carro_id = %s WHERE id = %s', (equipe.carro.id, equipe.id))
                 conn.commit()
                 conn.close()
-                print(f"[CADASTRO EQUIPE] equipes.carro_id atualizado para {equipe.carro.id}")
+                logger.debug('[CADASTRO EQUIPE] equipes.carro_id atualizado para %s', equipe.carro.id)
             except Exception as ex:
-                print(f"[CADASTRO EQUIPE] Aviso ao atualizar carro_id: {ex}")
-        print(f"[CADASTRO EQUIPE] Equipe salva no banco")
+                logger.debug('[CADASTRO EQUIPE] Aviso ao atualizar carro_id: %s', ex)
+        logger.debug('[CADASTRO EQUIPE] Equipe salva no banco')
         
         resp_equipe = {
             'id': equipe.id,
@@ -4639,9 +4670,7 @@ def cadastrar_equipe():
             'equipe': resp_equipe
         })
     except Exception as e:
-        print(f"[ERRO CADASTRO EQUIPE] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO CADASTRO EQUIPE] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/deletar-equipe', methods=['POST'])
@@ -4665,7 +4694,7 @@ def deletar_equipe_admin():
         sucesso = api.apagar_equipe(equipe_id)
         
         if sucesso:
-            print(f"[EQUIPE DELETADA] {nome_equipe} (ID: {equipe_id})")
+            logger.debug('[EQUIPE DELETADA] %s (ID: %s)', nome_equipe, equipe_id)
             return jsonify({
                 'sucesso': True,
                 'mensagem': f'Equipe {nome_equipe} deletada com sucesso'
@@ -4676,9 +4705,7 @@ def deletar_equipe_admin():
                 'erro': 'Erro ao deletar equipe'
             }), 400
     except Exception as e:
-        print(f"[ERRO DELETAR EQUIPE] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO DELETAR EQUIPE] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/editar-equipe', methods=['POST'])
@@ -4701,11 +4728,10 @@ def editar_equipe_admin():
             else:
                 return jsonify({'sucesso': False, 'erro': 'Nome deve ter pelo menos 2 caracteres'}), 400
 
+        novo_saldo = None
         if 'doricoins' in dados and dados['doricoins'] is not None:
             try:
-                equipe.doricoins = float(dados['doricoins'])
-                if equipe.doricoins < 0:
-                    equipe.doricoins = 0
+                novo_saldo = max(0.0, float(dados['doricoins']))
             except (TypeError, ValueError):
                 return jsonify({'sucesso': False, 'erro': 'Saldo inválido'}), 400
 
@@ -4716,21 +4742,32 @@ def editar_equipe_admin():
             else:
                 return jsonify({'sucesso': False, 'erro': 'Série deve ser A ou B'}), 400
 
-        api.db.salvar_equipe(equipe)
+        with api.db.transacao():
+            api.db.salvar_equipe(equipe)
+            if novo_saldo is not None:
+                # Ajuste pelo extrato (salvar_equipe não grava doricoins)
+                saldo = api.db.ajustar_saldo(equipe.id, novo_saldo)
+                if saldo is not None:
+                    equipe.doricoins = saldo
         return jsonify({
             'sucesso': True,
             'mensagem': f'Equipe {equipe.nome} atualizada com sucesso',
             'equipe': {'id': equipe.id, 'nome': equipe.nome, 'doricoins': equipe.doricoins, 'serie': getattr(equipe, 'serie', 'A')}
         })
     except Exception as e:
-        print(f"[ERRO EDITAR EQUIPE] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO EDITAR EQUIPE] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/carros')
 def listar_carros_admin():
-    """Listar todos os modelos de carros da loja para edição"""
+    """Listar todos os modelos de carros da loja para edição
+
+    Paginado com ?limite=&cursor=&ordenar=marca|preco|data&classe=&marca=&busca=
+    (sem imagem: tem_imagem indica se existe).
+    """
+    pagina = pagina_admin_solicitada('modelos_carro')
+    if pagina is not None:
+        return pagina
     try:
         modelos = []
         
@@ -4794,16 +4831,14 @@ def listar_carros_admin():
                 
                 imagem_attr = getattr(modelo, 'imagem', None)
                 if imagem_attr:
-                    print(f"[DEBUG IMAGEM] {modelo.modelo}: Tem imagem, tipo={type(imagem_attr).__name__}, tamanho={len(imagem_attr) if isinstance(imagem_attr, (str, bytes)) else 'N/A'}")
+                    log_amostrado(logger, 'listar_carros_admin', '[DEBUG IMAGEM] %s: Tem imagem, tipo=%s, tamanho=%s', modelo.modelo, type(imagem_attr).__name__, (len(imagem_attr) if isinstance(imagem_attr, (str, bytes)) else 'N/A'))
                 else:
-                    print(f"[DEBUG IMAGEM] {modelo.modelo}: SEM IMAGEM")
+                    log_amostrado(logger, 'listar_carros_admin', '[DEBUG IMAGEM] %s: SEM IMAGEM', modelo.modelo)
         
-        print(f"[ADMIN] Retornando {len(modelos)} modelos de carros")
+        logger.debug('[ADMIN] Retornando %s modelos de carros', len(modelos))
         return jsonify(modelos)
     except Exception as e:
-        print(f"Erro ao listar carros: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('Erro ao listar carros: %s', e)
         return jsonify([]), 400
 
 @app.route('/api/admin/pecas')
@@ -4830,6 +4865,7 @@ def listar_pecas_admin():
         return jsonify({'erro': str(e)}), 400
 
 @app.route('/api/peca/<peca_id>/imagem')
+@politica_cache(CONDICIONAL)
 def obter_imagem_peca(peca_id):
     """Obter imagem em base64 de uma peça"""
     try:
@@ -4848,6 +4884,7 @@ def obter_imagem_peca(peca_id):
         return jsonify({'erro': str(e)}), 400
 
 @app.route('/api/carro/<carro_id>/imagem')
+@politica_cache(CONDICIONAL)
 def obter_imagem_carro(carro_id):
     """Obter imagem em base64 de um carro"""
     try:
@@ -4869,7 +4906,7 @@ def obter_imagem_carro(carro_id):
 def cadastrar_carro():
     """Cadastrar novo carro na loja"""
     dados = request.json
-    print(f"[CADASTRO CARRO] Dados recebidos (sem imagem para brevidade)")
+    logger.debug('[CADASTRO CARRO] Dados recebidos (sem imagem para brevidade)')
     try:
         marca = str(dados.get('marca', 'Genérica')).strip()
         modelo = str(dados.get('modelo', 'Modelo')).strip()
@@ -4884,12 +4921,12 @@ def cadastrar_carro():
         classe = str(dados.get('classe', 'basico')).strip()
         descricao = str(dados.get('descricao', f'{marca} {modelo}')).strip()
         
-        print(f"[CADASTRO CARRO] Marca: {marca}, Modelo: {modelo}, Preço: {preco}")
+        logger.debug('[CADASTRO CARRO] Marca: %s, Modelo: %s, Preço: %s', marca, modelo, preco)
         if imagem_base64:
-            print(f"[CADASTRO CARRO] Imagem: Recebida, tipo={type(imagem_base64).__name__}, tamanho={len(imagem_base64)}")
-            print(f"[CADASTRO CARRO] Preview (primeiros 100 chars): {imagem_base64[:100]}")
+            logger.debug('[CADASTRO CARRO] Imagem: Recebida, tipo=%s, tamanho=%s', type(imagem_base64).__name__, len(imagem_base64))
+            logger.debug('[CADASTRO CARRO] Preview (primeiros 100 chars): %s', imagem_base64[:100])
         else:
-            print(f"[CADASTRO CARRO] Imagem: Não recebida")
+            logger.debug('[CADASTRO CARRO] Imagem: Não recebida')
         
         # Validar marca e modelo
         if not marca or marca == '':
@@ -4906,18 +4943,18 @@ def cadastrar_carro():
             descricao=descricao
         )
         
-        print(f"[CADASTRO CARRO] Modelo criado: {novo_modelo.id}")
+        logger.debug('[CADASTRO CARRO] Modelo criado: %s', novo_modelo.id)
         
         # Atualizar o valor da variação V1 padrão que foi criada automaticamente
         if novo_modelo.variacoes and len(novo_modelo.variacoes) > 0:
             novo_modelo.variacoes[0].valor = preco
-            print(f"[CADASTRO CARRO] Variação V1 atualizada com valor: R${preco}")
+            logger.debug('[CADASTRO CARRO] Variação V1 atualizada com valor: R$%s', preco)
         
         # Salvar no banco com imagem
         if imagem_base64:
-            print(f"[CADASTRO CARRO] Salvando imagem: tipo={type(imagem_base64).__name__}, tamanho={len(imagem_base64)}")
+            logger.debug('[CADASTRO CARRO] Salvando imagem: tipo=%s, tamanho=%s', type(imagem_base64).__name__, len(imagem_base64))
         salvo = api.db.salvar_modelo_loja(novo_modelo, imagem_base64=imagem_base64)
-        print(f"[CADASTRO CARRO] Salvo no banco: {salvo}")
+        logger.debug('[CADASTRO CARRO] Salvo no banco: %s', salvo)
         
         if not salvo:
             return jsonify({'sucesso': False, 'erro': 'Erro ao salvar no banco'}), 400
@@ -4926,7 +4963,7 @@ def cadastrar_carro():
         modelos_db = api.db.carregar_modelos_loja()
         if modelos_db:
             api.loja_carros.modelos = modelos_db
-            print(f"[CADASTRO CARRO] Modelos recarregados: {len(modelos_db)} modelos")
+            logger.debug('[CADASTRO CARRO] Modelos recarregados: %s modelos', len(modelos_db))
         
         # Preparar imagem para retorno
         imagem_retorno = imagem_base64
@@ -4946,19 +4983,17 @@ def cadastrar_carro():
             }
         })
     except ValueError as e:
-        print(f"[ERRO CADASTRO CARRO] Erro de valor: {str(e)}")
+        logger.error('[ERRO CADASTRO CARRO] Erro de valor: %s', str(e))
         return jsonify({'sucesso': False, 'erro': f'Dados inválidos: {str(e)}'}), 400
     except Exception as e:
-        print(f"[ERRO CADASTRO CARRO] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO CADASTRO CARRO] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/cadastrar-variacao', methods=['POST'])
 def cadastrar_variacao():
     """Cadastrar nova variação de carro"""
     dados = request.json
-    print(f"[CADASTRO VARIAÇÃO] Dados recebidos")
+    logger.debug('[CADASTRO VARIAÇÃO] Dados recebidos')
     try:
         modelo_id = dados.get('modelo_carro_loja_id')
         motor_id = dados.get('motor_id')
@@ -4976,8 +5011,8 @@ def cadastrar_variacao():
         if not modelo:
             return jsonify({'sucesso': False, 'erro': 'Modelo de carro não encontrado'}), 404
         
-        print(f"[CADASTRO VARIAÇÃO] Modelo: {modelo.marca} {modelo.modelo}")
-        print(f"[CADASTRO VARIAÇÃO] Motor: {motor_id}, Câmbio: {cambio_id}, Valor: {valor}")
+        logger.debug('[CADASTRO VARIAÇÃO] Modelo: %s %s', modelo.marca, modelo.modelo)
+        logger.debug('[CADASTRO VARIAÇÃO] Motor: %s, Câmbio: %s, Valor: %s', motor_id, cambio_id, valor)
         
         # Validar IDs de peças
         def validar_id_peca(peca_id, tipo_peca):
@@ -5008,18 +5043,18 @@ def cadastrar_variacao():
         )
         
         if resultado:
-            print(f"[CADASTRO VARIAÇÃO] Variação adicionada com sucesso")
+            logger.info('[CADASTRO VARIAÇÃO] Variação adicionada com sucesso')
             
             # Salvar o modelo no banco de dados (persiste a nova variação)
             salvo = api.db.salvar_modelo_loja(modelo)
             if salvo:
-                print(f"[CADASTRO VARIAÇÃO] Modelo salvo no banco com a nova variação")
+                logger.debug('[CADASTRO VARIAÇÃO] Modelo salvo no banco com a nova variação')
                 
                 # Recarregar modelos para sincronizar em memória
                 modelos_db = api.db.carregar_modelos_loja()
                 if modelos_db:
                     api.loja_carros.modelos = modelos_db
-                    print(f"[CADASTRO VARIAÇÃO] Modelos recarregados do banco")
+                    logger.debug('[CADASTRO VARIAÇÃO] Modelos recarregados do banco')
                 
                 return jsonify({
                     'sucesso': True,
@@ -5031,16 +5066,14 @@ def cadastrar_variacao():
             return jsonify({'sucesso': False, 'erro': 'Erro ao cadastrar variação'}), 400
     
     except Exception as e:
-        print(f"[ERRO CADASTRO VARIAÇÃO] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO CADASTRO VARIAÇÃO] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/editar-variacao', methods=['POST'])
 def editar_variacao():
     """Editar uma variação de carro existente"""
     dados = request.json
-    print(f"[EDITAR VARIAÇÃO] Dados recebidos")
+    logger.debug('[EDITAR VARIAÇÃO] Dados recebidos')
     try:
         variacao_id = dados.get('variacao_id')
         modelo_id = dados.get('modelo_carro_loja_id')
@@ -5054,7 +5087,7 @@ def editar_variacao():
         if not variacao_id or not modelo_id:
             return jsonify({'sucesso': False, 'erro': 'Variação ou modelo não fornecidos'}), 400
         
-        print(f"[EDITAR VARIAÇÃO] Variação: {variacao_id}, Modelo: {modelo_id}")
+        logger.debug('[EDITAR VARIAÇÃO] Variação: %s, Modelo: %s', variacao_id, modelo_id)
         
         # Validar IDs de peças
         def validar_id_peca(peca_id, tipo_peca):
@@ -5087,13 +5120,13 @@ def editar_variacao():
         conn.commit()
         conn.close()
         
-        print(f"[EDITAR VARIAÇÃO] Variação atualizada no banco")
+        logger.debug('[EDITAR VARIAÇÃO] Variação atualizada no banco')
         
         # Recarregar modelos para sincronizar em memória
         modelos_db = api.db.carregar_modelos_loja()
         if modelos_db:
             api.loja_carros.modelos = modelos_db
-            print(f"[EDITAR VARIAÇÃO] Modelos recarregados do banco")
+            logger.debug('[EDITAR VARIAÇÃO] Modelos recarregados do banco')
         
         return jsonify({
             'sucesso': True,
@@ -5101,9 +5134,7 @@ def editar_variacao():
         })
     
     except Exception as e:
-        print(f"[ERRO EDITAR VARIAÇÃO] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO EDITAR VARIAÇÃO] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/editar-carro', methods=['POST'])
@@ -5154,9 +5185,7 @@ def editar_carro():
             return jsonify({'sucesso': False, 'erro': 'Carro não encontrado'}), 400
             
     except Exception as e:
-        print(f"[ERRO EDITAR CARRO] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO EDITAR CARRO] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/deletar-carro', methods=['POST'])
@@ -5188,9 +5217,7 @@ def deletar_carro():
             return jsonify({'sucesso': False, 'erro': 'Carro não encontrado'}), 400
             
     except Exception as e:
-        print(f"[ERRO DELETAR CARRO] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO DELETAR CARRO] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/cadastrar-peca', methods=['POST'])
@@ -5221,11 +5248,11 @@ def cadastrar_peca():
         
         imagem_base64 = dados.get('imagem')  # Receber imagem em base64
         
-        print(f"\n[CADASTRAR PEÇA] Recebido:")
-        print(f"  Nome: {nome}")
-        print(f"  Tipo: {tipo}")
-        print(f"  Compatibilidades: {compatibilidades}")
-        print(f"  Imagem: {'Sim' if imagem_base64 else 'Não'}")
+        logger.debug('[CADASTRAR PEÇA] Recebido:')
+        logger.debug('Nome: %s', nome)
+        logger.debug('Tipo: %s', tipo)
+        logger.debug('Compatibilidades: %s', compatibilidades)
+        logger.debug('Imagem: %s', ('Sim' if imagem_base64 else 'Não'))
         
         # Criar descrição padrão se não fornecida
         descricao = f'{nome} - Tipo: {tipo}'
@@ -5243,17 +5270,17 @@ def cadastrar_peca():
         
         # Salvar no banco com imagem
         sucesso_salvar = api.db.salvar_peca_loja(nova_peca, imagem_base64=imagem_base64)
-        print(f"[DEBUG] Salvar peça sucesso: {sucesso_salvar}")
+        logger.info('[DEBUG] Salvar peça sucesso: %s', sucesso_salvar)
         if not sucesso_salvar:
             raise Exception("Falha ao salvar peça no banco de dados")
         
-        print(f"[DEBUG] Peça cadastrada: {nova_peca.id} - {nova_peca.nome}")
+        logger.debug('[DEBUG] Peça cadastrada: %s - %s', nova_peca.id, nova_peca.nome)
         
         # Recarregar peças na API para atualizar a imagem em memória
         pecas_db = api.db.carregar_pecas_loja()
         if pecas_db:
             api.loja_pecas.pecas = pecas_db
-            print(f"[CADASTRO PEÇA] Peças recarregadas: {len(pecas_db)} peças")
+            logger.debug('[CADASTRO PEÇA] Peças recarregadas: %s peças', len(pecas_db))
         
         # Preparar imagem para retorno
         imagem_retorno = imagem_base64
@@ -5273,9 +5300,7 @@ def cadastrar_peca():
             }
         })
     except Exception as e:
-        print(f"[ERRO CADASTRO PEÇA] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO CADASTRO PEÇA] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/editar-peca', methods=['POST'])
@@ -5304,15 +5329,15 @@ def editar_peca():
         
         imagem_base64 = dados.get('imagem')
         
-        print(f"\n[EDITAR PEÇA] Iniciando edição")
-        print(f"[EDITAR PEÇA] ID: {peca_id}")
-        print(f"[EDITAR PEÇA] Nome: {nome}")
-        print(f"[EDITAR PEÇA] Tipo: {tipo}")
-        print(f"[EDITAR PEÇA] Preco: {preco}")
-        print(f"[EDITAR PEÇA] Durabilidade: {durabilidade}")
-        print(f"[EDITAR PEÇA] Coeficiente: {coeficiente_quebra}")
-        print(f"[EDITAR PEÇA] Compatibilidades: {compatibilidades}")
-        print(f"[EDITAR PEÇA] Imagem: {'Sim' if imagem_base64 else 'Não'}")
+        logger.debug('[EDITAR PEÇA] Iniciando edição')
+        logger.debug('[EDITAR PEÇA] ID: %s', peca_id)
+        logger.debug('[EDITAR PEÇA] Nome: %s', nome)
+        logger.debug('[EDITAR PEÇA] Tipo: %s', tipo)
+        logger.debug('[EDITAR PEÇA] Preco: %s', preco)
+        logger.debug('[EDITAR PEÇA] Durabilidade: %s', durabilidade)
+        logger.debug('[EDITAR PEÇA] Coeficiente: %s', coeficiente_quebra)
+        logger.debug('[EDITAR PEÇA] Compatibilidades: %s', compatibilidades)
+        logger.debug('[EDITAR PEÇA] Imagem: %s', ('Sim' if imagem_base64 else 'Não'))
         
         if not peca_id:
             return jsonify({'sucesso': False, 'erro': 'ID da peça não fornecido'}), 400
@@ -5328,32 +5353,30 @@ def editar_peca():
             compatibilidade=compatibilidade_json
         )
         
-        print(f"[EDITAR PEÇA] Retorno de editar_peca: {sucesso}")
+        logger.debug('[EDITAR PEÇA] Retorno de editar_peca: %s', sucesso)
         
         if sucesso:
             # Salvar no banco
             peca = api.loja_pecas.obter_peca(peca_id)
             if peca:
-                print(f"[EDITAR PEÇA] Peça encontrada: {peca.nome}, compatibilidade: {peca.compatibilidade}")
+                logger.debug('[EDITAR PEÇA] Peça encontrada: %s, compatibilidade: %s', peca.nome, peca.compatibilidade)
                 api.db.salvar_peca_loja(peca, imagem_base64=imagem_base64)
                 # Recarregar do banco para garantir sincronização
                 pecas_db = api.db.carregar_pecas_loja()
                 if pecas_db:
                     api.loja_pecas.pecas = pecas_db
-                    print(f"[EDITAR PEÇA] Peças recarregadas do banco")
+                    logger.debug('[EDITAR PEÇA] Peças recarregadas do banco')
             
             return jsonify({
                 'sucesso': True,
                 'mensagem': f'Peça {nome} atualizada com sucesso'
             })
         else:
-            print(f"[EDITAR PEÇA] Peça não encontrada!")
+            logger.debug('[EDITAR PEÇA] Peça não encontrada!')
             return jsonify({'sucesso': False, 'erro': 'Peça não encontrada'}), 400
             
     except Exception as e:
-        print(f"[ERRO EDITAR PEÇA] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO EDITAR PEÇA] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/deletar-peca', methods=['POST'])
@@ -5385,9 +5408,7 @@ def deletar_peca():
             return jsonify({'sucesso': False, 'erro': 'Peça não encontrada'}), 400
             
     except Exception as e:
-        print(f"[ERRO DELETAR PEÇA] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO DELETAR PEÇA] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/deletar-imagem-peca', methods=['POST'])
@@ -5422,9 +5443,7 @@ def deletar_imagem_peca():
         })
             
     except Exception as e:
-        print(f"[ERRO DELETAR IMAGEM PECA] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO DELETAR IMAGEM PECA] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/deletar-imagem-carro', methods=['POST'])
@@ -5464,9 +5483,7 @@ def deletar_imagem_carro():
         })
             
     except Exception as e:
-        print(f"[ERRO DELETAR IMAGEM CARRO] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO DELETAR IMAGEM CARRO] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/aprovar-solicitacao-ativacao-carro', methods=['POST'])
@@ -5483,9 +5500,7 @@ def aprovar_solicitacao_ativacao_carro():
         resultado = api.db.aprovar_solicitacao_ativacao_carro(solicitacao_id)
         return jsonify(resultado)
     except Exception as e:
-        print(f"[ERRO] Erro ao aprovar solicitação: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao aprovar solicitação: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/equipe/mudar-senha', methods=['POST'])
@@ -5511,18 +5526,18 @@ def mudar_senha_equipe():
             return jsonify({'sucesso': False, 'erro': 'Equipe não encontrada'}), 404
         
         # Mudar a senha (armazenar hash para compatibilidade com login)
-        equipe.senha = generate_password_hash(str(nova_senha))
-        api.db.salvar_equipe(equipe)
+        equipe.senha = gerar_hash(str(nova_senha))
+        api.db.atualizar_senha_equipe(equipe.id, equipe.senha)
         
-        print(f"[SENHA EQUIPE ALTERADA] {equipe.nome} (ID: {equipe_id})")
+        logger.debug('[SENHA EQUIPE ALTERADA] %s (ID: %s)', equipe.nome, equipe_id)
         return jsonify({
             'sucesso': True,
             'mensagem': f'Senha de {equipe.nome} alterada com sucesso'
         })
+    except SenhasSaturadas:
+        raise
     except Exception as e:
-        print(f"[ERRO MUDAR SENHA] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO MUDAR SENHA] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 @app.route('/api/admin/solicitacao/<solicitacao_id>')
@@ -5584,40 +5599,55 @@ def obter_solicitacao(solicitacao_id):
         })
     
     except Exception as e:
-        print(f"[ERRO OBTER SOLICITAÇÃO] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO OBTER SOLICITAÇÃO] %s', str(e))
         return jsonify({'erro': str(e)}), 400
 
 @app.route('/api/admin/solicitacoes-pecas')
 def listar_solicitacoes_pecas():
-    """Listar todas as solicitações de compra de peças pendentes do banco de dados"""
+    """Listar todas as solicitações de compra de peças pendentes do banco de dados
+
+    Paginado com ?limite=&cursor=&status=&equipe_id=&desde=&ate=&busca=
+    """
+    pagina = pagina_admin_solicitada('solicitacoes_pecas')
+    if pagina is not None:
+        return pagina
     try:
         # Carregar solicitações do banco de dados
         solicitacoes = api.db.carregar_solicitacoes_pecas()
         
-        print(f"[SOLICITAÇÕES PECAS] Total carregadas: {len(solicitacoes)}")
+        logger.debug('[SOLICITAÇÕES PECAS] Total carregadas: %s', len(solicitacoes))
         return jsonify(solicitacoes)
     except Exception as e:
-        print(f"[ERRO LISTAR SOLICITAÇÕES] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO LISTAR SOLICITAÇÕES] %s', str(e))
+        return jsonify({'erro': str(e)}), 400
+
+@app.route('/api/admin/solicitacoes/pendentes')
+def contar_solicitacoes_pendentes():
+    """Contadores de solicitações pendentes para o menu admin"""
+    try:
+        return jsonify(api.db.contar_solicitacoes_pendentes())
+    except Exception as e:
+        logger.exception('[ERRO CONTAR SOLICITAÇÕES] %s', str(e))
         return jsonify({'erro': str(e)}), 400
 
 @app.route('/api/admin/solicitacoes-carros')
 def listar_solicitacoes_carros():
-    """Listar todas as solicitações de mudança de carro do banco de dados"""
+    """Listar todas as solicitações de mudança de carro do banco de dados
+
+    Paginado com ?limite=&cursor=&status=&tipo=&equipe_id=&busca=
+    """
+    pagina = pagina_admin_solicitada('solicitacoes_carros')
+    if pagina is not None:
+        return pagina
     try:
         # Carregar solicitações do banco de dados (com dados completos já enriquecidos)
         solicitacoes = api.db.carregar_solicitacoes_carros()
         
-        print(f"[SOLICITAÇÕES CARROS] Total carregadas: {len(solicitacoes)}")
+        logger.debug('[SOLICITAÇÕES CARROS] Total carregadas: %s', len(solicitacoes))
         
         return jsonify(solicitacoes)
     except Exception as e:
-        print(f"[ERRO LISTAR SOLICITAÇÕES CARROS] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO LISTAR SOLICITAÇÕES CARROS] %s', str(e))
         return jsonify({'erro': str(e)}), 400
 
 @app.route('/api/admin/processar-solicitacao', methods=['POST'])
@@ -5630,13 +5660,13 @@ def processar_solicitacao():
         tipo = dados.get('tipo', 'peca')  # 'peca' ou 'carro'
         carro_id_request = dados.get('carro_id')  # Carro selecionado no admin para instalar peça
         
-        print(f"\n[PROCESSAR SOLICITAÇÃO] ========== INICIANDO ==========")
-        print(f"[PROCESSAR SOLICITAÇÃO] ID: {solicitacao_id}")
-        print(f"[PROCESSAR SOLICITAÇÃO] Status: {novo_status}")
-        print(f"[PROCESSAR SOLICITAÇÃO] Tipo: {tipo}")
-        print(f"[PROCESSAR SOLICITAÇÃO] CarroID Request: '{carro_id_request}' (tipo={type(carro_id_request)}, bool={bool(carro_id_request)})")
+        logger.debug('[PROCESSAR SOLICITAÇÃO] ========== INICIANDO ==========')
+        logger.debug('[PROCESSAR SOLICITAÇÃO] ID: %s', solicitacao_id)
+        logger.debug('[PROCESSAR SOLICITAÇÃO] Status: %s', novo_status)
+        logger.debug('[PROCESSAR SOLICITAÇÃO] Tipo: %s', tipo)
+        logger.debug("[PROCESSAR SOLICITAÇÃO] CarroID Request: '%s' (tipo=%s, bool=%s)", carro_id_request, type(carro_id_request), bool(carro_id_request))
         
-        print(f"[PROCESSAR SOLICITAÇÃO] Dados validados, continuando...")
+        logger.debug('[PROCESSAR SOLICITAÇÃO] Dados validados, continuando...')
         
         # ===== PROCESSAR SOLICITAÇÃO DE CARRO =====
         if tipo == 'carro':
@@ -5655,7 +5685,7 @@ def processar_solicitacao():
             sucesso = api.db.atualizar_status_solicitacao_carro(solicitacao_id, novo_status)
             
             if sucesso:
-                print(f"[CARRO ATIVADO] Solicitação {solicitacao_id} aprovada")
+                logger.debug('[CARRO ATIVADO] Solicitação %s aprovada', solicitacao_id)
                 return jsonify({
                     'sucesso': True,
                     'mensagem': f'Carro {solicitacao.get("marca", "")} {solicitacao.get("modelo", "")} ativado com sucesso!'
@@ -5681,7 +5711,7 @@ def processar_solicitacao():
                 # Usar carro_id do request se fornecido, senão usar da solicitação
                 carro_id_final = carro_id_request if carro_id_request else solicitacao.get('carro_id')
                 
-                print(f"[INSTALAR PEÇA] carro_id_request={carro_id_request}, carro_id_solicitacao={solicitacao.get('carro_id')}, carro_id_final={carro_id_final}")
+                logger.debug('[INSTALAR PEÇA] carro_id_request=%s, carro_id_solicitacao=%s, carro_id_final=%s', carro_id_request, solicitacao.get('carro_id'), carro_id_final)
                 
                 # Validar que tem carro_id
                 if not carro_id_final:
@@ -5689,40 +5719,38 @@ def processar_solicitacao():
                 
                 # SEMPRE atualizar solicitação com o carro_id do request se foi fornecido
                 if carro_id_request:
-                    print(f"[INSTALAR PEÇA] Atualizando carro_id da solicitação de {solicitacao.get('carro_id')} para {carro_id_request}...")
+                    logger.debug('[INSTALAR PEÇA] Atualizando carro_id da solicitação de %s para %s...', solicitacao.get('carro_id'), carro_id_request)
                     resultado_atualizar = api.db.atualizar_carro_id_solicitacao_peca(solicitacao_id, carro_id_request)
-                    print(f"[INSTALAR PEÇA] Resultado da atualização: {resultado_atualizar}")
+                    logger.debug('[INSTALAR PEÇA] Resultado da atualização: %s', resultado_atualizar)
                 
                 # Criar peça no armazém se não existir
-                print(f"[INSTALAR PEÇA] Criando peça no armazém: peca_loja_id={solicitacao['peca_id']}, equipe_id={solicitacao['equipe_id']}")
+                logger.debug('[INSTALAR PEÇA] Criando peça no armazém: peca_loja_id=%s, equipe_id=%s', solicitacao['peca_id'], solicitacao['equipe_id'])
                 try:
                     peca_armazem = api.db.criar_peca_armazem(solicitacao['peca_id'], solicitacao['equipe_id'])
                     if not peca_armazem:
-                        print(f"[INSTALAR PEÇA] ERRO ao criar peça no armazém")
+                        logger.error('[INSTALAR PEÇA] ERRO ao criar peça no armazém')
                         return jsonify({'erro': 'Erro ao criar peça no armazém'}), 400
-                    print(f"[INSTALAR PEÇA] Peça criada com sucesso: {peca_armazem}")
+                    logger.info('[INSTALAR PEÇA] Peça criada com sucesso: %s', peca_armazem)
                 except Exception as e:
-                    print(f"[INSTALAR PEÇA] EXCEPTION ao criar peça: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception('[INSTALAR PEÇA] EXCEPTION ao criar peça: %s', e)
                     return jsonify({'erro': f'Erro ao criar peça: {str(e)}'}), 400
                 
                 # Instalar a peça no carro
-                print(f"[INSTALAR PEÇA] Instalando peça {solicitacao['peca_id']} no carro {carro_id_final}")
+                logger.debug('[INSTALAR PEÇA] Instalando peça %s no carro %s', solicitacao['peca_id'], carro_id_final)
                 sucesso, mensagem = api.db.instalar_peca_no_carro(
                     solicitacao['peca_id'],
                     carro_id_final
                 )
                 
                 if not sucesso:
-                    print(f"[ERRO INSTALAÇÃO] {mensagem}")
+                    logger.error('[ERRO INSTALAÇÃO] %s', mensagem)
                     return jsonify({'erro': mensagem}), 400
                 
                 # Atualizar status da solicitação
                 sucesso_status = api.db.atualizar_status_solicitacao_peca(solicitacao_id, 'instalado')
                 
                 if sucesso_status:
-                    print(f"[PEÇA INSTALADA] Solicitação {solicitacao_id} instalada com sucesso")
+                    logger.info('[PEÇA INSTALADA] Solicitação %s instalada com sucesso', solicitacao_id)
                     
                     # Registrar comissão se a peça era do armazém
                     try:
@@ -5737,9 +5765,9 @@ def processar_solicitacao():
                                 equipe_nome=equipe.nome if equipe else 'Desconhecido',
                                 descricao=f'Instalação de {solicitacao["peca_nome"]} do warehouse'
                             )
-                            print(f"[COMISSÃO] Registrada: R$ {comissao_valor} por instalação de peça do warehouse")
+                            logger.debug('[COMISSÃO] Registrada: R$ %s por instalação de peça do warehouse', comissao_valor)
                     except Exception as e:
-                        print(f"[AVISO] Erro ao registrar comissão: {e}")
+                        logger.error('[AVISO] Erro ao registrar comissão: %s', e)
                     
                     return jsonify({
                         'sucesso': True,
@@ -5754,7 +5782,7 @@ def processar_solicitacao():
                 sucesso = api.db.atualizar_status_solicitacao_peca(solicitacao_id, 'guardada')
                 
                 if sucesso:
-                    print(f"[PEÇA GUARDADA] Solicitação {solicitacao_id} guardada")
+                    logger.debug('[PEÇA GUARDADA] Solicitação %s guardada', solicitacao_id)
                     return jsonify({
                         'sucesso': True,
                         'mensagem': f'Peça {solicitacao["peca_nome"]} guardada no armazém'
@@ -5769,7 +5797,7 @@ def processar_solicitacao():
                 
                 if sucesso:
                     # Aqui você poderia devolver os doricoins para a equipe
-                    print(f"[PEÇA REPROVADA] Solicitação {solicitacao_id} reprovada")
+                    logger.debug('[PEÇA REPROVADA] Solicitação %s reprovada', solicitacao_id)
                     return jsonify({
                         'sucesso': True,
                         'mensagem': f'Solicitação de {solicitacao["peca_nome"]} reprovada'
@@ -5780,16 +5808,44 @@ def processar_solicitacao():
                 return jsonify({'erro': 'Status inválido'}), 400
     
     except Exception as e:
-        print(f"[ERRO PROCESSAR SOLICITAÇÃO] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO PROCESSAR SOLICITAÇÃO] %s', str(e))
         return jsonify({'erro': str(e)}), 500
 
+# Máximo de itens por chamada de /api/admin/processar-solicitacoes
+LIMITE_LOTE_SOLICITACOES = 500
+
+@app.route('/api/admin/processar-solicitacoes', methods=['POST'])
+@requer_admin
+@politica_cache(SEM_ARMAZENAMENTO)
+def processar_solicitacoes_lote():
+    """Processar várias solicitações de peça/carro de uma vez
+
+    Body: {"itens": [{"solicitacao_id", "status", "carro_id"?, "tipo"?: "peca"|"carro"}]}
+    Retorna o resultado de cada item; itens inválidos não impedem os demais.
+    """
+    dados = request.get_json(silent=True) or {}
+    itens = dados.get('itens')
+    if not isinstance(itens, list) or not itens:
+        return jsonify({'sucesso': False, 'erro': 'Informe a lista "itens"'}), 400
+    if len(itens) > LIMITE_LOTE_SOLICITACOES:
+        return jsonify({'sucesso': False, 'erro': f'Máximo de {LIMITE_LOTE_SOLICITACOES} itens por lote'}), 400
+    if not all(isinstance(item, dict) for item in itens):
+        return jsonify({'sucesso': False, 'erro': 'Itens inválidos'}), 400
+
+    resultado = api.db.processar_solicitacoes_lote(itens)
+    if not resultado['sucesso']:
+        return jsonify(resultado), 500
+    logger.info('[PROCESSAR SOLICITAÇÕES] Lote: %s processadas, %s com erro',
+                resultado['processadas'], resultado['falhas'])
+    return jsonify(resultado)
+
 @app.route('/api/admin/etapas')
+@politica_cache(CONDICIONAL)
 @requer_admin
 def api_admin_etapas():
     """Listar todas as etapas (robusto a formatos variados retornados pelo DB)"""
     try:
+        definir_ultima_modificacao(api.db.obter_ultima_atualizacao('etapas'))
         etapas_raw = api.db.listar_etapas()
 
         etapas = []
@@ -5820,18 +5876,14 @@ def api_admin_etapas():
                     'hora_etapa': hora_etapa
                 })
             except Exception as inner_e:
-                print(f"[ERRO NORMALIZAR ETAPA] índice={idx} erro={inner_e} item={repr(item)[:200]}")
-                import traceback
-                traceback.print_exc()
+                logger.exception('[ERRO NORMALIZAR ETAPA] índice=%s erro=%s item=%s', idx, inner_e, repr(item)[:200])
                 # pular item problemático
                 continue
 
         return jsonify({'sucesso': True, 'etapas': etapas})
 
     except Exception as e:
-        print(f"[ERRO LISTAR ETAPAS] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO LISTAR ETAPAS] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 # ============ ROTAS ADMIN - COMISSÕES ============
@@ -5839,9 +5891,18 @@ def api_admin_etapas():
 @app.route('/api/admin/comissoes')
 @requer_admin
 def api_admin_comissoes():
-    """Listar todas as comissões"""
+    """Listar comissões (paginado com ?limite=&cursor=&tipo=&equipe_id=&desde=&ate=&busca=)"""
     try:
-        comissoes = api.db.listar_comissoes(limit=50)
+        paginada = 'limite' in request.args or 'cursor' in request.args
+        if paginada:
+            try:
+                pagina = api.db.listar_pagina_admin('comissoes', request.args)
+            except ValueError as e:
+                return jsonify({'sucesso': False, 'erro': str(e)}), 400
+            if 'cursor' in request.args:
+                return jsonify({'sucesso': True, **pagina})
+        else:
+            comissoes = api.db.listar_comissoes(limit=50)
         resumo_raw = api.db.obter_resumo_comissoes()
         
         # Calcular totais por categoria
@@ -5855,15 +5916,15 @@ def api_admin_comissoes():
             'pecas': float(pecas)
         }
         
+        if paginada:
+            return jsonify({'sucesso': True, **pagina, 'resumo': resumo})
         return jsonify({
             'sucesso': True,
             'comissoes': comissoes,
             'resumo': resumo
         })
     except Exception as e:
-        print(f"[ERRO LISTAR COMISSÕES] {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO LISTAR COMISSÕES] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/admin/configuracao/<config_key>', methods=['GET', 'POST'])
@@ -5883,7 +5944,7 @@ def gerenciar_configuracao(config_key):
             api.db.salvar_configuracao(config_key, valor)
             return jsonify({'sucesso': True})
     except Exception as e:
-        print(f"[ERRO CONFIGURAÇÃO] {str(e)}")
+        logger.error('[ERRO CONFIGURAÇÃO] %s', str(e))
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 # ============ ROTAS PIX / MERCADO PAGO ============
@@ -5913,13 +5974,13 @@ def gerar_qr_pix():
         for trans in transacoes_existentes:
             if trans['tipo_item'] == tipo and trans['item_id'] == item_id:
                 # Transação pendente já existe - retornar dados existentes
-                print(f"[QR PIX] Transação pendente encontrada: {trans['id']}")
+                logger.debug('[QR PIX] Transação pendente encontrada: %s', trans['id'])
                 
                 # Gerar imagem QR code se não tiver sido feita ainda
                 qr_code_url = trans['qr_code_url']
                 if trans['qr_code'] and not qr_code_url.startswith('data:'):
                     # O qr_code_url é na verdade o código PIX em texto, gerar imagem
-                    print(f"[QR PIX] Gerando imagem para código PIX existente...")
+                    logger.debug('[QR PIX] Gerando imagem para código PIX existente...')
                     from src.mercado_pago_client import mp_client
                     img_base64 = mp_client.gerar_qr_code_imagem_pix(trans['qr_code'])
                     if img_base64:
@@ -5931,7 +5992,7 @@ def gerar_qr_pix():
                             qr_code=trans['qr_code'],
                             qr_code_url=qr_code_url
                         )
-                        print(f"[QR PIX] Imagem gerada e salva")
+                        logger.debug('[QR PIX] Imagem gerada e salva')
                 
                 return jsonify({
                     'sucesso': True,
@@ -6020,9 +6081,9 @@ def gerar_qr_pix():
             qr_code_url=resultado_mp.get('qr_code_url', '')
         )
         
-        print(f"[QR PIX] Gerado para {item_nome} - Valor: R$ {valor_total}")
-        print(f"[QR PIX] QR Code URL: {resultado_mp.get('qr_code_url', '')[:100] if resultado_mp.get('qr_code_url') else 'VAZIO'}")
-        print(f"[QR PIX] Carro ID: {carro_id}")
+        logger.debug('[QR PIX] Gerado para %s - Valor: R$ %s', item_nome, valor_total)
+        logger.debug('[QR PIX] QR Code URL: %s', (resultado_mp.get('qr_code_url', '')[:100] if resultado_mp.get('qr_code_url') else 'VAZIO'))
+        logger.debug('[QR PIX] Carro ID: %s', carro_id)
         
         return jsonify({
             'sucesso': True,
@@ -6039,9 +6100,7 @@ def gerar_qr_pix():
         })
     
     except Exception as e:
-        print(f"[ERRO] Erro ao gerar QR PIX: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao gerar QR PIX: %s', e)
         return jsonify({'erro': str(e)}), 500
 
 @app.route('/api/webhook/mercado-pago', methods=['POST'])
@@ -6052,7 +6111,7 @@ def webhook_mercado_pago():
         
         dados = request.json or {}
         
-        print(f"\n[WEBHOOK MP] Recebido: {dados}")
+        logger.debug('[WEBHOOK MP] Recebido: %s', dados)
         
         # Processar webhook
         resultado = mp_client.processar_webhook(dados)
@@ -6062,19 +6121,19 @@ def webhook_mercado_pago():
             transacao_id = resultado.get('transacao_id')
             
             if status == 'approved':
-                print(f"[WEBHOOK MP] Pagamento APROVADO: {transacao_id}")
+                logger.debug('[WEBHOOK MP] Pagamento APROVADO: %s', transacao_id)
                 
                 # Confirmar transação no BD
                 confirmacao = api.db.confirmar_transacao_pix(resultado.get('payment_id', ''))
                 
                 if confirmacao.get('sucesso'):
                     # Aqui você pode processar a compra automaticamente
-                    print(f"[WEBHOOK MP] Transação confirmada: {transacao_id}")
+                    logger.debug('[WEBHOOK MP] Transação confirmada: %s', transacao_id)
         
         return jsonify({'sucesso': True}), 200
     
     except Exception as e:
-        print(f"[ERRO WEBHOOK] {e}")
+        logger.error('[ERRO WEBHOOK] %s', e)
         return jsonify({'erro': str(e)}), 400
 
 @app.route('/api/transacao-pix/<transacao_id>', methods=['GET'])
@@ -6091,386 +6150,389 @@ def obter_transacao_pix(transacao_id):
         
         # Se está pendente no BD, consultar MercadoPago para verificar se foi pago
         if transacao['status'] == 'pendente' and transacao.get('mercado_pago_id'):
-            print(f"[TRANSACAO] Status pendente no BD, consultando MercadoPago: {transacao['mercado_pago_id']}")
+            logger.debug('[TRANSACAO] Status pendente no BD, consultando MercadoPago: %s', transacao['mercado_pago_id'])
             
             # Consultar MercadoPago
             pagamento = mp_client.obter_pagamento(transacao['mercado_pago_id'])
             
             if pagamento and pagamento.get('status') == 'approved':
-                print(f"[TRANSACAO] MercadoPago confirma: PAGAMENTO APROVADO! Atualizando BD...")
+                logger.debug('[TRANSACAO] MercadoPago confirma: PAGAMENTO APROVADO! Atualizando BD...')
                 
                 # Atualizar status no BD
                 api.db.confirmar_transacao_pix(transacao['mercado_pago_id'])
                 
                 # Recarregar dados atualizados
                 transacao = api.db.obter_transacao_pix(transacao_id)
-                print(f"[TRANSACAO] Novo status no BD: {transacao['status']}")
+                logger.debug('[TRANSACAO] Novo status no BD: %s', transacao['status'])
             elif pagamento:
-                print(f"[TRANSACAO] MercadoPago status: {pagamento.get('status')}")
+                logger.debug('[TRANSACAO] MercadoPago status: %s', pagamento.get('status'))
         
         return jsonify({'sucesso': True, 'transacao': transacao})
     
     except Exception as e:
-        print(f"[ERRO] Erro ao obter transação: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao obter transação: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
-@app.route('/api/confirmar-pagamento-manual', methods=['POST'])
-@requer_login_api
-def confirmar_pagamento_manual():
-    """Confirma manualmente um pagamento (para testes sem webhook)"""
-    try:
-        equipe_id = obter_equipe_id_request()
-        if not equipe_id:
-            return jsonify({'sucesso': False, 'erro': 'Não autenticado'}), 401
-        
-        dados = request.json
-        transacao_id = dados.get('transacao_id')
-        
-        if not transacao_id:
-            return jsonify({'sucesso': False, 'erro': 'transacao_id é obrigatório'}), 400
-        
-        # Obter a transação
-        transacao = api.db.obter_transacao_pix(transacao_id)
-        
-        if not transacao:
-            return jsonify({'sucesso': False, 'erro': 'Transação não encontrada'}), 404
+def _processar_pagamento_confirmado(equipe_id, transacao_id, transacao):
+    """Confirma a transação PIX e processa a compra correspondente (carro, peça, etapa...)
+
+    Chamado dentro de api.db.transacao() por confirmar_pagamento_manual.
+    """
+    # Confirmar a transação (atualiza status)
+    sucesso = api.db.confirmar_transacao_pix(transacao['mercado_pago_id'] or transacao_id)
+    
+    if sucesso.get('sucesso'):
+        logger.debug('[CONFIRMAÇÃO MANUAL] Transação %s confirmada manualmente', transacao_id)
         
-        # Verificar se pertence à equipe do usuário
-        if transacao['equipe_id'] != equipe_id:
-            return jsonify({'sucesso': False, 'erro': 'Acesso negado'}), 403
+        # Agora processar a compra (carro, peça, etc)
+        logger.debug('[CONFIRMAÇÃO MANUAL] Processando compra: tipo=%s, item_id=%s', transacao['tipo_item'], transacao['item_id'])
         
-        # Verificar se está pendente
-        if transacao['status'] != 'pendente':
-            return jsonify({'sucesso': False, 'erro': f'Transação não está pendente (status: {transacao["status"]})'}), 400
+        if transacao['tipo_item'] == 'carro':
+            # Buscar variacao_id da transação se foi salvo, senão usar compatibilidade
+            variacao_id_trans = transacao.get('variacao_id')
+            resultado = api.comprar_carro(equipe_id, transacao['item_id'], variacao_id_trans)
+            if resultado:
+                logger.info('[CONFIRMAÇÃO MANUAL] Carro comprado com sucesso')
+                return jsonify({'sucesso': True, 'mensagem': 'Carro comprado com sucesso'})
+            else:
+                return jsonify({'sucesso': False, 'erro': 'Erro ao comprar carro'}), 400
         
-        # Confirmar a transação (atualiza status)
-        sucesso = api.db.confirmar_transacao_pix(transacao['mercado_pago_id'] or transacao_id)
+        elif transacao['tipo_item'] == 'peca':
+            # Compra de peça da loja - criar no armazém e instalar no carro ativo
+            try:
+                logger.debug('[COMPRA PIX LOJA] ===== INICIANDO COMPRA DE PEÇA =====')
+                logger.debug('[COMPRA PIX LOJA] Transacao ID: %s', transacao_id)
+                logger.debug('[COMPRA PIX LOJA] Equipe: %s', equipe_id)
+                logger.debug('[COMPRA PIX LOJA] Peça ID: %s', transacao['item_id'])
+                logger.debug('[COMPRA PIX LOJA] Carro ID (transacao): %s', transacao.get('carro_id'))
+                
+                # Usar carro_id da transação se foi selecionado, senão usar o carro ativo
+                carro_id_peca = transacao.get('carro_id')
+                if not carro_id_peca:
+                    equipe = api.db.carregar_equipe(equipe_id)
+                    carro_id_peca = equipe.carro.id if equipe and equipe.carro else None
+                
+                logger.debug('[COMPRA PIX LOJA] Carro final: %s', carro_id_peca)
+                
+                if not carro_id_peca:
+                    logger.error('[COMPRA PIX LOJA] ❌ Nenhum carro selecionado')
+                    return jsonify({'sucesso': False, 'erro': 'Nenhum carro selecionado'}), 400
+                
+                # Obter dados da peça da loja
+                peca_loja = api.obter_peca_loja(transacao['item_id'])
+                if not peca_loja:
+                    logger.error('[COMPRA PIX LOJA] ❌ Peça loja %s não encontrada', transacao['item_id'])
+                    return jsonify({'sucesso': False, 'erro': 'Peça não encontrada'}), 404
+                
+                peca_tipo = peca_loja.tipo
+                peca_nome = peca_loja.nome
+                logger.info('[COMPRA PIX LOJA] ✅ Peça encontrada: %s (tipo: %s)', peca_nome, peca_tipo)
+                
+                # 1. REMOVER TODAS as peças antigas do mesmo tipo do carro ativo
+                cursor = api.db.db.cursor()
+                
+                logger.debug("[COMPRA PIX LOJA] 🗑️ Procurando peças antigas do tipo '%s'...", peca_tipo)
+                cursor.execute('''
+                    SELECT id, nome FROM pecas 
+                    WHERE carro_id = %s AND tipo = %s AND instalado = 1 AND equipe_id = %s
+                ''', (str(carro_id_peca), peca_tipo, str(equipe_id)))
+                
+                pecas_antigas = cursor.fetchall()
+                logger.debug('[COMPRA PIX LOJA] Encontradas %s peça(s) antigas', len(pecas_antigas))
+                
+                for peca_id, peca_nome_antiga in pecas_antigas:
+                    logger.debug('[COMPRA PIX LOJA] 🗑️ Removendo: %s (ID: %s)', peca_nome_antiga, peca_id)
+                    cursor.execute('''
+                        UPDATE pecas 
+                        SET carro_id = NULL, instalado = 0, pix_id = NULL
+                        WHERE id = %s
+                    ''', (str(peca_id),))
+                
+                api.db.db.commit()
+                logger.info('[COMPRA PIX LOJA] ✅ %s peça(s) desinstalada(s)', len(pecas_antigas))
+                
+                # 2. CRIAR a peça nova no banco de dados (na tabela pecas como armazém)
+                nova_peca_id = str(__import__('uuid').uuid4())
+                logger.debug('[COMPRA PIX LOJA] 📦 Criando peça no armazém: %s', nova_peca_id)
+                
+                cursor.execute('''
+                    INSERT INTO pecas 
+                    (id, peca_loja_id, nome, tipo, preco, durabilidade_maxima, durabilidade_atual, instalado, carro_id, equipe_id, data_criacao)
+                    VALUES (%s, %s, %s, %s, %s, 100, 100, 0, NULL, %s, NOW())
+                ''', (nova_peca_id, str(transacao['item_id']), peca_nome, peca_tipo, peca_loja.preco, str(equipe_id)))
+                
+                api.db.db.commit()
+                logger.info('[COMPRA PIX LOJA] ✅ Peça criada no armazém: %s', nova_peca_id)
+                
+                # 3. INSTALAR a peça nova usando a função que trata o banco corretamente
+                logger.debug('[COMPRA PIX LOJA] Instalando peça no carro...')
+                resultado = api.db.instalar_peca_warehouse(transacao['item_id'], carro_id_peca, equipe_id)
+                
+                if resultado:
+                    logger.info('[COMPRA PIX LOJA] ✅ Peça instalada com sucesso!')
+                    logger.info('[COMPRA PIX LOJA] ===== COMPRA CONCLUÍDA COM SUCESSO =====')
+                    return jsonify({'sucesso': True, 'mensagem': 'Peça instalada com sucesso'})
+                else:
+                    logger.warning('[COMPRA PIX LOJA] ⚠️ Peça criada mas não foi possível instalar')
+                    logger.warning('[COMPRA PIX LOJA] ===== COMPRA CONCLUÍDA (COM AVISO) =====')
+                    return jsonify({'sucesso': True, 'mensagem': 'Peça adicionada ao armazém (não foi possível instalar no carro)'}), 200
+                    
+            except Exception as e:
+                logger.exception('[COMPRA PIX LOJA] ❌ ERRO ao processar compra: %s', e)
+                logger.error('[COMPRA PIX LOJA] ===== ERRO FATAL =====')
+                return jsonify({'sucesso': False, 'erro': f'Erro ao processar peça: {str(e)}'}), 500
         
-        if sucesso.get('sucesso'):
-            print(f"[CONFIRMAÇÃO MANUAL] Transação {transacao_id} confirmada manualmente")
+        elif transacao['tipo_item'] == 'instalacao_armazem' or transacao['tipo_item'] == 'warehouse':
+            # Instalar peça do armazém no carro
+            logger.debug('[CONFIRMAÇÃO MANUAL] Instalando peça do armazém...')
+            
+            peca_loja_id = transacao['item_id']
+            carro_id_instalacao = transacao.get('carro_id')
+            
+            if not carro_id_instalacao:
+                equipe = api.db.carregar_equipe(equipe_id)
+                carro_id_instalacao = equipe.carro.id if equipe and equipe.carro else None
             
-            # Agora processar a compra (carro, peça, etc)
-            print(f"[CONFIRMAÇÃO MANUAL] Processando compra: tipo={transacao['tipo_item']}, item_id={transacao['item_id']}")
+            logger.debug('[CONFIRMAÇÃO MANUAL] Instalando peça %s no carro %s', peca_loja_id, carro_id_instalacao)
             
-            if transacao['tipo_item'] == 'carro':
-                # Buscar variacao_id da transação se foi salvo, senão usar compatibilidade
-                variacao_id_trans = transacao.get('variacao_id')
-                resultado = api.comprar_carro(equipe_id, transacao['item_id'], variacao_id_trans)
+            # Atualizar a peça para instalado = 1 (muda de armazém para carro)
+            try:
+                resultado = api.db.instalar_peca_warehouse(peca_loja_id, carro_id_instalacao, equipe_id)
                 if resultado:
-                    print(f"[CONFIRMAÇÃO MANUAL] Carro comprado com sucesso")
-                    return jsonify({'sucesso': True, 'mensagem': 'Carro comprado com sucesso'})
+                    logger.info('[CONFIRMAÇÃO MANUAL] Peça instalada com sucesso no carro')
+                    return jsonify({'sucesso': True, 'mensagem': 'Peça instalada com sucesso'})
                 else:
-                    return jsonify({'sucesso': False, 'erro': 'Erro ao comprar carro'}), 400
+                    logger.error('[CONFIRMAÇÃO MANUAL] ERRO ao instalar peça')
+                    return jsonify({'sucesso': False, 'erro': 'Erro ao instalar peça'}), 400
+            except Exception as e:
+                logger.exception('[CONFIRMAÇÃO MANUAL] ERRO ao instalar peça: %s', e)
+                return jsonify({'sucesso': False, 'erro': str(e)}), 400
+        
+        elif transacao['tipo_item'] == 'carro_ativacao':
+            # Ativação de carro já foi criada como solicitação no confirmar_transacao_pix()
+            # Agora apenas retornamos sucesso - a ativação real será feita quando admin aprovar
+            logger.debug('[ATIVAÇÃO CARRO PIX] ===== SOLICITAÇÃO CRIADA =====')
+            logger.debug('[ATIVAÇÃO CARRO PIX] Transacao ID: %s', transacao_id)
+            logger.debug('[ATIVAÇÃO CARRO PIX] Carro ID: %s', transacao['item_id'])
+            logger.info('[ATIVAÇÃO CARRO PIX] ✅ Solicitação criada com sucesso (aguardando aprovação do admin)')
             
-            elif transacao['tipo_item'] == 'peca':
-                # Compra de peça da loja - criar no armazém e instalar no carro ativo
-                try:
-                    print(f"\n[COMPRA PIX LOJA] ===== INICIANDO COMPRA DE PEÇA =====")
-                    print(f"[COMPRA PIX LOJA] Transacao ID: {transacao_id}")
-                    print(f"[COMPRA PIX LOJA] Equipe: {equipe_id}")
-                    print(f"[COMPRA PIX LOJA] Peça ID: {transacao['item_id']}")
-                    print(f"[COMPRA PIX LOJA] Carro ID (transacao): {transacao.get('carro_id')}")
-                    
-                    # Usar carro_id da transação se foi selecionado, senão usar o carro ativo
-                    carro_id_peca = transacao.get('carro_id')
-                    if not carro_id_peca:
-                        equipe = api.db.carregar_equipe(equipe_id)
-                        carro_id_peca = equipe.carro.id if equipe and equipe.carro else None
-                    
-                    print(f"[COMPRA PIX LOJA] Carro final: {carro_id_peca}")
-                    
-                    if not carro_id_peca:
-                        print(f"[COMPRA PIX LOJA] ❌ Nenhum carro selecionado")
-                        return jsonify({'sucesso': False, 'erro': 'Nenhum carro selecionado'}), 400
-                    
-                    # Obter dados da peça da loja
-                    peca_loja = api.obter_peca_loja(transacao['item_id'])
-                    if not peca_loja:
-                        print(f"[COMPRA PIX LOJA] ❌ Peça loja {transacao['item_id']} não encontrada")
-                        return jsonify({'sucesso': False, 'erro': 'Peça não encontrada'}), 404
-                    
-                    peca_tipo = peca_loja.tipo
-                    peca_nome = peca_loja.nome
-                    print(f"[COMPRA PIX LOJA] ✅ Peça encontrada: {peca_nome} (tipo: {peca_tipo})")
-                    
-                    # 1. REMOVER TODAS as peças antigas do mesmo tipo do carro ativo
-                    cursor = api.db.db.cursor()
-                    
-                    print(f"[COMPRA PIX LOJA] 🗑️ Procurando peças antigas do tipo '{peca_tipo}'...")
-                    cursor.execute('''
-                        SELECT id, nome FROM pecas 
-                        WHERE carro_id = %s AND tipo = %s AND instalado = 1 AND equipe_id = %s
-                    ''', (str(carro_id_peca), peca_tipo, str(equipe_id)))
-                    
-                    pecas_antigas = cursor.fetchall()
-                    print(f"[COMPRA PIX LOJA] Encontradas {len(pecas_antigas)} peça(s) antigas")
-                    
-                    for peca_id, peca_nome_antiga in pecas_antigas:
-                        print(f"[COMPRA PIX LOJA] 🗑️ Removendo: {peca_nome_antiga} (ID: {peca_id})")
-                        cursor.execute('''
-                            UPDATE pecas 
-                            SET carro_id = NULL, instalado = 0, pix_id = NULL
-                            WHERE id = %s
-                        ''', (str(peca_id),))
-                    
-                    api.db.db.commit()
-                    print(f"[COMPRA PIX LOJA] ✅ {len(pecas_antigas)} peça(s) desinstalada(s)")
-                    
-                    # 2. CRIAR a peça nova no banco de dados (na tabela pecas como armazém)
-                    nova_peca_id = str(__import__('uuid').uuid4())
-                    print(f"[COMPRA PIX LOJA] 📦 Criando peça no armazém: {nova_peca_id}")
-                    
-                    cursor.execute('''
-                        INSERT INTO pecas 
-                        (id, peca_loja_id, nome, tipo, preco, durabilidade_maxima, durabilidade_atual, instalado, carro_id, equipe_id, data_criacao)
-                        VALUES (%s, %s, %s, %s, %s, 100, 100, 0, NULL, %s, NOW())
-                    ''', (nova_peca_id, str(transacao['item_id']), peca_nome, peca_tipo, peca_loja.preco, str(equipe_id)))
+            return jsonify({
+                'sucesso': True, 
+                'mensagem': 'Solicitação de ativação criada com sucesso! Aguardando aprovação do administrador.',
+                'transacao_id': transacao_id,
+                'carro_id': transacao['item_id']
+            })
+        
+        elif transacao['tipo_item'] == 'regularizacao_saldo':
+            # Regularização de saldo para participação em etapa
+            logger.debug('[REGULARIZAÇÃO ETAPA] ===== REGISTRANDO PARTICIPAÇÃO =====')
+            logger.debug('[REGULARIZAÇÃO ETAPA] Transacao ID: %s', transacao_id)
+            logger.debug('[REGULARIZAÇÃO ETAPA] Equipe: %s', equipe_id)
+            logger.debug('[REGULARIZAÇÃO ETAPA] Etapa ID: %s', transacao['item_id'])
+            
+            try:
+                import json
+                # Extrair dados da participação do dados_json
+                dados_json_str = transacao.get('dados_json', '{}')
+                dados_participacao = json.loads(dados_json_str) if dados_json_str else {}
+                
+                tipo_participacao = dados_participacao.get('tipo_participacao', 'dono_vai_andar')
+                etapa_id = dados_participacao.get('etapa_id') or transacao['item_id']
+                carro_id = dados_participacao.get('carro_id') or transacao.get('carro_id')
+                valor_regularizacao = float(transacao.get('valor_item', 0))
+                
+                logger.debug('[REGULARIZAÇÃO ETAPA] Tipo participação: %s', tipo_participacao)
+                logger.debug('[REGULARIZAÇÃO ETAPA] Carro ID: %s', carro_id)
+                logger.debug('[REGULARIZAÇÃO ETAPA] Valor regularizado: R$ %.2f', valor_regularizacao)
+                
+                if not carro_id:
+                    return jsonify({'sucesso': False, 'erro': 'Carro não especificado'}), 400
+                
+                # 1. Obter saldo atual para determinar quanto é débito vs inscrição
+                conn = api.db._get_conn()
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute('SELECT saldo_pix FROM equipes WHERE id = %s', (equipe_id,))
+                result = cursor.fetchone()
+                saldo_atual = float(result['saldo_pix']) if result else 0.0
+                cursor.close()
+                
+                logger.debug('[REGULARIZAÇÃO ETAPA] Saldo atual: R$ %.2f', saldo_atual)
+                
+                # Calcular quanto é débito (quitação) vs inscrição
+                if saldo_atual < 0:
+                    # Há débito a quitar
+                    valor_quitacao = abs(saldo_atual)  # Quanto deve quitando para chegar a 0
+                    valor_inscricao = valor_regularizacao - valor_quitacao
                     
-                    api.db.db.commit()
-                    print(f"[COMPRA PIX LOJA] ✅ Peça criada no armazém: {nova_peca_id}")
+                    logger.debug('[REGULARIZAÇÃO ETAPA] Débito a quitar: R$ %.2f', valor_quitacao)
+                    logger.debug('[REGULARIZAÇÃO ETAPA] Valor para inscrição: R$ %.2f', valor_inscricao)
                     
-                    # 3. INSTALAR a peça nova usando a função que trata o banco corretamente
-                    print(f"[COMPRA PIX LOJA] Instalando peça no carro...")
-                    resultado = api.db.instalar_peca_warehouse(transacao['item_id'], carro_id_peca, equipe_id)
+                    # 2. Atualizar saldo PIX APENAS para quitar o débito (volta a 0)
+                    resultado_saldo = api.db.atualizar_saldo_pix(equipe_id, valor_quitacao, 'quitacao_debito', etapa_id)
                     
-                    if resultado:
-                        print(f"[COMPRA PIX LOJA] ✅ Peça instalada com sucesso!")
-                        print(f"[COMPRA PIX LOJA] ===== COMPRA CONCLUÍDA COM SUCESSO =====\n")
-                        return jsonify({'sucesso': True, 'mensagem': 'Peça instalada com sucesso'})
+                    if not resultado_saldo['sucesso']:
+                        logger.error('[REGULARIZAÇÃO ETAPA] ⚠️ Erro ao atualizar saldo: %s', resultado_saldo.get('erro'))
                     else:
-                        print(f"[COMPRA PIX LOJA] ⚠️ Peça criada mas não foi possível instalar")
-                        print(f"[COMPRA PIX LOJA] ===== COMPRA CONCLUÍDA (COM AVISO) =====\n")
-                        return jsonify({'sucesso': True, 'mensagem': 'Peça adicionada ao armazém (não foi possível instalar no carro)'}), 200
-                        
-                except Exception as e:
-                    print(f"[COMPRA PIX LOJA] ❌ ERRO ao processar compra: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    print(f"[COMPRA PIX LOJA] ===== ERRO FATAL =====\n")
-                    return jsonify({'sucesso': False, 'erro': f'Erro ao processar peça: {str(e)}'}), 500
-            
-            elif transacao['tipo_item'] == 'instalacao_armazem' or transacao['tipo_item'] == 'warehouse':
-                # Instalar peça do armazém no carro
-                print(f"[CONFIRMAÇÃO MANUAL] Instalando peça do armazém...")
+                        logger.info('[REGULARIZAÇÃO ETAPA] ✅ Débito quitado. Novo saldo: R$ %.2f', resultado_saldo['novo_saldo'])
+                else:
+                    # Sem débito - este é caso incomum (não deveria chegar aqui)
+                    logger.warning('[REGULARIZAÇÃO ETAPA] ⚠️ Saldo positivo (sem débito): R$ %.2f', saldo_atual)
+                    resultado_saldo = {'sucesso': True, 'novo_saldo': saldo_atual}
                 
-                peca_loja_id = transacao['item_id']
-                carro_id_instalacao = transacao.get('carro_id')
+                # 3. Registrar a equipe na etapa (SEM mexer em saldo_pix adicional)
+                conn = api.db._get_conn()
+                cursor = conn.cursor()
                 
-                if not carro_id_instalacao:
-                    equipe = api.db.carregar_equipe(equipe_id)
-                    carro_id_instalacao = equipe.carro.id if equipe and equipe.carro else None
+                participacao_id = str(__import__('uuid').uuid4())
                 
-                print(f"[CONFIRMAÇÃO MANUAL] Instalando peça {peca_loja_id} no carro {carro_id_instalacao}")
+                cursor.execute('''
+                    INSERT INTO participacoes_etapas 
+                    (id, etapa_id, equipe_id, carro_id, status, data_inscricao, data_atualizacao, tipo_participacao)
+                    VALUES (%s, %s, %s, %s, %s, NOW(), NOW(), %s)
+                ''', (
+                    participacao_id,
+                    etapa_id,
+                    equipe_id,
+                    carro_id,
+                    'ativa',
+                    tipo_participacao
+                ))
                 
-                # Atualizar a peça para instalado = 1 (muda de armazém para carro)
-                try:
-                    resultado = api.db.instalar_peca_warehouse(peca_loja_id, carro_id_instalacao, equipe_id)
-                    if resultado:
-                        print(f"[CONFIRMAÇÃO MANUAL] Peça instalada com sucesso no carro")
-                        return jsonify({'sucesso': True, 'mensagem': 'Peça instalada com sucesso'})
-                    else:
-                        print(f"[CONFIRMAÇÃO MANUAL] ERRO ao instalar peça")
-                        return jsonify({'sucesso': False, 'erro': 'Erro ao instalar peça'}), 400
-                except Exception as e:
-                    print(f"[CONFIRMAÇÃO MANUAL] ERRO ao instalar peça: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    return jsonify({'sucesso': False, 'erro': str(e)}), 400
-            
-            elif transacao['tipo_item'] == 'carro_ativacao':
-                # Ativação de carro já foi criada como solicitação no confirmar_transacao_pix()
-                # Agora apenas retornamos sucesso - a ativação real será feita quando admin aprovar
-                print(f"\n[ATIVAÇÃO CARRO PIX] ===== SOLICITAÇÃO CRIADA =====")
-                print(f"[ATIVAÇÃO CARRO PIX] Transacao ID: {transacao_id}")
-                print(f"[ATIVAÇÃO CARRO PIX] Carro ID: {transacao['item_id']}")
-                print(f"[ATIVAÇÃO CARRO PIX] ✅ Solicitação criada com sucesso (aguardando aprovação do admin)")
+                conn.commit()
+                conn.close()
+                
+                logger.info('[REGULARIZAÇÃO ETAPA] ✅ Participação registrada: %s', participacao_id)
+                logger.info('[REGULARIZAÇÃO ETAPA] ✅ Inscrição processada (saldo_pix não é afetado)')
+                logger.debug('[REGULARIZAÇÃO ETAPA] ===== REGISTRO CONCLUÍDO =====')
                 
                 return jsonify({
-                    'sucesso': True, 
-                    'mensagem': 'Solicitação de ativação criada com sucesso! Aguardando aprovação do administrador.',
+                    'sucesso': True,
+                    'mensagem': 'Saldo regularizado e participação registrada com sucesso!',
                     'transacao_id': transacao_id,
-                    'carro_id': transacao['item_id']
+                    'etapa_id': etapa_id,
+                    'participacao_id': participacao_id,
+                    'novo_saldo': resultado_saldo.get('novo_saldo', 0)
                 })
-            
-            elif transacao['tipo_item'] == 'regularizacao_saldo':
-                # Regularização de saldo para participação em etapa
-                print(f"\n[REGULARIZAÇÃO ETAPA] ===== REGISTRANDO PARTICIPAÇÃO =====")
-                print(f"[REGULARIZAÇÃO ETAPA] Transacao ID: {transacao_id}")
-                print(f"[REGULARIZAÇÃO ETAPA] Equipe: {equipe_id}")
-                print(f"[REGULARIZAÇÃO ETAPA] Etapa ID: {transacao['item_id']}")
                 
+            except Exception as e:
+                logger.exception('[REGULARIZAÇÃO ETAPA] ❌ ERRO ao registrar participação: %s', e)
+                return jsonify({'sucesso': False, 'erro': f'Erro ao registrar participação: {str(e)}'}), 500
+        
+        elif transacao['tipo_item'] == 'multiplas_pecas_armazem_ativo_modal':
+            # Criar solicitações de peças (não instalar diretamente)
+            logger.debug('[MULTIPLAS PEÇAS CARRO ATIVO] ===== CRIANDO SOLICITAÇÕES DE PEÇAS =====')
+            logger.debug('[MULTIPLAS PEÇAS CARRO ATIVO] Transacao ID: %s', transacao_id)
+            logger.debug('[MULTIPLAS PEÇAS CARRO ATIVO] Equipe: %s', equipe_id)
+            logger.debug('[MULTIPLAS PEÇAS CARRO ATIVO] Carro: %s', transacao.get('carro_id'))
+            
+            try:
+                import json
+                # Obter lista de peças do dados_json
+                dados_json_str = transacao.get('dados_json', '{}')
                 try:
-                    import json
-                    # Extrair dados da participação do dados_json
-                    dados_json_str = transacao.get('dados_json', '{}')
-                    dados_participacao = json.loads(dados_json_str) if dados_json_str else {}
-                    
-                    tipo_participacao = dados_participacao.get('tipo_participacao', 'dono_vai_andar')
-                    etapa_id = dados_participacao.get('etapa_id') or transacao['item_id']
-                    carro_id = dados_participacao.get('carro_id') or transacao.get('carro_id')
-                    valor_regularizacao = float(transacao.get('valor_item', 0))
-                    
-                    print(f"[REGULARIZAÇÃO ETAPA] Tipo participação: {tipo_participacao}")
-                    print(f"[REGULARIZAÇÃO ETAPA] Carro ID: {carro_id}")
-                    print(f"[REGULARIZAÇÃO ETAPA] Valor regularizado: R$ {valor_regularizacao:.2f}")
-                    
-                    if not carro_id:
-                        return jsonify({'sucesso': False, 'erro': 'Carro não especificado'}), 400
-                    
-                    # 1. Obter saldo atual para determinar quanto é débito vs inscrição
-                    conn = api.db._get_conn()
-                    cursor = conn.cursor(dictionary=True)
-                    cursor.execute('SELECT saldo_pix FROM equipes WHERE id = %s', (equipe_id,))
-                    result = cursor.fetchone()
-                    saldo_atual = float(result['saldo_pix']) if result else 0.0
-                    cursor.close()
-                    
-                    print(f"[REGULARIZAÇÃO ETAPA] Saldo atual: R$ {saldo_atual:.2f}")
-                    
-                    # Calcular quanto é débito (quitação) vs inscrição
-                    if saldo_atual < 0:
-                        # Há débito a quitar
-                        valor_quitacao = abs(saldo_atual)  # Quanto deve quitando para chegar a 0
-                        valor_inscricao = valor_regularizacao - valor_quitacao
-                        
-                        print(f"[REGULARIZAÇÃO ETAPA] Débito a quitar: R$ {valor_quitacao:.2f}")
-                        print(f"[REGULARIZAÇÃO ETAPA] Valor para inscrição: R$ {valor_inscricao:.2f}")
-                        
-                        # 2. Atualizar saldo PIX APENAS para quitar o débito (volta a 0)
-                        resultado_saldo = api.db.atualizar_saldo_pix(equipe_id, valor_quitacao)
-                        
-                        if not resultado_saldo['sucesso']:
-                            print(f"[REGULARIZAÇÃO ETAPA] ⚠️ Erro ao atualizar saldo: {resultado_saldo.get('erro')}")
-                        else:
-                            print(f"[REGULARIZAÇÃO ETAPA] ✅ Débito quitado. Novo saldo: R$ {resultado_saldo['novo_saldo']:.2f}")
-                    else:
-                        # Sem débito - este é caso incomum (não deveria chegar aqui)
-                        print(f"[REGULARIZAÇÃO ETAPA] ⚠️ Saldo positivo (sem débito): R$ {saldo_atual:.2f}")
-                        resultado_saldo = {'sucesso': True, 'novo_saldo': saldo_atual}
-                    
-                    # 3. Registrar a equipe na etapa (SEM mexer em saldo_pix adicional)
-                    conn = api.db._get_conn()
-                    cursor = conn.cursor()
-                    
-                    participacao_id = str(__import__('uuid').uuid4())
-                    
-                    cursor.execute('''
-                        INSERT INTO participacoes_etapas 
-                        (id, etapa_id, equipe_id, carro_id, status, data_inscricao, data_atualizacao, tipo_participacao)
-                        VALUES (%s, %s, %s, %s, %s, NOW(), NOW(), %s)
-                    ''', (
-                        participacao_id,
-                        etapa_id,
-                        equipe_id,
-                        carro_id,
-                        'ativa',
-                        tipo_participacao
-                    ))
-                    
-                    conn.commit()
-                    conn.close()
-                    
-                    print(f"[REGULARIZAÇÃO ETAPA] ✅ Participação registrada: {participacao_id}")
-                    print(f"[REGULARIZAÇÃO ETAPA] ✅ Inscrição processada (saldo_pix não é afetado)")
-                    print(f"[REGULARIZAÇÃO ETAPA] ===== REGISTRO CONCLUÍDO =====\n")
-                    
-                    return jsonify({
-                        'sucesso': True,
-                        'mensagem': 'Saldo regularizado e participação registrada com sucesso!',
-                        'transacao_id': transacao_id,
-                        'etapa_id': etapa_id,
-                        'participacao_id': participacao_id,
-                        'novo_saldo': resultado_saldo.get('novo_saldo', 0)
-                    })
-                    
-                except Exception as e:
-                    print(f"[REGULARIZAÇÃO ETAPA] ❌ ERRO ao registrar participação: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    return jsonify({'sucesso': False, 'erro': f'Erro ao registrar participação: {str(e)}'}), 500
-            
-            elif transacao['tipo_item'] == 'multiplas_pecas_armazem_ativo_modal':
-                # Criar solicitações de peças (não instalar diretamente)
-                print(f"\n[MULTIPLAS PEÇAS CARRO ATIVO] ===== CRIANDO SOLICITAÇÕES DE PEÇAS =====")
-                print(f"[MULTIPLAS PEÇAS CARRO ATIVO] Transacao ID: {transacao_id}")
-                print(f"[MULTIPLAS PEÇAS CARRO ATIVO] Equipe: {equipe_id}")
-                print(f"[MULTIPLAS PEÇAS CARRO ATIVO] Carro: {transacao.get('carro_id')}")
+                    dados_json = json.loads(dados_json_str) if dados_json_str else {}
+                except:
+                    dados_json = {}
                 
-                try:
-                    import json
-                    # Obter lista de peças do dados_json
-                    dados_json_str = transacao.get('dados_json', '{}')
-                    try:
-                        dados_json = json.loads(dados_json_str) if dados_json_str else {}
-                    except:
-                        dados_json = {}
-                    
-                    pecas_armazem_lista = dados_json.get('pecas', [])
-                    print(f"[MULTIPLAS PEÇAS CARRO ATIVO] Peças recuperadas: {len(pecas_armazem_lista)}")
-                    
-                    if not pecas_armazem_lista:
-                        print(f"[MULTIPLAS PEÇAS CARRO ATIVO] ⚠️ Nenhuma peça na lista")
-                        return jsonify({'sucesso': True, 'mensagem': 'Nenhuma peça a processar'})
-                    
-                    carro_id = transacao.get('carro_id')
-                    pecas_loja = api.db.carregar_pecas_loja()
-                    pecas_armazem = api.db.carregar_pecas_armazem_equipe(str(equipe_id))
+                pecas_armazem_lista = dados_json.get('pecas', [])
+                logger.debug('[MULTIPLAS PEÇAS CARRO ATIVO] Peças recuperadas: %s', len(pecas_armazem_lista))
+                
+                if not pecas_armazem_lista:
+                    logger.warning('[MULTIPLAS PEÇAS CARRO ATIVO] ⚠️ Nenhuma peça na lista')
+                    return jsonify({'sucesso': True, 'mensagem': 'Nenhuma peça a processar'})
+                
+                carro_id = transacao.get('carro_id')
+                pecas_loja = api.db.carregar_pecas_loja()
+                pecas_armazem = api.db.carregar_pecas_armazem_equipe(str(equipe_id))
+                
+                solicitacoes_criadas = 0
+                
+                # Para cada peça, criar uma solicitação com status 'pendente'
+                for peca_armazem_info in pecas_armazem_lista:
+                    peca_nome = peca_armazem_info.get('nome')
+                    peca_tipo = peca_armazem_info.get('tipo')
                     
-                    solicitacoes_criadas = 0
+                    logger.debug('[MULTIPLAS PEÇAS CARRO ATIVO] Processando: %s (%s)', peca_nome, peca_tipo)
                     
-                    # Para cada peça, criar uma solicitação com status 'pendente'
-                    for peca_armazem_info in pecas_armazem_lista:
-                        peca_nome = peca_armazem_info.get('nome')
-                        peca_tipo = peca_armazem_info.get('tipo')
-                        
-                        print(f"[MULTIPLAS PEÇAS CARRO ATIVO] Processando: {peca_nome} ({peca_tipo})")
-                        
-                        # Buscar peça na loja
-                        peca_loja = None
-                        for p in pecas_loja:
-                            if p.nome.lower() == peca_nome.lower() and p.tipo.lower() == peca_tipo.lower():
-                                peca_loja = p
-                                break
-                        
-                        if not peca_loja:
-                            print(f"[MULTIPLAS PEÇAS CARRO ATIVO] ⚠️ Peça {peca_nome} não encontrada na loja")
-                            continue
-                        
-                        # Criar solicitação com status 'pendente'
-                        solicitacao_id = str(uuid.uuid4())
-                        api.db.salvar_solicitacao_peca(
-                            id=solicitacao_id,
-                            equipe_id=equipe_id,
-                            peca_id=peca_loja.id,
-                            quantidade=1,
-                            status='pendente',
-                            carro_id=carro_id
-                        )
-                        solicitacoes_criadas += 1
-                        print(f"[MULTIPLAS PEÇAS CARRO ATIVO] ✅ Solicitação criada: {solicitacao_id} para {peca_nome}")
+                    # Buscar peça na loja
+                    peca_loja = None
+                    for p in pecas_loja:
+                        if p.nome.lower() == peca_nome.lower() and p.tipo.lower() == peca_tipo.lower():
+                            peca_loja = p
+                            break
                     
-                    print(f"[MULTIPLAS PEÇAS CARRO ATIVO] ✅ {solicitacoes_criadas} solicitação(ões) criada(s)")
-                    print(f"[MULTIPLAS PEÇAS CARRO ATIVO] ===== PROCESSAMENTO CONCLUÍDO =====\n")
-                    return jsonify({'sucesso': True, 'mensagem': f'{solicitacoes_criadas} solicitação(ões) criada(s)', 'solicitacoes': solicitacoes_criadas})
+                    if not peca_loja:
+                        logger.warning('[MULTIPLAS PEÇAS CARRO ATIVO] ⚠️ Peça %s não encontrada na loja', peca_nome)
+                        continue
                     
-                except Exception as e:
-                    print(f"[MULTIPLAS PEÇAS CARRO ATIVO] ❌ ERRO: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    print(f"[MULTIPLAS PEÇAS CARRO ATIVO] ===== ERRO FATAL =====\n")
-                    return jsonify({'sucesso': False, 'erro': f'Erro ao criar solicitações: {str(e)}'}), 500
-            
-            else:
-                return jsonify({'sucesso': True, 'mensagem': 'Pagamento confirmado'})
+                    # Criar solicitação com status 'pendente'
+                    solicitacao_id = str(uuid.uuid4())
+                    api.db.salvar_solicitacao_peca(
+                        id=solicitacao_id,
+                        equipe_id=equipe_id,
+                        peca_id=peca_loja.id,
+                        quantidade=1,
+                        status='pendente',
+                        carro_id=carro_id
+                    )
+                    solicitacoes_criadas += 1
+                    logger.info('[MULTIPLAS PEÇAS CARRO ATIVO] ✅ Solicitação criada: %s para %s', solicitacao_id, peca_nome)
+                
+                logger.info('[MULTIPLAS PEÇAS CARRO ATIVO] ✅ %s solicitação(ões) criada(s)', solicitacoes_criadas)
+                logger.debug('[MULTIPLAS PEÇAS CARRO ATIVO] ===== PROCESSAMENTO CONCLUÍDO =====')
+                return jsonify({'sucesso': True, 'mensagem': f'{solicitacoes_criadas} solicitação(ões) criada(s)', 'solicitacoes': solicitacoes_criadas})
+                
+            except Exception as e:
+                logger.exception('[MULTIPLAS PEÇAS CARRO ATIVO] ❌ ERRO: %s', e)
+                logger.error('[MULTIPLAS PEÇAS CARRO ATIVO] ===== ERRO FATAL =====')
+                return jsonify({'sucesso': False, 'erro': f'Erro ao criar solicitações: {str(e)}'}), 500
+        
         else:
-            return jsonify({'sucesso': False, 'erro': 'Erro ao confirmar transação'}), 500
+            return jsonify({'sucesso': True, 'mensagem': 'Pagamento confirmado'})
+    elif sucesso.get('ja_confirmada'):
+        # Outra confirmação (webhook/varredura) chegou antes: não processar a compra de novo
+        return jsonify({'sucesso': False, 'erro': 'Transação já confirmada'}), 409
+    else:
+        return jsonify({'sucesso': False, 'erro': 'Erro ao confirmar transação'}), 500
+
+@app.route('/api/confirmar-pagamento-manual', methods=['POST'])
+@requer_login_api
+def confirmar_pagamento_manual():
+    """Confirma manualmente um pagamento (para testes sem webhook)"""
+    try:
+        equipe_id = obter_equipe_id_request()
+        if not equipe_id:
+            return jsonify({'sucesso': False, 'erro': 'Não autenticado'}), 401
+        
+        dados = request.json
+        transacao_id = dados.get('transacao_id')
+        
+        if not transacao_id:
+            return jsonify({'sucesso': False, 'erro': 'transacao_id é obrigatório'}), 400
+        
+        # Obter a transação
+        transacao = api.db.obter_transacao_pix(transacao_id)
+        
+        if not transacao:
+            return jsonify({'sucesso': False, 'erro': 'Transação não encontrada'}), 404
+        
+        # Verificar se pertence à equipe do usuário
+        if transacao['equipe_id'] != equipe_id:
+            return jsonify({'sucesso': False, 'erro': 'Acesso negado'}), 403
+        
+        # Verificar se está pendente
+        if transacao['status'] != 'pendente':
+            return jsonify({'sucesso': False, 'erro': f'Transação não está pendente (status: {transacao["status"]})'}), 400
+        
+        # Confirmação e processamento da compra são atômicos: qualquer falha desfaz tudo
+        with api.db.transacao() as tx:
+            resposta = app.make_response(_processar_pagamento_confirmado(equipe_id, transacao_id, transacao))
+            if resposta.status_code >= 400:
+                tx.abortar()
+        return resposta
     
     except Exception as e:
-        print(f"[ERRO] Erro ao confirmar pagamento manualmente: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao confirmar pagamento manualmente: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/cancelar-transacao-pix', methods=['POST'])
@@ -6487,22 +6549,20 @@ def cancelar_transacao_pix():
         transacao = api.db.obter_transacao_pix(transacao_id)
         
         if not transacao:
-            print(f"[CANCELAR] Transação {transacao_id} não encontrada (pode ter sido deletada)")
+            logger.debug('[CANCELAR] Transação %s não encontrada (pode ter sido deletada)', transacao_id)
             return jsonify({'sucesso': True, 'mensagem': 'Transação já não existe'})
         
         # Se ainda está pendente, deletar do banco
         if transacao['status'] == 'pendente':
             api.db.deletar_transacao_pix(transacao_id)
-            print(f"[CANCELAR] Transação {transacao_id} cancelada e deletada do banco")
+            logger.debug('[CANCELAR] Transação %s cancelada e deletada do banco', transacao_id)
             return jsonify({'sucesso': True, 'mensagem': 'Transação cancelada com sucesso'})
         else:
-            print(f"[CANCELAR] Transação {transacao_id} não estava pendente (status: {transacao['status']}), ignorando")
+            logger.debug('[CANCELAR] Transação %s não estava pendente (status: %s), ignorando', transacao_id, transacao['status'])
             return jsonify({'sucesso': False, 'mensagem': f'Transação não está pendente (status: {transacao["status"]})'}), 400
     
     except Exception as e:
-        print(f"[ERRO] Erro ao cancelar transação PIX: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao cancelar transação PIX: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/processar-compra-pix', methods=['POST'])
@@ -6528,30 +6588,30 @@ def processar_compra_pix():
         if not equipe:
             return jsonify({'sucesso': False, 'erro': 'Equipe não encontrada'}), 404
         
-        print(f"[COMPRA PIX] Processando: tipo={tipo}, item_id={item_id}, variacao_id={variacao_id}, carro_id={carro_id}, equipe={equipe.nome}")
+        logger.debug('[COMPRA PIX] Processando: tipo=%s, item_id=%s, variacao_id=%s, carro_id=%s, equipe=%s', tipo, item_id, variacao_id, carro_id, equipe.nome)
         
         if tipo == 'carro':
             # Compra de carro - usar variacao_id se disponível
-            print(f"[COMPRA PIX] Comprando carro...")
+            logger.debug('[COMPRA PIX] Comprando carro...')
             resultado = api.comprar_carro(equipe_id, item_id, variacao_id)
             if not resultado:
-                print(f"[COMPRA PIX] ❌ FALHA ao comprar carro!")
+                logger.error('[COMPRA PIX] ❌ FALHA ao comprar carro!')
                 return jsonify({'sucesso': False, 'erro': 'Falha ao comprar carro'}), 400
-            print(f"[COMPRA PIX] ✅ Carro adicionado à equipe {equipe.nome}")
+            logger.info('[COMPRA PIX] ✅ Carro adicionado à equipe %s', equipe.nome)
             
         elif tipo == 'peca':
             # Compra de peça com instalação direta no carro
-            print(f"[COMPRA PIX] Comprando peça para carro...")
-            print(f"  - Equipe: {equipe_id}")
-            print(f"  - Peça: {item_id}")
-            print(f"  - Carro: {carro_id}")
+            logger.debug('[COMPRA PIX] Comprando peça para carro...')
+            logger.debug('- Equipe: %s', equipe_id)
+            logger.debug('- Peça: %s', item_id)
+            logger.debug('- Carro: %s', carro_id)
             
             # Se carro_id não foi selecionado, usar o carro ativo da equipe
             if not carro_id:
                 equipe_obj = api.db.carregar_equipe(equipe_id)
                 if equipe_obj and equipe_obj.carro:
                     carro_id = equipe_obj.carro.id
-                    print(f"[COMPRA PIX] Carro não selecionado, usando carro ativo: {carro_id}")
+                    logger.debug('[COMPRA PIX] Carro não selecionado, usando carro ativo: %s', carro_id)
                 else:
                     return jsonify({'sucesso': False, 'erro': 'Nenhum carro ativo selecionado'}), 400
             
@@ -6589,10 +6649,10 @@ def processar_compra_pix():
                 )
                 
                 if not resultado_instalar:
-                    print(f"[COMPRA PIX] ❌ FALHA ao instalar peça no carro!")
+                    logger.error('[COMPRA PIX] ❌ FALHA ao instalar peça no carro!')
                     return jsonify({'sucesso': False, 'erro': 'Falha ao instalar peça no carro'}), 500
                 
-                print(f"[COMPRA PIX] ✅ Peça instalada no carro com sucesso!")
+                logger.info('[COMPRA PIX] ✅ Peça instalada no carro com sucesso!')
                 
                 # Registrar na tabela de compras (HISTÓRICO)
                 try:
@@ -6610,26 +6670,24 @@ def processar_compra_pix():
                     conn.commit()
                     conn.close()
                     
-                    print(f"[COMPRA PIX] ✅ Compra registrada na tabela de histórico com ID: {compra_id}")
+                    logger.info('[COMPRA PIX] ✅ Compra registrada na tabela de histórico com ID: %s', compra_id)
                 except Exception as e:
-                    print(f"[COMPRA PIX] ⚠️ Aviso ao registrar compra no histórico: {e}")
+                    logger.warning('[COMPRA PIX] ⚠️ Aviso ao registrar compra no histórico: %s', e)
                 
             except Exception as e:
-                print(f"[COMPRA PIX] ❌ ERRO ao processar compra de peça: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception('[COMPRA PIX] ❌ ERRO ao processar compra de peça: %s', e)
                 return jsonify({'sucesso': False, 'erro': f'Erro ao processar compra: {str(e)}'}), 500
             
-            print(f"[COMPRA PIX] ✅ Peça {peca_encontrada['nome']} instalada no carro para equipe {equipe.nome}")
+            logger.info('[COMPRA PIX] ✅ Peça %s instalada no carro para equipe %s', peca_encontrada['nome'], equipe.nome)
             
         elif tipo == 'warehouse':
             # Instalação warehouse (peça guardada no warehouse)
             solicitacao_id = str(uuid.uuid4())
-            print(f"[COMPRA PIX] Criando solicitação de warehouse...")
-            print(f"  - ID: {solicitacao_id}")
-            print(f"  - Equipe: {equipe_id}")
-            print(f"  - Peça: {item_id}")
-            print(f"  - Status: guardada")
+            logger.debug('[COMPRA PIX] Criando solicitação de warehouse...')
+            logger.debug('- ID: %s', solicitacao_id)
+            logger.debug('- Equipe: %s', equipe_id)
+            logger.debug('- Peça: %s', item_id)
+            logger.debug('- Status: guardada')
             
             try:
                 resultado_salvar = api.db.salvar_solicitacao_peca(
@@ -6642,24 +6700,22 @@ def processar_compra_pix():
                 )
                 
                 if not resultado_salvar:
-                    print(f"[COMPRA PIX] ❌ FALHA: salvar_solicitacao_peca retornou False!")
+                    logger.error('[COMPRA PIX] ❌ FALHA: salvar_solicitacao_peca retornou False!')
                     return jsonify({'sucesso': False, 'erro': 'Falha ao criar solicitação de warehouse'}), 500
                 
-                print(f"[COMPRA PIX] ✅ Solicitação de warehouse criada com sucesso!")
+                logger.info('[COMPRA PIX] ✅ Solicitação de warehouse criada com sucesso!')
             except Exception as e:
-                print(f"[COMPRA PIX] ❌ ERRO ao criar solicitação warehouse: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception('[COMPRA PIX] ❌ ERRO ao criar solicitação warehouse: %s', e)
                 return jsonify({'sucesso': False, 'erro': f'Erro ao criar solicitação: {str(e)}'}), 500
             
-            print(f"[COMPRA PIX] Warehouse instalação {item_id} para equipe {equipe.nome}")
+            logger.debug('[COMPRA PIX] Warehouse instalação %s para equipe %s', item_id, equipe.nome)
         
         elif tipo == 'instalacao_armazem':
             # Instalação de peça do armazém no carro
-            print(f"[COMPRA PIX] Criando solicitação de instalação de peça do armazém...")
-            print(f"  - Equipe: {equipe_id}")
-            print(f"  - Peça: {item_id}")
-            print(f"  - Carro: {carro_id}")
+            logger.debug('[COMPRA PIX] Criando solicitação de instalação de peça do armazém...')
+            logger.debug('- Equipe: %s', equipe_id)
+            logger.debug('- Peça: %s', item_id)
+            logger.debug('- Carro: %s', carro_id)
             
             try:
                 # Criar solicitação de instalação (como em compra normal)
@@ -6673,20 +6729,18 @@ def processar_compra_pix():
                     carro_id=carro_id
                 )
                 
-                print(f"[COMPRA PIX] ✅ Solicitação de instalação {solicitacao_id} criada com sucesso!")
+                logger.info('[COMPRA PIX] ✅ Solicitação de instalação %s criada com sucesso!', solicitacao_id)
                 
             except Exception as e:
-                print(f"[COMPRA PIX] ❌ ERRO ao criar solicitação: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception('[COMPRA PIX] ❌ ERRO ao criar solicitação: %s', e)
                 return jsonify({'sucesso': False, 'erro': f'Erro ao criar solicitação: {str(e)}'}), 500
         
         elif tipo == 'multiplas_pecas_armazem':
             # Instalação de múltiplas peças do armazém no carro
-            print(f"[COMPRA PIX] Criando solicitações de instalação de múltiplas peças do armazém...")
-            print(f"  - Equipe: {equipe_id}")
-            print(f"  - Carro: {carro_id}")
-            print(f"  - Transação: {transacao_id}")
+            logger.debug('[COMPRA PIX] Criando solicitações de instalação de múltiplas peças do armazém...')
+            logger.debug('- Equipe: %s', equipe_id)
+            logger.debug('- Carro: %s', carro_id)
+            logger.debug('- Transação: %s', transacao_id)
             
             try:
                 # Buscar transação para ver quais peças foram incluídas
@@ -6713,7 +6767,7 @@ def processar_compra_pix():
                 for peca_armazem in pecas_armazem:
                     # Se já tem pix_id, pular
                     if peca_armazem.get('pix_id'):
-                        print(f"[COMPRA PIX] Peça {peca_armazem['nome']} já foi paga (pix_id: {peca_armazem.get('pix_id')}), ignorando")
+                        logger.debug('[COMPRA PIX] Peça %s já foi paga (pix_id: %s), ignorando', peca_armazem['nome'], peca_armazem.get('pix_id'))
                         continue
                     
                     # Buscar peça na loja para ter o ID
@@ -6724,7 +6778,7 @@ def processar_compra_pix():
                             break
                     
                     if not peca_loja:
-                        print(f"[COMPRA PIX] Peça {peca_armazem['nome']} não encontrada na loja, ignorando")
+                        logger.debug('[COMPRA PIX] Peça %s não encontrada na loja, ignorando', peca_armazem['nome'])
                         continue
                     
                     # Criar solicitação de instalação para cada quantidade
@@ -6739,24 +6793,22 @@ def processar_compra_pix():
                             carro_id=carro_id
                         )
                         pecas_processadas += 1
-                        print(f"[COMPRA PIX] ✅ Solicitação {solicitacao_id} criada para {peca_armazem['nome']}")
+                        logger.info('[COMPRA PIX] ✅ Solicitação %s criada para %s', solicitacao_id, peca_armazem['nome'])
                 
                 if pecas_processadas == 0:
-                    print(f"[COMPRA PIX] ⚠️ Nenhuma peça foi processada (todas já pagas)")
+                    logger.warning('[COMPRA PIX] ⚠️ Nenhuma peça foi processada (todas já pagas)')
                 else:
-                    print(f"[COMPRA PIX] ✅ {pecas_processadas} solicitações criadas com sucesso!")
+                    logger.info('[COMPRA PIX] ✅ %s solicitações criadas com sucesso!', pecas_processadas)
                 
             except Exception as e:
-                print(f"[COMPRA PIX] ❌ ERRO ao criar solicitações: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception('[COMPRA PIX] ❌ ERRO ao criar solicitações: %s', e)
                 return jsonify({'sucesso': False, 'erro': f'Erro ao criar solicitações: {str(e)}'}), 500
         
         elif tipo == 'multiplas_pecas_armazem_ativo':
             # Instalação de múltiplas peças do armazém no CARRO ATIVO com PIX condicional
-            print(f"[COMPRA PIX] Criando solicitações para carro ativo...")
-            print(f"  - Equipe: {equipe_id}")
-            print(f"  - Carro: {carro_id}")
+            logger.debug('[COMPRA PIX] Criando solicitações para carro ativo...')
+            logger.debug('- Equipe: %s', equipe_id)
+            logger.debug('- Carro: %s', carro_id)
             
             try:
                 # Carregar peças do armazém
@@ -6789,26 +6841,24 @@ def processar_compra_pix():
                             carro_id=carro_id
                         )
                         solicitacoes_criadas += 1
-                        print(f"[COMPRA PIX] ✅ Solicitação criada para {peca_armazem['nome']}")
+                        logger.info('[COMPRA PIX] ✅ Solicitação criada para %s', peca_armazem['nome'])
                 
-                print(f"[COMPRA PIX] {solicitacoes_criadas} solicitações criadas para carro ativo")
+                logger.debug('[COMPRA PIX] %s solicitações criadas para carro ativo', solicitacoes_criadas)
                 
             except Exception as e:
-                print(f"[COMPRA PIX] ❌ ERRO ao criar solicitações ativo: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception('[COMPRA PIX] ❌ ERRO ao criar solicitações ativo: %s', e)
                 return jsonify({'sucesso': False, 'erro': f'Erro ao criar solicitações: {str(e)}'}), 500
         
         elif tipo == 'multiplas_pecas_armazem_ativo_modal':
             # PIX confirmado: instalar peças novas e remover antigas
-            print(f"[PIX CONFIRMADO MODAL] Processando peças para carro ativo (modal)...")
-            print(f"  - Equipe: {equipe_id}")
-            print(f"  - Carro: {carro_id}")
+            logger.debug('[PIX CONFIRMADO MODAL] Processando peças para carro ativo (modal)...')
+            logger.debug('- Equipe: %s', equipe_id)
+            logger.debug('- Carro: %s', carro_id)
             
             try:
                 # Obter lista de peças específicas do request
                 pecas_solicitadas = request.json.get('pecas', [])
-                print(f"[PIX CONFIRMADO MODAL] Peças a instalar: {[p.get('nome') for p in pecas_solicitadas]}")
+                logger.debug('[PIX CONFIRMADO MODAL] Peças a instalar: %s', [p.get('nome') for p in pecas_solicitadas])
                 
                 # Carregar peças do armazém
                 pecas_armazem = api.db.carregar_pecas_armazem_equipe(str(equipe_id))
@@ -6816,7 +6866,7 @@ def processar_compra_pix():
                 # Obter carro ativo
                 carro_ativo = api.db.obter_carro(carro_id)
                 if not carro_ativo:
-                    print(f"[PIX CONFIRMADO MODAL] ❌ Carro {carro_id} não encontrado")
+                    logger.error('[PIX CONFIRMADO MODAL] ❌ Carro %s não encontrado', carro_id)
                     return jsonify({'sucesso': False, 'erro': 'Carro não encontrado'}), 404
                 
                 pecas_instaladas = 0
@@ -6826,7 +6876,7 @@ def processar_compra_pix():
                     peca_nome = peca_req.get('nome')
                     peca_tipo = peca_req.get('tipo')
                     
-                    print(f"[PIX CONFIRMADO MODAL] Processando: {peca_nome} ({peca_tipo})")
+                    logger.debug('[PIX CONFIRMADO MODAL] Processando: %s (%s)', peca_nome, peca_tipo)
                     
                     # Buscar peça no armazém
                     peca_armazem = None
@@ -6836,7 +6886,7 @@ def processar_compra_pix():
                             break
                     
                     if not peca_armazem:
-                        print(f"[PIX CONFIRMADO MODAL] ⚠️ Peça {peca_nome} não encontrada no armazém")
+                        logger.warning('[PIX CONFIRMADO MODAL] ⚠️ Peça %s não encontrada no armazém', peca_nome)
                         continue
                     
                     # IMPORTANTE: Remover TODAS as peças antigas do mesmo tipo ANTES de instalar a nova
@@ -6849,11 +6899,11 @@ def processar_compra_pix():
                     ''', (str(carro_id), peca_tipo))
                     
                     pecas_antigas = cursor.fetchall()
-                    print(f"[PIX CONFIRMADO MODAL] Encontradas {len(pecas_antigas)} peça(s) antiga(s) do tipo {peca_tipo}")
+                    logger.debug('[PIX CONFIRMADO MODAL] Encontradas %s peça(s) antiga(s) do tipo %s', len(pecas_antigas), peca_tipo)
                     
                     # Remover TODAS as peças antigas
                     for peca_antigua_id, peca_antigua_nome in pecas_antigas:
-                        print(f"[PIX CONFIRMADO MODAL] 🗑️ Removendo: {peca_antigua_nome} (ID: {peca_antigua_id})")
+                        logger.debug('[PIX CONFIRMADO MODAL] 🗑️ Removendo: %s (ID: %s)', peca_antigua_nome, peca_antigua_id)
                         cursor.execute('''
                             UPDATE pecas 
                             SET carro_id = NULL, instalado = 0, pix_id = NULL
@@ -6861,7 +6911,7 @@ def processar_compra_pix():
                         ''', (str(peca_antigua_id),))
                     
                     api.db.db.commit()
-                    print(f"[PIX CONFIRMADO MODAL] ✅ {len(pecas_antigas)} peça(s) desinstalada(s)")
+                    logger.info('[PIX CONFIRMADO MODAL] ✅ %s peça(s) desinstalada(s)', len(pecas_antigas))
                     
                     # Agora instalar a peça nova
                     cursor.execute('''
@@ -6872,7 +6922,7 @@ def processar_compra_pix():
                     
                     api.db.db.commit()
                     pecas_instaladas += 1
-                    print(f"[PIX CONFIRMADO MODAL] ✅ Peça instalada: {peca_nome}")
+                    logger.info('[PIX CONFIRMADO MODAL] ✅ Peça instalada: %s', peca_nome)
                     
                     # Criar solicitação de peça para rastreamento
                     solicitacao_id = str(uuid.uuid4())
@@ -6884,28 +6934,26 @@ def processar_compra_pix():
                         status='instalada',
                         carro_id=carro_id
                     )
-                    print(f"[PIX CONFIRMADO MODAL] 📋 Solicitação de peça criada: {solicitacao_id}")
+                    logger.debug('[PIX CONFIRMADO MODAL] 📋 Solicitação de peça criada: %s', solicitacao_id)
                 
-                print(f"[PIX CONFIRMADO MODAL] ✅ {pecas_instaladas} peça(s) instalada(s)")
+                logger.info('[PIX CONFIRMADO MODAL] ✅ %s peça(s) instalada(s)', pecas_instaladas)
                 return jsonify({'sucesso': True, 'mensagem': f'{pecas_instaladas} peça(s) instalada(s)', 'pecas_instaladas': pecas_instaladas})
                 
             except Exception as e:
-                print(f"[PIX CONFIRMADO MODAL] ❌ ERRO: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception('[PIX CONFIRMADO MODAL] ❌ ERRO: %s', e)
                 return jsonify({'sucesso': False, 'erro': f'Erro ao processar peças: {str(e)}'}), 500
         
         elif tipo == 'carro_ativacao':
             # Ativação de carro (sem compra, apenas ativação)
-            print(f"[COMPRA PIX] Ativando carro...")
-            print(f"  - Equipe: {equipe_id}")
-            print(f"  - Carro: {item_id}")
+            logger.debug('[COMPRA PIX] Ativando carro...')
+            logger.debug('- Equipe: %s', equipe_id)
+            logger.debug('- Carro: %s', item_id)
             
             try:
                 # Obter o carro a ativar
                 carro_encontrado = api.db.carregar_carro(item_id)
                 if not carro_encontrado:
-                    print(f"[COMPRA PIX] ❌ Carro {item_id} não encontrado")
+                    logger.error('[COMPRA PIX] ❌ Carro %s não encontrado', item_id)
                     return jsonify({'sucesso': False, 'erro': 'Carro não encontrado'}), 404
                 
                 # Atualizar carro como ativo no banco
@@ -6931,14 +6979,12 @@ def processar_compra_pix():
                     data_solicitacao=datetime.now()
                 )
                 
-                print(f"[COMPRA PIX] ✅ Carro {carro_encontrado.marca} {carro_encontrado.modelo} ativado")
-                print(f"[COMPRA PIX] ✅ Solicitação {solicitacao_id} criada com status 'pendente'")
+                logger.info('[COMPRA PIX] ✅ Carro %s %s ativado', carro_encontrado.marca, carro_encontrado.modelo)
+                logger.info("[COMPRA PIX] ✅ Solicitação %s criada com status 'pendente'", solicitacao_id)
                 return jsonify({'sucesso': True, 'mensagem': f'Carro {carro_encontrado.marca} {carro_encontrado.modelo} ativado com sucesso'})
                 
             except Exception as e:
-                print(f"[COMPRA PIX] ❌ ERRO ao ativar carro: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception('[COMPRA PIX] ❌ ERRO ao ativar carro: %s', e)
                 return jsonify({'sucesso': False, 'erro': f'Erro ao ativar carro: {str(e)}'}), 500
         
         else:
@@ -6947,9 +6993,7 @@ def processar_compra_pix():
         return jsonify({'sucesso': True, 'mensagem': 'Compra processada com sucesso'})
     
     except Exception as e:
-        print(f"[ERRO] Erro ao processar compra PIX: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao processar compra PIX: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/comprar-peca-armazem', methods=['POST'])
@@ -6995,20 +7039,19 @@ def comprar_peca_armazem():
         if equipe.doricoins < preco:
             return jsonify({'sucesso': False, 'erro': 'Saldo insuficiente'}), 400
         
-        print(f"[ARMAZÉM] Comprando peça para armazém...")
-        print(f"  - Equipe: {equipe.nome} (ID: {equipe_id})")
-        print(f"  - Peça: {peca_encontrada['nome']} (ID: {peca_id}, Preço: R${preco:.2f})")
-        print(f"  - Saldo atual: R${equipe.doricoins:.2f}")
+        logger.debug('[ARMAZÉM] Comprando peça para armazém...')
+        logger.debug('- Equipe: %s (ID: %s)', equipe.nome, equipe_id)
+        logger.debug('- Peça: %s (ID: %s, Preço: R$%.2f)', peca_encontrada['nome'], peca_id, preco)
+        logger.debug('- Saldo atual: R$%.2f', equipe.doricoins)
         
         try:
-            # 1. DESCONTAR O VALOR DO SALDO
-            novo_saldo = equipe.doricoins - preco
+            # 1. DESCONTAR O VALOR DO SALDO (débito condicional no banco)
+            novo_saldo = api.db.movimentar_saldo(equipe_id, -preco, 'compra_peca_armazem', peca_id)
+            if novo_saldo is None:
+                return jsonify({'sucesso': False, 'erro': 'Saldo insuficiente'}), 400
             equipe.doricoins = novo_saldo
-            
-            # Salvar no banco (via salvar_equipe)
-            api.db.salvar_equipe(equipe)
-            print(f"[ARMAZÉM] ✅ Saldo descontado: R${preco:.2f}")
-            print(f"[ARMAZÉM] Novo saldo: R${novo_saldo:.2f}")
+            logger.info('[ARMAZÉM] ✅ Saldo descontado: R$%.2f', preco)
+            logger.debug('[ARMAZÉM] Novo saldo: R$%.2f', novo_saldo)
             
             # 2. ADICIONAR A PEÇA AO ARMAZÉM (sem carro, instalado=0)
             # Usar a função existente que insere peça com instalado=0
@@ -7023,10 +7066,10 @@ def comprar_peca_armazem():
             )
             
             if not resultado_salvar:
-                print(f"[ARMAZÉM] ❌ FALHA: adicionar_peca_armazem retornou False!")
+                logger.error('[ARMAZÉM] ❌ FALHA: adicionar_peca_armazem retornou False!')
                 return jsonify({'sucesso': False, 'erro': 'Falha ao adicionar peça ao armazém'}), 500
             
-            print(f"[ARMAZÉM] ✅ Peça adicionada ao armazém com sucesso!")
+            logger.info('[ARMAZÉM] ✅ Peça adicionada ao armazém com sucesso!')
             
             # 3. REGISTRAR NA TABELA DE COMPRAS (HISTÓRICO)
             try:
@@ -7045,9 +7088,9 @@ def comprar_peca_armazem():
                 conn.commit()
                 conn.close()
                 
-                print(f"[ARMAZÉM] ✅ Compra registrada na tabela de histórico com ID: {compra_id}")
+                logger.info('[ARMAZÉM] ✅ Compra registrada na tabela de histórico com ID: %s', compra_id)
             except Exception as e:
-                print(f"[ARMAZÉM] ⚠️ Aviso ao registrar compra no histórico: {e}")
+                logger.warning('[ARMAZÉM] ⚠️ Aviso ao registrar compra no histórico: %s', e)
                 # Não retorna erro, pois a compra foi concluída mesmo assim
             
             return jsonify({
@@ -7059,15 +7102,11 @@ def comprar_peca_armazem():
             })
             
         except Exception as e:
-            print(f"[ARMAZÉM] ❌ ERRO: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception('[ARMAZÉM] ❌ ERRO: %s', e)
             return jsonify({'sucesso': False, 'erro': f'Erro ao adicionar peça: {str(e)}'}), 500
         
     except Exception as e:
-        print(f"[ERRO] Erro ao comprar peça para armazém: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao comprar peça para armazém: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 @app.route('/api/test/ativar-carro-direto', methods=['POST'])
@@ -7251,7 +7290,7 @@ def get_configuracoes():
             'configuracoes': configs
         })
     except Exception as e:
-        print(f"[ERRO] Erro ao carregar configurações: {e}")
+        logger.error('[ERRO] Erro ao carregar configurações: %s', e)
         return jsonify({'erro': str(e)}), 400
 
 @app.route('/api/admin/configuracoes', methods=['PUT'])
@@ -7273,20 +7312,24 @@ def atualizar_configuracoes():
         else:
             return jsonify({'erro': 'Erro ao atualizar configuração'}), 500
     except Exception as e:
-        print(f"[ERRO] Erro ao atualizar configurações: {e}")
+        logger.error('[ERRO] Erro ao atualizar configurações: %s', e)
         return jsonify({'erro': str(e)}), 400
 
 @app.route('/api/admin/transacoes-pix', methods=['GET'])
 def listar_transacoes_pix():
-    """Lista todas as transações PIX (comissões de instalação de warehouse)"""
+    """Lista todas as transações PIX (comissões de instalação de warehouse)
+
+    A resposta é enviada em streaming: as linhas saem de um cursor server-side e são
+    serializadas uma a uma; resumo e total são acumulados no caminho e vão no final.
+    Com ?limite=&cursor= devolve uma página (filtros status, tipo, equipe_id, desde, ate, busca).
+    """
+    pagina = pagina_admin_solicitada('transacoes_pix')
+    if pagina is not None:
+        return pagina
     try:
         tipo = request.args.get('tipo')  # 'instalacao_armazem' ou vazio para todos
         filtro_mes = request.args.get('mes')  # 'este_mes' ou vazio para todos
         
-        # Buscar transações PIX do banco
-        conn = api.db._get_conn()
-        cursor = conn.cursor()
-        
         query = "SELECT id, mercado_pago_id, equipe_nome, tipo_item, item_nome, valor_item, valor_taxa, status, data_criacao FROM transacoes_pix WHERE 1=1"
         params = []
         
@@ -7301,50 +7344,34 @@ def listar_transacoes_pix():
         
         query += " ORDER BY data_criacao DESC"
         
-        cursor.execute(query, params)
-        transacoes = cursor.fetchall()
+        totais = {'resumo': {}, 'total': 0}
         
-        # Converter para dicts
-        comissoes = []
-        total_valor_item = 0
-        resumo = {}
-        
-        if transacoes:
-            for trans in transacoes:
-                tipo_item = trans[3]
-                valor_item = float(trans[5])
+        def comissoes():
+            for trans in api.db.iterar_consulta(query, params):
+                tipo_item = trans['tipo_item']
+                valor_item = float(trans['valor_item'])
+                
+                # Somar valor_item e resumo por tipo
+                totais['total'] += valor_item
+                totais['resumo'][tipo_item] = totais['resumo'].get(tipo_item, 0) + valor_item
                 
-                comissoes.append({
-                    'id': trans[0],
-                    'mercado_pago_id': trans[1],
-                    'equipe_nome': trans[2],
+                yield {
+                    'id': trans['id'],
+                    'mercado_pago_id': trans['mercado_pago_id'],
+                    'equipe_nome': trans['equipe_nome'],
                     'tipo': tipo_item,
-                    'item_nome': trans[4],
+                    'item_nome': trans['item_nome'],
                     'valor_item': valor_item,
-                    'valor_taxa': float(trans[6]),
-                    'status': trans[7],
-                    'data_transacao': trans[8],
-                    'descricao': f"Instalação de {trans[4]} do warehouse",
+                    'valor_taxa': float(trans['valor_taxa']),
+                    'status': trans['status'],
+                    'data_transacao': trans['data_criacao'],
+                    'descricao': f"Instalação de {trans['item_nome']} do warehouse",
                     'valor_comissao': valor_item
-                })
-                
-                # Somar valor_item
-                total_valor_item += valor_item
-                
-                # Resumo por tipo
-                resumo[tipo_item] = resumo.get(tipo_item, 0) + valor_item
-        
-        conn.close()
+                }
         
-        return jsonify({
-            'comissoes': comissoes,
-            'resumo': resumo,
-            'total': total_valor_item
-        })
+        return resposta_json_stream(app, comissoes(), chave='comissoes', rodape=lambda: totais)
     except Exception as e:
-        print(f"[ERRO] Erro ao listar comissões: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[ERRO] Erro ao listar comissões: %s', e)
         return jsonify({'erro': str(e)}), 400
 
 # ============ INICIALIZAÇÃO DE CONFIGURAÇÕES =====
@@ -7365,11 +7392,11 @@ def inicializar_configuracoes_padrao():
             config_existente = api.db.obter_configuracao(chave)
             if not config_existente:
                 api.db.salvar_configuracao(chave, valor, descricao)
-                print(f"[CONFIG] Inicializada: {chave} = {valor}")
+                logger.debug('[CONFIG] Inicializada: %s = %s', chave, valor)
             else:
-                print(f"[CONFIG] Já existe: {chave} = {config_existente}")
+                logger.debug('[CONFIG] Já existe: %s = %s', chave, config_existente)
     except Exception as e:
-        print(f"[AVISO] Erro ao inicializar configurações: {e}")
+        logger.error('[AVISO] Erro ao inicializar configurações: %s', e)
 
 # ====== ENDPOINT APELIDO CARRO ======
 @app.route('/api/carro/<carro_id>/apelido', methods=['PUT'])
@@ -7398,7 +7425,7 @@ def atualizar_apelido_carro(carro_id):
         
         return jsonify({'sucesso': True, 'novo_apelido': novo_apelido}), 200
     except Exception as e:
-        print(f'[APELIDO] Erro ao atualizar: {e}')
+        logger.error('[APELIDO] Erro ao atualizar: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 # ====== ENDPOINT REMOVER PEÇA DO CARRO ======
@@ -7416,7 +7443,7 @@ def remover_peca_carro():
         tipo_peca = dados.get('tipo_peca')  # motor, cambio, suspensao, diferencial, kit_angulo
         novo_carro_id = dados.get('novo_carro_id')  # Se None, vai para armazém; se setado, vai para outro carro
         
-        print(f'[REMOVER PEÇA] Carro: {carro_id}, Tipo: {tipo_peca}, Novo Carro: {novo_carro_id}')
+        logger.debug('[REMOVER PEÇA] Carro: %s, Tipo: %s, Novo Carro: %s', carro_id, tipo_peca, novo_carro_id)
         
         # Validar que o carro pertence à equipe
         conn = api.db._get_conn()
@@ -7442,7 +7469,7 @@ def remover_peca_carro():
             ''', (novo_carro_id, tipo_peca))
             peca_antiga_destino = cursor.fetchone()
             if peca_antiga_destino:
-                print(f'[REMOVER PEÇA] Desinstalando peça antiga do destino: {peca_antiga_destino[0]}')
+                logger.debug('[REMOVER PEÇA] Desinstalando peça antiga do destino: %s', peca_antiga_destino[0])
                 # Desinstalar peça antiga: enviar para armazém
                 cursor.execute('''
                     UPDATE pecas 
@@ -7464,7 +7491,7 @@ def remover_peca_carro():
             return jsonify({'sucesso': False, 'erro': f'Nenhuma peça {tipo_peca} instalada'}), 404
         
         peca_id, peca_loja_id = peca_instalada
-        print(f'[REMOVER PEÇA] Movendo peça {peca_id} para {novo_carro_id or "armazém"}')
+        logger.debug('[REMOVER PEÇA] Movendo peça %s para %s', peca_id, novo_carro_id or "armazém")
         
         # 2. Mover peça
         if novo_carro_id:
@@ -7475,7 +7502,7 @@ def remover_peca_carro():
                 SET carro_id = %s, instalado = 1, pix_id = NULL
                 WHERE id = %s
             ''', (novo_carro_id, peca_id))
-            print(f'[REMOVER PEÇA] Peça {peca_id} movida para carro {novo_carro_id} (pix_id limpo)')
+            logger.debug('[REMOVER PEÇA] Peça %s movida para carro %s (pix_id limpo)', peca_id, novo_carro_id)
         else:
             # Mover para armazém (carro_id = NULL, instalado = 0)
             # Limpar pix_id quando enviar para armazém
@@ -7484,77 +7511,256 @@ def remover_peca_carro():
                 SET carro_id = NULL, instalado = 0, pix_id = NULL
                 WHERE id = %s
             ''', (peca_id,))
-            print(f'[REMOVER PEÇA] Peça {peca_id} movida para armazém (pix_id limpo)')
+            logger.debug('[REMOVER PEÇA] Peça %s movida para armazém (pix_id limpo)', peca_id)
         
         conn.commit()
         conn.close()
         
-        print(f'[REMOVER PEÇA] Peça movida com sucesso!')
+        logger.info('[REMOVER PEÇA] Peça movida com sucesso!')
         return jsonify({'sucesso': True, 'mensagem': 'Peça movida com sucesso!'}), 200
     
     except Exception as e:
-        print(f'[REMOVER PEÇA] Erro: {e}')
-        import traceback
-        traceback.print_exc()
+        logger.exception('[REMOVER PEÇA] Erro: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 400
 
 
+# ============ ROTAS ADMIN - JOBS =============
+
+@app.route('/api/admin/jobs', methods=['GET'])
+@requer_admin
+@politica_cache(SEM_ARMAZENAMENTO)
+def listar_jobs():
+    """Jobs recentes (?tipo=&limite=)"""
+    return jsonify(api.db.listar_jobs(request.args.get('tipo'), ler_limite(request.args.get('limite'), 50)))
+
+
+@app.route('/api/admin/jobs/<job_id>', methods=['GET'])
+@requer_admin
+@politica_cache(SEM_ARMAZENAMENTO)
+def obter_job(job_id):
+    """Status, progresso e (quando concluído) resultado do job; o cliente consulta até status final"""
+    job = api.db.obter_job(job_id)
+    if not job:
+        return jsonify({'erro': 'Job não encontrado'}), 404
+    return jsonify(job)
+
+
+@app.route('/api/admin/exportar-excel', methods=['POST'])
+@requer_admin
+def exportar_excel_todas_equipes():
+    """Enfileira a exportação de todas as equipes para Excel ({"forcar": true} ignora o cooldown)"""
+    dados = request.get_json(silent=True) or {}
+    return responder_job('exportar_excel', {'forcar': bool(dados.get('forcar', True))})
+
+
+def _job_exportar_excel(parametros, progresso):
+    exportadas = api.exportar_todas_equipes_agora(forcar=parametros.get('forcar', True), progresso=progresso)
+    return {'sucesso': True, 'exportadas': exportadas}
+
+
+jobs.registrar('exportar_excel', _job_exportar_excel)
+
+
+@app.route('/api/admin/backup', methods=['POST'])
+@requer_admin
+def criar_backup():
+    """Enfileira um backup NDJSON gzip em data/backups/<data>/ ({"incremental": true} parte do último)"""
+    dados = request.get_json(silent=True) or {}
+    base = ultimo_backup(PASTA_BACKUPS) if dados.get('incremental') else None
+    if dados.get('incremental') and not base:
+        return jsonify({'sucesso': False, 'erro': 'Nenhum backup anterior para o incremental'}), 400
+    pasta = os.path.join(PASTA_BACKUPS, datetime.now().strftime('%Y%m%d_%H%M%S'))
+    return responder_job('backup', {'pasta': pasta, 'incremental_de': base})
+
+
+@app.route('/api/admin/backup/restaurar', methods=['POST'])
+@requer_admin
+def restaurar_backup():
+    """Enfileira a restauração de um backup ({"backup": "<nome da pasta em data/backups>"})"""
+    nome = os.path.basename((request.get_json(silent=True) or {}).get('backup') or '')
+    pasta = os.path.join(PASTA_BACKUPS, nome)
+    if not nome or not os.path.isfile(os.path.join(pasta, 'manifesto.json')):
+        return jsonify({'sucesso': False, 'erro': 'Backup não encontrado'}), 404
+    return responder_job('restaurar_backup', {'pasta': pasta})
+
+
+def _job_backup(parametros, progresso):
+    manifesto = api.db.exportar_backup(parametros['pasta'], parametros.get('incremental_de'), progresso=progresso)
+    return {
+        'sucesso': True,
+        'pasta': parametros['pasta'],
+        'incremental_de': parametros.get('incremental_de'),
+        'linhas': {tabela: info['linhas'] for tabela, info in manifesto['tabelas'].items()},
+    }
+
+
+def _job_restaurar_backup(parametros, progresso):
+    restauradas = api.db.restaurar_backup(parametros['pasta'], progresso=progresso)
+    return {'sucesso': True, 'pasta': parametros['pasta'], 'linhas': restauradas}
+
+
+jobs.registrar('restaurar_backup', _job_restaurar_backup)
+jobs.registrar('backup', _job_backup, max_tentativas=2)
+
+
+@app.route('/api/admin/etapas/<etapa_id>/batalhas', methods=['POST'])
+@requer_admin
+def registrar_batalha_etapa(etapa_id):
+    """Registra o resultado de uma partida da etapa ({"vencedora_id", "perdedora_id", "partida_id"?})
+
+    Sem partida_id cada chamada é uma batalha nova; com ele, reportar de novo
+    substitui o resultado daquela partida.
+    """
+    dados = request.get_json(silent=True) or {}
+    vencedora_id, perdedora_id = dados.get('vencedora_id'), dados.get('perdedora_id')
+    if not vencedora_id or not perdedora_id:
+        return jsonify({'sucesso': False, 'erro': 'vencedora_id e perdedora_id obrigatórios'}), 400
+    resultado = api.registrar_batalha_etapa(etapa_id, dados.get('partida_id') or uuid.uuid4().hex,
+                                            vencedora_id, perdedora_id)
+    if not resultado['sucesso']:
+        return jsonify(resultado), 404 if resultado['erro'] == 'Etapa não encontrada' else 400
+    return jsonify(resultado), 201
+
+
+@app.route('/api/admin/etapas/<etapa_id>/finalizar', methods=['POST'])
+@requer_admin
+def finalizar_etapa(etapa_id):
+    """Enfileira a pontuação da etapa e a atualização das colocações do campeonato"""
+    return responder_job('finalizar_etapa', {'etapa_id': etapa_id})
+
+
+def _job_finalizar_etapa(parametros, progresso):
+    etapa_id = parametros['etapa_id']
+    conn = api.db._get_conn()
+    cursor = conn.cursor()
+    cursor.execute('SELECT campeonato_id FROM etapas WHERE id = %s', (etapa_id,))
+    row = cursor.fetchone()
+    conn.close()
+    if not row:
+        return {'sucesso': False, 'erro': 'Etapa não encontrada'}
+    progresso(0, 1, 'Atribuindo pontos e colocações')
+    resultado = api.db.atribuir_pontos_etapa(etapa_id, row[0])
+    if resultado.pop('retentavel', False):
+        # Falha do banco: o executor tenta de novo; falhas de regra (pontos já
+        # atribuídos...) terminam o job com sucesso=False, sem nova tentativa
+        raise RuntimeError(resultado['erro'])
+    resultado['campeonato_id'] = row[0]
+    return resultado
+
+
+jobs.registrar('finalizar_etapa', _job_finalizar_etapa, max_tentativas=2)
+
+
+@app.route('/api/admin/arquivamento', methods=['POST'])
+@requer_admin
+def arquivar_finalizados():
+    """Enfileira o arquivamento agora ({"retencao": {"solicitacoes": dias, "financeiro": dias}, "lote": n})
+
+    Sem corpo usa a configuração do agendamento (GRANPIX_ARQUIVAMENTO_*).
+    """
+    dados = request.get_json(silent=True) or {}
+    try:
+        parametros = {
+            'retencao': ler_retencao({**ARQUIVAMENTO_PARAMETROS['retencao'], **(dados.get('retencao') or {})}),
+            'lote': int(dados.get('lote', ARQUIVAMENTO_PARAMETROS['lote'])),
+        }
+        if parametros['lote'] < 1:
+            raise ValueError('Lote deve ser positivo')
+    except (TypeError, ValueError) as e:
+        return jsonify({'sucesso': False, 'erro': str(e)}), 400
+    return responder_job('arquivamento', parametros)
+
+
+def _job_arquivamento(parametros, progresso):
+    movidas = api.db.arquivar_finalizados(parametros.get('retencao'), parametros.get('lote', LOTE_PADRAO_ARQUIVAMENTO),
+                                          progresso=progresso)
+    return {'sucesso': True, 'movidas': movidas, 'total': sum(movidas.values())}
+
+
+jobs.registrar('arquivamento', _job_arquivamento)
+if ARQUIVAMENTO_INTERVALO > 0:
+    jobs.agendar('arquivamento', ARQUIVAMENTO_INTERVALO, ARQUIVAMENTO_PARAMETROS)
+
+
+@app.route('/api/admin/pix/expirar-pendentes', methods=['POST'])
+@requer_admin
+def expirar_pix_pendentes():
+    """Enfileira a varredura de PIX pendentes agora ({"ttl_minutos": n, "lote": n}; padrão: GRANPIX_PIX_*)"""
+    dados = request.get_json(silent=True) or {}
+    try:
+        parametros = {chave: int(dados.get(chave, padrao)) for chave, padrao in PIX_VARREDURA_PARAMETROS.items()}
+    except (TypeError, ValueError):
+        return jsonify({'sucesso': False, 'erro': 'ttl_minutos e lote devem ser inteiros'}), 400
+    if parametros['ttl_minutos'] < 1 or parametros['lote'] < 1:
+        return jsonify({'sucesso': False, 'erro': 'ttl_minutos e lote devem ser positivos'}), 400
+    return responder_job('expirar_pix', parametros)
+
+
+def _job_expirar_pix(parametros, progresso):
+    contagens = varrer_pendentes(api.db, pix_status_cliente, parametros.get('ttl_minutos', TTL_PADRAO_PIX_MINUTOS),
+                                 parametros.get('lote', LOTE_PADRAO_PIX), progresso=progresso)
+    return {'sucesso': True, **contagens}
+
+
+jobs.registrar('expirar_pix', _job_expirar_pix)
+if PIX_VARREDURA_INTERVALO > 0:
+    jobs.agendar('expirar_pix', PIX_VARREDURA_INTERVALO, PIX_VARREDURA_PARAMETROS)
+
+
 # ============ ROTAS ADMIN - MIGRATION =============
 
 @app.route('/api/admin/migration/remove-colunas-carros', methods=['POST'])
 @requer_admin
 def migration_remove_colunas_carros():
+    """Enfileira a remoção das colunas redundantes da tabela carros (job 'migracao_colunas_carros')"""
+    return responder_job('migracao_colunas_carros')
+
+
+def _job_remover_colunas_carros(parametros, progresso):
     """Remove colunas redundantes da tabela carros"""
-    try:
-        print("[MIGRATION] Iniciando remoção de colunas da tabela carros...")
-        
-        # Colunas a remover: motor_id, cambio_id, suspensao_id, kit_angulo_id, diferencial_id
-        colunas = ['motor_id', 'cambio_id', 'suspensao_id', 'kit_angulo_id', 'diferencial_id']
-        
-        conn = api.db._get_conn()
-        cursor = conn.cursor()
-        
-        removidas = []
-        erros = []
-        
-        for coluna in colunas:
-            try:
-                sql = f"ALTER TABLE carros DROP COLUMN {coluna}"
-                print(f"[MIGRATION] Executando: {sql}")
-                cursor.execute(sql)
+    logger.debug('[MIGRATION] Iniciando remoção de colunas da tabela carros...')
+
+    # Colunas a remover: motor_id, cambio_id, suspensao_id, kit_angulo_id, diferencial_id
+    colunas = ['motor_id', 'cambio_id', 'suspensao_id', 'kit_angulo_id', 'diferencial_id']
+
+    conn = api.db._get_conn()
+    cursor = conn.cursor()
+
+    removidas = []
+    erros = []
+
+    for i, coluna in enumerate(colunas, 1):
+        try:
+            sql = f"ALTER TABLE carros DROP COLUMN {coluna}"
+            logger.debug('[MIGRATION] Executando: %s', sql)
+            cursor.execute(sql)
+            removidas.append(coluna)
+            logger.info('[MIGRATION] ✓ Coluna %s removida com sucesso', coluna)
+        except Exception as e:
+            erro_msg = str(e)
+            if 'Unknown column' in erro_msg:
+                logger.warning('[MIGRATION] ⚠ Coluna %s não existe (já foi removida)', coluna)
                 removidas.append(coluna)
-                print(f"[MIGRATION] ✓ Coluna {coluna} removida com sucesso")
-            except Exception as e:
-                erro_msg = str(e)
-                if 'Unknown column' in erro_msg:
-                    print(f"[MIGRATION] ⚠ Coluna {coluna} não existe (já foi removida)")
-                    removidas.append(coluna)
-                else:
-                    erros.append({'coluna': coluna, 'erro': erro_msg})
-                    print(f"[MIGRATION] ✗ Erro ao remover {coluna}: {erro_msg}")
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        print(f"[MIGRATION] Processo finalizado. Removidas: {removidas}, Erros: {len(erros)}")
-        
-        return jsonify({
-            'sucesso': len(erros) == 0,
-            'removidas': removidas,
-            'erros': erros,
-            'mensagem': f'{len(removidas)} coluna(s) removida(s) com sucesso'
-        }), 200 if len(erros) == 0 else 206
-        
-    except Exception as e:
-        print(f"[MIGRATION] Erro geral: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({
-            'sucesso': False,
-            'erro': str(e),
-            'mensagem': 'Erro ao executar migration'
-        }), 500
+            else:
+                erros.append({'coluna': coluna, 'erro': erro_msg})
+                logger.error('[MIGRATION] ✗ Erro ao remover %s: %s', coluna, erro_msg)
+        progresso(i, len(colunas), coluna)
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    logger.info('[MIGRATION] Processo finalizado. Removidas: %s, Erros: %s', removidas, len(erros))
+
+    return {
+        'sucesso': len(erros) == 0,
+        'removidas': removidas,
+        'erros': erros,
+        'mensagem': f'{len(removidas)} coluna(s) removida(s) com sucesso'
+    }
+
+
+jobs.registrar('migracao_colunas_carros', _job_remover_colunas_carros)
 
 
 # ==================== CAMPEONATOS E ETAPAS (registrar sempre, para testes e flask run) ====================
@@ -7575,19 +7781,21 @@ def criar_campeonato():
             return jsonify({'sucesso': True, 'campeonato_id': campeonato_id})
         return jsonify({'sucesso': False, 'erro': 'Erro ao criar campeonato'}), 500
     except Exception as e:
-        print(f"[CRIAR CAMPEONATO] Erro: {e}")
+        logger.error('[CRIAR CAMPEONATO] Erro: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 
 @app.route('/api/admin/listar-campeonatos', methods=['GET'])
+@politica_cache(CONDICIONAL)
 def listar_campeonatos():
     """Lista campeonatos com filtros opcionais"""
     try:
         serie = request.args.get('serie')
+        definir_ultima_modificacao(api.db.obter_ultima_atualizacao('campeonatos'))
         campeonatos = api.db.listar_campeonatos(serie=serie)
         return jsonify(campeonatos)
     except Exception as e:
-        print(f"[LISTAR CAMPEONATOS] Erro: {e}")
+        logger.error('[LISTAR CAMPEONATOS] Erro: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 
@@ -7610,25 +7818,32 @@ def cadastrar_etapa():
             return jsonify({'sucesso': True, 'etapa_id': etapa_id})
         return jsonify({'sucesso': False, 'erro': 'Erro ao cadastrar etapa'}), 500
     except Exception as e:
-        print(f"[CADASTRO ETAPA] Erro: {e}")
+        logger.error('[CADASTRO ETAPA] Erro: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 
 @app.route('/api/admin/listar-etapas', methods=['GET'])
+@politica_cache(CONDICIONAL)
 def listar_etapas_filtradas():
-    """Lista etapas com filtros opcionais"""
+    """Lista etapas com filtros opcionais (paginado com ?limite=&cursor=&ordenar=data|numero)"""
+    pagina = pagina_admin_solicitada('etapas')
+    if pagina is not None:
+        return pagina
     try:
         serie = request.args.get('serie')
         status = request.args.get('status')
+        definir_ultima_modificacao(api.db.obter_ultima_atualizacao('etapas'))
         etapas = api.db.listar_etapas(serie=serie, status=status)
         return jsonify(etapas if isinstance(etapas, list) else [])
     except Exception as e:
-        print(f"[LISTAR ETAPAS] Erro: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('[LISTAR ETAPAS] Erro: %s', e)
         return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
 
+# Handlers registrados: recupera jobs interrompidos e começa a renovar batimentos (e os agendados)
+jobs.iniciar()
+
+
 if __name__ == '__main__':
     import atexit
     import threading
@@ -7675,19 +7890,15 @@ if __name__ == '__main__':
     # Registrar função de limpeza
     atexit.register(cleanup_on_exit)
     
-    print("\n" + "="*70)
-    print("WEB SYSTEM GRANPIX")
-    print("="*70)
-    print("\nOpening at http://localhost:5000")
-    print("   Team Login: Team ID + password (default: 123456)")
-    print("   Admin Login: Password = admin123")
-    print("   Press CTRL+C to stop\n")
+    logger.info('WEB SYSTEM GRANPIX')
+    logger.info('Opening at http://localhost:5000')
+    logger.info('Press CTRL+C to stop')
     
     # Inicializar configurações padrão
-    print("[INICIALIZAÇÃO] Verificando configurações de comissão...")
+    logger.info('[INICIALIZAÇÃO] Verificando configurações de comissão...')
     inicializar_configuracoes_padrao()
     
-    print("\n[ROTAS REGISTRADAS - API]")
+    logger.info('[ROTAS REGISTRADAS - API]')
     # Campeonatos e etapas já registrados no nível do módulo (acima)
     
     @app.route('/api/admin/campeonato/<campeonato_id>', methods=['GET'])
@@ -7700,7 +7911,7 @@ if __name__ == '__main__':
             else:
                 return jsonify({}), 404
         except Exception as e:
-            print(f"[OBTER CAMPEONATO] Erro: {e}")
+            logger.error('[OBTER CAMPEONATO] Erro: %s', e)
             return jsonify({'sucesso': False, 'erro': str(e)}), 500
     
     @app.route('/api/admin/deletar-campeonato', methods=['POST'])
@@ -7717,7 +7928,7 @@ if __name__ == '__main__':
             else:
                 return jsonify({'sucesso': False, 'erro': 'Campeonato não encontrado'}), 404
         except Exception as e:
-            print(f"[DELETAR CAMPEONATO] Erro: {e}")
+            logger.error('[DELETAR CAMPEONATO] Erro: %s', e)
             return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
     @app.route('/api/admin/pontuacoes-campeonato/<campeonato_id>', methods=['GET'])
@@ -7730,7 +7941,7 @@ if __name__ == '__main__':
                 'pontuacoes': pontuacoes
             })
         except Exception as e:
-            print(f"[OBTER PONTUACOES] Erro: {e}")
+            logger.error('[OBTER PONTUACOES] Erro: %s', e)
             return jsonify({'sucesso': False, 'erro': str(e)}), 500
     
     @app.route('/api/admin/atualizar-pontuacao', methods=['POST'])
@@ -7750,7 +7961,7 @@ if __name__ == '__main__':
             else:
                 return jsonify({'sucesso': False, 'erro': 'Erro ao atualizar pontuação'}), 500
         except Exception as e:
-            print(f"[ATUALIZAR PONTUACAO] Erro: {e}")
+            logger.error('[ATUALIZAR PONTUACAO] Erro: %s', e)
             return jsonify({'sucesso': False, 'erro': str(e)}), 500
     
     @app.route('/api/admin/atualizar-colocacoes/<campeonato_id>', methods=['POST'])
@@ -7766,7 +7977,7 @@ if __name__ == '__main__':
             else:
                 return jsonify({'sucesso': False, 'erro': 'Erro ao atualizar colocações'}), 500
         except Exception as e:
-            print(f"[ATUALIZAR COLOCACOES] Erro: {e}")
+            logger.error('[ATUALIZAR COLOCACOES] Erro: %s', e)
             return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
     # Cadastrar-etapa e listar-etapas já registrados no nível do módulo
@@ -7777,16 +7988,11 @@ if __name__ == '__main__':
         try:
             etapa = api.db.obter_proxima_etapa(serie)
             if etapa:
-                # Converter datetime para string se necessário
-                if 'data_etapa' in etapa and hasattr(etapa['data_etapa'], 'isoformat'):
-                    etapa['data_etapa'] = etapa['data_etapa'].isoformat()
-                if 'hora_etapa' in etapa and hasattr(etapa['hora_etapa'], 'isoformat'):
-                    etapa['hora_etapa'] = etapa['hora_etapa'].isoformat()
                 return jsonify(etapa)
             else:
                 return jsonify({}), 404
         except Exception as e:
-            print(f"[PRÓXIMA ETAPA] Erro: {e}")
+            logger.error('[PRÓXIMA ETAPA] Erro: %s', e)
             return jsonify({'sucesso': False, 'erro': str(e)}), 500
     
     @app.route('/api/validar-pecas-etapa', methods=['POST'])
@@ -7800,7 +8006,7 @@ if __name__ == '__main__':
             resultado = api.db.validar_pecas_carro(carro_id, equipe_id)
             return jsonify(resultado)
         except Exception as e:
-            print(f"[VALIDAR PEÇAS] Erro: {e}")
+            logger.error('[VALIDAR PEÇAS] Erro: %s', e)
             return jsonify({'sucesso': False, 'erro': str(e)}), 500
     
     @app.route('/api/inscrever-etapa', methods=['POST'])
@@ -7832,14 +8038,13 @@ if __name__ == '__main__':
             else:
                 return jsonify({'sucesso': False, 'erro': 'Erro ao inscrever'}), 500
         except Exception as e:
-            print(f"[INSCREVER ETAPA] Erro: {e}")
+            logger.error('[INSCREVER ETAPA] Erro: %s', e)
             return jsonify({'sucesso': False, 'erro': str(e)}), 500
 
     for rule in app.url_map.iter_rules():
         if 'api' in rule.rule:
             methods = list(rule.methods - {'OPTIONS', 'HEAD'})
-            print(f"  {rule.rule:50} -> {methods}")
-    print()
+            logger.info('%-50s -> %s', rule.rule, methods)
     
     try:
         host = os.environ.get("FLASK_RUN_HOST", "localhost")
@@ -7847,9 +8052,9 @@ if __name__ == '__main__':
         debug = os.environ.get("FLASK_DEBUG", "true").lower() in ("1", "true", "yes")
         app.run(debug=debug, host=host, port=port, use_reloader=debug)
     except KeyboardInterrupt:
-        print("\n[ENCERRAMENTO] Encerrando aplicação...")
+        logger.info('[ENCERRAMENTO] Encerrando aplicação...')
         cleanup_on_exit()
     except Exception as e:
-        print(f"\n[ERRO ENCERRAMENTO] {e}")
+        logger.error('[ERRO ENCERRAMENTO] %s', e)
         cleanup_on_exit()
 
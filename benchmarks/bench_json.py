@@ -0,0 +1,100 @@
+"""
+Benchmark de serialização JSON: provider padrão do Flask x GranpixJSONProvider x streaming
+
+Uso:
+    python benchmarks/bench_json.py [linhas] [repeticoes]
+
+Gera linhas sintéticas no formato de transacoes_pix (Decimal, datetime, date, TIME)
+e mede o tempo para montar a resposta completa de cada estratégia.
+"""
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from src.json_provider import GranpixJSONProvider, resposta_json_stream, orjson
+
+
+class _ProviderStdlib(DefaultJSONProvider):
+    """Equivalente ao CustomJSONProvider antigo (stdlib + Decimal -> float)"""
+    sort_keys = False
+
+    @staticmethod
+    def default(obj):
+        if isinstance(obj, Decimal):
+            return float(obj)
+        if isinstance(obj, timedelta):
+            return str(obj)
+        return DefaultJSONProvider.default(obj)
+
+
+def gerar_linhas(n):
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    for i in range(n):
+        yield {
+            'id': f'trans-{i:08d}',
+            'mercado_pago_id': f'mp-{i}',
+            'equipe_nome': f'Equipe {i % 60}',
+            'tipo': 'instalacao_armazem' if i % 3 else 'peca',
+            'item_nome': f'Turbo Nível {i % 7}',
+            'valor_item': Decimal('149.90'),
+            'valor_taxa': Decimal('2.50'),
+            'status': 'aprovado',
+            'data_transacao': base + timedelta(minutes=i),
+            'data_etapa': date(2026, 3, 1),
+            'hora_etapa': timedelta(hours=19, minutes=30),
+        }
+
+
+def medir(nome, func, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        tamanho = func()
+    duracao = (time.perf_counter() - inicio) / repeticoes
+    # Pico de memória medido numa execução separada (tracemalloc distorce o tempo)
+    tracemalloc.start()
+    func()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {nome:<28} {duracao * 1000:9.1f} ms   pico {pico / 1024 / 1024:7.1f} MiB   {tamanho / 1024:8.0f} KiB")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    app_stdlib = Flask('bench_stdlib')
+    app_stdlib.json = _ProviderStdlib(app_stdlib)
+    app_granpix = Flask('bench_granpix')
+    app_granpix.json = GranpixJSONProvider(app_granpix)
+
+    def lista_completa(app):
+        def rodar():
+            with app.test_request_context():
+                linhas = list(gerar_linhas(n))
+                return len(app.json.response({'comissoes': linhas}).get_data())
+        return rodar
+
+    def streaming():
+        with app_granpix.test_request_context():
+            resp = resposta_json_stream(app_granpix, gerar_linhas(n), chave='comissoes',
+                                        rodape=lambda: {'total': 0})
+            return sum(len(parte) for parte in resp.iter_encoded())
+
+    print(f"Serialização de {n} linhas ({repeticoes} repetições, orjson={'sim' if orjson else 'não'})")
+    medir('stdlib (lista + jsonify)', lista_completa(app_stdlib), repeticoes)
+    medir('granpix (lista + jsonify)', lista_completa(app_granpix), repeticoes)
+    medir('granpix (streaming)', streaming, repeticoes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+"""
+Micro-benchmarks dos caminhos quentes do DatabaseManager e da simulação
+
+Uso:
+    python benchmarks/bench_micro.py [--tamanhos pequeno,medio,grande] [--casos carregar_equipe,...]
+    python benchmarks/bench_micro.py --gravar-baseline          # grava a referência desta máquina
+    python benchmarks/bench_micro.py --fator 1.3                # falha (exit 1) se piorar >30%
+
+Cada tamanho usa um banco populado por benchmarks/dados_sinteticos.py (SQLite
+temporário por tamanho; com MYSQL_CONFIG, o banco configurado com prefixo
+"bench-" apagado no fim). Para cada caso e tamanho:
+  - tempo: mediana e mínimo de até --repeticoes execuções (limitado a
+    --tempo-max segundos por caso);
+  - consultas: comandos SQL de uma execução (contadores do db_metrics);
+  - pico_kb: pico de memória alocada numa execução (tracemalloc).
+A preparação de cada execução (ex. voltar a transação PIX para "pendente",
+copiar as equipes da batalha) fica fora da medição.
+
+Com uma baseline (--baseline, padrão benchmarks/resultados/baseline_micro.json)
+qualquer métrica acima de baseline * --fator é marcada como REGRESSÃO e o
+processo termina com código 1, para uso em CI. A baseline é da máquina em que
+foi gravada: compare sempre no mesmo ambiente.
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _caminho in (_ROOT, os.path.join(_ROOT, 'src')):
+    if _caminho not in sys.path:
+        sys.path.insert(0, _caminho)
+
+from dados_sinteticos import Escala, limpar, semear
+from src import db_metrics
+
+TAMANHOS = {
+    'pequeno': Escala(equipes=20, modelos_loja=10, pecas_loja=50, transacoes_pix=200),
+    'medio': Escala(),
+    'grande': Escala(equipes=1000, modelos_loja=100, pecas_loja=500, transacoes_pix=10000),
+}
+BASELINE = os.path.join(_ROOT, 'benchmarks', 'resultados', 'baseline_micro.json')
+METRICAS = ('mediana_ms', 'consultas', 'pico_kb')
+
+CASOS = {}
+
+
+def caso(nome):
+    """Registra (preparar, executar): preparar(ctx) roda fora da medição e devolve
+    os argumentos de executar(ctx, *args)"""
+    def registrar(funcao):
+        CASOS[nome] = funcao
+        return funcao
+    return registrar
+
+
+class Contexto:
+    """Banco e ids semeados de um tamanho, com rodízio para não medir sempre a mesma linha"""
+
+    def __init__(self, db, escala, semeado, pasta):
+        self.db = db
+        self.escala = escala
+        self.semeado = semeado
+        self.pasta = pasta
+        self.cache = {}
+        self._indices = {}
+
+    def proxima(self, chave, valores):
+        i = self._indices.get(chave, 0)
+        self._indices[chave] = i + 1
+        return valores[i % len(valores)]
+
+
+def _sem_preparo(ctx):
+    return ()
+
+
+def _equipe_da_vez(ctx):
+    return (ctx.proxima('equipe', ctx.semeado.equipes),)
+
+
+@caso('carregar_equipe')
+def _carregar_equipe():
+    return _equipe_da_vez, lambda ctx, equipe_id: ctx.db.carregar_equipe(equipe_id)
+
+
+@caso('carregar_todas_equipes')
+def _carregar_todas_equipes():
+    return _sem_preparo, lambda ctx: ctx.db.carregar_todas_equipes()
+
+
+@caso('carregar_modelos_loja')
+def _carregar_modelos_loja():
+    return _sem_preparo, lambda ctx: ctx.db.carregar_modelos_loja()
+
+
+@caso('carregar_pecas_loja')
+def _carregar_pecas_loja():
+    return _sem_preparo, lambda ctx: ctx.db.carregar_pecas_loja()
+
+
+@caso('carregar_solicitacoes_pecas')
+def _carregar_solicitacoes_pecas():
+    return _sem_preparo, lambda ctx: ctx.db.carregar_solicitacoes_pecas()
+
+
+@caso('obter_etapas_equipe')
+def _obter_etapas_equipe():
+    return _equipe_da_vez, lambda ctx, equipe_id: ctx.db.obter_etapas_equipe(equipe_id)
+
+
+@caso('aplicar_ordenacao_qualificacao')
+def _aplicar_ordenacao_qualificacao():
+    return _sem_preparo, lambda ctx: ctx.db.aplicar_ordenacao_qualificacao(ctx.semeado.etapa_em_andamento)
+
+
+@caso('confirmar_transacao_pix')
+def _confirmar_transacao_pix():
+    def preparar(ctx):
+        mercado_pago_id = f'{ctx.semeado.prefixo}mp-{ctx.proxima("pix", range(ctx.escala.transacoes_pix)):06d}'
+        conn = ctx.db._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("UPDATE transacoes_pix SET status = 'pendente', data_confirmacao = NULL "
+                       "WHERE mercado_pago_id = %s", (mercado_pago_id,))
+        conn.commit()
+        conn.close()
+        return (mercado_pago_id,)
+    return preparar, lambda ctx, mercado_pago_id: ctx.db.confirmar_transacao_pix(mercado_pago_id)
+
+
+def _duas_equipes(ctx):
+    if 'batalha' not in ctx.cache:
+        ctx.cache['batalha'] = tuple(ctx.db.carregar_equipe(i) for i in ctx.semeado.equipes[:2])
+    return copy.deepcopy(ctx.cache['batalha'])
+
+
+@caso('Carro.sofrer_desgaste_batalha')
+def _sofrer_desgaste_batalha():
+    from src.config import DESGASTE_BASE_BATALHA
+    return (lambda ctx: (_duas_equipes(ctx)[0].carro,),
+            lambda ctx, carro: carro.sofrer_desgaste_batalha(DESGASTE_BASE_BATALHA))
+
+
+@caso('SistemaBatalha.executar_batalha_completa')
+def _executar_batalha_completa():
+    from src.battle_system import SistemaBatalha
+    from src.models import Piloto
+
+    def preparar(ctx):
+        a, b = _duas_equipes(ctx)
+        return SistemaBatalha(), Piloto('pa', 'Piloto A', a.id), Piloto('pb', 'Piloto B', b.id), a, b
+
+    return preparar, lambda ctx, sistema, pa, pb, a, b: sistema.executar_batalha_completa(pa, pb, a, b, 1)
+
+
+@caso('ExportadorEquipes.exportar_equipe')
+def _exportar_equipe():
+    from src.exportador_excel import ExportadorEquipes
+
+    def preparar(ctx):
+        equipe = ctx.db.carregar_equipe(ctx.proxima('exportar', ctx.semeado.equipes))
+        exportador = ExportadorEquipes(pasta_saida=os.path.join(ctx.pasta, 'excel'))
+        # Mede a criação do arquivo, não a atualização de um já existente
+        shutil.rmtree(exportador.pasta_saida, ignore_errors=True)
+        os.makedirs(exportador.pasta_saida)
+        return exportador, equipe
+
+    def executar(ctx, exportador, equipe):
+        # O exportador imprime o progresso de cada aba e grava data/solicitacoes_compra
+        # relativo ao diretório atual
+        with contextlib.chdir(ctx.pasta), contextlib.redirect_stdout(io.StringIO()):
+            return exportador.exportar_equipe(equipe)
+    return preparar, executar
+
+
+def _consultas_fora_requisicao():
+    linha = db_metrics.agregado.por_endpoint.get(db_metrics.ENDPOINT_FORA_REQUISICAO)
+    return linha[2] if linha else 0
+
+
+def medir(ctx, preparar, executar, repeticoes, tempo_max):
+    """{mediana_ms, minimo_ms, execucoes, consultas, pico_kb} de um caso"""
+    # Uma execução para aquecer caches e contar consultas e memória
+    args = preparar(ctx)
+    antes = _consultas_fora_requisicao()
+    tracemalloc.start()
+    try:
+        executar(ctx, *args)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    consultas = _consultas_fora_requisicao() - antes
+
+    tempos = []
+    limite = time.perf_counter() + tempo_max
+    while len(tempos) < repeticoes and (len(tempos) < 3 or time.perf_counter() < limite):
+        args = preparar(ctx)
+        inicio = time.perf_counter()
+        executar(ctx, *args)
+        tempos.append(time.perf_counter() - inicio)
+    return {
+        'mediana_ms': round(statistics.median(tempos) * 1000, 3),
+        'minimo_ms': round(min(tempos) * 1000, 3),
+        'execucoes': len(tempos),
+        'consultas': consultas if db_metrics.METRICAS_HABILITADAS else None,
+        'pico_kb': round(pico / 1024, 1),
+    }
+
+
+def regressoes(atual, baseline, fator, tolerancia_ms):
+    """[(métrica, valor_baseline)] que passaram de baseline * fator
+
+    Tempos abaixo de tolerancia_ms de diferença são ruído e não contam.
+    """
+    piores = []
+    for metrica in METRICAS:
+        valor, referencia = atual.get(metrica), baseline.get(metrica)
+        if valor is None or not referencia:
+            continue
+        if metrica == 'mediana_ms' and valor - referencia < tolerancia_ms:
+            continue
+        if valor > referencia * fator:
+            piores.append((metrica, referencia))
+    return piores
+
+
+def abrir_banco(tamanho, pasta):
+    from src.database import DatabaseManager
+    url = os.environ.get('MYSQL_CONFIG') or 'sqlite:///' + os.path.join(pasta, f'{tamanho}.db')
+    return DatabaseManager(url)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanhos', default=','.join(TAMANHOS))
+    parser.add_argument('--casos', help='nomes separados por vírgula (padrão: todos)')
+    parser.add_argument('--repeticoes', type=int, default=20)
+    parser.add_argument('--tempo-max', type=float, default=5.0, help='segundos por caso e tamanho')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--fator', type=float, default=float(os.environ.get('GRANPIX_BENCH_FATOR', '1.5')),
+                        help='regressão quando a métrica passa de baseline * fator')
+    parser.add_argument('--tolerancia-ms', type=float, default=0.5,
+                        help='diferença mínima de tempo para contar como regressão')
+    parser.add_argument('--gravar-baseline', action='store_true')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    tamanhos = [t for t in args.tamanhos.split(',') if t]
+    casos = args.casos.split(',') if args.casos else list(CASOS)
+    desconhecidos = [n for n in tamanhos if n not in TAMANHOS] + [n for n in casos if n not in CASOS]
+    if desconhecidos:
+        parser.error(f'desconhecido(s): {", ".join(desconhecidos)}')
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.gravar_baseline:
+        with open(args.baseline, encoding='utf-8') as arquivo:
+            baseline = json.load(arquivo).get('resultados', {})
+
+    resultados, total_regressoes = {}, 0
+    pasta = tempfile.mkdtemp(prefix='granpix-micro-')
+    try:
+        for tamanho in tamanhos:
+            db = abrir_banco(tamanho, pasta)
+            prefixo = f'bench-{uuid.uuid4().hex[:6]}-'
+            print(f'\n== {tamanho}: {TAMANHOS[tamanho]}')
+            semeado = semear(db, TAMANHOS[tamanho], args.seed, prefixo, 'pbkdf2:sha256:1000')
+            ctx = Contexto(db, TAMANHOS[tamanho], semeado, pasta)
+            print(f'{"caso":<44} {"mediana ms":>11} {"mín ms":>9} {"n":>4} {"sql":>6} {"pico KB":>9}')
+            try:
+                for nome in casos:
+                    try:
+                        preparar, executar = CASOS[nome]()
+                        medida = medir(ctx, preparar, executar, args.repeticoes, args.tempo_max)
+                    except ImportError as e:
+                        print(f'{nome:<44} indisponível ({e})')
+                        continue
+                    resultados.setdefault(tamanho, {})[nome] = medida
+                    piores = regressoes(medida, baseline.get(tamanho, {}).get(nome, {}), args.fator,
+                                         args.tolerancia_ms)
+                    total_regressoes += len(piores)
+                    sql = '-' if medida['consultas'] is None else str(medida['consultas'])
+                    aviso = '  REGRESSÃO ' + ', '.join(f'{m} (baseline {v})' for m, v in piores) if piores else ''
+                    print(f'{nome:<44} {medida["mediana_ms"]:>11.3f} {medida["minimo_ms"]:>9.3f} '
+                          f'{medida["execucoes"]:>4} {sql:>6} {medida["pico_kb"]:>9.1f}{aviso}')
+            finally:
+                limpar(db, prefixo)
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    if args.gravar_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as arquivo:
+            json.dump({'data': datetime.now().isoformat(timespec='seconds'), 'resultados': resultados},
+                      arquivo, ensure_ascii=False, indent=2)
+        print(f'\nBaseline gravada em {args.baseline}')
+    elif baseline:
+        print(f'\n{total_regressoes} regressão(ões) acima de {args.fator}x a baseline')
+        if total_regressoes:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
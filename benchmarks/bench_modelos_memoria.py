@@ -0,0 +1,104 @@
+"""
+Benchmark de memória dos modelos de domínio (Equipe, Carro, Peca, Piloto)
+
+Uso:
+    python benchmarks/bench_modelos_memoria.py [equipes] [carros_por_equipe]
+
+Duas medições com tracemalloc, em KB retidos (o que fica vivo depois de
+montar os objetos) e pico:
+  1. em memória: `equipes` equipes com 2 pilotos e `carros_por_equipe` carros
+     de 5 peças, como carregar_todas_equipes monta;
+  2. do banco: carregar_todas_equipes() num SQLite temporário populado por
+     benchmarks/dados_sinteticos.py na mesma escala.
+Também mostra quanto custa materializar Carro.pecas_instaladas (derivada no
+primeiro acesso) em todos os carros.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from src.models import Carro, Equipe, Peca, Piloto
+
+TIPOS = ('motor', 'cambio', 'kit_angulo', 'suspensao', 'diferencial')
+
+
+def montar_equipes(n, carros_por_equipe):
+    equipes = []
+    for e in range(n):
+        carros = []
+        for c in range(carros_por_equipe):
+            pecas = {tipo: Peca(id=str(uuid.uuid4()), nome=f'{tipo} {e}-{c}', tipo=tipo, durabilidade_maxima=100.0,
+                                durabilidade_atual=87.5, preco=1500.0, coeficiente_quebra=1.1)
+                     for tipo in TIPOS}
+            carros.append(Carro(id=str(uuid.uuid4()), numero_carro=e * 10 + c, marca='Nissan', modelo='Silvia S15',
+                                motor=pecas['motor'], cambio=pecas['cambio'], kit_angulo=pecas['kit_angulo'],
+                                suspensao=pecas['suspensao'], diferenciais=[pecas['diferencial']],
+                                status='ativo' if c == 0 else 'repouso', modelo_id=str(uuid.uuid4())))
+        equipe = Equipe(id=str(uuid.uuid4()), nome=f'Equipe {e:05d}', carro=carros[0], doricoins=1000.0,
+                        serie='AB'[e % 2], carros=carros)
+        for p in range(2):
+            equipe.pilotos.append(Piloto(id=str(uuid.uuid4()), nome=f'Piloto {e}-{p}', equipe_id=equipe.id))
+        equipes.append(equipe)
+    return equipes
+
+
+def medir(funcao):
+    """(resultado, KB retidos, KB de pico, segundos)"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        resultado = funcao()
+        duracao = time.perf_counter() - inicio
+        retido, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, retido / 1024, pico / 1024, duracao
+
+
+def materializar(equipes):
+    return sum(len(carro.pecas_instaladas) for equipe in equipes for carro in equipe.carros)
+
+
+def relatar(nome, n, retido, pico, duracao):
+    print(f'  {nome:<34} {retido:10.0f} KB retidos ({retido * 1024 / n:7.0f} B/equipe)   '
+          f'pico {pico:10.0f} KB   {duracao * 1000:8.1f} ms')
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    carros_por_equipe = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    print(f'{n} equipes, {carros_por_equipe} carros de 5 peças cada')
+
+    print('Em memória:')
+    equipes, retido, pico, duracao = medir(lambda: montar_equipes(n, carros_por_equipe))
+    relatar('montar equipes', n, retido, pico, duracao)
+    _, retido, pico, duracao = medir(lambda: materializar(equipes))
+    relatar('+ pecas_instaladas (todos os carros)', n, retido, pico, duracao)
+    del equipes
+
+    from dados_sinteticos import Escala, semear
+    from src.database import DatabaseManager
+    pasta = tempfile.mkdtemp(prefix='granpix-memoria-')
+    db = DatabaseManager('sqlite:///' + os.path.join(pasta, 'granpix.db'))
+    semear(db, Escala(equipes=n, carros_por_equipe=carros_por_equipe, transacoes_pix=0, solicitacoes_por_equipe=0),
+           prefixo='bench-', metodo_senha='pbkdf2:sha256:1000')
+    try:
+        print('Do banco (SQLite):')
+        equipes, retido, pico, duracao = medir(db.carregar_todas_equipes)
+        relatar(f'carregar_todas_equipes ({len(equipes)})', n, retido, pico, duracao)
+        _, retido, pico, duracao = medir(lambda: materializar(equipes))
+        relatar('+ pecas_instaladas (todos os carros)', n, retido, pico, duracao)
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
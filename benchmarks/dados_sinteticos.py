@@ -0,0 +1,231 @@
+"""
+Gerador de dados sintéticos para os testes de carga
+
+semear(db, escala, seed, prefixo) cria, direto no banco configurado, um
+campeonato realista de noite de corrida: equipes (séries A e B) com senha,
+carros com peças instaladas e no armazém, pilotos, catálogo da loja,
+solicitações de peças, histórico de transações PIX e um campeonato por série
+com a primeira etapa hoje (a da série A em andamento, com participações e
+ordem de qualificação).
+
+O conteúdo depende só de `seed`; todos os ids começam com `prefixo`
+("bench-<hex6>-" por padrão), o que permite rodar contra um banco com dados
+reais e apagar tudo no fim com limpar(db, prefixo).
+"""
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from src import senhas
+from src.compatibilidade import linhas_compatibilidade
+
+SENHA = 'bench-123'
+TIPOS_PECA = ('motor', 'cambio', 'suspensao', 'kit_angulo', 'diferencial')
+MARCAS = ('Nissan', 'Toyota', 'Mazda', 'BMW', 'Subaru', 'Honda', 'Chevrolet', 'Ford')
+STATUS_PIX = ('aprovado',) * 7 + ('pendente',) * 2 + ('cancelado',)
+
+
+@dataclass
+class Escala:
+    equipes: int = 200
+    carros_por_equipe: int = 2
+    pecas_por_carro: int = 5
+    pecas_armazem: int = 3
+    pilotos_por_equipe: int = 2
+    modelos_loja: int = 30
+    pecas_loja: int = 150
+    transacoes_pix: int = 2000
+    solicitacoes_por_equipe: int = 2
+    etapas_por_serie: int = 4
+
+
+@dataclass
+class Semeado:
+    """Ids criados, usados pelo gerador de carga para montar as requisições"""
+    prefixo: str
+    senha: str
+    equipes: List[str]
+    etapa_em_andamento: str
+    participantes: List[str]
+
+    def resumo(self) -> Dict:
+        return {'prefixo': self.prefixo, 'equipes': len(self.equipes),
+                'etapa_em_andamento': self.etapa_em_andamento, 'participantes': len(self.participantes)}
+
+
+def _inserir(cursor, tabela: str, colunas: tuple, linhas: list, lote: int = 1000) -> None:
+    sql = f'INSERT INTO {tabela} ({", ".join(colunas)}) VALUES ({", ".join(["%s"] * len(colunas))})'
+    for i in range(0, len(linhas), lote):
+        cursor.executemany(sql, linhas[i:i + lote])
+
+
+def semear(db, escala: Escala, seed: int = 42, prefixo: str = 'bench-', metodo_senha: str = None) -> Semeado:
+    """Popula o banco na escala pedida e devolve os ids que a carga vai usar"""
+    rng = random.Random(seed)
+    agora = datetime.now().replace(microsecond=0)
+    hoje = date.today()
+    senha_hash = senhas.PoolSenhas(processos=0, metodo=metodo_senha).gerar_hash(SENHA)
+
+    conn = db._get_conn()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute('SELECT COALESCE(MAX(numero_carro), 0) AS maior FROM carros')
+        proximo_numero = int(cursor.fetchone()['maior']) + 1000
+
+        # Catálogo da loja
+        pecas_loja = []
+        compatibilidades = []
+        for i in range(escala.pecas_loja):
+            peca_id = f'{prefixo}pl-{i:05d}'
+            tipo = TIPOS_PECA[i % len(TIPOS_PECA)]
+            pecas_loja.append((peca_id, f'{prefixo}{tipo} {i}', tipo, round(rng.uniform(50, 5000), 2),
+                               f'Peça sintética {i}', '{"compatibilidades": ["universal"]}',
+                               100.0, round(rng.uniform(0.5, 2.0), 2)))
+            compatibilidades.extend(linhas_compatibilidade(peca_id, None))
+        _inserir(cursor, 'pecas_loja', ('id', 'nome', 'tipo', 'preco', 'descricao', 'compatibilidade',
+                                        'durabilidade', 'coeficiente_quebra'), pecas_loja)
+        _inserir(cursor, 'pecas_loja_compatibilidade', ('peca_loja_id', 'modelo_id'), compatibilidades)
+        por_tipo = {}
+        for peca in pecas_loja:
+            por_tipo.setdefault(peca[2], []).append(peca)
+
+        modelos = [(f'{prefixo}ml-{i:04d}', rng.choice(MARCAS), f'{prefixo}Modelo {i}', rng.choice('ABC'),
+                    round(rng.uniform(10000, 200000), 2), f'Modelo sintético {i}')
+                   for i in range(escala.modelos_loja)]
+        _inserir(cursor, 'modelos_carro_loja', ('id', 'marca', 'modelo', 'classe', 'preco', 'descricao'), modelos)
+
+        # Equipes, carros, peças e pilotos
+        equipes, carros, pecas, pilotos = [], [], [], []
+        primeiro_carro, primeiro_piloto = {}, {}
+        for e in range(escala.equipes):
+            equipe_id = f'{prefixo}eq-{e:05d}'
+            equipes.append((equipe_id, f'{prefixo}Equipe {e:05d}', 'AB'[e % 2],
+                            round(rng.uniform(0, 50000), 2), 0.0, senha_hash))
+            for c in range(escala.carros_por_equipe):
+                carro_id = f'{prefixo}ca-{e:05d}-{c}'
+                modelo = rng.choice(modelos) if modelos else None
+                carros.append((carro_id, proximo_numero, modelo[1] if modelo else 'Nissan',
+                               modelo[2] if modelo else 'Silvia', equipe_id, modelo[0] if modelo else None,
+                               'ativo' if c == 0 else 'repouso'))
+                proximo_numero += 1
+                primeiro_carro.setdefault(equipe_id, carro_id)
+                # Instaladas: um de cada tipo, como um carro montado
+                for p in range(escala.pecas_por_carro):
+                    pecas.append(_peca(rng, f'{prefixo}pc-{e:05d}-{c}-{p}', carro_id, equipe_id,
+                                       por_tipo, TIPOS_PECA[p % len(TIPOS_PECA)], True))
+            for p in range(escala.pecas_armazem):
+                pecas.append(_peca(rng, f'{prefixo}pa-{e:05d}-{p}', None, equipe_id,
+                                   por_tipo, rng.choice(TIPOS_PECA), False))
+            for p in range(escala.pilotos_por_equipe):
+                piloto_id = f'{prefixo}pi-{e:05d}-{p}'
+                pilotos.append((piloto_id, f'{prefixo}Piloto {e:05d}-{p}', equipe_id, senha_hash))
+                primeiro_piloto.setdefault(equipe_id, piloto_id)
+        _inserir(cursor, 'equipes', ('id', 'nome', 'serie', 'doricoins', 'saldo_pix', 'senha'), equipes)
+        _inserir(cursor, 'carros', ('id', 'numero_carro', 'marca', 'modelo', 'equipe_id', 'modelo_id', 'status'),
+                 carros)
+        cursor.executemany('UPDATE equipes SET carro_id = %s WHERE id = %s',
+                           [(carro_id, equipe_id) for equipe_id, carro_id in primeiro_carro.items()])
+        _inserir(cursor, 'pecas', ('id', 'carro_id', 'peca_loja_id', 'nome', 'tipo', 'durabilidade_maxima',
+                                   'durabilidade_atual', 'preco', 'coeficiente_quebra', 'instalado', 'equipe_id'),
+                 pecas)
+        _inserir(cursor, 'pilotos', ('id', 'nome', 'equipe_id', 'senha'), pilotos)
+
+        # Solicitações de peças (fila do admin)
+        solicitacoes = []
+        for e, equipe in enumerate(equipes if pecas_loja else []):
+            for n in range(escala.solicitacoes_por_equipe):
+                peca = rng.choice(pecas_loja)
+                solicitacoes.append((f'{prefixo}sp-{e:05d}-{n}', equipe[0], peca[0], primeiro_carro.get(equipe[0]),
+                                     peca[2], 1, rng.choice(('pendente', 'pendente', 'instalado'))))
+        _inserir(cursor, 'solicitacoes_pecas', ('id', 'equipe_id', 'peca_id', 'carro_id', 'tipo_peca',
+                                                'quantidade', 'status'), solicitacoes)
+
+        # Histórico PIX (últimos 90 dias)
+        transacoes = []
+        for i in range(escala.transacoes_pix if equipes else 0):
+            equipe = rng.choice(equipes)
+            item = rng.choice(pecas_loja) if pecas_loja else None
+            valor = item[3] if item else round(rng.uniform(50, 5000), 2)
+            status = rng.choice(STATUS_PIX)
+            criacao = agora - timedelta(seconds=rng.randint(0, 90 * 86400))
+            transacoes.append((f'{prefixo}px-{i:06d}', f'{prefixo}mp-{i:06d}', equipe[0], equipe[1], 'peca',
+                               item[0] if item else None, item[1] if item else None, valor,
+                               round(valor * 0.01, 2), round(valor * 1.01, 2), status, criacao,
+                               criacao + timedelta(minutes=2) if status == 'aprovado' else None))
+        _inserir(cursor, 'transacoes_pix', ('id', 'mercado_pago_id', 'equipe_id', 'equipe_nome', 'tipo_item',
+                                            'item_id', 'item_nome', 'valor_item', 'valor_taxa', 'valor_total',
+                                            'status', 'data_criacao', 'data_confirmacao'), transacoes)
+
+        # Campeonatos: a primeira etapa de cada série é hoje; a da série A já começou
+        etapas, participacoes = [], []
+        etapa_em_andamento, participantes = '', []
+        for serie in 'AB':
+            campeonato_id = f'{prefixo}cp-{serie}'
+            cursor.execute('INSERT INTO campeonatos (id, nome, descricao, serie, numero_etapas, status) '
+                           'VALUES (%s, %s, %s, %s, %s, %s)',
+                           (campeonato_id, f'{prefixo}Campeonato {serie}', '', serie,
+                            escala.etapas_por_serie, 'ativo'))
+            for n in range(1, escala.etapas_por_serie + 1):
+                etapa_id = f'{prefixo}et-{serie}-{n}'
+                hora = '20:00:00' if serie == 'A' else '22:00:00'
+                status = 'em_andamento' if (serie, n) == ('A', 1) else 'agendada'
+                etapas.append((etapa_id, campeonato_id, n, f'{prefixo}Etapa {serie}{n}', '',
+                               hoje + timedelta(days=7 * (n - 1)), hora, serie, status))
+                if n != 1:
+                    continue
+                inscritas = [eq[0] for eq in equipes if eq[2] == serie]
+                for ordem, equipe_id in enumerate(inscritas, start=1):
+                    participacoes.append((f'{prefixo}pe-{serie}-{ordem:05d}', etapa_id, equipe_id,
+                                          primeiro_piloto.get(equipe_id), primeiro_carro.get(equipe_id),
+                                          'inscrita', 'equipe_completa', ordem))
+                if serie == 'A':
+                    etapa_em_andamento, participantes = etapa_id, inscritas
+        _inserir(cursor, 'etapas', ('id', 'campeonato_id', 'numero', 'nome', 'descricao', 'data_etapa',
+                                    'hora_etapa', 'serie', 'status'), etapas)
+        _inserir(cursor, 'participacoes_etapas', ('id', 'etapa_id', 'equipe_id', 'piloto_id', 'carro_id',
+                                                  'status', 'tipo_participacao', 'ordem_qualificacao'),
+                 participacoes)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    # Os caches em memória (calendário, classificação) não viram INSERTs diretos
+    calendario = getattr(db, 'calendario_etapas', None)
+    if calendario is not None:
+        calendario.invalidar()
+    return Semeado(prefixo, SENHA, [e[0] for e in equipes], etapa_em_andamento, participantes)
+
+
+def _peca(rng, peca_id, carro_id, equipe_id, por_tipo, tipo, instalado):
+    base = rng.choice(por_tipo[tipo]) if por_tipo.get(tipo) else (None, f'Peça {tipo}', tipo, 100.0)
+    durabilidade = round(rng.uniform(10, 100), 1)
+    return (peca_id, carro_id, base[0], base[1], base[2], 100.0, durabilidade, base[3],
+            round(rng.uniform(0.5, 2.0), 2), 1 if instalado else 0, equipe_id)
+
+
+def limpar(db, prefixo: str) -> None:
+    """Apaga tudo o que semear (e a carga) criou com este prefixo"""
+    padrao = prefixo + '%'
+    conn = db._get_conn()
+    cursor = conn.cursor()
+    try:
+        cursor.execute('DELETE FROM volta WHERE id_etapa LIKE %s', (padrao,))
+        for tabela in ('participacoes_etapas', 'etapas', 'campeonatos', 'transacoes_pix', 'pilotos_equipes',
+                       'solicitacoes_pecas'):
+            coluna = 'piloto_id' if tabela == 'pilotos_equipes' else 'id'
+            cursor.execute(f'DELETE FROM {tabela} WHERE {coluna} LIKE %s', (padrao,))
+        cursor.execute('UPDATE equipes SET carro_id = NULL WHERE id LIKE %s', (padrao,))
+        for tabela in ('pecas', 'pilotos', 'carros', 'equipes', 'pecas_loja_compatibilidade',
+                       'modelos_carro_loja', 'pecas_loja'):
+            coluna = 'peca_loja_id' if tabela == 'pecas_loja_compatibilidade' else 'id'
+            cursor.execute(f'DELETE FROM {tabela} WHERE {coluna} LIKE %s', (padrao,))
+        conn.commit()
+    finally:
+        conn.close()
+    calendario = getattr(db, 'calendario_etapas', None)
+    if calendario is not None:
+        calendario.invalidar()
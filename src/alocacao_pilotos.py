@@ -0,0 +1,103 @@
+"""
+Alocação automática de pilotos em equipes para uma etapa
+
+Planejamento puro (sem banco): recebe as participações da etapa e as candidaturas
+ativas já carregadas e devolve uma alocação sem conflitos.
+
+Regras:
+1. Candidaturas são atendidas por ordem de inscrição (data_inscricao): a primeira
+   candidatura de um piloto livre para uma equipe ainda sem piloto leva a vaga.
+2. Pilotos que sobraram (candidatos a equipes já preenchidas) formam a fila de
+   reserva, também por ordem de inscrição, e completam as equipes restantes na
+   ordem em que as equipes se inscreveram na etapa.
+3. Um piloto nunca é colocado em duas equipes, nem em uma equipe se já estiver
+   alocado em outra participação da etapa.
+"""
+from typing import Any, Dict, List
+
+ORIGEM_CANDIDATO = 'candidato'
+ORIGEM_RESERVA = 'reserva'
+
+# Só equipes com esse tipo de participação recebem piloto
+TIPO_PRECISA_PILOTO = 'precisa_piloto'
+
+
+def _chave_ordem(item: Dict[str, Any]):
+    # data_inscricao pode faltar em linhas antigas: vão para o fim, desempate pelo id
+    data = item.get('data_inscricao')
+    return (data is None, data or 0, str(item.get('id') or item.get('candidato_id') or ''))
+
+
+def planejar_alocacao(participacoes: List[Dict[str, Any]], candidaturas: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Calcula a alocação de pilotos para as equipes sem piloto de uma etapa
+
+    participacoes: linhas de participacoes_etapas (equipe_id, equipe_nome, piloto_id,
+        tipo_participacao, data_inscricao)
+    candidaturas: linhas ativas de candidatos_piloto_etapa (candidato_id, equipe_id,
+        piloto_id, piloto_nome, data_inscricao)
+    """
+    pilotos_ocupados = {p['piloto_id'] for p in participacoes if p.get('piloto_id')}
+
+    equipes_abertas = sorted(
+        (p for p in participacoes
+         if not p.get('piloto_id') and p.get('tipo_participacao') == TIPO_PRECISA_PILOTO),
+        key=_chave_ordem
+    )
+    nomes_equipes = {p['equipe_id']: p.get('equipe_nome') for p in equipes_abertas}
+    vagas = set(nomes_equipes)
+
+    alocacoes = []
+
+    def alocar(equipe_id, candidatura, origem):
+        vagas.discard(equipe_id)
+        pilotos_ocupados.add(candidatura['piloto_id'])
+        alocacoes.append({
+            'equipe_id': equipe_id,
+            'equipe_nome': nomes_equipes.get(equipe_id),
+            'piloto_id': candidatura['piloto_id'],
+            'piloto_nome': candidatura.get('piloto_nome'),
+            # Só a candidatura para a própria equipe é marcada como designada
+            'candidato_id': candidatura.get('candidato_id') if origem == ORIGEM_CANDIDATO else None,
+            'origem': origem,
+        })
+
+    candidaturas = sorted(candidaturas, key=_chave_ordem)
+
+    # 1) Candidaturas diretas, por ordem de inscrição
+    for candidatura in candidaturas:
+        if not vagas:
+            break
+        if candidatura['equipe_id'] in vagas and candidatura['piloto_id'] not in pilotos_ocupados:
+            alocar(candidatura['equipe_id'], candidatura, ORIGEM_CANDIDATO)
+
+    # 2) Reserva: pilotos livres (primeira inscrição de cada um) completam as vagas restantes
+    reservas = []
+    vistos = set()
+    for candidatura in candidaturas:
+        piloto_id = candidatura['piloto_id']
+        if piloto_id in pilotos_ocupados or piloto_id in vistos:
+            continue
+        vistos.add(piloto_id)
+        reservas.append(candidatura)
+
+    fila_reserva = iter(reservas)
+    for equipe in equipes_abertas:
+        if equipe['equipe_id'] not in vagas:
+            continue
+        candidatura = next(fila_reserva, None)
+        if candidatura is None:
+            break
+        alocar(equipe['equipe_id'], candidatura, ORIGEM_RESERVA)
+
+    alocados = {a['piloto_id'] for a in alocacoes}
+    return {
+        'alocacoes': alocacoes,
+        'equipes_sem_piloto': [
+            {'equipe_id': e['equipe_id'], 'equipe_nome': e.get('equipe_nome')}
+            for e in equipes_abertas if e['equipe_id'] in vagas
+        ],
+        'pilotos_sem_equipe': [
+            {'piloto_id': c['piloto_id'], 'piloto_nome': c.get('piloto_nome')}
+            for c in reservas if c['piloto_id'] not in alocados
+        ],
+    }
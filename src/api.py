@@ -11,9 +11,13 @@ from .loja import Loja, PecaMotor
 from .loja_carros import LojaCarros
 from .loja_pecas import LojaPecas
 from .oficina import Oficina
+from .log import obter_logger
+from .config import PREMIACAO_POR_ETAPA
 from datetime import datetime
 import uuid
 
+logger = obter_logger('api')
+
 
 class APIGranpix:
     """API Principal do Sistema GRANPIX"""
@@ -77,7 +81,7 @@ class APIGranpix:
             
             return True
         except Exception as e:
-            print(f"Erro ao apagar equipe: {e}")
+            logger.error('Erro ao apagar equipe: %s', e)
             return False
     
     # ============ PILOTOS ============
@@ -114,7 +118,8 @@ class APIGranpix:
     # ============ BATALHAS ============
     
     def registrar_batalha(self, piloto_a_id: str, piloto_b_id: str, 
-                         etapa: int = 1, auto_exportar: bool = True) -> Optional[Batalha]:
+                         etapa: int = 1, auto_exportar: bool = True,
+                         etapa_id: Optional[str] = None) -> Optional[Batalha]:
         """Registra e executa uma batalha entre dois pilotos
         
         Args:
@@ -122,6 +127,7 @@ class APIGranpix:
             piloto_b_id: ID do segundo piloto
             etapa: Número da etapa (padrão 1)
             auto_exportar: Se True, exporta dados das equipes para Excel automaticamente
+            etapa_id: ID da etapa; a vitória entra no placar da etapa (pontos do campeonato)
             
         Returns:
             Objeto Batalha com resultado
@@ -140,6 +146,7 @@ class APIGranpix:
         
         # Executar batalha (loop até vencedor) e obter resultados do D20
         batalha, resultados_d20 = self.batalhas.executar_batalha_completa(piloto_a, piloto_b, equipe_a, equipe_b, etapa)
+        batalha.etapa_id = etapa_id
         
         # Armazenar resultados do D20 para exibição posterior
         self.ultimos_resultados_d20 = resultados_d20
@@ -152,12 +159,79 @@ class APIGranpix:
         self.db.salvar_equipe(equipe_a)
         self.db.salvar_equipe(equipe_b)
         
+        # Prêmio do vencedor pelo extrato (salvar_equipe não grava doricoins)
+        vencedora = {
+            ResultadoBatalha.VITORIA_EQUIPE_A: equipe_a,
+            ResultadoBatalha.VITORIA_EQUIPE_B: equipe_b,
+        }.get(batalha.resultado)
+        if vencedora:
+            saldo = self.db.movimentar_saldo(vencedora.id, batalha.doricoins_vencedor, 'premio_batalha', batalha.id)
+            if saldo is not None:
+                vencedora.doricoins = saldo
+        
         # Exportar dados das equipes para Excel automaticamente
         if auto_exportar:
             self._exportar_apos_batalha(equipe_a, equipe_b)
         
         return batalha
     
+    @staticmethod
+    def id_batalha_etapa(etapa_id: str, partida_id) -> str:
+        """Id estável da batalha de uma partida da etapa (o mesmo a cada novo reporte)"""
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f'granpix:etapa:{etapa_id}:partida:{partida_id}'))
+
+    def registrar_batalha_etapa(self, etapa_id: str, partida_id, vencedora_id: str, perdedora_id: str) -> dict:
+        """Registra o resultado de uma partida disputada na etapa (chaveamento/Challonge)
+
+        A partida acontece no jogo; aqui só entra o resultado, sem simulação,
+        prêmio ou desgaste. A batalha é gravada com etapa_id, então a vitória
+        conta no placar da etapa (vitorias_etapa) usado ao finalizá-la. Reportar
+        de novo a mesma partida substitui o resultado anterior.
+        """
+        if vencedora_id == perdedora_id:
+            return {'sucesso': False, 'erro': 'Vencedora e perdedora devem ser equipes diferentes'}
+        etapa = self.db.obter_etapa_batalhas(etapa_id)
+        if not etapa:
+            return {'sucesso': False, 'erro': 'Etapa não encontrada'}
+        if etapa['pontos_atribuidos']:
+            return {'sucesso': False, 'erro': 'Etapa já finalizada: pontos atribuídos'}
+        pilotos = {p['equipe_id']: p['piloto_id'] for p in etapa['participantes']}
+        for equipe_id in (vencedora_id, perdedora_id):
+            if equipe_id not in pilotos:
+                return {'sucesso': False, 'erro': f'Equipe {equipe_id} não participa da etapa'}
+            if not pilotos[equipe_id]:
+                return {'sucesso': False, 'erro': f'Equipe {equipe_id} sem piloto na etapa'}
+
+        batalha = Batalha(
+            id=self.id_batalha_etapa(etapa_id, partida_id),
+            piloto_a_id=pilotos[vencedora_id],
+            piloto_b_id=pilotos[perdedora_id],
+            equipe_a_id=vencedora_id,
+            equipe_b_id=perdedora_id,
+            etapa=etapa['numero'],
+            data=datetime.now(),
+            resultado=ResultadoBatalha.VITORIA_EQUIPE_A,
+            doricoins_vencedor=0.0,
+            desgaste_base=0.0,
+            etapa_id=etapa_id,
+        )
+        with self.db.transacao() as tx:
+            self.db.desfazer_batalha_etapa(batalha.id)
+            if not self.db.salvar_batalha(batalha):
+                tx.abortar()
+                return {'sucesso': False, 'erro': 'Erro ao gravar a batalha'}
+        return {'sucesso': True, 'batalha_id': batalha.id}
+
+    def desfazer_batalha_etapa(self, etapa_id: str, partida_id) -> dict:
+        """Tira do placar da etapa o resultado de uma partida reaberta"""
+        etapa = self.db.obter_etapa_batalhas(etapa_id)
+        if not etapa:
+            return {'sucesso': False, 'erro': 'Etapa não encontrada'}
+        if etapa['pontos_atribuidos']:
+            return {'sucesso': False, 'erro': 'Etapa já finalizada: pontos atribuídos'}
+        desfeita = self.db.desfazer_batalha_etapa(self.id_batalha_etapa(etapa_id, partida_id))
+        return {'sucesso': True, 'desfeita': desfeita}
+
     def _exportar_apos_batalha(self, equipe_a: Equipe, equipe_b: Equipe):
         """Exporta dados das equipes após uma batalha
         
@@ -175,7 +249,7 @@ class APIGranpix:
                 self.exportador_excel.exportar_equipe_silencioso(equipe_b)
         except Exception as e:
             # Não interromper a batalha se exportação falhar
-            print(f"⚠️ Aviso: Erro ao exportar dados das equipes: {e}")
+            logger.error('⚠️ Aviso: Erro ao exportar dados das equipes: %s', e)
     
     
     def obter_relatorio_batalha(self, batalha: Batalha) -> str:
@@ -295,8 +369,7 @@ class APIGranpix:
     
     def obter_saldo_equipe(self, equipe_id: str) -> Optional[float]:
         """Obtém o saldo de doricoins de uma equipe"""
-        equipe = self.gerenciador.obter_equipe(equipe_id)
-        return equipe.doricoins if equipe else None
+        return self.db.obter_saldo_equipe(equipe_id)
     
     # ============ ETAPAS ============
     
@@ -308,14 +381,15 @@ class APIGranpix:
         etapa = self.etapas_ativas[numero_etapa]
         equipes = self.gerenciador.listar_equipes()
         
-        etapa.calcular_premio_equipes(equipes)
+        # Prêmio da etapa para cada equipe, numa transação só
+        with self.db.transacao():
+            for equipe in equipes:
+                saldo = self.db.movimentar_saldo(equipe.id, PREMIACAO_POR_ETAPA, 'premio_etapa', etapa.id)
+                if saldo is not None:
+                    equipe.doricoins = saldo
         etapa.completa = True
         etapa.data_fim = datetime.now()
         
-        # Salvar equipes com os prêmios atualizados
-        for equipe in equipes:
-            self.db.salvar_equipe(equipe)
-        
         return True
     
     # ============ RELATÓRIOS GERAIS ============
@@ -478,7 +552,7 @@ class APIGranpix:
             # Buscar variação e modelo
             variacao_dict = self.db.buscar_variacao_carro_por_id(variacao_id)
             if not variacao_dict:
-                print(f"[ERRO] Variação não encontrada: {variacao_id}")
+                logger.error('[ERRO] Variação não encontrada: %s', variacao_id)
                 return False
             
             modelo_id = variacao_dict['modelo_carro_loja_id']
@@ -498,7 +572,7 @@ class APIGranpix:
         
         modelo = self.loja_carros.obter_modelo(modelo_id)
         if not modelo:
-            print(f"[ERRO] Modelo não encontrado: {modelo_id}")
+            logger.error('[ERRO] Modelo não encontrado: %s', modelo_id)
             return False
         
         # Buscar o valor da variação para uso no débito
@@ -507,11 +581,11 @@ class APIGranpix:
             variacao_data = self.db.buscar_variacao_carro_por_id(variacao_id)
             if variacao_data:
                 preco = float(variacao_data.get('valor', modelo.preco))
-                print(f"[COMPRA] Usando preço da variação: R${preco}")
+                logger.debug('[COMPRA] Usando preço da variação: R$%s', preco)
         
-        # Verificar se a equipe tem doricoins suficientes
+        # Verificar se a equipe tem doricoins suficientes (o débito abaixo confere de novo, atomicamente)
         if equipe.doricoins < preco:
-            print(f"[ERRO] Saldo insuficiente: {equipe.doricoins} < {preco}")
+            logger.error('[ERRO] Saldo insuficiente: %s < %s', equipe.doricoins, preco)
             return False
         
         # ❌ REMOVIDO: Não criar peças padrão quando compra carro
@@ -544,13 +618,6 @@ class APIGranpix:
             status='repouso'  # Carros comprados começam em repouso
         )
         
-        # Definir os IDs das peças no novo carro
-        novo_carro.motor_id = motor.id if motor else ''
-        novo_carro.cambio_id = cambio.id if cambio else ''
-        novo_carro.kit_angulo_id = kit_angulo.id if kit_angulo else ''
-        novo_carro.suspensao_id = suspensao.id if suspensao else ''
-        novo_carro.diferencial_id = diferenciais[0].id if diferenciais else ''
-        
         # Preencher pecas_instaladas apenas com as peças que existem em pecas_loja
         novo_carro.pecas_instaladas = []
         
@@ -569,7 +636,6 @@ class APIGranpix:
         #     novo_carro.pecas_instaladas.append({'id': diferencial.id, 'nome': diferencial.nome, 'tipo': diferencial.tipo})
         
         # Descontar doricoins baseado no valor da variação
-        equipe.doricoins -= float(preco)
         
         # Adicionar novo carro à frota da equipe (comentado para evitar cache issues)
         # if not hasattr(equipe, 'carros'):
@@ -580,9 +646,18 @@ class APIGranpix:
         # if not equipe.carro:
         #     equipe.carro = novo_carro
         
-        # Salvar no banco de dados com variacao_carro_id
-        self.db.salvar_carro(novo_carro, equipe.id, variacao_carro_id=variacao_id)
-        self.db.salvar_equipe(equipe)
+        # Débito e carro na mesma transação (com variacao_carro_id)
+        with self.db.transacao() as tx:
+            saldo = self.db.movimentar_saldo(equipe.id, -float(preco), 'compra_carro', novo_carro.id)
+            if saldo is None:
+                tx.abortar()
+                logger.error('[ERRO] Débito recusado (saldo insuficiente) para equipe %s', equipe.id)
+                return False
+            if not self.db.salvar_carro(novo_carro, equipe.id, variacao_carro_id=variacao_id):
+                tx.abortar()
+                logger.error('[ERRO] Falha ao gravar o carro comprado; débito desfeito (equipe %s)', equipe.id)
+                return False
+            equipe.doricoins = saldo
         
         return True
     
@@ -601,7 +676,7 @@ class APIGranpix:
             self.db.salvar_modelo_loja(novo_modelo)
             return True
         except Exception as e:
-            print(f"Erro ao cadastrar carro: {e}")
+            logger.error('Erro ao cadastrar carro: %s', e)
             return False
     
     def obter_carros_loja(self) -> List:
@@ -621,7 +696,7 @@ class APIGranpix:
             self.db.salvar_peca_loja(nova_peca)
             return True
         except Exception as e:
-            print(f"Erro ao cadastrar peca: {e}")
+            logger.error('Erro ao cadastrar peca: %s', e)
             return False
     
     def obter_pecas_loja(self) -> List:
@@ -646,12 +721,9 @@ class APIGranpix:
                 return False
             
             if equipe.doricoins < peca.preco:
-                print(f"Doricoins insuficientes! Necessario {peca.preco:.2f}, tem {equipe.doricoins:.2f}")
+                logger.debug('Doricoins insuficientes! Necessario %.2f, tem %.2f', peca.preco, equipe.doricoins)
                 return False
             
-            # Descontar doricoins
-            equipe.doricoins -= peca.preco
-            
             # Adicionar peca ao carro da equipe
             carro = equipe.carro
             if peca.tipo == "motor":
@@ -693,12 +765,21 @@ class APIGranpix:
             }
             carro.pecas_instaladas.append(peca_info)
             
-            # Salvar alterações
-            self.db.salvar_carro(carro)
-            self.db.salvar_equipe(equipe)
+            # Débito e peça na mesma transação
+            with self.db.transacao() as tx:
+                saldo = self.db.movimentar_saldo(equipe.id, -peca.preco, 'compra_peca', peca.id)
+                if saldo is None:
+                    tx.abortar()
+                    logger.debug('Débito recusado (saldo insuficiente) para equipe %s', equipe.id)
+                    return False
+                if not self.db.salvar_carro(carro):
+                    tx.abortar()
+                    logger.error('Falha ao gravar a peça comprada; débito desfeito (equipe %s)', equipe.id)
+                    return False
+                equipe.doricoins = saldo
             return True
         except Exception as e:
-            print(f"Erro ao comprar peca: {e}")
+            logger.error('Erro ao comprar peca: %s', e)
             return False
     
     # ============ ETAPAS ============
@@ -727,10 +808,7 @@ class APIGranpix:
         
         # Se presente, adiciona 2000 doricoins
         if presente:
-            equipe = self.gerenciador.obter_equipe(equipe_id)
-            if equipe:
-                equipe.adicionar_doricoins(2000.0)
-                self.db.salvar_equipe(equipe)
+            self.db.movimentar_saldo(equipe_id, 2000.0, 'presenca_etapa', etapa.id)
         
         return True
     
@@ -745,7 +823,7 @@ class APIGranpix:
             etapa.registrar_atributos(equipe_id, linha, angulo, estilo)
             return True
         except ValueError as e:
-            print(f"Erro ao registrar atributos: {e}")
+            logger.error('Erro ao registrar atributos: %s', e)
             return False
     
     def gerar_ranking_etapa(self, numero_etapa: int) -> List[str]:
@@ -918,17 +996,14 @@ class APIGranpix:
         etapa.rodadas[rodada]["vencedores"].append(vencedor_id)
         
         # Adicionar prêmio
-        equipe = self.gerenciador.obter_equipe(vencedor_id)
-        if equipe:
-            premio = {
-                "top32": 1000,
-                "top16": 1000,
-                "top8": 1000,
-                "top4": 1000,
-                "final": 1000
-            }.get(rodada, 1000)
-            equipe.adicionar_doricoins(premio)
-            self.db.salvar_equipe(equipe)
+        premio = {
+            "top32": 1000,
+            "top16": 1000,
+            "top8": 1000,
+            "top4": 1000,
+            "final": 1000
+        }.get(rodada, 1000)
+        self.db.movimentar_saldo(vencedor_id, premio, f'premio_{rodada}', etapa.id)
         
         return True
     
@@ -1058,15 +1133,15 @@ class APIGranpix:
         """
         equipe = self.gerenciador.obter_equipe(equipe_id)
         if not equipe:
-            print(f"❌ Equipe com ID '{equipe_id}' não encontrada")
+            logger.error("❌ Equipe com ID '%s' não encontrada", equipe_id)
             return False
         
         try:
             caminho = self.exportador_excel.exportar_equipe(equipe)
-            print(f"✓ Equipe '{equipe.nome}' exportada para: {caminho}")
+            logger.info("✓ Equipe '%s' exportada para: %s", equipe.nome, caminho)
             return True
         except Exception as e:
-            print(f"❌ Erro ao exportar equipe: {e}")
+            logger.error('❌ Erro ao exportar equipe: %s', e)
             return False
     
     def exportar_todas_equipes_excel(self) -> List[str]:
@@ -1077,13 +1152,13 @@ class APIGranpix:
         """
         equipes = self.gerenciador.listar_equipes()
         if not equipes:
-            print("❌ Nenhuma equipe cadastrada para exportar")
+            logger.error('❌ Nenhuma equipe cadastrada para exportar')
             return []
         
-        print(f"\n📊 Exportando {len(equipes)} equipe(s)...\n")
+        logger.debug('📊 Exportando %s equipe(s)...', len(equipes))
         arquivos = self.exportador_excel.exportar_todas_equipes(equipes)
         
-        print(f"\n✓ {len(arquivos)} arquivo(s) gerado(s) com sucesso!")
+        logger.info('✓ %s arquivo(s) gerado(s) com sucesso!', len(arquivos))
         return arquivos
     
     # ============ ONEDRIVE ============
@@ -1119,13 +1194,13 @@ class APIGranpix:
         if not self.auto_export_habilitado and self.auto_export_monitor:
             self.auto_export_monitor.iniciar()
             self.auto_export_habilitado = True
-            print("✅ Auto-export ATIVADO - Excel será atualizado em tempo real!")
+            logger.info('✅ Auto-export ATIVADO - Excel será atualizado em tempo real!')
             return True
         elif self.auto_export_habilitado:
-            print("⚠️ Auto-export já está ativado")
+            logger.warning('⚠️ Auto-export já está ativado')
             return False
         else:
-            print("❌ Auto-export não foi inicializado")
+            logger.error('❌ Auto-export não foi inicializado')
             return False
     
     def desativar_auto_export(self) -> bool:
@@ -1137,13 +1212,13 @@ class APIGranpix:
         if self.auto_export_habilitado and self.auto_export_monitor:
             self.auto_export_monitor.parar()
             self.auto_export_habilitado = False
-            print("⛔ Auto-export DESATIVADO")
+            logger.debug('⛔ Auto-export DESATIVADO')
             return True
         elif not self.auto_export_habilitado:
-            print("⚠️ Auto-export já está desativado")
+            logger.warning('⚠️ Auto-export já está desativado')
             return False
         else:
-            print("❌ Auto-export não foi inicializado")
+            logger.error('❌ Auto-export não foi inicializado')
             return False
     
     def obter_status_auto_export(self) -> dict:
@@ -1160,27 +1235,30 @@ class APIGranpix:
             'erro': 'Auto-export não foi inicializado'
         }
     
-    def exportar_todas_equipes_agora(self, forcar: bool = False) -> int:
+    def exportar_todas_equipes_agora(self, forcar: bool = False, progresso=None) -> int:
         """Exporta todas as equipes para Excel imediatamente
         
         Args:
             forcar: Se True, ignora o cooldown entre exports
+            progresso: progresso(atual, total, mensagem) a cada equipe (jobs do admin)
             
         Returns:
             Número de equipes exportadas com sucesso
         """
         if self.auto_export_monitor:
-            return self.auto_export_monitor.exportar_todas_agora(forcar=forcar)
+            return self.auto_export_monitor.exportar_todas_agora(forcar=forcar, progresso=progresso)
         
         # Fallback manual
         equipes = self.gerenciador.listar_equipes()
         exportadas = 0
-        for equipe in equipes:
+        for i, equipe in enumerate(equipes, 1):
             try:
                 self.exportador_excel.exportar_equipe_silencioso(equipe)
                 exportadas += 1
             except Exception as e:
-                print(f"Erro ao exportar {equipe.nome}: {e}")
+                logger.error('Erro ao exportar %s: %s', equipe.nome, e)
+            if progresso:
+                progresso(i, len(equipes), equipe.nome)
         
         return exportadas
     
@@ -1194,7 +1272,7 @@ class APIGranpix:
         """
         if self.monitor_compras and not self.monitor_compras.rodando:
             self.monitor_compras.iniciar()
-            print("✅ Monitor de compras ATIVADO")
+            logger.info('✅ Monitor de compras ATIVADO')
             return True
         return False
     
@@ -1206,7 +1284,7 @@ class APIGranpix:
         """
         if self.monitor_compras and self.monitor_compras.rodando:
             self.monitor_compras.parar()
-            print("⛔ Monitor de compras DESATIVADO")
+            logger.debug('⛔ Monitor de compras DESATIVADO')
             return True
         return False
     
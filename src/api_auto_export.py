@@ -87,10 +87,10 @@ def adicionar_metodos_auto_export(api):
         return piloto
     
     def registrar_batalha_auto(self, piloto_a_id: str, piloto_b_id: str, 
-                              etapa: int = 1) -> bool:
+                              etapa: int = 1, etapa_id: str = None) -> bool:
         """Registra batalha e dispara auto-export para ambas as equipes"""
         # Registrar batalha sem auto-export manual
-        batalha = self.registrar_batalha(piloto_a_id, piloto_b_id, etapa, auto_exportar=False)
+        batalha = self.registrar_batalha(piloto_a_id, piloto_b_id, etapa, auto_exportar=False, etapa_id=etapa_id)
         
         if batalha and self.auto_export_monitor:
             # Registrar mudanças para ambas as equipes
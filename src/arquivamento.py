@@ -0,0 +1,80 @@
+"""
+Arquivamento quente/frio de solicitações, transações PIX e comissões
+
+Linhas finalizadas há mais que a retenção saem da tabela do dia a dia para
+<tabela>_historico (mesmas colunas + arquivado_em), em lotes: cada lote copia e
+apaga as mesmas ids numa transação. As consultas do dia a dia (garagem, painel,
+contadores do admin) leem só as linhas vivas; quem quer o passado consulta o
+arquivo explicitamente (histórico de compras, listagens admin com ?arquivo=1,
+resumo de comissões).
+
+Retenção por grupo, em dias:
+    solicitacoes   solicitações de peças/carros finalizadas (antes: filtro de 72h na consulta)
+    financeiro     transações PIX finalizadas e comissões
+
+DatabaseManager.arquivar_finalizados executa; o job 'arquivamento' (app.py) o
+agenda. Nada aqui acessa o banco.
+"""
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple
+
+from .solicitacoes_lote import STATUS_PECA_FINAIS
+
+GRUPOS = ('solicitacoes', 'financeiro')
+RETENCAO_PADRAO_DIAS = {'solicitacoes': 3, 'financeiro': 90}
+# Linhas por lote (uma transação por lote)
+LOTE_PADRAO = 500
+
+
+@dataclass(frozen=True)
+class PoliticaArquivamento:
+    """Quais linhas de uma tabela podem ir para o arquivo"""
+    tabela: str
+    coluna_data: str                   # idade da linha (última mudança de status)
+    status_finais: Tuple[str, ...]     # vazio: toda linha já nasce final
+    grupo: str
+
+    @property
+    def tabela_historico(self) -> str:
+        return f'{self.tabela}_historico'
+
+
+POLITICAS = {
+    politica.tabela: politica for politica in (
+        PoliticaArquivamento('solicitacoes_pecas', 'data_atualizacao', STATUS_PECA_FINAIS, 'solicitacoes'),
+        PoliticaArquivamento('solicitacoes_carros', 'data_atualizacao', ('aprovado', 'aprovada', 'reprovado'),
+                             'solicitacoes'),
+        PoliticaArquivamento('transacoes_pix', 'data_criacao', ('aprovado', 'recusado', 'cancelado', 'expirado'),
+                             'financeiro'),
+        PoliticaArquivamento('comissoes', 'data_transacao', (), 'financeiro'),
+    )
+}
+
+
+def ler_retencao(valores: Optional[Mapping[str, object]] = None) -> Dict[str, int]:
+    """Retenção por grupo (padrão + valores informados); ValueError se inválida"""
+    retencao = dict(RETENCAO_PADRAO_DIAS)
+    for grupo, dias in (valores or {}).items():
+        if grupo not in GRUPOS:
+            raise ValueError(f'Grupo de retenção desconhecido: {grupo} (válidos: {", ".join(GRUPOS)})')
+        try:
+            dias = int(dias)
+        except (TypeError, ValueError):
+            raise ValueError(f'Retenção inválida para {grupo}: {dias!r}')
+        if dias < 0:
+            raise ValueError(f'Retenção de {grupo} não pode ser negativa')
+        retencao[grupo] = dias
+    return retencao
+
+
+def consulta_candidatas(politica: PoliticaArquivamento, dias: int, lote: int) -> Tuple[str, list]:
+    """SELECT das ids do próximo lote (mais antigas primeiro, pelo índice status + data)"""
+    condicoes, params = [], []
+    if politica.status_finais:
+        condicoes.append(f"status IN ({', '.join(['%s'] * len(politica.status_finais))})")
+        params.extend(politica.status_finais)
+    condicoes.append(f'{politica.coluna_data} < NOW() - INTERVAL %s DAY')
+    params.extend([int(dias), int(lote)])
+    sql = (f'SELECT id FROM {politica.tabela} WHERE {" AND ".join(condicoes)} '
+           f'ORDER BY {politica.coluna_data} LIMIT %s')
+    return sql, params
@@ -229,12 +229,13 @@ class AutoExportMonitor:
                 logger.error(f"Erro no loop de monitoramento: {e}")
                 time.sleep(1)
     
-    def exportar_todas_agora(self, forcar: bool = False) -> int:
+    def exportar_todas_agora(self, forcar: bool = False, progresso: Optional[Callable] = None) -> int:
         """
         Exporta todas as equipes imediatamente
         
         Args:
             forcar: Se True, ignora o cooldown
+            progresso: progresso(atual, total, mensagem) a cada equipe (jobs do admin)
             
         Returns:
             Número de equipes exportadas
@@ -242,9 +243,11 @@ class AutoExportMonitor:
         equipes = self.gerenciador.listar_equipes()
         exportadas = 0
         
-        for equipe in equipes:
+        for i, equipe in enumerate(equipes, 1):
             if self.exportar_equipe(equipe.id, forcar=forcar):
                 exportadas += 1
+            if progresso:
+                progresso(i, len(equipes), equipe.nome)
         
         return exportadas
     
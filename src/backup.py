@@ -0,0 +1,242 @@
+"""
+Backup em NDJSON compactado (gzip), por tabela e em blocos, com manifesto
+
+Layout de um backup:
+
+    data/backups/20260301_120000/
+        manifesto.json
+        equipes.0000.ndjson.gz
+        transacoes_pix.0000.ndjson.gz
+        transacoes_pix.0001.ndjson.gz
+        ...
+
+Cada linha de um bloco é um objeto JSON (uma linha da tabela). As linhas chegam
+de um iterador (cursor server-side, ver DatabaseManager.iterar_consulta) e vão
+direto para o arquivo, então a memória não cresce com o tamanho da tabela; a
+restauração lê os blocos linha a linha e insere em lotes.
+
+Backup incremental: cada tabela tem um modo, gravado no manifesto:
+
+- 'atualizacao': data_atualizacao (ON UPDATE CURRENT_TIMESTAMP) >= marca do
+  backup anterior; pega linhas novas e alteradas;
+- 'criacao': tabelas só de inserção (MARCAS_CRIACAO), pela coluna de criação;
+- 'completo': as demais (mutáveis sem data_atualizacao) saem inteiras sempre;
+  uma marca de criação perderia os UPDATEs.
+
+A restauração aplica o completo e depois os incrementais em ordem (upsert).
+Linhas apagadas não aparecem no incremental.
+
+Este módulo não conhece o banco: recebe funções de leitura/escrita.
+"""
+import base64
+import gzip
+import json
+import os
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+ARQUIVO_MANIFESTO = 'manifesto.json'
+VERSAO_FORMATO = 1
+LINHAS_POR_BLOCO_PADRAO = 50_000
+TAMANHO_LOTE_PADRAO = 500
+MODO_COMPLETO = 'completo'
+MODO_ATUALIZACAO = 'atualizacao'
+MODO_CRIACAO = 'criacao'
+COLUNA_ATUALIZACAO = 'data_atualizacao'
+# Tabelas só de inserção (linhas não mudam depois de gravadas) -> coluna de criação
+MARCAS_CRIACAO = {
+    'batalhas': 'data',
+    'movimentacoes_saldo': 'data_movimentacao',
+    'comissoes': 'data_transacao',
+}
+
+
+def _serializar(valor: Any) -> Any:
+    if isinstance(valor, datetime):
+        return valor.strftime('%Y-%m-%d %H:%M:%S.%f') if valor.microsecond else valor.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, timedelta):
+        # Coluna TIME (PyMySQL devolve timedelta)
+        segundos = int(valor.total_seconds())
+        sinal = '-' if segundos < 0 else ''
+        segundos = abs(segundos)
+        return f'{sinal}{segundos // 3600:02d}:{segundos % 3600 // 60:02d}:{segundos % 60:02d}'
+    if isinstance(valor, Decimal):
+        return str(valor)
+    if isinstance(valor, (bytes, bytearray)):
+        return {'$b64': base64.b64encode(bytes(valor)).decode('ascii')}
+    raise TypeError(f'Tipo não serializável no backup: {type(valor).__name__}')
+
+
+def _desserializar(valor: Any) -> Any:
+    if isinstance(valor, dict) and set(valor) == {'$b64'}:
+        return base64.b64decode(valor['$b64'])
+    return valor
+
+
+def escolher_coluna_marca(tabela: str, colunas: Iterable[str]) -> Optional[str]:
+    """Coluna de marca do incremental da tabela; None = exportar sempre completa"""
+    colunas = set(colunas)
+    if COLUNA_ATUALIZACAO in colunas:
+        return COLUNA_ATUALIZACAO
+    if MARCAS_CRIACAO.get(tabela) in colunas:
+        return MARCAS_CRIACAO[tabela]
+    return None
+
+
+def modo_backup(coluna_marca: Optional[str]) -> str:
+    if not coluna_marca:
+        return MODO_COMPLETO
+    return MODO_ATUALIZACAO if coluna_marca == COLUNA_ATUALIZACAO else MODO_CRIACAO
+
+
+def escrever_tabela(
+    pasta: Path,
+    tabela: str,
+    linhas: Iterable[Dict[str, Any]],
+    coluna_marca: Optional[str] = None,
+    linhas_por_bloco: int = LINHAS_POR_BLOCO_PADRAO,
+) -> Dict[str, Any]:
+    """Grava as linhas em blocos gzip; retorna a entrada da tabela no manifesto"""
+    blocos: List[Dict[str, Any]] = []
+    colunas: Optional[List[str]] = None
+    marca = None
+    total = 0
+    arquivo = None
+    try:
+        for linha in linhas:
+            if arquivo is None or blocos[-1]['linhas'] >= linhas_por_bloco:
+                if arquivo is not None:
+                    arquivo.close()
+                nome = f'{tabela}.{len(blocos):04d}.ndjson.gz'
+                arquivo = gzip.open(pasta / nome, 'wt', encoding='utf-8')
+                blocos.append({'arquivo': nome, 'linhas': 0})
+            if colunas is None:
+                colunas = list(linha.keys())
+            arquivo.write(json.dumps(linha, default=_serializar, ensure_ascii=False, separators=(',', ':')))
+            arquivo.write('\n')
+            blocos[-1]['linhas'] += 1
+            total += 1
+            if coluna_marca and linha.get(coluna_marca) is not None:
+                valor = linha[coluna_marca]
+                if marca is None or valor > marca:
+                    marca = valor
+    finally:
+        if arquivo is not None:
+            arquivo.close()
+    return {
+        'linhas': total,
+        'colunas': colunas or [],
+        'blocos': blocos,
+        'coluna_marca': coluna_marca,
+        'marca': _serializar(marca) if marca is not None else None,
+    }
+
+
+def gerar_backup(
+    pasta: str,
+    tabelas: Dict[str, Optional[str]],
+    iterar_tabela: Callable[[str, Optional[str], Optional[str]], Iterable[Dict[str, Any]]],
+    base: Optional[Dict[str, Any]] = None,
+    linhas_por_bloco: int = LINHAS_POR_BLOCO_PADRAO,
+    progresso: Optional[Callable] = None,
+) -> Dict[str, Any]:
+    """Exporta as tabelas para pasta e grava o manifesto
+
+    tabelas: nome -> coluna de marca (ou None, ver escolher_coluna_marca).
+    iterar_tabela(tabela, coluna, desde) devolve as linhas (todas se desde for
+    None). base: manifesto do backup anterior para o modo incremental; a marca
+    dele só vale se a tabela usava a mesma coluna (senão sai completa).
+    """
+    destino = Path(pasta)
+    destino.mkdir(parents=True, exist_ok=True)
+    marcas_base = {}
+    if base:
+        marcas_base = {nome: (info['coluna_marca'], info.get('marca')) for nome, info in base['tabelas'].items()
+                       if info.get('coluna_marca')}
+    manifesto = {
+        'versao': VERSAO_FORMATO,
+        'data': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'incremental_de': base.get('pasta') if base else None,
+        'pasta': str(destino),
+        'tabelas': {},
+    }
+    for i, (tabela, coluna_marca) in enumerate(tabelas.items(), 1):
+        coluna_base, desde = marcas_base.get(tabela, (None, None))
+        if not coluna_marca or coluna_base != coluna_marca:
+            desde = None
+        entrada = escrever_tabela(destino, tabela, iterar_tabela(tabela, coluna_marca, desde),
+                                  coluna_marca, linhas_por_bloco)
+        entrada['modo'] = modo_backup(coluna_marca)
+        entrada['desde'] = desde
+        if entrada['marca'] is None and desde is not None:
+            # Nada novo: mantém a marca anterior para o próximo incremental
+            entrada['marca'] = desde
+        manifesto['tabelas'][tabela] = entrada
+        if progresso:
+            progresso(i, len(tabelas), tabela)
+    with open(destino / ARQUIVO_MANIFESTO, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+    return manifesto
+
+
+def ler_manifesto(pasta: str) -> Dict[str, Any]:
+    with open(Path(pasta) / ARQUIVO_MANIFESTO, encoding='utf-8') as f:
+        manifesto = json.load(f)
+    manifesto['pasta'] = str(pasta)
+    return manifesto
+
+
+def ultimo_backup(raiz: str) -> Optional[str]:
+    """Pasta do backup mais recente com manifesto em raiz (nomes ordenáveis por data)"""
+    if not os.path.isdir(raiz):
+        return None
+    pastas = sorted(p for p in os.listdir(raiz) if os.path.isfile(os.path.join(raiz, p, ARQUIVO_MANIFESTO)))
+    return os.path.join(raiz, pastas[-1]) if pastas else None
+
+
+def iterar_linhas(pasta: str, entrada: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    for bloco in entrada['blocos']:
+        with gzip.open(Path(pasta) / bloco['arquivo'], 'rt', encoding='utf-8') as f:
+            for texto in f:
+                if texto.strip():
+                    yield json.loads(texto)
+
+
+def iterar_lotes(pasta: str, entrada: Dict[str, Any],
+                 tamanho_lote: int = TAMANHO_LOTE_PADRAO) -> Iterator[List[Tuple]]:
+    """Linhas da tabela como tuplas na ordem de entrada['colunas'], em lotes"""
+    colunas = entrada['colunas']
+    lote: List[Tuple] = []
+    for linha in iterar_linhas(pasta, entrada):
+        lote.append(tuple(_desserializar(linha.get(c)) for c in colunas))
+        if len(lote) >= tamanho_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def restaurar_backup(
+    pasta: str,
+    inserir_lote: Callable[[str, List[str], List[Tuple]], None],
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO,
+    tabelas: Optional[Iterable[str]] = None,
+    progresso: Optional[Callable] = None,
+) -> Dict[str, int]:
+    """Aplica um backup (completo ou incremental); retorna linhas restauradas por tabela"""
+    manifesto = ler_manifesto(pasta)
+    selecionadas = [t for t in manifesto['tabelas'] if tabelas is None or t in set(tabelas)]
+    restauradas: Dict[str, int] = {}
+    for i, tabela in enumerate(selecionadas, 1):
+        entrada = manifesto['tabelas'][tabela]
+        restauradas[tabela] = 0
+        for lote in iterar_lotes(pasta, entrada, tamanho_lote):
+            inserir_lote(tabela, entrada['colunas'], lote)
+            restauradas[tabela] += len(lote)
+        if progresso:
+            progresso(i, len(selecionadas), tabela)
+    return restauradas
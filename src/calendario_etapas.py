@@ -0,0 +1,97 @@
+"""
+Calendário de etapas em memória (etapa de hoje, em andamento e próxima por série)
+
+/api/admin/etapa-hoje, /api/etapa-em-andamento e /api/proxima-etapa/<serie> são
+consultados a cada poucos segundos por todos os clientes (sistema_notificacao.js).
+O calendário é montado com uma carga e servido de memória até a próxima
+meia-noite local ou até `ttl` segundos, o que vier antes. Escritas em etapas
+neste processo chamam invalidar(); o ttl limita o atraso visto pelos outros
+workers.
+
+O calendário não conhece o banco: recebe a função de carga (ver
+DatabaseManager.carregar_calendario_etapas).
+"""
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+# Segundos até recarregar mesmo sem invalidação (mudanças feitas por outros workers)
+TTL_PADRAO = 30.0
+
+Linha = Dict[str, Any]
+
+
+def proxima_meia_noite(agora: datetime) -> datetime:
+    return datetime.combine(agora.date() + timedelta(days=1), datetime.min.time())
+
+
+class CalendarioEtapas:
+    """Snapshot de etapas do dia, em andamento e próximas, expirando à meia-noite"""
+
+    def __init__(
+        self,
+        carregar: Callable[[date], Dict[str, List[Linha]]],
+        ttl: float = TTL_PADRAO,
+        agora: Callable[[], datetime] = datetime.now,
+    ):
+        """carregar(hoje) -> {'hoje': [...], 'em_andamento': [...], 'agendadas': [...]}
+
+        hoje: etapas de hoje por hora_etapa; em_andamento: por data_etapa DESC;
+        agendadas: a partir de hoje por data_etapa, hora_etapa (linhas com 'serie').
+        """
+        self._carregar = carregar
+        self.ttl = ttl
+        self._agora = agora
+        self._lock = threading.Lock()
+        self._dados: Optional[Dict[str, Any]] = None
+        self._expira_em: Optional[datetime] = None
+
+    def _snapshot(self) -> Dict[str, Any]:
+        dados, expira_em = self._dados, self._expira_em
+        if dados is not None and self._agora() < expira_em:
+            return dados
+        with self._lock:
+            agora = self._agora()
+            if self._dados is None or agora >= self._expira_em:
+                self._dados = self._montar(self._carregar(agora.date()))
+                self._expira_em = min(proxima_meia_noite(agora), agora + timedelta(seconds=self.ttl))
+            return self._dados
+
+    @staticmethod
+    def _montar(linhas: Dict[str, List[Linha]]) -> Dict[str, Any]:
+        em_andamento = linhas.get('em_andamento') or []
+        proximas: Dict[str, Linha] = {}
+        for etapa in linhas.get('agendadas') or []:
+            proximas.setdefault(etapa.get('serie'), etapa)
+        andamento_por_serie: Dict[str, Linha] = {}
+        for etapa in em_andamento:
+            andamento_por_serie.setdefault(etapa.get('serie'), etapa)
+        return {
+            'hoje': list(linhas.get('hoje') or []),
+            'em_andamento': em_andamento[0] if em_andamento else None,
+            'em_andamento_por_serie': andamento_por_serie,
+            'proximas': proximas,
+        }
+
+    def etapa_hoje(self) -> Optional[Linha]:
+        """Primeira etapa de hoje (menor hora_etapa)"""
+        hoje = self._snapshot()['hoje']
+        return hoje[0] if hoje else None
+
+    def etapas_hoje(self) -> List[Linha]:
+        return self._snapshot()['hoje']
+
+    def em_andamento(self, serie: Optional[str] = None) -> Optional[Linha]:
+        """Etapa em andamento mais recente (da série, se informada)"""
+        dados = self._snapshot()
+        if serie is None:
+            return dados['em_andamento']
+        return dados['em_andamento_por_serie'].get(serie)
+
+    def proxima(self, serie: str) -> Optional[Linha]:
+        """Próxima etapa agendada da série (hoje ou depois)"""
+        return self._snapshot()['proximas'].get(serie)
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._dados = None
@@ -0,0 +1,116 @@
+"""
+Compatibilidade de peças da loja com modelos de carro
+
+pecas_loja.compatibilidade aparece em vários formatos ao longo do histórico do banco:
+    '{"compatibilidades": ["<modelo_id>", ...]}'  (atual)
+    '{"compatibilidades": ["universal"]}'
+    'universal' ou 'id1, id2'                     (antigo)
+    NULL                                          (universal)
+
+O campo é normalizado na tabela pecas_loja_compatibilidade (peca_loja_id, modelo_id),
+com modelo_id = 'universal' para peças universais, e carregado em memória como
+IndiceCompatibilidade: modelo_id -> peças compatíveis, mais o conjunto universal.
+"""
+import json
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+UNIVERSAL = 'universal'
+
+
+def listar_modelos_compativeis(valor: Any) -> List[str]:
+    """Lista os modelo_id do campo compatibilidade como gravados ([] = universal)"""
+    if valor is None or valor == '':
+        return []
+    itens = None
+    try:
+        if isinstance(valor, dict):
+            itens = valor.get('compatibilidades', [UNIVERSAL])
+        elif isinstance(valor, str) and valor.strip().startswith('{'):
+            itens = json.loads(valor).get('compatibilidades', [UNIVERSAL])
+        elif isinstance(valor, str):
+            itens = [item.strip() for item in valor.split(',') if item.strip()]
+    except (ValueError, AttributeError):
+        return []
+    modelos = []
+    for item in itens or []:
+        item = str(item).strip()
+        if item and item not in modelos:
+            modelos.append(item)
+    if any(m.lower() == UNIVERSAL for m in modelos):
+        return []
+    return modelos
+
+
+def interpretar_compatibilidade(valor: Any) -> Optional[FrozenSet[str]]:
+    """Converte o campo compatibilidade em um conjunto de modelo_id (minúsculos)
+
+    Retorna None quando a peça é universal (compatível com qualquer carro).
+    """
+    modelos = listar_modelos_compativeis(valor)
+    return frozenset(m.lower() for m in modelos) if modelos else None
+
+
+def linhas_compatibilidade(peca_id: str, valor: Any) -> List[Tuple[str, str]]:
+    """Linhas (peca_loja_id, modelo_id) da tabela normalizada para uma peça"""
+    modelos = listar_modelos_compativeis(valor)
+    return [(peca_id, modelo) for modelo in modelos] if modelos else [(peca_id, UNIVERSAL)]
+
+
+def peca_compativel(compatibilidades: Optional[FrozenSet[str]], modelo_id: Optional[str]) -> bool:
+    """Verifica o resultado de interpretar_compatibilidade contra o modelo do carro"""
+    if compatibilidades is None:
+        return True
+    return bool(modelo_id) and str(modelo_id).lower() in compatibilidades
+
+
+class IndiceCompatibilidade:
+    """Índice modelo_id -> peças compatíveis (validação O(1) e filtro por carro)"""
+
+    def __init__(self, linhas: Iterable[Tuple[str, str]] = ()):
+        self.universais: Set[str] = set()
+        # modelo_id (minúsculo) -> peças específicas desse modelo
+        self.por_modelo: Dict[str, Set[str]] = {}
+        # peça -> modelos como gravados (ordem preservada), para exibição
+        self.modelos_por_peca: Dict[str, List[str]] = {}
+        for peca_id, modelo_id in linhas:
+            self.adicionar(peca_id, modelo_id)
+
+    @classmethod
+    def de_pecas(cls, pecas: Iterable[Tuple[str, Any]]) -> 'IndiceCompatibilidade':
+        """Monta o índice direto de (id, compatibilidade) de pecas_loja"""
+        indice = cls()
+        for peca_id, valor in pecas:
+            for linha in linhas_compatibilidade(peca_id, valor):
+                indice.adicionar(*linha)
+        return indice
+
+    def adicionar(self, peca_id: str, modelo_id: str) -> None:
+        if modelo_id is None or str(modelo_id).lower() == UNIVERSAL:
+            self.universais.add(peca_id)
+            self.modelos_por_peca.setdefault(peca_id, [])
+            return
+        self.por_modelo.setdefault(str(modelo_id).lower(), set()).add(peca_id)
+        self.modelos_por_peca.setdefault(peca_id, []).append(modelo_id)
+
+    def conhece(self, peca_id: str) -> bool:
+        return peca_id in self.modelos_por_peca
+
+    def compativel(self, peca_id: str, modelo_id: Optional[str]) -> bool:
+        if peca_id in self.universais:
+            return True
+        return bool(modelo_id) and peca_id in self.por_modelo.get(str(modelo_id).lower(), ())
+
+    def pecas_compativeis(self, modelo_id: Optional[str]) -> Set[str]:
+        """Peças que servem no modelo (universais incluídas)"""
+        if not modelo_id:
+            return set(self.universais)
+        return self.universais | self.por_modelo.get(str(modelo_id).lower(), set())
+
+    def modelos(self, peca_id: str) -> List[str]:
+        """Modelos específicos da peça ([] = universal ou desconhecida)"""
+        if peca_id in self.universais:
+            return []
+        return list(self.modelos_por_peca.get(peca_id, []))
+
+    def __len__(self) -> int:
+        return len(self.modelos_por_peca)
@@ -0,0 +1,79 @@
+"""
+Cache em processo da tabela configuracoes
+
+Todas as chaves são carregadas de uma vez; leituras são consultas a um dict. Cada
+escrita incrementa configuracoes_versao.versao na mesma transação. Os outros
+processos (workers) conferem essa versão no máximo a cada `intervalo` segundos
+e recarregam tudo quando ela mudou.
+
+O cache não conhece o banco: recebe funções de carga (ver DatabaseManager).
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# Segundos entre conferências da versão no banco (0 = conferir em toda leitura)
+INTERVALO_VERIFICACAO_PADRAO = 5.0
+
+
+class CacheConfiguracoes:
+    """Chave -> valor de configuracoes, invalidado por carimbo de versão"""
+
+    def __init__(
+        self,
+        carregar: Callable[[], Tuple[int, Dict[str, str]]],
+        ler_versao: Callable[[], int],
+        intervalo: float = INTERVALO_VERIFICACAO_PADRAO,
+        relogio: Callable[[], float] = time.monotonic,
+    ):
+        self._carregar = carregar
+        self._ler_versao = ler_versao
+        self.intervalo = intervalo
+        self._relogio = relogio
+        self._lock = threading.Lock()
+        self._valores: Optional[Dict[str, str]] = None
+        self.versao: Optional[int] = None
+        self._proxima_verificacao = 0.0
+
+    def obter(self, chave: str) -> Optional[str]:
+        return self.todas().get(chave)
+
+    def todas(self) -> Dict[str, str]:
+        """Snapshot atual (não alterar o dict devolvido)"""
+        valores = self._valores
+        if valores is not None and self._relogio() < self._proxima_verificacao:
+            return valores
+        with self._lock:
+            if self._valores is None:
+                self._recarregar()
+            elif self._relogio() >= self._proxima_verificacao:
+                if self._ler_versao() != self.versao:
+                    self._recarregar()
+                else:
+                    self._proxima_verificacao = self._relogio() + self.intervalo
+            return self._valores
+
+    def _recarregar(self) -> None:
+        versao, valores = self._carregar()
+        self._valores = dict(valores)
+        self.versao = versao
+        self._proxima_verificacao = self._relogio() + self.intervalo
+
+    def registrar_escrita(self, chave: str, valor: str, versao: int) -> None:
+        """Aplica uma escrita deste processo sem recarregar
+
+        Se a versão não é a seguinte à do cache, outro processo também escreveu:
+        descarta tudo e recarrega na próxima leitura.
+        """
+        with self._lock:
+            if self._valores is None or self.versao is None or versao != self.versao + 1:
+                self._valores = None
+                return
+            valores = dict(self._valores)
+            valores[chave] = valor
+            self._valores = valores
+            self.versao = versao
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._valores = None
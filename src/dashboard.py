@@ -0,0 +1,242 @@
+"""
+Painel da equipe: as seções do dashboard numa única requisição
+
+GET /api/equipes/<id>/dashboard?fields=equipe,garagem,... devolve só as seções
+pedidas (todas sem fields=), no mesmo formato das rotas avulsas:
+
+    equipe             /api/equipes/<id>
+    saldo_pix          /api/equipes/<id>/saldo-pix
+    carro_ativo        /api/equipes/<id>/carro-ativo (None sem carro ativo)
+    garagem            /api/garagem/<id> + solicitações pendentes da equipe
+    armazem            /api/armazem/<id>
+    aguardando_pecas   /api/aguardando-pecas
+    aguardando_carros  /api/aguardando-carros
+    etapas             /api/equipes/<id>/etapas
+    historico          primeira página de /api/historico/compras
+
+CarregadorPainel vive uma requisição e lê cada fonte no máximo uma vez, por
+mais seções que a usem: equipe + carros + peças (três consultas), solicitações
+de peças, solicitações de carros, etapas e histórico (uma consulta cada).
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .paginacao import LIMITE_PADRAO, montar_pagina
+
+SECOES = ('equipe', 'saldo_pix', 'carro_ativo', 'garagem', 'armazem',
+          'aguardando_pecas', 'aguardando_carros', 'etapas', 'historico')
+
+
+def ler_secoes(valor: Optional[str]) -> Tuple[str, ...]:
+    """Seções de ?fields= (vírgulas; aceita saldo-pix ou saldo_pix); ValueError se desconhecida"""
+    if not valor or not valor.strip():
+        return SECOES
+    pedidas = []
+    for nome in valor.split(','):
+        nome = nome.strip().replace('-', '_')
+        if not nome:
+            continue
+        if nome not in SECOES:
+            raise ValueError(f'Seção desconhecida: {nome} (válidas: {", ".join(SECOES)})')
+        if nome not in pedidas:
+            pedidas.append(nome)
+    return tuple(pedidas) or SECOES
+
+
+def formatar_item_historico(row: Dict[str, Any], tipo_pix: str) -> Dict[str, Any]:
+    """Linha de DatabaseManager.listar_historico_compras no formato da API"""
+    processado_em = row['processado_em'] or row['ts']
+    item = {
+        'id': row['id'],
+        'tipo': row['tipo'],
+        'preco': float(row['preco'] or 0),
+        'status': row['status'] or '',
+        'timestamp': row['ts'].isoformat() if row['ts'] else '',
+        'processado_em': processado_em.isoformat() if processado_em else '',
+    }
+    if row['tipo'] == tipo_pix:
+        item.update({
+            'item_nome': row['nome'] or '',
+            'tipo_item': row['item_tipo'] or '',
+            'valor_total': float(row['valor_total'] or 0),
+        })
+    else:
+        item.update({
+            'peca_nome': row['nome'] or '',
+            'peca_tipo': row['item_tipo'] or '',
+        })
+    return item
+
+
+def _resumo_carro(carro) -> Dict[str, Any]:
+    return {'id': carro.id, 'marca': carro.marca, 'modelo': carro.modelo, 'numero_carro': carro.numero_carro}
+
+
+class CarregadorPainel:
+    """Fontes de dados do painel de uma equipe, lidas sob demanda e guardadas
+
+    modelos_loja: modelos de carro já em memória (loja), consultados antes do
+    banco ao resolver solicitações de carro.
+    """
+
+    def __init__(self, db, equipe_id: str, modelos_loja: Iterable = ()):
+        self.db = db
+        self.equipe_id = str(equipe_id)
+        self._modelos_loja = {str(m.id): m for m in modelos_loja}
+        self._cache: Dict[str, Any] = {}
+
+    def _obter(self, chave: str, carregar: Callable[[], Any]) -> Any:
+        if chave not in self._cache:
+            self._cache[chave] = carregar()
+        return self._cache[chave]
+
+    @property
+    def painel(self) -> Optional[Dict[str, Any]]:
+        return self._obter('painel', lambda: self.db.carregar_painel_equipe(self.equipe_id))
+
+    @property
+    def equipe(self):
+        painel = self.painel
+        return painel['equipe'] if painel else None
+
+    @property
+    def solicitacoes_pecas(self) -> List[Dict[str, Any]]:
+        return self._obter('solicitacoes_pecas', lambda: self.db.carregar_solicitacoes_pecas(self.equipe_id))
+
+    @property
+    def solicitacoes_carros(self) -> List[Dict[str, Any]]:
+        # A equipe do painel serve ao enriquecimento (sem recarregar por solicitação)
+        return self._obter('solicitacoes_carros', lambda: self.db.carregar_solicitacoes_carros(
+            self.equipe_id, equipes_carregadas={self.equipe_id: self.equipe}))
+
+    def _buscar_modelo(self, modelo_id: str):
+        modelo = self._modelos_loja.get(str(modelo_id))
+        if modelo is None:
+            modelo = self.db.buscar_modelo_loja_por_id(modelo_id)
+            self._modelos_loja[str(modelo_id)] = modelo
+        return modelo
+
+    # ---------- seções ----------
+
+    def montar(self, secoes: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """{seção: dados} das seções pedidas; None se a equipe não existe"""
+        if self.equipe is None:
+            return None
+        return {secao: getattr(self, f'secao_{secao}')() for secao in secoes}
+
+    def secao_equipe(self) -> Dict[str, Any]:
+        equipe = self.equipe
+        carro_ativo = next((c for c in equipe.carros if getattr(c, 'status', 'repouso') == 'ativo'), None)
+        return {
+            'id': equipe.id,
+            'nome': equipe.nome,
+            'saldo': equipe.doricoins,
+            'carro': _resumo_carro(equipe.carro) if equipe.carro else None,
+            'carro_ativo': _resumo_carro(carro_ativo) if carro_ativo else None,
+            'carros': [{
+                'id': carro.id,
+                'marca': carro.marca,
+                'modelo': carro.modelo,
+                'numero_carro': carro.numero_carro,
+                'modelo_id': carro.modelo_id,
+                'status': carro.status,
+            } for carro in equipe.carros],
+            'pecas_adicionais': [{
+                'id': sol['id'],
+                'peca_nome': sol.get('peca_nome', ''),
+                'peca_tipo': sol.get('peca_tipo', ''),
+                'preco': sol.get('preco', 0),
+                'timestamp': sol.get('data_solicitacao', ''),
+            } for sol in self.solicitacoes_pecas if sol['status'] == 'pendente'],
+        }
+
+    def secao_saldo_pix(self) -> Dict[str, Any]:
+        saldo = self.painel['saldo_pix']
+        return {
+            'equipe_id': self.equipe_id,
+            'saldo_pix': saldo,
+            'saldo_formatado': f'R$ {saldo:.2f}',
+            'pode_participar': saldo >= -20.0,
+        }
+
+    def secao_carro_ativo(self) -> Optional[Dict[str, Any]]:
+        carro = next((c for c in self.equipe.carros if getattr(c, 'status', 'repouso') == 'ativo'), None)
+        return _resumo_carro(carro) if carro else None
+
+    def secao_garagem(self) -> Dict[str, Any]:
+        pecas_carros = self.painel['pecas_carros']
+        carros = [{
+            'id': carro.id,
+            'marca': carro.marca,
+            'modelo': carro.modelo,
+            'numero_carro': carro.numero_carro,
+            'classe': getattr(carro, 'classe', 'N/A'),
+            'modelo_id': carro.modelo_id,
+            'status': carro.status,
+            'carro_ativo': carro.status == 'ativo',
+            'apelido': getattr(carro, 'apelido', None),
+            'pecas': pecas_carros.get(carro.id, []),
+        } for carro in self.equipe.carros]
+        return {
+            'carros': carros,
+            'solicitacoes_carros_pendentes': [s for s in self.solicitacoes_carros if s['status'] == 'pendente'],
+            'solicitacoes_pecas_pendentes': [s for s in self.solicitacoes_pecas if s['status'] == 'pendente'],
+        }
+
+    def secao_armazem(self) -> Dict[str, Any]:
+        pecas = self.painel['armazem']
+        return {'pecas_guardadas': pecas, 'total': len(pecas)}
+
+    def secao_aguardando_pecas(self) -> List[Dict[str, Any]]:
+        equipe = self.equipe
+        carros = {str(c.id): c for c in equipe.carros}
+        aguardando = []
+        for sol in self.solicitacoes_pecas:
+            if sol['status'] != 'pendente':
+                continue
+            carro = carros.get(str(sol.get('carro_id'))) or equipe.carro
+            aguardando.append({
+                'id': sol.get('id'),
+                'peca_nome': sol.get('peca_nome') or '',
+                'peca_tipo': sol.get('peca_tipo') or '',
+                'preco': sol.get('preco', 0),
+                'carro': {
+                    'id': carro.id,
+                    'numero': carro.numero_carro,
+                    'marca': carro.marca,
+                    'modelo': carro.modelo,
+                    'status': carro.status,
+                } if carro else None,
+                'timestamp': sol.get('data_solicitacao', ''),
+            })
+        aguardando.sort(key=lambda x: x.get('timestamp') or '', reverse=True)
+        return aguardando
+
+    def secao_aguardando_carros(self) -> List[Dict[str, Any]]:
+        aguardando = []
+        for sol in self.solicitacoes_carros:
+            if sol['status'] != 'pendente':
+                continue
+            # tipo_carro: "UUID|Marca|Modelo" ou UUID puro (legado)
+            partes = (sol.get('tipo_carro') or '').split('|')
+            modelo = self._buscar_modelo(partes[0]) if partes[0] else None
+            if modelo:
+                item = {'marca': modelo.marca, 'modelo': modelo.modelo,
+                        'classe': getattr(modelo, 'classe', 'N/A'), 'preco': modelo.preco}
+            elif len(partes) > 2 and partes[1] and partes[2]:
+                item = {'marca': partes[1], 'modelo': partes[2], 'classe': 'N/A', 'preco': 0}
+            else:
+                item = {'marca': 'Modelo Deletado', 'modelo': 'Desconhecido', 'classe': 'N/A', 'preco': 0}
+            aguardando.append({'id': sol.get('id'), **item, 'timestamp': sol.get('data_solicitacao', '')})
+        aguardando.sort(key=lambda x: x.get('timestamp') or '', reverse=True)
+        return aguardando
+
+    def secao_etapas(self) -> List[Dict[str, Any]]:
+        return self._obter('etapas', lambda: self.db.obter_etapas_equipe(self.equipe_id, serie=self.equipe.serie or ''))
+
+    def secao_historico(self) -> Dict[str, Any]:
+        linhas = self.db.listar_historico_compras(self.equipe_id, LIMITE_PADRAO)
+        linhas, proximo_cursor = montar_pagina(linhas, LIMITE_PADRAO, lambda r: (r['ts'], r['tipo'], r['id']))
+        return {
+            'historico': [formatar_item_historico(row, self.db.HISTORICO_PIX) for row in linhas],
+            'proximo_cursor': proximo_cursor,
+        }
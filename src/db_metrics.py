@@ -0,0 +1,332 @@
+"""
+Instrumentação de consultas do DatabaseManager
+
+Por requisição (flask.g): conexões abertas, comandos executados, linhas lidas,
+tempo total no banco e os comandos mais lentos (SQL normalizado).
+Agregado do processo: contadores por endpoint expostos em formato Prometheus.
+
+Configuração por variável de ambiente:
+    GRANPIX_SLOW_QUERY_MS   - loga comandos acima desse tempo (0 = desligado)
+    GRANPIX_SLOW_REQUEST_MS - loga requisições acima desse tempo, com os
+                              comandos mais lentos delas (0 = desligado)
+    GRANPIX_DB_METRICAS     - "0" desliga toda a instrumentação
+"""
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from flask import g, has_request_context, request
+except ImportError:  # DatabaseManager também é usado fora do Flask (scripts, testes)
+    g = None
+
+    def has_request_context():
+        return False
+
+logger = logging.getLogger('granpix.db.slow')
+
+METRICAS_HABILITADAS = os.environ.get('GRANPIX_DB_METRICAS', '1') != '0'
+SLOW_QUERY_MS = float(os.environ.get('GRANPIX_SLOW_QUERY_MS', '0') or 0)
+SLOW_REQUEST_MS = float(os.environ.get('GRANPIX_SLOW_REQUEST_MS', '0') or 0)
+
+# Quantos comandos lentos guardar por requisição
+MAX_LENTAS_REQUISICAO = 5
+# Quantos SQL normalizados distintos acompanhar no agregado
+MAX_SQL_AGREGADO = 500
+ENDPOINT_FORA_REQUISICAO = '<fora_requisicao>'
+
+
+# ============ NORMALIZAÇÃO DE SQL ============
+
+_RE_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_RE_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_LISTA_IN = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))+\s*\)", re.IGNORECASE)
+_RE_ESPACOS = re.compile(r"\s+")
+
+
+def normalizar_sql(sql) -> str:
+    """Remove literais e espaços extras para agrupar comandos equivalentes"""
+    if isinstance(sql, bytes):
+        sql = sql.decode('utf-8', errors='replace')
+    sql = _RE_STRING.sub('?', str(sql))
+    sql = _RE_NUMERO.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _RE_LISTA_IN.sub('(?+)', sql)
+    return _RE_ESPACOS.sub(' ', sql).strip()
+
+
+# ============ MÉTRICAS POR REQUISIÇÃO ============
+
+class MetricasRequisicao:
+    """Contadores de banco de uma requisição"""
+
+    __slots__ = ('conexoes', 'comandos', 'linhas', 'tempo_db', 'lentas')
+
+    def __init__(self):
+        self.conexoes = 0
+        self.comandos = 0
+        self.linhas = 0
+        self.tempo_db = 0.0
+        # (duração, sql_normalizado) dos comandos mais lentos
+        self.lentas: List[Tuple[float, str]] = []
+
+    def registrar_comando(self, duracao: float, sql: str) -> None:
+        self.comandos += 1
+        self.tempo_db += duracao
+        if len(self.lentas) < MAX_LENTAS_REQUISICAO:
+            self.lentas.append((duracao, sql))
+            self.lentas.sort(reverse=True)
+        elif duracao > self.lentas[-1][0]:
+            self.lentas[-1] = (duracao, sql)
+            self.lentas.sort(reverse=True)
+
+    def para_dict(self) -> dict:
+        return {
+            'conexoes': self.conexoes,
+            'comandos': self.comandos,
+            'linhas': self.linhas,
+            'tempo_db_ms': round(self.tempo_db * 1000, 3),
+            'mais_lentos': [
+                {'ms': round(d * 1000, 3), 'sql': sql} for d, sql in self.lentas
+            ],
+        }
+
+
+def metricas_atuais() -> Optional[MetricasRequisicao]:
+    """Métricas da requisição corrente (None fora de requisição ou se desligado)"""
+    if not METRICAS_HABILITADAS or not has_request_context():
+        return None
+    metricas = g.get('_metricas_db')
+    if metricas is None:
+        metricas = MetricasRequisicao()
+        g._metricas_db = metricas
+    return metricas
+
+
+# ============ AGREGADO DO PROCESSO ============
+
+class MetricasAgregadas:
+    """Totais do processo por endpoint e por SQL normalizado (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # endpoint -> [requisicoes, conexoes, comandos, linhas, tempo_db, tempo_total]
+        self.por_endpoint: Dict[str, List[float]] = {}
+        # sql -> [execucoes, tempo_total, tempo_max]
+        self.por_sql: Dict[str, List[float]] = {}
+        self.lentas_total = 0
+
+    def _endpoint(self, endpoint: str) -> List[float]:
+        linha = self.por_endpoint.get(endpoint)
+        if linha is None:
+            linha = [0, 0, 0, 0, 0.0, 0.0]
+            self.por_endpoint[endpoint] = linha
+        return linha
+
+    def registrar_requisicao(self, endpoint: str, metricas: MetricasRequisicao, tempo_total: float) -> None:
+        with self._lock:
+            linha = self._endpoint(endpoint)
+            linha[0] += 1
+            linha[1] += metricas.conexoes
+            linha[2] += metricas.comandos
+            linha[3] += metricas.linhas
+            linha[4] += metricas.tempo_db
+            linha[5] += tempo_total
+
+    def registrar_fora_requisicao(self, conexoes: int = 0, comandos: int = 0,
+                                  linhas: int = 0, tempo_db: float = 0.0) -> None:
+        with self._lock:
+            linha = self._endpoint(ENDPOINT_FORA_REQUISICAO)
+            linha[1] += conexoes
+            linha[2] += comandos
+            linha[3] += linhas
+            linha[4] += tempo_db
+
+    def registrar_sql(self, sql: str, duracao: float, lenta: bool) -> None:
+        with self._lock:
+            if lenta:
+                self.lentas_total += 1
+            item = self.por_sql.get(sql)
+            if item is None:
+                if len(self.por_sql) >= MAX_SQL_AGREGADO:
+                    return
+                item = [0, 0.0, 0.0]
+                self.por_sql[sql] = item
+            item[0] += 1
+            item[1] += duracao
+            if duracao > item[2]:
+                item[2] = duracao
+
+    def prometheus(self, top_sql: int = 20) -> str:
+        """Exporta os contadores no formato texto do Prometheus"""
+        with self._lock:
+            endpoints = {k: list(v) for k, v in self.por_endpoint.items()}
+            sqls = sorted(self.por_sql.items(), key=lambda kv: kv[1][1], reverse=True)[:top_sql]
+            lentas_total = self.lentas_total
+
+        linhas = []
+
+        def metrica(nome, tipo, ajuda, indice, fora_requisicao=True):
+            linhas.append(f'# HELP {nome} {ajuda}')
+            linhas.append(f'# TYPE {nome} {tipo}')
+            for endpoint, valores in sorted(endpoints.items()):
+                if not fora_requisicao and endpoint == ENDPOINT_FORA_REQUISICAO:
+                    continue
+                linhas.append(f'{nome}{{endpoint="{_escapar_label(endpoint)}"}} {_numero(valores[indice])}')
+
+        metrica('granpix_http_requests_total', 'counter', 'Requisições atendidas', 0, False)
+        metrica('granpix_db_connections_total', 'counter', 'Conexões abertas ao banco', 1)
+        metrica('granpix_db_statements_total', 'counter', 'Comandos SQL executados', 2)
+        metrica('granpix_db_rows_fetched_total', 'counter', 'Linhas lidas do banco', 3)
+        metrica('granpix_db_time_seconds_total', 'counter', 'Tempo gasto no banco', 4)
+        metrica('granpix_http_time_seconds_total', 'counter', 'Tempo total das requisições', 5, False)
+
+        linhas.append('# HELP granpix_db_slow_statements_total Comandos acima de GRANPIX_SLOW_QUERY_MS')
+        linhas.append('# TYPE granpix_db_slow_statements_total counter')
+        linhas.append(f'granpix_db_slow_statements_total {lentas_total}')
+
+        linhas.append('# HELP granpix_db_statement_seconds Tempo por SQL normalizado (maiores consumidores)')
+        linhas.append('# TYPE granpix_db_statement_seconds summary')
+        for sql, (execucoes, total, maximo) in sqls:
+            label = _escapar_label(sql[:200])
+            linhas.append(f'granpix_db_statement_seconds_count{{sql="{label}"}} {int(execucoes)}')
+            linhas.append(f'granpix_db_statement_seconds_sum{{sql="{label}"}} {_numero(total)}')
+            linhas.append(f'granpix_db_statement_seconds_max{{sql="{label}"}} {_numero(maximo)}')
+
+        return '\n'.join(linhas) + '\n'
+
+
+def _escapar_label(valor: str) -> str:
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+def _numero(valor) -> str:
+    return repr(round(valor, 6)) if isinstance(valor, float) else str(valor)
+
+
+agregado = MetricasAgregadas()
+
+
+# ============ REGISTRO (chamado pelo DatabaseManager) ============
+
+def registrar_conexao() -> None:
+    if not METRICAS_HABILITADAS:
+        return
+    metricas = metricas_atuais()
+    if metricas is not None:
+        metricas.conexoes += 1
+    else:
+        agregado.registrar_fora_requisicao(conexoes=1)
+
+
+def registrar_comando(sql, duracao: float) -> None:
+    sql_normalizado = normalizar_sql(sql)
+    lenta = SLOW_QUERY_MS > 0 and duracao * 1000 >= SLOW_QUERY_MS
+    if lenta:
+        endpoint = request.endpoint if has_request_context() else ENDPOINT_FORA_REQUISICAO
+        logger.warning("Consulta lenta (%.1f ms) em %s: %s", duracao * 1000, endpoint, sql_normalizado)
+    agregado.registrar_sql(sql_normalizado, duracao, lenta)
+    metricas = metricas_atuais()
+    if metricas is not None:
+        metricas.registrar_comando(duracao, sql_normalizado)
+    else:
+        agregado.registrar_fora_requisicao(comandos=1, tempo_db=duracao)
+
+
+def registrar_linhas(quantidade: int) -> None:
+    if not quantidade:
+        return
+    metricas = metricas_atuais()
+    if metricas is not None:
+        metricas.linhas += quantidade
+    else:
+        agregado.registrar_fora_requisicao(linhas=quantidade)
+
+
+class CursorInstrumentado:
+    """Proxy de cursor PyMySQL que mede execute/executemany e conta linhas lidas"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, query, args=None):
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.execute(query, args)
+        finally:
+            registrar_comando(query, time.perf_counter() - inicio)
+
+    def executemany(self, query, args):
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, args)
+        finally:
+            registrar_comando(query, time.perf_counter() - inicio)
+
+    def fetchone(self):
+        linha = self._cursor.fetchone()
+        if linha is not None:
+            registrar_linhas(1)
+        return linha
+
+    def fetchmany(self, size=None):
+        linhas = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        registrar_linhas(len(linhas))
+        return linhas
+
+    def fetchall(self):
+        linhas = self._cursor.fetchall()
+        registrar_linhas(len(linhas))
+        return linhas
+
+    def __iter__(self):
+        for linha in self._cursor:
+            registrar_linhas(1)
+            yield linha
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+        return False
+
+
+def instrumentar_cursor(cursor):
+    return CursorInstrumentado(cursor) if METRICAS_HABILITADAS else cursor
+
+
+# ============ INTEGRAÇÃO COM O FLASK ============
+
+def configurar_metricas(app) -> None:
+    """Registra o cronômetro da requisição, o header Server-Timing e o log de requisições lentas"""
+    if not METRICAS_HABILITADAS:
+        return
+
+    @app.before_request
+    def _iniciar_cronometro():
+        g._inicio_requisicao = time.perf_counter()
+
+    @app.after_request
+    def _server_timing(response):
+        inicio = g.pop('_inicio_requisicao', None)
+        if inicio is None:
+            return response
+        total = time.perf_counter() - inicio
+        metricas = g.get('_metricas_db') or MetricasRequisicao()
+        agregado.registrar_requisicao(request.endpoint or '<404>', metricas, total)
+        if SLOW_REQUEST_MS > 0 and total * 1000 >= SLOW_REQUEST_MS:
+            logger.warning("Requisição lenta (%.1f ms) em %s %s: %s", total * 1000, request.method,
+                           request.path, metricas.para_dict())
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={metricas.tempo_db * 1000:.1f};desc="{metricas.comandos} sql, {metricas.conexoes} conn"'
+        )
+        response.headers.add('Server-Timing', f'app;dur={total * 1000:.1f}')
+        return response
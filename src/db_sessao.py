@@ -0,0 +1,204 @@
+"""
+Sessão de banco por requisição e transações entre métodos do DatabaseManager
+
+Dentro de uma requisição Flask o primeiro _get_conn() abre a conexão e a vincula a
+flask.g; as chamadas seguintes (inclusive aninhadas) reutilizam a mesma conexão.
+close() vira no-op e a conexão é liberada no teardown do app context.
+
+    with db.transacao():
+        db.confirmar_transacao_pix(...)
+        db.atualizar_saldo_pix(...)
+
+Dentro da transação os commit() dos métodos são adiados para o fim do bloco; uma
+exceção, um rollback() de qualquer método ou tx.abortar() desfazem tudo.
+Fora de requisição (scripts, threads) a conexão só é compartilhada durante a transação.
+"""
+import threading
+from contextlib import contextmanager
+
+try:
+    from flask import g, has_app_context
+except ImportError:  # DatabaseManager também é usado fora do Flask
+    g = None
+
+    def has_app_context():
+        return False
+
+
+class ConexaoCompartilhada:
+    """Conexão reutilizada pelos métodos do DatabaseManager durante a sessão"""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.profundidade_transacao = 0
+        self.abortada = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    @property
+    def em_transacao(self) -> bool:
+        return self.profundidade_transacao > 0
+
+    def cursor(self, dictionary=False, **kw):
+        return _CursorSessao(self._conn.cursor(dictionary=dictionary, **kw), self)
+
+    def commit(self):
+        if self.em_transacao:
+            return None  # adiado para o fim da transação
+        return self._conn.commit()
+
+    def rollback(self):
+        if self.em_transacao:
+            self.abortada = True
+            return None
+        return self._conn.rollback()
+
+    def close(self):
+        # A conexão pertence à sessão; é fechada em liberar()
+        return None
+
+    def falha_sql(self):
+        """Um comando falhou: descarta o que ficou pendente (ou condena a transação)"""
+        if self.em_transacao:
+            self.abortada = True
+            return
+        try:
+            self._conn.rollback()
+        except Exception:
+            pass
+
+    def liberar(self):
+        try:
+            self._conn.rollback()
+        except Exception:
+            pass
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+
+class _CursorSessao:
+    """Cursor que avisa a sessão quando um comando falha"""
+
+    def __init__(self, cursor, conexao: ConexaoCompartilhada):
+        self._cursor = cursor
+        self._conexao = conexao
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+        return False
+
+    def execute(self, query, args=None):
+        try:
+            return self._cursor.execute(query, args)
+        except Exception:
+            self._conexao.falha_sql()
+            raise
+
+    def executemany(self, query, args):
+        try:
+            return self._cursor.executemany(query, args)
+        except Exception:
+            self._conexao.falha_sql()
+            raise
+
+
+class Transacao:
+    """Handle devolvido por DatabaseManager.transacao()"""
+
+    def __init__(self, conexao: ConexaoCompartilhada):
+        self.conexao = conexao
+
+    @property
+    def abortada(self) -> bool:
+        return self.conexao.abortada
+
+    def abortar(self) -> None:
+        """Desfaz tudo ao fim do bloco sem precisar levantar exceção"""
+        self.conexao.abortada = True
+
+
+class SessaoDB:
+    """Guarda a conexão compartilhada de um DatabaseManager (flask.g ou thread-local)"""
+
+    def __init__(self, abrir_conexao, chave: str):
+        self._abrir_conexao = abrir_conexao
+        self._atributo_g = f'_sessao_db_{chave}'
+        self._local = threading.local()
+
+    def atual(self):
+        if has_app_context():
+            return g.get(self._atributo_g)
+        return getattr(self._local, 'conexao', None)
+
+    def _guardar(self, conexao) -> None:
+        if has_app_context():
+            setattr(g, self._atributo_g, conexao)
+        else:
+            self._local.conexao = conexao
+
+    def _remover(self) -> None:
+        if has_app_context():
+            g.pop(self._atributo_g, None)
+        else:
+            self._local.conexao = None
+
+    def obter(self):
+        """Conexão da sessão; abre e vincula a flask.g se ainda não houver"""
+        conexao = self.atual()
+        if conexao is not None:
+            return conexao
+        if not has_app_context():
+            return None
+        conexao = ConexaoCompartilhada(self._abrir_conexao())
+        self._guardar(conexao)
+        return conexao
+
+    def liberar(self) -> None:
+        conexao = self.atual()
+        if conexao is not None:
+            self._remover()
+            conexao.liberar()
+
+    @contextmanager
+    def transacao(self):
+        conexao = self.atual()
+        temporaria = False
+        if conexao is None:
+            conexao = ConexaoCompartilhada(self._abrir_conexao())
+            self._guardar(conexao)
+            temporaria = not has_app_context()
+
+        if not conexao.em_transacao:
+            # Começa limpo: descarta leituras/snapshot anteriores da sessão
+            conexao._conn.rollback()
+            conexao.abortada = False
+        conexao.profundidade_transacao += 1
+        try:
+            yield Transacao(conexao)
+        except BaseException:
+            conexao.abortada = True
+            raise
+        finally:
+            conexao.profundidade_transacao -= 1
+            if not conexao.em_transacao:
+                try:
+                    if conexao.abortada:
+                        conexao._conn.rollback()
+                    else:
+                        conexao._conn.commit()
+                finally:
+                    if temporaria:
+                        self._remover()
+                        conexao.liberar()
@@ -0,0 +1,462 @@
+"""
+Backend SQLite do DatabaseManager (dialeto MariaDB -> SQLite)
+
+O DatabaseManager e as rotas que usam api.db._get_conn() escrevem SQL no dialeto
+do MariaDB: placeholders %s, ON DUPLICATE KEY UPDATE, INSERT IGNORE, DDL com
+ENGINE/índices inline/ON UPDATE CURRENT_TIMESTAMP, NOW() - INTERVAL n HOUR.
+Com MYSQL_CONFIG=sqlite:///caminho/granpix.db a conexão devolvida por
+_abrir_conexao é um ConexaoSQLite, que traduz cada comando na hora (com cache)
+e expõe a mesma interface do wrapper PyMySQL (cursor(dictionary=True), commit,
+rollback, close).
+
+Usos: suíte de testes sem MariaDB (tests/conftest.py) e etapas regionais num
+único servidor. O arquivo roda em WAL (leitores não bloqueiam o escritor) e
+cada thread reaproveita a sua conexão; os workers do servidor devem ficar em
+um único processo ou aceitar busy_timeout nas escritas concorrentes.
+
+Fora do tradutor (ver DatabaseManager.is_mysql): information_schema, UPDATE
+... JOIN e CREATE TABLE ... LIKE (copiar_tabela, a partir de sqlite_master), que
+têm ramos próprios no DatabaseManager.
+"""
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from .db_metrics import instrumentar_cursor, registrar_conexao
+
+PREFIXO_URL = 'sqlite:///'
+# Espera por lock de escrita de outra conexão antes de 'database is locked' (ms)
+BUSY_TIMEOUT_MS = 5000
+
+
+def eh_sqlite(url: str) -> bool:
+    return (url or '').startswith(PREFIXO_URL)
+
+
+def caminho_sqlite(url: str) -> str:
+    """sqlite:///data/granpix.db -> data/granpix.db; sqlite:////tmp/x.db -> /tmp/x.db"""
+    return url[len(PREFIXO_URL):]
+
+
+def nome_indice(tabela: str, nome: str) -> str:
+    """Índices do SQLite são globais ao banco; os do MariaDB, por tabela"""
+    return f'{tabela}__{nome}'
+
+
+# ============ TRADUÇÃO ============
+
+_RE_ESPACOS = re.compile(r'\s+')
+_RE_ADD_INDEX = re.compile(r'^ALTER\s+TABLE\s+`?(\w+)`?\s+ADD\s+(UNIQUE\s+)?(?:INDEX|KEY)\s+`?(\w+)`?\s*\((.+)\)\s*;?$',
+                           re.I | re.S)
+_RE_DESCRIBE = re.compile(r'^(?:DESCRIBE|DESC)\s+`?(\w+)`?\s*;?$', re.I)
+_RE_FK_CHECKS = re.compile(r'^SET\s+FOREIGN_KEY_CHECKS\s*=\s*([01])\s*;?$', re.I)
+_RE_AFTER = re.compile(r'\s+(?:AFTER\s+`?\w+`?|FIRST)\s*;?\s*$', re.I)
+_RE_TIPO_TEXTO = re.compile(r'\b((?:VAR)?CHAR\s*\(\s*\d+\s*\)|(?:LONG|MEDIUM|TINY)?TEXT\b)(?!\s+COLLATE)', re.I)
+_RE_AUTO_INCREMENT = re.compile(r'\b(?:BIG|SMALL|TINY)?INT(?:EGER)?\s+(?:NOT\s+NULL\s+)?AUTO_INCREMENT\s+PRIMARY\s+KEY',
+                                re.I)
+_RE_COMENTARIO = re.compile(r"\s+COMMENT\s+'(?:[^']|'')*'", re.I)
+_RE_ON_UPDATE = re.compile(r'\s+ON\s+UPDATE\s+CURRENT_TIMESTAMP(?:\(\))?', re.I)
+_RE_OPCOES_TABELA = re.compile(r'\)\s*(?:(?:ENGINE|DEFAULT\s+CHARSET|CHARSET|COLLATE)\s*=\s*\w+\s*)+;?\s*$', re.I)
+_RE_INDICE_INLINE = re.compile(r'^(UNIQUE\s+)?(?:INDEX|KEY)\s+`?(\w+)`?\s*\((.+)\)$', re.I | re.S)
+_RE_INTERVALO = re.compile(
+    r'(NOW\(\)|CURRENT_TIMESTAMP|CURDATE\(\)|%s|\?|[\w.]+)\s*([+-])\s*INTERVAL\s+(%s|\?|\d+)\s+(SECOND|MINUTE|HOUR|DAY)\b',
+    re.I)
+_RE_VALUES_FUNCAO = re.compile(r'\bVALUES\s*\(\s*(`?\w+`?)\s*\)', re.I)
+_RE_CREATE_INDEX = re.compile(r'^CREATE\s+(UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?[`"]?(\w+)[`"]?\s+ON\s+'
+                              r'[`"]?\w+[`"]?\s*(\(.+\))\s*$', re.I | re.S)
+
+
+def _partes_topo(corpo: str):
+    """Separa as definições de CREATE TABLE pelas vírgulas fora de parênteses e aspas"""
+    partes, profundidade, inicio, aspas = [], 0, 0, None
+    for i, caractere in enumerate(corpo):
+        if aspas:
+            if caractere == aspas:
+                aspas = None
+        elif caractere in '\'"':
+            aspas = caractere
+        elif caractere == '(':
+            profundidade += 1
+        elif caractere == ')':
+            profundidade -= 1
+        elif caractere == ',' and profundidade == 0:
+            partes.append(corpo[inicio:i].strip())
+            inicio = i + 1
+    partes.append(corpo[inicio:].strip())
+    return [p for p in partes if p]
+
+
+def _tem_where_no_topo(sql: str) -> bool:
+    profundidade = 0
+    for token in re.finditer(r"\(|\)|'(?:[^']|'')*'|\bWHERE\b", sql, re.I):
+        texto = token.group(0)
+        if texto == '(':
+            profundidade += 1
+        elif texto == ')':
+            profundidade -= 1
+        elif texto.upper() == 'WHERE' and profundidade == 0:
+            return True
+    return False
+
+
+def _colunas_texto(definicao: str) -> str:
+    # Comparações do MariaDB (utf8mb4_unicode_ci) ignoram maiúsculas
+    return _RE_TIPO_TEXTO.sub(lambda m: f'{m.group(1)} COLLATE NOCASE', definicao)
+
+
+def _traduzir_create_table(sql: str) -> Tuple[str, ...]:
+    abre = sql.index('(')
+    cabecalho = sql[:abre]
+    tabela = re.search(r'`?(\w+)`?\s*$', cabecalho).group(1)
+    fim = _RE_OPCOES_TABELA.search(sql)
+    corpo = sql[abre + 1:fim.start()] if fim else sql[abre + 1:sql.rindex(')')]
+
+    definicoes, indices, gatilhos = [], [], []
+    for parte in _partes_topo(corpo):
+        inline = _RE_INDICE_INLINE.match(parte)
+        if inline:
+            unico = 'UNIQUE ' if inline.group(1) else ''
+            indices.append(f'CREATE {unico}INDEX IF NOT EXISTS {nome_indice(tabela, inline.group(2))} '
+                           f'ON {tabela} ({inline.group(3)})')
+            continue
+        parte = _RE_COMENTARIO.sub('', parte)
+        # CURRENT_TIMESTAMP do SQLite é UTC; o do MariaDB, hora local (como NOW())
+        parte = re.sub(r'\bDEFAULT\s+CURRENT_TIMESTAMP\b', "DEFAULT (datetime('now', 'localtime'))", parte, flags=re.I)
+        parte = _RE_AUTO_INCREMENT.sub('INTEGER PRIMARY KEY AUTOINCREMENT', parte)
+        if _RE_ON_UPDATE.search(parte):
+            parte = _RE_ON_UPDATE.sub('', parte)
+            coluna = parte.split()[0].strip('`')
+            # ON UPDATE CURRENT_TIMESTAMP: atualiza a coluna quando o UPDATE não a alterou
+            gatilhos.append(
+                f'CREATE TRIGGER IF NOT EXISTS {tabela}__{coluna}_ao_atualizar AFTER UPDATE ON {tabela} '
+                f'FOR EACH ROW WHEN NEW.{coluna} IS OLD.{coluna} '
+                f'BEGIN UPDATE {tabela} SET {coluna} = NOW() WHERE rowid = NEW.rowid; END'
+            )
+        definicoes.append(_colunas_texto(parte))
+
+    tabela_sql = f'{cabecalho.strip()} (\n    ' + ',\n    '.join(definicoes) + '\n)'
+    return (tabela_sql, *indices, *gatilhos)
+
+
+def _traduzir_dml(sql: str) -> str:
+    sql = re.sub(r'^\s*INSERT\s+IGNORE\b', 'INSERT OR IGNORE', sql, flags=re.I)
+    duplicada = re.search(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', sql, re.I)
+    if duplicada:
+        insercao, atualizacao = sql[:duplicada.start()], sql[duplicada.end():]
+        # INSERT ... SELECT sem WHERE: o ON do upsert seria lido como ON de um JOIN
+        if re.search(r'\bSELECT\b', insercao, re.I) and not _tem_where_no_topo(
+                insercao[re.search(r'\bSELECT\b', insercao, re.I).start():]):
+            insercao = insercao.rstrip() + ' WHERE true\n'
+        atualizacao = _RE_VALUES_FUNCAO.sub(lambda m: f'excluded.{m.group(1)}', atualizacao)
+        sql = f'{insercao} ON CONFLICT DO UPDATE SET {atualizacao}'
+    sql = re.sub(r'\bCURRENT_TIMESTAMP\b(?:\(\))?', 'NOW()', sql, flags=re.I)
+    sql = re.sub(r'\s+FOR\s+UPDATE(?:\s+(?:NOWAIT|SKIP\s+LOCKED))?\s*;?\s*$', '', sql, flags=re.I)
+    sql = _RE_INTERVALO.sub(
+        lambda m: f"datetime({m.group(1)}, '{m.group(2)}' || ({m.group(3)}) || ' {m.group(4).lower()}s')", sql)
+    return sql
+
+
+@lru_cache(maxsize=2048)
+def traduzir(sql: str, com_parametros: bool = True) -> Tuple[str, ...]:
+    """Comando no dialeto MariaDB -> comandos SQLite (zero, um ou vários)
+
+    com_parametros: como no PyMySQL, %s vira parâmetro e %% vira % só quando
+    há parâmetros.
+    """
+    texto = sql.strip()
+    compacto = _RE_ESPACOS.sub(' ', texto).upper()
+
+    if compacto.startswith(('CREATE DATABASE', 'USE ')):
+        return ()
+    fk = _RE_FK_CHECKS.match(texto)
+    if fk:
+        return (f"PRAGMA foreign_keys = {'ON' if fk.group(1) == '1' else 'OFF'}",)
+    describe = _RE_DESCRIBE.match(texto)
+    if describe:
+        return (f"SELECT name, type FROM pragma_table_info('{describe.group(1)}')",)
+
+    if compacto.startswith('ALTER TABLE'):
+        indice = _RE_ADD_INDEX.match(texto)
+        if indice:
+            unico = 'UNIQUE ' if indice.group(2) else ''
+            comandos = (f'CREATE {unico}INDEX IF NOT EXISTS {nome_indice(indice.group(1), indice.group(3))} '
+                        f'ON {indice.group(1)} ({indice.group(4)})',)
+        elif re.search(r'\b(MODIFY|CHANGE)\s+COLUMN\b', compacto):
+            # Tipos são dinâmicos no SQLite; as colunas já nascem no formato final
+            comandos = ()
+        else:
+            comandos = (_colunas_texto(_RE_COMENTARIO.sub('', _RE_AFTER.sub('', texto))),)
+    elif compacto.startswith('CREATE TABLE'):
+        comandos = _traduzir_create_table(texto)
+    else:
+        comandos = (_traduzir_dml(texto),)
+
+    if com_parametros:
+        comandos = tuple(c.replace('%s', '?').replace('%%', '%') for c in comandos)
+    return comandos
+
+
+def copiar_tabela(esquema, tabela: str, nova: str) -> Tuple[str, ...]:
+    """CREATE TABLE nova LIKE tabela: comandos SQLite a partir do DDL em sqlite_master
+
+    esquema: linhas (type, sql) de sqlite_master com tbl_name = tabela. Como no
+    MariaDB, a cópia leva colunas, chave primária e índices, mas não as FOREIGN
+    KEY (nem os gatilhos de ON UPDATE).
+    """
+    comandos, indices = [], []
+    for tipo, sql in esquema:
+        if not sql:
+            continue
+        if tipo == 'table':
+            abre, fecha = sql.index('('), sql.rindex(')')
+            partes = [p for p in _partes_topo(sql[abre + 1:fecha])
+                      if not re.match(r'(?:CONSTRAINT\s+`?\w+`?\s+)?FOREIGN\s+KEY\b', p, re.I)]
+            comandos.append(f'CREATE TABLE IF NOT EXISTS {nova} (\n    ' + ',\n    '.join(partes) + '\n)')
+        elif tipo == 'index':
+            indice = _RE_CREATE_INDEX.match(sql)
+            if indice:
+                nome = indice.group(2)
+                if nome.startswith(f'{tabela}__'):
+                    nome = nome[len(tabela) + 2:]
+                indices.append(f'CREATE {indice.group(1) or ""}INDEX IF NOT EXISTS {nome_indice(nova, nome)} '
+                               f'ON {nova} {indice.group(3)}')
+    return (*comandos, *indices)
+
+
+# ============ TIPOS E FUNÇÕES ============
+
+def _converter_data_hora(valor: bytes):
+    texto = valor.decode()
+    try:
+        return datetime.fromisoformat(texto)
+    except ValueError:
+        return texto
+
+
+def _converter_data(valor: bytes):
+    texto = valor.decode()
+    try:
+        return date.fromisoformat(texto[:10])
+    except ValueError:
+        return texto
+
+
+def _converter_hora(valor: bytes):
+    # Colunas TIME chegam do PyMySQL como timedelta
+    texto = valor.decode()
+    try:
+        partes = [float(p) for p in texto.split(':')]
+    except ValueError:
+        return texto
+    horas, minutos, segundos = (partes + [0.0, 0.0])[:3]
+    return timedelta(hours=horas, minutes=minutos, seconds=segundos)
+
+
+def _formatar_hora(valor: timedelta) -> str:
+    total = int(valor.total_seconds())
+    return f'{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}'
+
+
+sqlite3.register_adapter(datetime, lambda v: v.isoformat(' ', timespec='seconds'))
+sqlite3.register_adapter(date, lambda v: v.isoformat())
+sqlite3.register_adapter(time, lambda v: v.isoformat(timespec='seconds'))
+sqlite3.register_adapter(timedelta, _formatar_hora)
+sqlite3.register_adapter(Decimal, float)
+for _tipo in ('TIMESTAMP', 'DATETIME'):
+    sqlite3.register_converter(_tipo, _converter_data_hora)
+sqlite3.register_converter('DATE', _converter_data)
+sqlite3.register_converter('TIME', _converter_hora)
+
+
+def _comparar_sem_caixa(a: str, b: str) -> int:
+    a, b = a.casefold(), b.casefold()
+    return (a > b) - (a < b)
+
+
+def _texto_sql(valor) -> str:
+    if isinstance(valor, bytes):
+        return valor.decode()
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
+def _concat(*valores):
+    # Como no MariaDB: um argumento NULL deixa o resultado NULL
+    if any(v is None for v in valores):
+        return None
+    return ''.join(_texto_sql(v) for v in valores)
+
+
+def _timestamp(*valores):
+    """TIMESTAMP(data) / TIMESTAMP(data, hora): data e hora somadas; NULL se nulas ou inválidas"""
+    if not 1 <= len(valores) <= 2 or any(v is None for v in valores):
+        return None
+    try:
+        momento = datetime.fromisoformat(_texto_sql(valores[0]))
+    except ValueError:
+        return None
+    if len(valores) == 2:
+        intervalo = _converter_hora(_texto_sql(valores[1]).encode())
+        if not isinstance(intervalo, timedelta):
+            return None
+        momento += intervalo
+    return momento.isoformat(' ', timespec='seconds')
+
+
+def _registrar_funcoes(raw: sqlite3.Connection) -> None:
+    """Funções do MariaDB usadas no SQL do projeto"""
+    ultimo_id = {'valor': None}
+
+    def last_insert_id(*valor):
+        # LAST_INSERT_ID(expr) guarda expr para o próximo LAST_INSERT_ID()
+        if valor:
+            ultimo_id['valor'] = valor[0]
+            return valor[0]
+        if ultimo_id['valor'] is not None:
+            return ultimo_id['valor']
+        return raw.execute('SELECT last_insert_rowid()').fetchone()[0]
+
+    raw.create_function('NOW', 0, lambda: datetime.now().isoformat(' ', timespec='seconds'))
+    raw.create_function('CURDATE', 0, lambda: date.today().isoformat())
+    raw.create_function('UUID', 0, lambda: str(uuid.uuid4()))
+    raw.create_function('LAST_INSERT_ID', -1, last_insert_id)
+    raw.create_function('GREATEST', -1, lambda *v: None if None in v else max(v))
+    raw.create_function('LEAST', -1, lambda *v: None if None in v else min(v))
+    raw.create_function('CONCAT', -1, _concat)
+    raw.create_function('TIMESTAMP', -1, _timestamp)
+    for colacao in ('utf8mb4_unicode_ci', 'utf8mb4_general_ci'):
+        raw.create_collation(colacao, _comparar_sem_caixa)
+
+
+# ============ CONEXÃO ============
+
+class _CursorSQLite:
+    """Cursor com a interface usada do PyMySQL (tuplas ou dicts, rowcount, lastrowid)"""
+
+    def __init__(self, raw: sqlite3.Connection, dicionario: bool):
+        self._cursor = raw.cursor()
+        self._dicionario = dicionario
+        self.rowcount = -1
+        self.lastrowid = None
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def _linha(self, linha):
+        if linha is None or not self._dicionario:
+            return linha
+        return {coluna[0]: valor for coluna, valor in zip(self._cursor.description, linha)}
+
+    def execute(self, query, args=None):
+        comandos = traduzir(query, args is not None)
+        self.rowcount = 0
+        for comando in comandos:
+            self._cursor.execute(comando, tuple(args) if args is not None and '?' in comando else ())
+            if self._cursor.rowcount >= 0:
+                self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+        return self.rowcount
+
+    def executemany(self, query, args):
+        (comando,) = traduzir(query, True)
+        self._cursor.executemany(comando, [tuple(a) for a in args])
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+        return self.rowcount
+
+    def fetchone(self):
+        return self._linha(self._cursor.fetchone())
+
+    def fetchmany(self, tamanho=None):
+        linhas = self._cursor.fetchmany(tamanho) if tamanho else self._cursor.fetchmany()
+        return [self._linha(linha) for linha in linhas]
+
+    def fetchall(self):
+        return [self._linha(linha) for linha in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        self._cursor.close()
+
+
+class ConexaoSQLite:
+    """Conexão no formato do wrapper PyMySQL do DatabaseManager
+
+    As instâncias de uma mesma thread compartilham a conexão sqlite3 da thread;
+    quando a última é fechada sem commit o pendente é desfeito, como no close()
+    de uma conexão MariaDB.
+    """
+
+    def __init__(self, banco: 'BancoSQLite', local):
+        self._banco = banco
+        self._local = local
+        self._raw = local.raw
+        self._aberta = True
+        local.abertas += 1
+
+    def cursor(self, dictionary=False, cursor=None, **kw):
+        # cursor=DictCursor/SSDictCursor do PyMySQL também devolvem dicts
+        dicionario = dictionary or (cursor is not None and 'Dict' in getattr(cursor, '__name__', ''))
+        return instrumentar_cursor(_CursorSQLite(self._raw, dicionario))
+
+    def commit(self):
+        return self._raw.commit()
+
+    def rollback(self):
+        return self._raw.rollback()
+
+    def close(self):
+        if not self._aberta:
+            return
+        self._aberta = False
+        self._local.abertas -= 1
+        if self._local.abertas == 0 and self._raw.in_transaction:
+            self._raw.rollback()
+
+
+class BancoSQLite:
+    """Arquivo SQLite em WAL com uma conexão sqlite3 por thread"""
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._local = threading.local()
+
+    def _raw_da_thread(self):
+        local = self._local
+        if getattr(local, 'raw', None) is None:
+            raw = sqlite3.connect(self.caminho, detect_types=sqlite3.PARSE_DECLTYPES,
+                                  timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+            raw.execute('PRAGMA journal_mode = WAL')
+            raw.execute('PRAGMA synchronous = NORMAL')
+            raw.execute('PRAGMA foreign_keys = ON')
+            _registrar_funcoes(raw)
+            local.raw = raw
+            local.abertas = 0
+            registrar_conexao()
+        return local
+
+    def abrir(self) -> ConexaoSQLite:
+        return ConexaoSQLite(self, self._raw_da_thread())
+
+    def fechar_thread(self) -> None:
+        """Fecha a conexão sqlite3 da thread atual (fim de worker/teste)"""
+        raw: Optional[sqlite3.Connection] = getattr(self._local, 'raw', None)
+        if raw is not None:
+            self._local.raw = None
+            raw.close()
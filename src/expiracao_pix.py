@@ -0,0 +1,131 @@
+"""
+Varredura de transações PIX pendentes abandonadas
+
+Toda rota de cobrança grava uma transação 'pendente' (criar_transacao_pix); as
+que o jogador abandona ficariam pendentes para sempre. O job 'expirar_pix'
+(app.py) passa periodicamente pelas pendentes mais velhas que o TTL, em lotes
+pelo índice (status, data_criacao), e reconcilia cada uma com o Mercado Pago:
+
+    approved                            confirmada (como o webhook)
+    rejected                            'recusado'
+    cancelled, refunded, charged_back   'cancelado'
+    pending, in_process, 404...         'expirado' (QR abandonado)
+    sem resposta                        continua pendente (próxima varredura)
+
+Sem mercado_pago_id (QR nunca gerado) a transação expira direto. Um pagamento
+que chegue depois ainda é confirmado pelo webhook (confirmar_transacao_pix não
+exige 'pendente'). Webhook e varredura confirmando ao mesmo tempo aplicam o
+pagamento uma vez só: confirmar_transacao_pix toma a linha antes dos efeitos.
+
+O cliente de status é plugável: ClienteStatusMercadoPago consulta a API;
+ClienteStatusLocal responde de um dicionário (desenvolvimento, testes, etapas
+sem internet).
+"""
+from typing import Any, Dict, Mapping, Optional
+
+from .log import obter_logger
+
+logger = obter_logger('pix')
+
+TTL_PADRAO_MINUTOS = 60
+LOTE_PADRAO = 50
+
+CONFIRMAR = 'confirmar'
+EXPIRADO = 'expirado'
+# Status do Mercado Pago -> status final da transação (demais abertos: expirado)
+STATUS_FINAIS_MP = {
+    'rejected': 'recusado',
+    'cancelled': 'cancelado',
+    'refunded': 'cancelado',
+    'charged_back': 'cancelado',
+}
+
+
+def decidir(status_mp: Optional[str]) -> Optional[str]:
+    """Ação para uma pendente vencida: CONFIRMAR, um status final ou None (manter)"""
+    if status_mp is None:
+        return None
+    if status_mp == 'approved':
+        return CONFIRMAR
+    return STATUS_FINAIS_MP.get(status_mp, EXPIRADO)
+
+
+class ClienteStatusMercadoPago:
+    """Status do pagamento na API do Mercado Pago (None se não houve resposta válida)"""
+
+    def consultar(self, mercado_pago_id: str) -> Optional[str]:
+        from .mercado_pago_client import mp_client
+        pagamento = mp_client.obter_pagamento(mercado_pago_id)
+        status = pagamento.get('status') if pagamento else None
+        if isinstance(status, int):
+            # Corpo de erro da API ({"status": 404, ...}): 404 = pagamento inexistente
+            return 'not_found' if status == 404 else None
+        return status
+
+
+class ClienteStatusLocal:
+    """Stub: status fixos por mercado_pago_id; os demais respondem `padrao`"""
+
+    def __init__(self, status: Optional[Mapping[str, Optional[str]]] = None, padrao: Optional[str] = 'pending'):
+        self.status = dict(status or {})
+        self.padrao = padrao
+
+    def consultar(self, mercado_pago_id: str) -> Optional[str]:
+        return self.status.get(mercado_pago_id, self.padrao)
+
+
+CLIENTES_STATUS = {
+    'mercado_pago': ClienteStatusMercadoPago,
+    'local': ClienteStatusLocal,
+}
+
+
+def criar_cliente_status(nome: str):
+    """Cliente de status pelo nome (GRANPIX_PIX_STATUS_CLIENTE); ValueError se desconhecido"""
+    if nome not in CLIENTES_STATUS:
+        raise ValueError(f'Cliente de status PIX desconhecido: {nome} (válidos: {", ".join(CLIENTES_STATUS)})')
+    return CLIENTES_STATUS[nome]()
+
+
+def varrer_pendentes(db, cliente, ttl_minutos: int = TTL_PADRAO_MINUTOS, lote: int = LOTE_PADRAO,
+                     progresso=None) -> Dict[str, Any]:
+    """Reconcilia as pendentes mais velhas que ttl_minutos; retorna contagens por ação
+
+    Percorre por keyset (data_criacao, id), então as que continuam pendentes
+    (sem resposta do cliente) não são lidas de novo na mesma varredura.
+    """
+    contagens = {CONFIRMAR: 0, EXPIRADO: 0, 'recusado': 0, 'cancelado': 0, 'mantidas': 0}
+    depois_de = None
+    while True:
+        pendentes = db.listar_pix_pendentes_vencidos(ttl_minutos, lote, depois_de)
+        if not pendentes:
+            break
+        encerrar: Dict[str, list] = {}
+        for transacao in pendentes:
+            mercado_pago_id = transacao['mercado_pago_id']
+            if not mercado_pago_id:
+                acao = EXPIRADO
+            else:
+                try:
+                    acao = decidir(cliente.consultar(mercado_pago_id))
+                except Exception as e:
+                    logger.warning('[PIX] Erro ao consultar %s: %s', mercado_pago_id, e)
+                    acao = None
+            if acao is None:
+                contagens['mantidas'] += 1
+            elif acao == CONFIRMAR:
+                if db.confirmar_transacao_pix(mercado_pago_id).get('sucesso'):
+                    contagens[CONFIRMAR] += 1
+            else:
+                encerrar.setdefault(acao, []).append(transacao['id'])
+        for status, ids in encerrar.items():
+            contagens[status] += db.encerrar_transacoes_pix(ids, status)
+        ultima = pendentes[-1]
+        depois_de = (ultima['data_criacao'], ultima['id'])
+        if progresso:
+            progresso(sum(contagens.values()), None, f'{sum(contagens.values())} pendente(s) verificada(s)')
+        if len(pendentes) < lote:
+            break
+    if any(v for k, v in contagens.items() if k != 'mantidas'):
+        logger.info('[PIX] Varredura de pendentes: %s', contagens)
+    return contagens
@@ -0,0 +1,201 @@
+"""
+Política de cache HTTP por rota do GRANPIX
+
+- Assets estáticos com URL versionada por hash do conteúdo (?v=<hash>) e cache imutável
+- GET condicional (ETag/Last-Modified -> 304) para catálogo da loja e listagens de etapas
+- no-store apenas para saldo e autenticação
+- Compressão gzip/brotli para JSON e HTML acima de um tamanho mínimo
+"""
+import gzip
+import hashlib
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from flask import g, request
+
+try:
+    import brotli  # Opcional: pip install brotli
+except ImportError:
+    brotli = None
+
+
+# ============ POLÍTICAS ============
+
+# Sempre revalidar com o servidor (padrão para dados da API)
+REVALIDAR = 'revalidar'
+# Revalidar com ETag/Last-Modified e responder 304 se nada mudou (catálogo, etapas)
+CONDICIONAL = 'condicional'
+# Nunca armazenar (saldo, login, sessão)
+SEM_ARMAZENAMENTO = 'sem_armazenamento'
+# Conteúdo endereçado por hash: pode ficar em cache "para sempre"
+IMUTAVEL = 'imutavel'
+
+CACHE_CONTROL = {
+    REVALIDAR: 'no-cache',
+    CONDICIONAL: 'no-cache',
+    SEM_ARMAZENAMENTO: 'no-store, no-cache, must-revalidate, max-age=0',
+    IMUTAVEL: 'public, max-age=31536000, immutable',
+}
+
+# Tipos de conteúdo que valem a pena comprimir
+TIPOS_COMPRIMIVEIS = {
+    'application/json',
+    'text/html',
+    'text/css',
+    'text/javascript',
+    'application/javascript',
+}
+
+# Respostas menores que isso não compensam a compressão
+COMPRESSAO_MIN_BYTES = int(os.environ.get('GRANPIX_COMPRESSAO_MIN_BYTES', '1024'))
+COMPRESSAO_NIVEL_GZIP = 6
+COMPRESSAO_NIVEL_BROTLI = 5
+
+
+def politica_cache(politica: str):
+    """Decorator que define a política de cache de uma rota
+
+    Deve ficar abaixo de @app.route (pode ficar acima ou abaixo de requer_login_api,
+    pois functools.wraps copia o atributo).
+    """
+    if politica not in CACHE_CONTROL:
+        raise ValueError(f"Política de cache desconhecida: {politica}")
+
+    def decorator(f):
+        f._politica_cache = politica
+        return f
+    return decorator
+
+
+def definir_ultima_modificacao(data: Optional[datetime]) -> None:
+    """Informa o Last-Modified da resposta atual (rotas CONDICIONAL com data_atualizacao: etapas, campeonatos)"""
+    if data is not None:
+        g._cache_ultima_modificacao = data
+
+
+# ============ ASSETS VERSIONADOS ============
+
+class VersaoAssets:
+    """Calcula (e memoriza por mtime) o hash de conteúdo dos arquivos estáticos"""
+
+    def __init__(self, pasta_static: str):
+        self.pasta_static = pasta_static
+        self._cache: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def versao(self, filename: str) -> Optional[str]:
+        caminho = os.path.join(self.pasta_static, filename)
+        try:
+            mtime = os.path.getmtime(caminho)
+        except OSError:
+            return None
+
+        with self._lock:
+            em_cache = self._cache.get(filename)
+        if em_cache and em_cache[0] == mtime:
+            return em_cache[1]
+
+        h = hashlib.sha256()
+        with open(caminho, 'rb') as f:
+            for bloco in iter(lambda: f.read(65536), b''):
+                h.update(bloco)
+        digest = h.hexdigest()[:12]
+        with self._lock:
+            self._cache[filename] = (mtime, digest)
+        return digest
+
+
+# ============ COMPRESSÃO ============
+
+def _escolher_codificacao(accept_encoding: str) -> Optional[str]:
+    """Escolhe br (se disponível) ou gzip a partir do Accept-Encoding"""
+    aceitas = set()
+    for parte in accept_encoding.split(','):
+        itens = parte.strip().split(';')
+        nome = itens[0].strip().lower()
+        if not nome:
+            continue
+        if any(p.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000') for p in itens[1:]):
+            continue
+        aceitas.add(nome)
+    if brotli is not None and 'br' in aceitas:
+        return 'br'
+    if 'gzip' in aceitas or '*' in aceitas:
+        return 'gzip'
+    return None
+
+
+def comprimir(dados: bytes, codificacao: str) -> bytes:
+    if codificacao == 'br':
+        return brotli.compress(dados, quality=COMPRESSAO_NIVEL_BROTLI)
+    return gzip.compress(dados, compresslevel=COMPRESSAO_NIVEL_GZIP)
+
+
+def _comprimir_resposta(response) -> None:
+    if response.direct_passthrough or response.is_streamed:
+        return
+    if response.mimetype not in TIPOS_COMPRIMIVEIS:
+        return
+    response.vary.add('Accept-Encoding')
+    if response.status_code != 200 or 'Content-Encoding' in response.headers:
+        return
+    if request.method == 'HEAD':
+        return
+    dados = response.get_data()
+    if len(dados) < COMPRESSAO_MIN_BYTES:
+        return
+    codificacao = _escolher_codificacao(request.headers.get('Accept-Encoding', ''))
+    if not codificacao:
+        return
+    comprimido = comprimir(dados, codificacao)
+    if len(comprimido) >= len(dados):
+        return
+    response.set_data(comprimido)
+    response.headers['Content-Encoding'] = codificacao
+
+
+# ============ INTEGRAÇÃO COM O FLASK ============
+
+def _politica_da_rota(app, versoes: 'VersaoAssets') -> str:
+    if request.endpoint == 'static':
+        # Só é imutável se a URL carrega o hash do conteúdo atual; ?v= antigo ou manual revalida
+        versao = versoes.versao((request.view_args or {}).get('filename', ''))
+        return IMUTAVEL if versao and request.args.get('v') == versao else REVALIDAR
+    view = app.view_functions.get(request.endpoint) if request.endpoint else None
+    return getattr(view, '_politica_cache', REVALIDAR)
+
+
+def configurar_cache_http(app) -> None:
+    """Registra o versionamento de assets e o after_request de cache/compressão"""
+    versoes = VersaoAssets(app.static_folder)
+
+    @app.url_defaults
+    def _versionar_static(endpoint, values):
+        # Sempre o hash atual: um v= fixo no template ficaria preso em cache por um ano
+        if endpoint == 'static' and 'filename' in values:
+            versao = versoes.versao(values['filename'])
+            if versao:
+                values['v'] = versao
+
+    @app.after_request
+    def aplicar_politica_cache(response):
+        politica = _politica_da_rota(app, versoes)
+
+        if (politica == CONDICIONAL and request.method in ('GET', 'HEAD')
+                and response.status_code == 200 and not response.is_streamed):
+            ultima_modificacao = g.pop('_cache_ultima_modificacao', None)
+            if ultima_modificacao is not None:
+                response.last_modified = ultima_modificacao
+            # ETag fraco: o mesmo recurso comprimido ou não continua "equivalente"
+            response.add_etag(weak=True)
+            response.make_conditional(request)
+
+        response.headers['Cache-Control'] = CACHE_CONTROL[politica]
+        if politica == SEM_ARMAZENAMENTO:
+            response.headers['Pragma'] = 'no-cache'
+            response.headers['Expires'] = '0'
+
+        _comprimir_resposta(response)
+        return response
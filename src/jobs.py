@@ -0,0 +1,235 @@
+"""
+Tarefas longas do admin em segundo plano (exportações, Challonge, migrações...)
+
+A rota enfileira um job (linha na tabela jobs) e responde 202 com o id; um pool
+de threads executa o handler registrado para o tipo, que informa o progresso.
+O estado fica no banco, então qualquer worker responde GET /api/admin/jobs/<id>.
+
+Cada job é reservado com um UPDATE condicional (pendente -> executando), então
+só um processo o executa mesmo que vários o tenham na fila. Enquanto roda, o
+executor renova o batimento do job; se o processo cai, o batimento para e
+recuperar_orfaos devolve o job para 'pendente' (ou 'falhou', se já gastou as
+tentativas) - na inicialização e depois periodicamente.
+
+Tipos agendados (agendar) são enfileirados pela mesma thread do batimento a
+cada intervalo; com vários processos cada um enfileira o seu, então o handler
+de um job agendado deve tolerar execuções simultâneas.
+
+O executor não conhece o banco: recebe um repositório (ver DatabaseManager,
+seção JOBS).
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .log import obter_logger
+
+logger = obter_logger('jobs')
+
+PENDENTE = 'pendente'
+EXECUTANDO = 'executando'
+CONCLUIDO = 'concluido'
+FALHOU = 'falhou'
+STATUS_FINAIS = (CONCLUIDO, FALHOU)
+
+WORKERS_PADRAO = 2
+# Segundos entre renovações do batimento (e buscas por órfãos)
+INTERVALO_BATIMENTO_PADRAO = 15.0
+# Job em execução sem batimento há mais que isso é considerado órfão
+TOLERANCIA_ORFAO_PADRAO = 60.0
+# Espera antes da retentativa n: espera_retentativa * n segundos
+ESPERA_RETENTATIVA_PADRAO = 5.0
+
+
+class Progresso:
+    """Passado ao handler: progresso(atual, total, mensagem)"""
+
+    def __init__(self, repositorio, job_id: str):
+        self._repositorio = repositorio
+        self.job_id = job_id
+
+    def __call__(self, atual: int, total: Optional[int] = None, mensagem: Optional[str] = None) -> None:
+        try:
+            self._repositorio.atualizar_progresso_job(self.job_id, atual, total, mensagem)
+        except Exception as e:
+            # Progresso é informativo: não derruba o job
+            logger.warning('[JOBS] Erro ao registrar progresso de %s: %s', self.job_id, e)
+
+
+class ExecutorJobs:
+    """Registro de tipos de job + pool de threads que os executa"""
+
+    def __init__(
+        self,
+        repositorio,
+        max_workers: int = WORKERS_PADRAO,
+        intervalo_batimento: float = INTERVALO_BATIMENTO_PADRAO,
+        tolerancia_orfao: float = TOLERANCIA_ORFAO_PADRAO,
+        espera_retentativa: float = ESPERA_RETENTATIVA_PADRAO,
+    ):
+        self._repositorio = repositorio
+        self.max_workers = max(1, int(max_workers))
+        self.intervalo_batimento = intervalo_batimento
+        self.tolerancia_orfao = tolerancia_orfao
+        self.espera_retentativa = espera_retentativa
+        self._handlers: Dict[str, Callable[[Dict[str, Any], Progresso], Any]] = {}
+        self._max_tentativas: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._em_execucao = set()
+        self._parar = threading.Event()
+        self._thread_batimento: Optional[threading.Thread] = None
+        # tipo -> {'intervalo', 'parametros', 'proximo' (time.monotonic)}
+        self._agendados: Dict[str, Dict[str, Any]] = {}
+
+    def registrar(self, tipo: str, handler: Callable[[Dict[str, Any], Progresso], Any],
+                  max_tentativas: int = 1) -> None:
+        """handler(parametros, progresso) -> resultado (serializável em JSON)
+
+        Exceções contam como falha da tentativa; o job é repetido até
+        max_tentativas vezes no total.
+        """
+        self._handlers[tipo] = handler
+        self._max_tentativas[tipo] = max(1, int(max_tentativas))
+
+    def agendar(self, tipo: str, intervalo: float, parametros: Optional[Dict[str, Any]] = None) -> None:
+        """Enfileira o tipo a cada `intervalo` segundos (o primeiro após um intervalo)
+
+        A verificação acompanha o batimento, então a precisão é de
+        intervalo_batimento segundos.
+        """
+        if tipo not in self._handlers:
+            raise ValueError(f'Tipo de job desconhecido: {tipo}')
+        if intervalo <= 0:
+            raise ValueError('Intervalo deve ser positivo')
+        self._agendados[tipo] = {
+            'intervalo': float(intervalo),
+            'parametros': parametros or {},
+            'proximo': time.monotonic() + intervalo,
+        }
+
+    def disparar_agendados(self, agora: Optional[float] = None) -> int:
+        """Enfileira os agendados vencidos; retorna quantos enfileirou"""
+        agora = time.monotonic() if agora is None else agora
+        disparados = 0
+        for tipo, agenda in list(self._agendados.items()):
+            if agora < agenda['proximo']:
+                continue
+            agenda['proximo'] = agora + agenda['intervalo']
+            try:
+                self.enfileirar(tipo, agenda['parametros'], criado_por='agendador')
+                disparados += 1
+            except Exception as e:
+                logger.error('[JOBS] Erro ao enfileirar o agendado %s: %s', tipo, e)
+        return disparados
+
+    def enfileirar(self, tipo: str, parametros: Optional[Dict[str, Any]] = None,
+                   criado_por: Optional[str] = None) -> str:
+        """Grava o job como pendente e o submete ao pool; retorna o id"""
+        if tipo not in self._handlers:
+            raise ValueError(f'Tipo de job desconhecido: {tipo}')
+        job_id = str(uuid.uuid4())
+        if not self._repositorio.criar_job(job_id, tipo, parametros or {}, self._max_tentativas[tipo], criado_por):
+            raise RuntimeError('Não foi possível registrar o job')
+        self._submeter(job_id)
+        return job_id
+
+    def _submeter(self, job_id: str) -> None:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='granpix-job')
+            pool = self._pool
+        pool.submit(self.executar, job_id)
+
+    def executar(self, job_id: str) -> None:
+        """Reserva e executa uma tentativa do job (no-op se outro worker já o pegou)"""
+        try:
+            job = self._repositorio.reservar_job(job_id)
+        except Exception as e:
+            # Fica pendente; recuperar_orfaos tenta de novo
+            logger.error('[JOBS] Erro ao reservar job %s: %s', job_id, e)
+            return
+        if not job:
+            return
+        handler = self._handlers.get(job['tipo'])
+        if handler is None:
+            self._repositorio.finalizar_job(job_id, FALHOU, erro=f"Tipo de job desconhecido: {job['tipo']}")
+            return
+        with self._lock:
+            self._em_execucao.add(job_id)
+        tentativa = job['tentativas']
+        logger.info('[JOBS] %s %s: tentativa %s/%s', job['tipo'], job_id, tentativa, job['max_tentativas'])
+        try:
+            resultado = handler(job['parametros'] or {}, Progresso(self._repositorio, job_id))
+        except Exception as e:
+            logger.exception('[JOBS] %s %s falhou na tentativa %s', job['tipo'], job_id, tentativa)
+            if tentativa < job['max_tentativas']:
+                self._repositorio.devolver_job(job_id, str(e))
+                self._agendar_retentativa(job_id, tentativa)
+            else:
+                self._repositorio.finalizar_job(job_id, FALHOU, erro=str(e))
+        else:
+            self._repositorio.finalizar_job(job_id, CONCLUIDO, resultado=resultado)
+            logger.info('[JOBS] %s %s concluído', job['tipo'], job_id)
+        finally:
+            with self._lock:
+                self._em_execucao.discard(job_id)
+
+    def _agendar_retentativa(self, job_id: str, tentativa: int) -> None:
+        espera = self.espera_retentativa * tentativa
+        if espera <= 0:
+            self._submeter(job_id)
+            return
+        timer = threading.Timer(espera, self._submeter, args=(job_id,))
+        timer.daemon = True
+        timer.start()
+
+    def recuperar_orfaos(self) -> int:
+        """Devolve à fila jobs interrompidos e submete os pendentes; retorna quantos submeteu"""
+        try:
+            pendentes = self._repositorio.recuperar_jobs_orfaos(self.tolerancia_orfao)
+        except Exception as e:
+            logger.error('[JOBS] Erro ao recuperar jobs órfãos: %s', e)
+            return 0
+        for job_id in pendentes:
+            self._submeter(job_id)
+        if pendentes:
+            logger.info('[JOBS] %s job(s) pendente(s) submetido(s) ao pool', len(pendentes))
+        return len(pendentes)
+
+    def bater(self) -> None:
+        """Renova o batimento dos jobs que este processo está executando"""
+        with self._lock:
+            ids = list(self._em_execucao)
+        if not ids:
+            return
+        try:
+            self._repositorio.registrar_batimento_jobs(ids)
+        except Exception as e:
+            logger.warning('[JOBS] Erro ao renovar batimento: %s', e)
+
+    def iniciar(self) -> None:
+        """Recupera jobs interrompidos e inicia a thread de batimento (e dos agendados)"""
+        if self._thread_batimento is not None:
+            return
+        self.recuperar_orfaos()
+        self._parar.clear()
+        self._thread_batimento = threading.Thread(target=self._loop_batimento, name='granpix-jobs-batimento',
+                                                  daemon=True)
+        self._thread_batimento.start()
+
+    def _loop_batimento(self) -> None:
+        while not self._parar.wait(self.intervalo_batimento):
+            self.bater()
+            self.recuperar_orfaos()
+            self.disparar_agendados()
+
+    def parar(self, aguardar: bool = False) -> None:
+        self._parar.set()
+        self._thread_batimento = None
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=aguardar)
@@ -0,0 +1,147 @@
+"""
+Serialização JSON do GRANPIX
+
+Provider do Flask baseado em orjson (quando instalado) com fallback para o json
+da biblioteca padrão. Converte nativamente os tipos que vêm do MariaDB:
+Decimal -> float, datetime/date -> ISO 8601, timedelta (colunas TIME) -> "HH:MM:SS".
+
+Também oferece resposta em streaming para listas grandes (linhas serializadas
+conforme saem de um cursor server-side, sem montar a lista inteira em memória).
+"""
+import dataclasses
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from flask import stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+from .log import obter_logger
+
+try:
+    import orjson  # Opcional: pip install orjson
+except ImportError:
+    orjson = None
+
+logger = obter_logger('app')
+
+# Marca de iterador esgotado (uma linha pode ser qualquer valor)
+_FIM = object()
+
+
+def formatar_timedelta(valor: datetime.timedelta) -> str:
+    """Formata um TIME do MariaDB (timedelta no PyMySQL) como HH:MM:SS"""
+    total = int(valor.total_seconds())
+    sinal = '-' if total < 0 else ''
+    total = abs(total)
+    return f"{sinal}{total // 3600:02d}:{(total % 3600) // 60:02d}:{total % 60:02d}"
+
+
+def converter_valor(obj: Any) -> Any:
+    """Converte tipos não suportados pelo JSON (usado como default= do encoder)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, datetime.timedelta):
+        return formatar_timedelta(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8', errors='replace')
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Objeto do tipo {type(obj).__name__} não é serializável em JSON")
+
+
+if orjson is not None:
+    _ORJSON_OPCOES = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj: Any, sort_keys: bool = False) -> bytes:
+        opcoes = _ORJSON_OPCOES | orjson.OPT_SORT_KEYS if sort_keys else _ORJSON_OPCOES
+        return orjson.dumps(obj, default=converter_valor, option=opcoes)
+else:
+    def dumps_bytes(obj: Any, sort_keys: bool = False) -> bytes:
+        return json.dumps(
+            obj, default=converter_valor, ensure_ascii=False,
+            separators=(',', ':'), sort_keys=sort_keys
+        ).encode('utf-8')
+
+
+class GranpixJSONProvider(DefaultJSONProvider):
+    """Provider JSON do app: orjson quando disponível, stdlib caso contrário"""
+
+    default = staticmethod(converter_valor)
+    # Mantém a ordem das chaves montada nas rotas (JSON_SORT_KEYS não é mais lido pelo Flask)
+    sort_keys = False
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            # Chamadas com argumentos específicos (indent etc.) usam o encoder padrão
+            kwargs.setdefault('default', self.default)
+            kwargs.setdefault('ensure_ascii', False)
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return dumps_bytes(obj, self.sort_keys).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            dumps_bytes(obj, self.sort_keys), mimetype=self.mimetype
+        )
+
+
+def resposta_json_stream(
+    app,
+    linhas: Iterable[Dict[str, Any]],
+    chave: Optional[str] = None,
+    rodape: Optional[Callable[[], Dict[str, Any]]] = None,
+):
+    """Resposta JSON em streaming
+
+    Sem `chave` gera uma lista: [linha, linha, ...].
+    Com `chave` gera um objeto: {"<chave>": [linha, ...], **rodape()}. O rodapé é
+    chamado depois da última linha, então pode conter totais acumulados no caminho.
+
+    A primeira linha é lida antes de devolver a resposta: um erro ao abrir a
+    consulta sobe para o try/except da rota, que ainda pode responder 4xx/5xx.
+    Um erro no meio do streaming (status 200 já enviado) fecha a lista e termina
+    o objeto com "erro" no lugar do rodapé; sem `chave` o corpo fica truncado
+    (JSON inválido), para o cliente não confundir com uma lista completa.
+    """
+    iterador = iter(linhas)
+    primeira = next(iterador, _FIM)
+
+    def gerar():
+        yield ('{' + json.dumps(chave) + ':[') if chave else '['
+        if primeira is _FIM:
+            yield ']'
+        else:
+            yield dumps_bytes(primeira)
+            try:
+                for linha in iterador:
+                    yield b',' + dumps_bytes(linha)
+            except Exception as e:
+                logger.exception('[JSON] Erro durante o streaming da resposta: %s', e)
+                if chave:
+                    yield b'],"erro":' + dumps_bytes(str(e)) + b'}'
+                return
+            yield ']'
+        if chave:
+            extras = rodape() if rodape else {}
+            for nome, valor in extras.items():
+                yield b',' + dumps_bytes(nome) + b':' + dumps_bytes(valor)
+            yield '}'
+
+    return app.response_class(stream_with_context(gerar()), mimetype='application/json')
@@ -0,0 +1,371 @@
+"""
+Listagens do painel admin paginadas no servidor
+
+Cada listagem é descrita por uma ListaAdmin: FROM/JOINs, colunas, campos de
+ordenação e de filtro permitidos (whitelist -> expressão SQL). montar_consulta
+transforma os parâmetros da query string em SQL com keyset (cursor) e LIMIT;
+DatabaseManager.listar_pagina_admin executa. Nada aqui acessa o banco.
+
+Parâmetros aceitos por todas as listas:
+    limite, cursor, ordenar=<campo>, direcao=asc|desc, <filtro>=<valor>
+Listas de tabelas arquivadas (ver src/arquivamento.py) aceitam também arquivo=1,
+que lê <tabela>_historico em vez da tabela viva.
+"""
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from .paginacao import codificar_cursor, decodificar_cursor, ler_limite
+
+# Operadores de filtro: '=' exato, 'busca' LIKE %valor%, '>=' / '<=' intervalos de data
+OPERADORES = ('=', 'busca', '>=', '<=')
+
+
+@dataclass(frozen=True)
+class ListaAdmin:
+    """Descrição de uma listagem: só campos presentes aqui chegam ao SQL"""
+    tabela: str                       # tabela base (para a estimativa de COUNT)
+    origem: str                       # FROM com alias e JOINs
+    colunas: str                      # lista do SELECT
+    coluna_id: str                    # desempate do keyset (chave primária)
+    ordenacoes: Dict[str, Tuple[str, ...]]  # campo -> colunas (sem expressão: o índice atende)
+    ordenacao_padrao: str
+    direcao_padrao: str = 'desc'
+    filtros: Dict[str, Tuple[str, str]] = field(default_factory=dict)  # campo -> (expressão, operador)
+    anulaveis: FrozenSet[str] = frozenset()  # colunas de ordenação que aceitam NULL
+    formatar: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+
+
+@dataclass
+class ConsultaLista:
+    sql: str
+    params: list
+    sql_contagem: str
+    params_contagem: list
+    limite: int
+    ordenar: str
+    direcao: str
+    filtrada: bool
+    primeira_pagina: bool
+
+    colunas_ordem: int = 1
+
+    def proximo_cursor(self, ultima: Dict[str, Any]) -> str:
+        valores = [ultima[f'_ordem{i}'] for i in range(self.colunas_ordem)]
+        return codificar_cursor((self.ordenar, self.direcao, valores, ultima['_id']))
+
+
+def lista_arquivada(lista: ListaAdmin, tabela_historico: str) -> ListaAdmin:
+    """A mesma listagem lendo a tabela de histórico (mesmo alias, JOINs e formato)"""
+    return replace(lista, tabela=tabela_historico, origem=tabela_historico + lista.origem[len(lista.tabela):])
+
+
+def _escapar_like(valor: str) -> str:
+    return valor.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _depois_na_coluna(coluna: str, valor: Any, direcao: str, anulavel: bool) -> Optional[Tuple[str, list]]:
+    """SQL "coluna vem depois de valor" na ordem pedida; None se nada vem depois
+
+    NULL é o menor valor (MySQL e SQLite): primeiro no ASC, último no DESC.
+    """
+    if valor is None:
+        return (f'{coluna} IS NOT NULL', []) if direcao == 'asc' else None
+    if direcao == 'asc':
+        return f'{coluna} > %s', [valor]
+    if anulavel:
+        return f'({coluna} < %s OR {coluna} IS NULL)', [valor]
+    return f'{coluna} < %s', [valor]
+
+
+def condicao_keyset(colunas: Tuple[str, ...], coluna_id: str, valores: List[Any], ultimo_id: Any,
+                    direcao: str, anulaveis: FrozenSet[str] = frozenset()) -> Tuple[str, list]:
+    """SQL "vem depois de (valores, ultimo_id)" para ORDER BY colunas..., id na direção
+
+    Expande a comparação de tuplas em OR de prefixos iguais, sobre as colunas
+    puras (sem COALESCE), para o índice atender o WHERE e o ORDER BY; NULL no
+    cursor vira IS NULL.
+    """
+    termos, params = [], []
+    prefixo, params_prefixo = [], []
+    for coluna, valor in zip((*colunas, coluna_id), (*valores, ultimo_id)):
+        depois = _depois_na_coluna(coluna, valor, direcao, coluna in anulaveis)
+        if depois is not None:
+            partes = prefixo + [depois[0]]
+            termos.append(f"({' AND '.join(partes)})" if len(partes) > 1 else partes[0])
+            params += params_prefixo + depois[1]
+        if valor is None:
+            prefixo.append(f'{coluna} IS NULL')
+        else:
+            prefixo.append(f'{coluna} = %s')
+            params_prefixo = params_prefixo + [valor]
+    return (termos[0] if len(termos) == 1 else f"({' OR '.join(termos)})"), params
+
+
+def montar_consulta(lista: ListaAdmin, args: Mapping[str, Any]) -> ConsultaLista:
+    """SQL da página pedida; ValueError para ordenação, direção ou cursor inválidos"""
+    limite = ler_limite(args.get('limite'))
+    ordenar = args.get('ordenar') or lista.ordenacao_padrao
+    direcao = (args.get('direcao') or lista.direcao_padrao).lower()
+    if ordenar not in lista.ordenacoes:
+        raise ValueError(f'Ordenação não permitida: {ordenar}')
+    if direcao not in ('asc', 'desc'):
+        raise ValueError('Direção deve ser asc ou desc')
+
+    condicoes, params = [], []
+    for campo, (expressao, operador) in lista.filtros.items():
+        valor = args.get(campo)
+        if valor in (None, ''):
+            continue
+        if operador == 'busca':
+            condicoes.append(f'{expressao} LIKE %s')
+            params.append(f'%{_escapar_like(str(valor))}%')
+        else:
+            condicoes.append(f'{expressao} {operador} %s')
+            params.append(valor)
+    filtrada = bool(condicoes)
+    where_filtros = ' AND '.join(condicoes) or '1=1'
+
+    colunas_ordem = lista.ordenacoes[ordenar]
+    cursor = decodificar_cursor(args.get('cursor'), 4)
+    where, params_pagina = where_filtros, list(params)
+    if cursor is not None:
+        if cursor[0] != ordenar or cursor[1] != direcao:
+            raise ValueError('Cursor não corresponde à ordenação pedida')
+        if not isinstance(cursor[2], list) or len(cursor[2]) != len(colunas_ordem):
+            raise ValueError('Cursor inválido')
+        condicao, params_cursor = condicao_keyset(colunas_ordem, lista.coluna_id, cursor[2], cursor[3],
+                                                  direcao, lista.anulaveis)
+        where += f' AND {condicao}'
+        params_pagina += params_cursor
+
+    sentido = direcao.upper()
+    selecao = ', '.join(f'{coluna} AS _ordem{i}' for i, coluna in enumerate(colunas_ordem))
+    ordem = ', '.join(f'{coluna} {sentido}' for coluna in (*colunas_ordem, lista.coluna_id))
+    sql = (f'SELECT {lista.colunas}, {selecao}, {lista.coluna_id} AS _id '
+           f'FROM {lista.origem} WHERE {where} ORDER BY {ordem} LIMIT %s')
+    params_pagina.append(limite + 1)
+
+    return ConsultaLista(
+        sql=sql,
+        params=params_pagina,
+        sql_contagem=f'SELECT COUNT(*) AS total FROM {lista.origem} WHERE {where_filtros}',
+        params_contagem=params,
+        limite=limite,
+        ordenar=ordenar,
+        direcao=direcao,
+        filtrada=filtrada,
+        primeira_pagina=cursor is None,
+        colunas_ordem=len(colunas_ordem),
+    )
+
+
+def montar_resposta(lista: ListaAdmin, consulta: ConsultaLista, linhas: List[Dict[str, Any]],
+                    total: Optional[int], total_estimado: bool) -> Dict[str, Any]:
+    """Página formatada + cursor da próxima; total só vem na primeira página"""
+    proximo = None
+    if len(linhas) > consulta.limite:
+        linhas = linhas[:consulta.limite]
+        proximo = consulta.proximo_cursor(linhas[-1])
+    itens = []
+    for linha in linhas:
+        linha = {k: v for k, v in linha.items() if k != '_id' and not k.startswith('_ordem')}
+        itens.append(lista.formatar(linha) if lista.formatar else linha)
+    return {
+        'itens': itens,
+        'proximo_cursor': proximo,
+        'total': total,
+        'total_estimado': total_estimado,
+        'ordenar': consulta.ordenar,
+        'direcao': consulta.direcao,
+    }
+
+
+# ============ FORMATAÇÃO (mesmo formato das respostas sem paginação) ============
+
+def _iso(valor):
+    return valor.isoformat() if hasattr(valor, 'isoformat') else valor
+
+
+def _formatar_solicitacao_peca(row):
+    carro = None
+    if row.get('carro_marca') and row.get('carro_modelo'):
+        carro = {'marca': row['carro_marca'], 'modelo': row['carro_modelo'], 'status': row['carro_status']}
+    return {
+        'id': row['id'],
+        'equipe_id': row['equipe_id'],
+        'peca_id': row['peca_id'],
+        'carro_id': row['carro_id'],
+        'quantidade': row['quantidade'],
+        'status': row['status'],
+        'data_solicitacao': _iso(row['data_solicitacao']),
+        'data_atualizacao': _iso(row['data_atualizacao']),
+        'equipe_nome': row['equipe_nome'],
+        'peca_nome': row['peca_nome'] or '',
+        'peca_tipo': row['peca_tipo'] or '',
+        'preco': float(row['preco']) if row['preco'] else 0.0,
+        'carro': carro,
+    }
+
+
+def _formatar_solicitacao_carro(row):
+    row = dict(row)
+    row['data_solicitacao'] = _iso(row['data_solicitacao'])
+    row['data_atualizacao'] = _iso(row['data_atualizacao'])
+    row['timestamp'] = row['data_solicitacao']
+    row['equipe_nome'] = row['equipe_nome'] or 'Desconhecida'
+    return row
+
+
+def _formatar_comissao(row):
+    return {
+        'id': row['id'],
+        'tipo': row['tipo'],
+        'valor': row['valor_comissao'],
+        'equipe_id': row['equipe_id'],
+        'equipe_nome': row['equipe_nome'],
+        'descricao': row['descricao'],
+        'data': _iso(row['data_transacao']) or '',
+    }
+
+
+def _formatar_equipe(row):
+    carro = 'Sem carro'
+    if row.get('carro_marca') and row.get('carro_modelo'):
+        carro = f"{row['carro_marca']} {row['carro_modelo']}"
+    return {
+        'id': row['id'],
+        'nome': row['nome'],
+        'serie': row['serie'] or 'A',
+        'saldo': row['doricoins'],
+        'carro': carro,
+    }
+
+
+def _formatar_modelo(row):
+    row = dict(row)
+    row['tem_imagem'] = bool(row['tem_imagem'])
+    return row
+
+
+LISTAS = {
+    'transacoes_pix': ListaAdmin(
+        tabela='transacoes_pix',
+        origem='transacoes_pix t',
+        colunas=('t.id, t.mercado_pago_id, t.equipe_id, t.equipe_nome, t.tipo_item, t.item_nome, '
+                 't.valor_item, t.valor_taxa, t.valor_total, t.status, t.data_criacao, t.data_confirmacao'),
+        coluna_id='t.id',
+        ordenacoes={'data': ('t.data_criacao',), 'valor': ('t.valor_total',)},
+        ordenacao_padrao='data',
+        filtros={
+            'status': ('t.status', '='),
+            'tipo': ('t.tipo_item', '='),
+            'equipe_id': ('t.equipe_id', '='),
+            'desde': ('t.data_criacao', '>='),
+            'ate': ('t.data_criacao', '<='),
+            'busca': ('t.equipe_nome', 'busca'),
+        },
+        anulaveis=frozenset({'t.data_criacao'}),
+    ),
+    'solicitacoes_pecas': ListaAdmin(
+        tabela='solicitacoes_pecas',
+        origem=('solicitacoes_pecas sp LEFT JOIN equipes e ON sp.equipe_id = e.id '
+                'LEFT JOIN pecas_loja p ON sp.peca_id = p.id LEFT JOIN carros c ON sp.carro_id = c.id'),
+        colunas=('sp.id, sp.equipe_id, sp.peca_id, sp.carro_id, sp.quantidade, sp.status, '
+                 'sp.data_solicitacao, sp.data_atualizacao, e.nome AS equipe_nome, p.nome AS peca_nome, '
+                 'COALESCE(p.tipo, sp.tipo_peca) AS peca_tipo, p.preco, '
+                 'c.marca AS carro_marca, c.modelo AS carro_modelo, c.status AS carro_status'),
+        coluna_id='sp.id',
+        ordenacoes={'data': ('sp.data_solicitacao',), 'atualizacao': ('sp.data_atualizacao',)},
+        ordenacao_padrao='data',
+        filtros={
+            'status': ('sp.status', '='),
+            'equipe_id': ('sp.equipe_id', '='),
+            'desde': ('sp.data_solicitacao', '>='),
+            'ate': ('sp.data_solicitacao', '<='),
+            'busca': ('e.nome', 'busca'),
+        },
+        formatar=_formatar_solicitacao_peca,
+        anulaveis=frozenset({'sp.data_solicitacao', 'sp.data_atualizacao'}),
+    ),
+    'solicitacoes_carros': ListaAdmin(
+        tabela='solicitacoes_carros',
+        origem='solicitacoes_carros sc LEFT JOIN equipes e ON sc.equipe_id = e.id',
+        colunas=('sc.id, sc.equipe_id, sc.tipo_carro, sc.status, sc.data_solicitacao, sc.data_atualizacao, '
+                 'e.nome AS equipe_nome, sc.carro_id, sc.carro_anterior_id, sc.tipo_solicitacao'),
+        coluna_id='sc.id',
+        ordenacoes={'data': ('sc.data_solicitacao',), 'atualizacao': ('sc.data_atualizacao',)},
+        ordenacao_padrao='data',
+        filtros={
+            'status': ('sc.status', '='),
+            'tipo': ('sc.tipo_solicitacao', '='),
+            'equipe_id': ('sc.equipe_id', '='),
+            'busca': ('e.nome', 'busca'),
+        },
+        formatar=_formatar_solicitacao_carro,
+        anulaveis=frozenset({'sc.data_solicitacao', 'sc.data_atualizacao'}),
+    ),
+    'modelos_carro': ListaAdmin(
+        tabela='modelos_carro_loja',
+        origem='modelos_carro_loja m',
+        colunas=('m.id, m.marca, m.modelo, m.classe, m.preco, m.descricao, '
+                 'm.imagem IS NOT NULL AS tem_imagem'),
+        coluna_id='m.id',
+        ordenacoes={'marca': ('m.marca',), 'preco': ('m.preco',), 'data': ('m.data_criacao',)},
+        ordenacao_padrao='marca',
+        direcao_padrao='asc',
+        filtros={
+            'classe': ('m.classe', '='),
+            'marca': ('m.marca', '='),
+            'busca': ("CONCAT(m.marca, ' ', m.modelo)", 'busca'),
+        },
+        formatar=_formatar_modelo,
+        anulaveis=frozenset({'m.data_criacao'}),
+    ),
+    'equipes': ListaAdmin(
+        tabela='equipes',
+        origem='equipes e LEFT JOIN carros c ON c.id = e.carro_id',
+        colunas=('e.id, e.nome, e.serie, e.doricoins, '
+                 'c.marca AS carro_marca, c.modelo AS carro_modelo'),
+        coluna_id='e.id',
+        ordenacoes={'nome': ('e.nome',), 'saldo': ('e.doricoins',), 'data': ('e.data_criacao',)},
+        ordenacao_padrao='nome',
+        direcao_padrao='asc',
+        filtros={
+            'serie': ('e.serie', '='),
+            'busca': ('e.nome', 'busca'),
+        },
+        formatar=_formatar_equipe,
+        anulaveis=frozenset({'e.doricoins', 'e.data_criacao'}),
+    ),
+    'comissoes': ListaAdmin(
+        tabela='comissoes',
+        origem='comissoes',
+        colunas='id, tipo, valor_comissao, equipe_id, equipe_nome, descricao, data_transacao',
+        coluna_id='id',
+        ordenacoes={'data': ('data_transacao',), 'valor': ('valor_comissao',)},
+        ordenacao_padrao='data',
+        filtros={
+            'tipo': ('tipo', '='),
+            'equipe_id': ('equipe_id', '='),
+            'desde': ('data_transacao', '>='),
+            'ate': ('data_transacao', '<='),
+            'busca': ('equipe_nome', 'busca'),
+        },
+        formatar=_formatar_comissao,
+        anulaveis=frozenset({'data_transacao'}),
+    ),
+    'etapas': ListaAdmin(
+        tabela='etapas',
+        origem='etapas',
+        colunas='*',
+        coluna_id='id',
+        ordenacoes={'data': ('data_etapa', 'hora_etapa'), 'numero': ('numero',)},
+        ordenacao_padrao='data',
+        direcao_padrao='asc',
+        filtros={
+            'serie': ('serie', '='),
+            'status': ('status', '='),
+            'campeonato_id': ('campeonato_id', '='),
+        },
+    ),
+}
@@ -0,0 +1,139 @@
+"""
+Logging do GRANPIX
+
+Substitui os print() espalhados pelo código por loggers com nível por módulo,
+saída não bloqueante (QueueHandler + thread QueueListener) e amostragem das
+linhas de debug emitidas por item (uma a cada N).
+
+Configuração por variável de ambiente:
+    GRANPIX_LOG_LEVEL       - nível padrão dos loggers granpix.* (padrão INFO)
+    GRANPIX_LOG_NIVEIS      - níveis por módulo, ex.: "granpix.db=DEBUG,granpix.app=WARNING"
+    GRANPIX_LOG_FORMATO     - "texto" (padrão) ou "json" (uma linha JSON por registro)
+    GRANPIX_LOG_AMOSTRAGEM  - em log_amostrado, registra 1 a cada N chamadas (padrão 20)
+"""
+import atexit
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+
+RAIZ = 'granpix'
+
+_configurado = False
+_lock = threading.Lock()
+_listener = None
+_contadores = {}
+
+
+def obter_logger(nome: str) -> logging.Logger:
+    """Logger filho de 'granpix' (ex.: obter_logger('db') -> granpix.db)"""
+    if nome == RAIZ or nome.startswith(RAIZ + '.'):
+        return logging.getLogger(nome)
+    return logging.getLogger(f'{RAIZ}.{nome}')
+
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro, com endpoint/rota quando houver requisição Flask"""
+
+    def format(self, record):
+        dados = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for campo in ('endpoint', 'rota', 'equipe_id'):
+            valor = getattr(record, campo, None)
+            if valor:
+                dados[campo] = valor
+        if record.exc_info:
+            dados['exc'] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class _FiltroContextoRequisicao(logging.Filter):
+    """Anexa endpoint/rota da requisição corrente aos registros (no thread que loga)"""
+
+    def filter(self, record):
+        try:
+            from flask import has_request_context, request, session
+            if has_request_context():
+                record.endpoint = request.endpoint
+                record.rota = request.path
+                record.equipe_id = session.get('equipe_id')
+        except Exception:
+            pass
+        return True
+
+
+def _niveis_por_modulo(texto: str) -> dict:
+    niveis = {}
+    for item in (texto or '').split(','):
+        if '=' not in item:
+            continue
+        nome, nivel = item.split('=', 1)
+        nome, nivel = nome.strip(), nivel.strip().upper()
+        if nome and nivel:
+            niveis[nome if nome.startswith(RAIZ) else f'{RAIZ}.{nome}'] = nivel
+    return niveis
+
+
+def configurar_logging(nivel: str = None, formato: str = None) -> None:
+    """Configura os loggers granpix.* (idempotente)"""
+    global _configurado, _listener
+    with _lock:
+        if _configurado:
+            return
+        _configurado = True
+
+        nivel = (nivel or os.environ.get('GRANPIX_LOG_LEVEL', 'INFO')).upper()
+        formato = (formato or os.environ.get('GRANPIX_LOG_FORMATO', 'texto')).lower()
+
+        saida = logging.StreamHandler(sys.stdout)
+        if formato == 'json':
+            saida.setFormatter(FormatadorJSON())
+        else:
+            saida.setFormatter(logging.Formatter(
+                '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+            ))
+
+        # Quem loga só enfileira; a escrita no stdout acontece na thread do listener
+        fila = queue.SimpleQueue()
+        manipulador = logging.handlers.QueueHandler(fila)
+        manipulador.addFilter(_FiltroContextoRequisicao())
+
+        raiz = logging.getLogger(RAIZ)
+        raiz.setLevel(nivel)
+        raiz.addHandler(manipulador)
+        raiz.propagate = False
+
+        for nome, nivel_modulo in _niveis_por_modulo(os.environ.get('GRANPIX_LOG_NIVEIS', '')).items():
+            logging.getLogger(nome).setLevel(nivel_modulo)
+
+        _listener = logging.handlers.QueueListener(fila, saida, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+AMOSTRAGEM = max(1, int(os.environ.get('GRANPIX_LOG_AMOSTRAGEM', '20') or 1))
+
+
+def log_amostrado(logger: logging.Logger, chave: str, msg: str, *args) -> None:
+    """Debug por item (dentro de loops): registra 1 a cada GRANPIX_LOG_AMOSTRAGEM chamadas
+
+    Custa só uma checagem de nível quando o debug está desligado.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    contador = _contadores.get(chave)
+    if contador is None:
+        contador = _contadores.setdefault(chave, itertools.count())
+    n = next(contador)
+    if n % AMOSTRAGEM == 0:
+        logger.debug(msg + ' [amostra 1/%d, #%d]', *args, AMOSTRAGEM, n)
@@ -267,7 +267,8 @@ class MercadoPagoIntegracao:
             
             response = requests.get(
                 f"{self.base_url}/payments/{payment_id}",
-                headers=headers
+                headers=headers,
+                timeout=10
             )
             return response.json()
         except Exception as e:
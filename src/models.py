@@ -1,8 +1,8 @@
 """
 Modelos de dados para o sistema de corrida GRANPIX
 """
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Tuple
+from dataclasses import InitVar, dataclass, field
+from typing import Iterator, List, Optional, Dict, Tuple
 from enum import Enum
 from datetime import datetime
 import random
@@ -21,7 +21,7 @@ class TipoDiferencial(Enum):
     SPOOL = "spool"
 
 
-@dataclass
+@dataclass(slots=True)
 class Peca:
     """Representa uma peça do carro"""
     id: str
@@ -64,9 +64,14 @@ class Peca:
         return (self.durabilidade_atual / self.durabilidade_maxima) < 0.5
 
 
-@dataclass
+@dataclass(slots=True)
 class Carro:
-    """Representa um carro com todas suas peças"""
+    """Representa um carro com todas suas peças
+
+    Com slots: carregar todas as equipes cria milhares de carros e peças.
+    pecas_instaladas e os *_id das peças são derivados das peças do carro
+    (ver propriedades abaixo), não guardados em cada instância.
+    """
     id: str
     numero_carro: int
     marca: str  # "Toyota", "Honda", "Nissan", etc.
@@ -76,7 +81,7 @@ class Carro:
     kit_angulo: Peca
     suspensao: Peca
     diferenciais: List[Peca] = field(default_factory=list)  # Pode ter mais de um
-    pecas_instaladas: List[dict] = field(default_factory=list)  # Peças compradas e instaladas (mantém compatibilidade)
+    pecas_instaladas: InitVar[Optional[List[dict]]] = None  # None = derivar das peças no primeiro acesso
     batidas_totais: int = 0
     vitoria: int = 0
     derrotas: int = 0
@@ -85,24 +90,46 @@ class Carro:
     timestamp_ativo: str = ''  # Data de quando ficou ativo
     timestamp_repouso: str = ''  # Data de quando foi para repouso
     modelo_id: str = ''  # ID do modelo de carro em modelos_loja (para compatibilidade de peças)
-    motor_id: str = ''  # ID da peça motor
-    cambio_id: str = ''  # ID da peça cambio
-    suspensao_id: str = ''  # ID da peça suspensao
-    kit_angulo_id: str = ''  # ID da peça kit_angulo
-    diferencial_id: str = ''  # ID da peça diferencial (primeira)
-    
+    _pecas_instaladas: Optional[List[dict]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self, pecas_instaladas: Optional[List[dict]]) -> None:
+        self._pecas_instaladas = pecas_instaladas
+
+    def _obter_pecas_instaladas(self) -> List[dict]:
+        """Peças compradas e instaladas (mantém compatibilidade), montada no primeiro acesso"""
+        if self._pecas_instaladas is None:
+            self._pecas_instaladas = [{'id': p.id, 'nome': p.nome, 'tipo': p.tipo} for p in self.iter_pecas()]
+        return self._pecas_instaladas
+
+    def _definir_pecas_instaladas(self, valor: Optional[List[dict]]) -> None:
+        self._pecas_instaladas = valor
+
+    # IDs das peças (legado: as colunas saíram de carros); atribuições são ignoradas
+    motor_id = property(lambda self: self.motor.id if self.motor else '', lambda self, valor: None)
+    cambio_id = property(lambda self: self.cambio.id if self.cambio else '', lambda self, valor: None)
+    suspensao_id = property(lambda self: self.suspensao.id if self.suspensao else '', lambda self, valor: None)
+    kit_angulo_id = property(lambda self: self.kit_angulo.id if self.kit_angulo else '', lambda self, valor: None)
+    diferencial_id = property(lambda self: self.diferenciais[0].id if self.diferenciais else '',
+                              lambda self, valor: None)
+
+    def iter_pecas(self) -> Iterator[Peca]:
+        """Peças do carro sem montar lista (None ignorado)"""
+        for peca in (self.motor, self.cambio, self.kit_angulo, self.suspensao):
+            if peca is not None:
+                yield peca
+        yield from self.diferenciais
+
     def get_todas_pecas(self) -> List[Peca]:
         """Retorna todas as peças do carro"""
-        # Filtrar None para não quebrar cálculos
-        return [p for p in [self.motor, self.cambio, self.kit_angulo, self.suspensao] + self.diferenciais if p is not None]
+        return list(self.iter_pecas())
     
     def calcular_condicao_geral(self) -> float:
         """Retorna a condição média do carro (0-100%)"""
-        pecas = self.get_todas_pecas()
-        if not pecas:
-            return 100.0
-        media = sum((p.durabilidade_atual / p.durabilidade_maxima * 100) for p in pecas) / len(pecas)
-        return media
+        total = quantidade = 0
+        for p in self.iter_pecas():
+            total += p.durabilidade_atual / p.durabilidade_maxima * 100
+            quantidade += 1
+        return total / quantidade if quantidade else 100.0
     
     def sofrer_desgaste_batalha(self, desgaste_base: float, empate: bool = False) -> Tuple[List[str], Dict[str, Tuple[int, float]]]:
         """Aplica desgaste a todas as peças após uma batalha com D20
@@ -120,7 +147,7 @@ class Carro:
         pecas_quebradas = []
         resultados_d20 = {}
         
-        for peca in self.get_todas_pecas():
+        for peca in self.iter_pecas():
             # Gerar D20 para a peça
             d20_resultado = random.randint(1, 20)
             
@@ -135,16 +162,22 @@ class Carro:
                 pecas_quebradas.append(peca.nome)
         
         # Remover peças instaladas que quebraram
-        self.pecas_instaladas = [
-            p for p in self.pecas_instaladas 
-            if p.get('nome', '') not in pecas_quebradas
-        ]
+        if pecas_quebradas:
+            self.pecas_instaladas = [
+                p for p in self.pecas_instaladas 
+                if p.get('nome', '') not in pecas_quebradas
+            ]
         
         self.batidas_totais += 1
         return pecas_quebradas, resultados_d20
 
 
-@dataclass
+# Depois do @dataclass: no corpo da classe o InitVar pecas_instaladas tomaria a
+# propriedade como valor padrão
+Carro.pecas_instaladas = property(Carro._obter_pecas_instaladas, Carro._definir_pecas_instaladas)
+
+
+@dataclass(slots=True)
 class Piloto:
     """Representa um piloto"""
     id: str
@@ -155,7 +188,7 @@ class Piloto:
     empates: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Equipe:
     """Representa uma equipe de pilotos"""
     id: str
@@ -226,6 +259,7 @@ class Batalha:
     empates_ate_vencer: int = 0  # Conta quantos empates ocorreram antes do vencedor
     doricoins_vencedor: float = PREMIACAO_VITORIA_BATALHA  # Doricoins ganhos pelo vencedor
     desgaste_base: float = DESGASTE_BASE_BATALHA           # Desgaste base por batalha
+    etapa_id: Optional[str] = None  # etapas.id: conta no placar da etapa (vitorias_etapa)
     
     def executar_batalha(self, resultado: ResultadoBatalha, 
                         piloto_a: Piloto, piloto_b: Piloto,
@@ -0,0 +1,99 @@
+"""
+Paginação por cursor (keyset) para listagens ordenadas por data
+
+O cursor é opaco para o cliente: base64url de um JSON com a chave de ordenação
+do último item da página. A próxima página filtra "depois desse item" na própria
+consulta (WHERE data < ... com índice), então qualquer página custa O(limite),
+ao contrário de OFFSET.
+"""
+import base64
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+LIMITE_PADRAO = 20
+LIMITE_MAXIMO = 100
+
+
+def _valor_cursor(valor: Any) -> Any:
+    if isinstance(valor, datetime):
+        return valor.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, timedelta):
+        # Coluna TIME (PyMySQL devolve timedelta)
+        segundos = int(valor.total_seconds())
+        return f'{segundos // 3600:02d}:{segundos % 3600 // 60:02d}:{segundos % 60:02d}'
+    if isinstance(valor, Decimal):
+        return str(valor)
+    if isinstance(valor, (list, tuple)):
+        return [_valor_cursor(v) for v in valor]
+    return valor
+
+
+def codificar_cursor(chave: Sequence[Any]) -> str:
+    texto = json.dumps(_valor_cursor(chave), separators=(',', ':'))
+    return base64.urlsafe_b64encode(texto.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(cursor: Optional[str], tamanho: int) -> Optional[List[Any]]:
+    """Chave do cursor, None se ausente; ValueError se malformado"""
+    if not cursor:
+        return None
+    try:
+        texto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        chave = json.loads(texto)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Cursor inválido') from e
+    if not isinstance(chave, list) or len(chave) != tamanho:
+        raise ValueError('Cursor inválido')
+    return chave
+
+
+def ler_limite(valor: Any, padrao: int = LIMITE_PADRAO, maximo: int = LIMITE_MAXIMO) -> int:
+    """Limite da query string, restrito a 1..maximo"""
+    try:
+        limite = int(valor)
+    except (TypeError, ValueError):
+        return padrao
+    return max(1, min(limite, maximo))
+
+
+def montar_pagina(
+    linhas: List[Dict[str, Any]],
+    limite: int,
+    chave: Callable[[Dict[str, Any]], Tuple],
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Recebe até limite + 1 linhas; devolve a página e o cursor da próxima (ou None)"""
+    if len(linhas) <= limite:
+        return linhas, None
+    pagina = linhas[:limite]
+    return pagina, codificar_cursor(chave(pagina[-1]))
+
+
+def condicao_depois_de(coluna_data: str, coluna_id: str, chave: Optional[Sequence[Any]]) -> Tuple[str, list]:
+    """SQL "vem depois de chave" para ORDER BY data DESC, id DESC ('' se sem cursor)"""
+    if chave is None:
+        return '', []
+    data, ultimo_id = chave
+    return (f' AND ({coluna_data} < %s OR ({coluna_data} = %s AND {coluna_id} < %s))',
+            [data, data, ultimo_id])
+
+
+def condicao_ramo_depois_de(coluna_data: str, coluna_id: str, origem: str,
+                            chave: Optional[Sequence[Any]]) -> Tuple[str, list]:
+    """Como condicao_depois_de, para um ramo de UNION ALL com origem constante
+
+    A ordem global é (data DESC, origem DESC, id DESC) e o cursor é
+    [data, origem, id]; como a origem é fixa em cada ramo, a condição vira uma
+    comparação simples sobre (data, id), que usa o índice (equipe_id, data).
+    """
+    if chave is None:
+        return '', []
+    data, origem_cursor, ultimo_id = chave
+    if origem < origem_cursor:
+        return f' AND {coluna_data} <= %s', [data]
+    if origem > origem_cursor:
+        return f' AND {coluna_data} < %s', [data]
+    return condicao_depois_de(coluna_data, coluna_id, (data, ultimo_id))
@@ -0,0 +1,51 @@
+"""
+Pontuação das etapas: tabela de pontos por colocação e ranking por vitórias
+
+A mesma tabela gera o valor em Python (pontos_por_colocacao) e a expressão SQL
+usada no INSERT ... SELECT que converte o placar da etapa em pontos do
+campeonato (sql_pontos_por_colocacao), então as duas nunca divergem.
+"""
+from typing import Iterable, List, Tuple
+
+# (colocação inicial, colocação final, pontos)
+PONTOS_POR_COLOCACAO: Tuple[Tuple[int, int, int], ...] = (
+    (1, 1, 100),
+    (2, 2, 88),
+    (3, 3, 76),
+    (4, 4, 64),
+    (5, 8, 48),
+    (9, 16, 32),
+    (17, 32, 16),
+)
+
+
+def pontos_por_colocacao(colocacao: int) -> int:
+    for inicio, fim, pontos in PONTOS_POR_COLOCACAO:
+        if inicio <= colocacao <= fim:
+            return pontos
+    return 0
+
+
+def sql_pontos_por_colocacao(coluna: str) -> str:
+    """CASE SQL equivalente a pontos_por_colocacao(coluna)"""
+    casos = ' '.join(
+        f'WHEN {coluna} = {inicio} THEN {pontos}' if inicio == fim
+        else f'WHEN {coluna} BETWEEN {inicio} AND {fim} THEN {pontos}'
+        for inicio, fim, pontos in PONTOS_POR_COLOCACAO
+    )
+    return f'CASE {casos} ELSE 0 END'
+
+
+def classificar(vitorias: Iterable[Tuple[str, int]]) -> List[Tuple[str, int, int]]:
+    """(equipe_id, vitorias) -> (equipe_id, colocacao, vitorias); empatadas dividem a colocação
+
+    Mesmo critério do RANK() OVER (ORDER BY vitorias DESC) usado no banco.
+    """
+    ordenadas = sorted(vitorias, key=lambda x: x[1], reverse=True)
+    colocacoes = []
+    colocacao = 1
+    for i, (equipe_id, num_vitorias) in enumerate(ordenadas):
+        if i and num_vitorias < ordenadas[i - 1][1]:
+            colocacao = i + 1
+        colocacoes.append((equipe_id, colocacao, num_vitorias))
+    return colocacoes
@@ -0,0 +1,165 @@
+"""
+Hash e verificação de senhas fora das threads de requisição
+
+PBKDF2/scrypt custam centenas de ms de CPU por chamada; na abertura de uma etapa
+todas as equipes e pilotos fazem login ao mesmo tempo e as threads do servidor
+ficavam presas no hash. Aqui o trabalho vai para um pool de processos limitado:
+a thread da requisição só espera o resultado (sem segurar o GIL) e, com a fila
+cheia, SenhasSaturadas vira 429 em vez de empilhar requisições.
+
+O método do hash é configurável (GRANPIX_SENHA_METODO, formato do werkzeug, ex.
+"pbkdf2:sha256:600000" ou "scrypt:32768:8:1"). Hashes gravados com outro método
+são refeitos no próximo login bem-sucedido (verificar devolve o novo hash).
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Optional, Tuple
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from .log import obter_logger
+
+logger = obter_logger('senhas')
+
+METODO_PADRAO = 'scrypt:32768:8:1'
+# Espera máxima por um resultado do pool (segundos)
+TIMEOUT_PADRAO = 10.0
+
+
+class SenhasSaturadas(Exception):
+    """Fila de hash cheia (ou sem resposta a tempo): responder 429 e tentar depois"""
+
+
+def normalizar_metodo(metodo: Optional[str]) -> str:
+    """Completa os parâmetros omitidos com os padrões do werkzeug ("pbkdf2" -> "pbkdf2:sha256:N")"""
+    if not metodo:
+        return METODO_PADRAO
+    partes = metodo.split(':')
+    if partes[0] == 'pbkdf2':
+        hash_nome = partes[1] if len(partes) > 1 else 'sha256'
+        iteracoes = partes[2] if len(partes) > 2 else str(DEFAULT_PBKDF2_ITERATIONS)
+        return f'pbkdf2:{hash_nome}:{iteracoes}'
+    if partes[0] == 'scrypt':
+        padrao = METODO_PADRAO.split(':')
+        return ':'.join(partes + padrao[len(partes):])
+    return metodo
+
+
+def metodo_do_hash(senha_hash: str) -> str:
+    return (senha_hash or '').split('$', 1)[0]
+
+
+def precisa_rehash(senha_hash: str, metodo: str) -> bool:
+    return normalizar_metodo(metodo_do_hash(senha_hash)) != normalizar_metodo(metodo)
+
+
+class PoolSenhas:
+    """Pool de processos para hash/verificação com limite de tarefas em andamento"""
+
+    def __init__(self, processos: int = 2, fila: Optional[int] = None, metodo: Optional[str] = None,
+                 timeout: float = TIMEOUT_PADRAO):
+        """processos=0 executa na própria thread (testes, ambientes sem fork)
+
+        fila: máximo de hashes aguardando ou em execução neste processo web.
+        """
+        self.processos = max(0, int(processos))
+        self.fila = int(fila) if fila else max(1, self.processos) * 8
+        self.metodo = normalizar_metodo(metodo)
+        self.timeout = timeout
+        self._vagas = threading.BoundedSemaphore(self.fila)
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executar(self, funcao, *args):
+        if not self._vagas.acquire(blocking=False):
+            raise SenhasSaturadas('Muitos logins simultâneos, tente novamente em instantes')
+        if self.processos == 0:
+            try:
+                return funcao(*args)
+            finally:
+                self._vagas.release()
+        try:
+            futuro = self._obter_pool().submit(funcao, *args)
+        except BaseException:
+            self._vagas.release()
+            raise
+        # A vaga só volta quando o trabalho termina (ou é cancelado): um hash que
+        # estourou o tempo continua no pool e segue contando na fila
+        futuro.add_done_callback(lambda _: self._vagas.release())
+        try:
+            return futuro.result(timeout=self.timeout)
+        except FuturesTimeout:
+            # Ainda não começou: sai da fila do pool
+            futuro.cancel()
+            raise SenhasSaturadas('Tempo esgotado aguardando verificação de senha')
+
+    def _obter_pool(self) -> ProcessPoolExecutor:
+        # Criado no primeiro uso: depois do fork dos workers do servidor
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processos)
+                logger.info('[SENHAS] Pool de hash: %s processo(s), fila %s, método %s',
+                            self.processos, self.fila, self.metodo)
+            return self._pool
+
+    def gerar_hash(self, senha: str) -> str:
+        return self._executar(generate_password_hash, senha, self.metodo)
+
+    def verificar(self, senha_hash: str, senha: str) -> Tuple[bool, Optional[str]]:
+        """(senha confere, novo hash se o gravado usa outro método)
+
+        O rehash é oportunista: com a fila cheia fica para o próximo login.
+        """
+        if not senha_hash:
+            return False, None
+        if not self._executar(check_password_hash, senha_hash, senha):
+            return False, None
+        if not precisa_rehash(senha_hash, self.metodo):
+            return True, None
+        try:
+            return True, self.gerar_hash(senha)
+        except SenhasSaturadas:
+            return True, None
+
+    def encerrar(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+
+_padrao: Optional[PoolSenhas] = None
+_padrao_lock = threading.Lock()
+
+
+def pool_padrao() -> PoolSenhas:
+    """Pool do processo, configurado por GRANPIX_SENHA_PROCESSOS/_FILA/_METODO/_TIMEOUT"""
+    global _padrao
+    with _padrao_lock:
+        if _padrao is None:
+            _padrao = PoolSenhas(
+                processos=int(os.environ.get('GRANPIX_SENHA_PROCESSOS', '2')),
+                fila=int(os.environ.get('GRANPIX_SENHA_FILA', '0')) or None,
+                metodo=os.environ.get('GRANPIX_SENHA_METODO') or None,
+                timeout=float(os.environ.get('GRANPIX_SENHA_TIMEOUT', str(TIMEOUT_PADRAO))),
+            )
+        return _padrao
+
+
+def configurar(**kwargs) -> PoolSenhas:
+    """Substitui o pool do processo (benchmarks/testes); kwargs de PoolSenhas"""
+    global _padrao
+    with _padrao_lock:
+        if _padrao is not None:
+            _padrao.encerrar()
+        _padrao = PoolSenhas(**kwargs)
+        return _padrao
+
+
+def gerar_hash(senha: str) -> str:
+    return pool_padrao().gerar_hash(senha)
+
+
+def verificar_senha(senha_hash: str, senha: str) -> Tuple[bool, Optional[str]]:
+    return pool_padrao().verificar(senha_hash, senha)
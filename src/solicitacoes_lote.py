@@ -0,0 +1,148 @@
+"""
+Processamento em lote de solicitações de peças (aprovação pelo admin)
+
+Planejamento puro (sem banco): recebe os itens pedidos pelo admin e os dados já
+carregados por chave primária e devolve o resultado de cada item mais as escritas
+a fazer em lote. DatabaseManager.processar_solicitacoes_lote carrega os dados e
+grava o plano numa única transação.
+"""
+from typing import Any, Dict, List, Tuple
+
+from .compatibilidade import interpretar_compatibilidade, peca_compativel
+
+# Máximo por carro (tipos ausentes, como diferencial, não têm limite)
+LIMITES_POR_TIPO = {
+    'motor': 1,
+    'cambio': 1,
+    'suspensao': 1,
+    'kit_angulo': 1,
+}
+
+STATUS_PECA_VALIDOS = ('instalado', 'guardada', 'reprovado')
+# Solicitações nesses status não são processadas de novo
+STATUS_PECA_FINAIS = ('instalado', 'reprovado')
+
+
+def planejar_lote_pecas(
+    itens: List[Dict[str, Any]],
+    solicitacoes: Dict[str, Dict[str, Any]],
+    carros: Dict[str, Dict[str, Any]],
+    instaladas: Dict[str, List[Dict[str, Any]]],
+    armazem: Dict[Tuple[str, str], List[str]],
+) -> Dict[str, Any]:
+    """Valida os itens em memória e monta as escritas do lote
+
+    itens: [{solicitacao_id, status, carro_id}]
+    solicitacoes: id -> linha de solicitacoes_pecas + peca_nome, peca_tipo, preco, compatibilidade
+    carros: id -> {id, equipe_id, modelo_id}
+    instaladas: carro_id -> [{id, tipo}] peças instaladas hoje
+    armazem: (peca_loja_id, equipe_id) -> ids de peças livres no armazém da equipe
+    """
+    plano = {
+        'resultados': [],
+        'desinstalar': [],   # ids de peças que voltam ao armazém
+        'instalar': [],      # (carro_id, equipe_id, peca_id) peças do armazém instaladas
+        'criar': [],         # peças novas já instaladas (sem estoque no armazém)
+        'status': [],        # (novo_status, carro_id, solicitacao_id)
+        'comissoes': [],     # instalações que geram comissão
+    }
+    # Cópias: o plano consome estoque e vagas conforme avança
+    instaladas = {carro_id: list(pecas) for carro_id, pecas in instaladas.items()}
+    armazem = {chave: list(ids) for chave, ids in armazem.items()}
+    instalados_no_lote = set()
+    processadas = set()
+    compat_cache = {}
+
+    def resultado(solicitacao_id, sucesso, texto):
+        chave = 'mensagem' if sucesso else 'erro'
+        plano['resultados'].append({'solicitacao_id': solicitacao_id, 'sucesso': sucesso, chave: texto})
+
+    for item in itens:
+        solicitacao_id = item.get('solicitacao_id')
+        novo_status = item.get('status')
+        solicitacao = solicitacoes.get(solicitacao_id)
+
+        if not solicitacao:
+            resultado(solicitacao_id, False, 'Solicitação não encontrada')
+            continue
+        if solicitacao_id in processadas:
+            resultado(solicitacao_id, False, 'Solicitação repetida no lote')
+            continue
+        if novo_status not in STATUS_PECA_VALIDOS:
+            resultado(solicitacao_id, False, 'Status inválido')
+            continue
+        if solicitacao.get('status') in STATUS_PECA_FINAIS:
+            resultado(solicitacao_id, False, f"Solicitação já está {solicitacao['status']}")
+            continue
+
+        peca_nome = solicitacao.get('peca_nome') or ''
+
+        if novo_status != 'instalado':
+            processadas.add(solicitacao_id)
+            plano['status'].append((novo_status, None, solicitacao_id))
+            texto = 'guardada no armazém' if novo_status == 'guardada' else 'reprovada'
+            resultado(solicitacao_id, True, f'Peça {peca_nome} {texto}')
+            continue
+
+        carro_id = item.get('carro_id') or solicitacao.get('carro_id')
+        if not carro_id:
+            resultado(solicitacao_id, False, 'Nenhum carro selecionado para instalação')
+            continue
+        carro = carros.get(carro_id)
+        if not carro:
+            resultado(solicitacao_id, False, 'Carro não encontrado')
+            continue
+        equipe_id = solicitacao['equipe_id']
+        if carro.get('equipe_id') != equipe_id:
+            resultado(solicitacao_id, False, 'Carro não pertence à equipe da solicitação')
+            continue
+        if not solicitacao.get('peca_tipo'):
+            resultado(solicitacao_id, False, 'Peça não encontrada')
+            continue
+
+        peca_id = solicitacao['peca_id']
+        if peca_id not in compat_cache:
+            compat_cache[peca_id] = interpretar_compatibilidade(solicitacao.get('compatibilidade'))
+        if not peca_compativel(compat_cache[peca_id], carro.get('modelo_id')):
+            resultado(solicitacao_id, False, 'Peça não é compatível com este modelo')
+            continue
+
+        tipo = solicitacao['peca_tipo']
+        if tipo in LIMITES_POR_TIPO and (carro_id, tipo) in instalados_no_lote:
+            resultado(solicitacao_id, False,
+                      f'Outra {tipo} já será instalada neste carro no mesmo lote. '
+                      f'Máximo permitido: {LIMITES_POR_TIPO[tipo]} por carro')
+            continue
+
+        # Como em instalar_peca_no_carro: a peça atual do mesmo tipo volta ao armazém
+        atuais = instaladas.get(carro_id, [])
+        for indice, atual in enumerate(atuais):
+            if atual.get('tipo') == tipo:
+                plano['desinstalar'].append(atual['id'])
+                del atuais[indice]
+                break
+
+        estoque = armazem.get((peca_id, equipe_id))
+        if estoque:
+            plano['instalar'].append((carro_id, equipe_id, estoque.pop(0)))
+        else:
+            plano['criar'].append({
+                'peca_loja_id': peca_id,
+                'nome': peca_nome,
+                'tipo': tipo,
+                'preco': solicitacao.get('preco') or 0,
+                'carro_id': carro_id,
+                'equipe_id': equipe_id,
+            })
+
+        instalados_no_lote.add((carro_id, tipo))
+        processadas.add(solicitacao_id)
+        plano['status'].append(('instalado', carro_id, solicitacao_id))
+        plano['comissoes'].append({
+            'equipe_id': equipe_id,
+            'equipe_nome': solicitacao.get('equipe_nome'),
+            'peca_nome': peca_nome,
+        })
+        resultado(solicitacao_id, True, f'Peça {peca_nome} instalada com sucesso!')
+
+    return plano
@@ -5,7 +5,7 @@ import uuid
 from typing import List, Optional, Dict
 from .models import Equipe, Piloto, Carro, Peca, TipoDiferencial
 from .database import DatabaseManager
-from werkzeug.security import generate_password_hash
+from .senhas import gerar_hash
 
 
 class GerenciadorEquipes:
@@ -26,18 +26,17 @@ class GerenciadorEquipes:
     
     def criar_equipe(self, nome: str, doricoins_iniciais: float = 1000.0, senha: str = None, serie: str = 'A') -> Equipe:
         """Cria uma nova equipe SEM carro padrão (garagem vazia)"""
-        # Verificar se já existe equipe com esse nome
-        equipes_existentes = self.listar_equipes()
-        for e in equipes_existentes:
-            if e.nome == nome:
-                return e
+        # Verificar se já existe equipe com esse nome (consulta pelo índice de nome)
+        equipe_existente_id = self.db.obter_id_equipe_por_nome(nome)
+        if equipe_existente_id:
+            return self.obter_equipe(equipe_existente_id)
         
         # Senha padrão é "123456" se não informada
         if senha is None:
             senha = "123456"
         
         # Hash da senha ANTES de salvar
-        senha_hash = generate_password_hash(senha)
+        senha_hash = gerar_hash(senha)
         
         # Validar série
         if serie not in ['A', 'B']:
@@ -49,14 +48,18 @@ class GerenciadorEquipes:
             nome=nome,
             carro=None,  # Sem carro padrão
             carros=[],   # Lista vazia
-            doricoins=doricoins_iniciais,
+            doricoins=0.0,  # Saldo inicial entra pelo extrato logo abaixo
             senha=senha_hash  # Usar senha hasheada
         )
         # Definir série
         equipe.serie = serie
         
         # Salvar APENAS no banco de dados - não usar cache em memória
-        self.db.salvar_equipe(equipe)
+        with self.db.transacao():
+            self.db.salvar_equipe(equipe)
+            if doricoins_iniciais:
+                saldo = self.db.movimentar_saldo(equipe.id, doricoins_iniciais, 'saldo_inicial', minimo=None)
+                equipe.doricoins = saldo if saldo is not None else 0.0
         return equipe
     
     def obter_equipe(self, equipe_id: str) -> Optional[Equipe]:
@@ -211,27 +214,13 @@ class GerenciadorEquipes:
     
     # ============ SISTEMA DE DORICOINS ============
     
-    def adicionar_doricoins(self, equipe_id: str, quantidade: float) -> bool:
+    def adicionar_doricoins(self, equipe_id: str, quantidade: float, motivo: str = 'credito') -> bool:
         """Adiciona doricoins a uma equipe"""
-        equipe = self.obter_equipe(equipe_id)
-        if not equipe:
-            return False
-        
-        equipe.adicionar_doricoins(quantidade)
-        self.db.salvar_equipe(equipe)
-        return True
+        return self.db.movimentar_saldo(equipe_id, quantidade, motivo) is not None
     
-    def gastar_doricoins(self, equipe_id: str, quantidade: float) -> bool:
-        """Gasta doricoins de uma equipe"""
-        equipe = self.obter_equipe(equipe_id)
-        if not equipe:
-            return False
-        
-        if equipe.gastar_doricoins(quantidade):
-            self.db.salvar_equipe(equipe)
-            return True
-        
-        return False
+    def gastar_doricoins(self, equipe_id: str, quantidade: float, motivo: str = 'debito') -> bool:
+        """Gasta doricoins de uma equipe (False se o saldo não basta)"""
+        return self.db.movimentar_saldo(equipe_id, -quantidade, motivo) is not None
     
     def reparar_carro_equipe(self, equipe_id: str, 
                            percentual: float = 100.0) -> bool:
@@ -241,9 +230,14 @@ class GerenciadorEquipes:
         if not equipe:
             return False
         
+        saldo_antes = equipe.doricoins
         if equipe.reparar_carro_equipe(percentual):
-            self.db.salvar_equipe(equipe)
-            self.db.salvar_carro(equipe.carro)
+            custo = saldo_antes - equipe.doricoins
+            with self.db.transacao() as tx:
+                if custo and self.db.movimentar_saldo(equipe_id, -custo, 'reparo_carro', equipe.carro.id) is None:
+                    tx.abortar()
+                    return False
+                self.db.salvar_carro(equipe.carro)
             return True
         
         return False
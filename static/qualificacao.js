@@ -1776,7 +1776,7 @@ async function finalizarQualificacao() {
             mostrarToast('✓ Qualificação finalizada! Enviando para Challonge...', 'success');
             try {
                 const respCh = await fetch(`/api/etapas/${etapaId}/enviar-challonge`, { method: 'POST', credentials: 'include' });
-                const dataCh = await respCh.json();
+                const dataCh = await aguardarJob(await respCh.json());
                 if (dataCh.sucesso) {
                     mostrarToast(dataCh.bracket_pendente ? '⚠ Torneio criado. Inicie manualmente no Challonge (link disponível).' : '✓ Torneio criado no Challonge!', dataCh.bracket_pendente ? 'warning' : 'success');
                 } else if (dataCh.erro) {
@@ -2203,6 +2203,20 @@ async function mostrarChaveamentoBatalhas(etapaId) {
     }
 }
 
+// Rotas longas do admin respondem 202 com job_id: consulta o job até terminar e
+// devolve o resultado (mesmo formato da antiga resposta síncrona)
+async function aguardarJob(data, intervaloMs = 1000) {
+    if (!data || !data.job_id) return data;
+    while (true) {
+        await new Promise(r => setTimeout(r, intervaloMs));
+        const resp = await fetch(`/api/admin/jobs/${data.job_id}`, { credentials: 'include' });
+        if (!resp.ok) return { sucesso: false, erro: `Falha ao consultar job (${resp.status})` };
+        const job = await resp.json();
+        if (job.status === 'concluido') return job.resultado || { sucesso: true };
+        if (job.status === 'falhou') return { sucesso: false, erro: job.erro || 'Job falhou' };
+    }
+}
+
 async function enviarParaChallonge(etapaId) {
     const btn = document.getElementById('btnEnviarChallonge');
     if (!btn) return;
@@ -2210,7 +2224,7 @@ async function enviarParaChallonge(etapaId) {
     btn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Enviando...';
     try {
         const resp = await fetch(`/api/etapas/${etapaId}/enviar-challonge`, { method: 'POST', credentials: 'include' });
-        const data = await resp.json();
+        const data = await aguardarJob(await resp.json());
         if (data.sucesso) {
             mostrarToast(data.bracket_pendente ? 'Torneio criado. Inicie manualmente no Challonge (link aberto).' : 'Torneio enviado para o Challonge!', data.bracket_pendente ? 'warning' : 'success');
             if (data.url) window.open(data.url, '_blank');
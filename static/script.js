@@ -18,14 +18,10 @@ let _cacheSolicitacoesCarros = null;
 // Função global para contadores admin - só atualiza DOM se valor mudou (evita flicker)
 window.atualizarContadoresSolicitacoesAdmin = async function() {
     try {
-        const [rP, rC] = await Promise.all([
-            fetch('/api/admin/solicitacoes-pecas'),
-            fetch('/api/admin/solicitacoes-carros')
-        ]);
-        const pecas = await rP.json();
-        const carros = await rC.json();
-        const nPecas = Array.isArray(pecas) ? pecas.filter(s => s.status === 'pendente').length : 0;
-        const nCarros = Array.isArray(carros) ? carros.filter(s => s.status === 'pendente').length : 0;
+        const resp = await fetch('/api/admin/solicitacoes/pendentes');
+        const pendentes = await resp.json();
+        const nPecas = pendentes.pecas || 0;
+        const nCarros = pendentes.carros || 0;
         const ep = document.getElementById('solicitacoesPecasPendentes');
         const ec = document.getElementById('solicitacoesCarrosPendentes');
         if (ep && String(ep.textContent) !== String(nPecas)) ep.textContent = nPecas;
@@ -33,6 +29,55 @@ window.atualizarContadoresSolicitacoesAdmin = async function() {
     } catch (e) { console.error('Erro atualizar contadores:', e); }
 };
 
+// ============= LISTAGENS ADMIN PAGINADAS =============
+// Acumula as páginas de /api/admin/... (?limite=&cursor=); filtros vão na query string
+window.criarListaPaginada = function(url, filtros = {}, limite = 50) {
+    return {
+        itens: [],
+        cursor: null,
+        total: null,
+        totalEstimado: false,
+        temMais: false,
+        async carregar(maisItens = false) {
+            const params = new URLSearchParams({ ...filtros, limite });
+            if (maisItens && this.cursor) params.set('cursor', this.cursor);
+            const resp = await fetch(`${url}?${params}`, { credentials: 'include' });
+            const dados = await resp.json();
+            if (!resp.ok) throw new Error(dados.erro || 'Erro ao carregar lista');
+            if (!maisItens) {
+                this.itens = [];
+                this.total = dados.total;
+                this.totalEstimado = !!dados.total_estimado;
+            }
+            this.itens = this.itens.concat(dados.itens || []);
+            this.cursor = dados.proximo_cursor || null;
+            this.temMais = !!this.cursor;
+            return dados;
+        }
+    };
+};
+
+// Botão "Carregar mais" no fim do container (removido quando não há próxima página)
+window.renderizarCarregarMais = function(container, lista, aoClicar) {
+    container.querySelector('.lista-carregar-mais')?.remove();
+    if (!lista.temMais) return;
+    const div = document.createElement('div');
+    div.className = 'text-center my-3 lista-carregar-mais';
+    const restante = lista.total != null ? ` (${lista.itens.length} de ${lista.totalEstimado ? '~' : ''}${lista.total})` : '';
+    div.innerHTML = `<button type="button" class="btn btn-outline-secondary btn-sm">Carregar mais${restante}</button>`;
+    div.querySelector('button').addEventListener('click', async (ev) => {
+        ev.target.disabled = true;
+        try {
+            await lista.carregar(true);
+            aoClicar();
+        } catch (e) {
+            ev.target.disabled = false;
+            mostrarToast(e.message, 'error');
+        }
+    });
+    container.appendChild(div);
+};
+
 // ============= AUTO-REFRESH DO SISTEMA =============
 let intervaloAutoRefresh = null;
 let intervaloSolicitacoes = null;
@@ -68,7 +113,7 @@ function iniciarAutoRefresh() {
                 // Recarregar apenas dados da aba ativa
                 switch (abaAtiva) {
                     case 'garagem-tab':
-                        carregarGaragem();
+                        // Equipe + garagem numa requisição
                         recarregarDadosEquipe();
                         break;
                     case 'carros-tab':
@@ -93,10 +138,9 @@ function iniciarAutoRefresh() {
         if (document.hidden) return;
         if (temModalAberto()) return; // Não atualizar se tem modal aberto
 
-        // Dashboard - solicitações de peças e carros
+        // Dashboard - solicitações de peças e carros (uma requisição do painel)
         if (window.location.pathname === '/dashboard') {
-            carregarPecasAguardando();
-            carregarCarrosAguardando();
+            carregarAguardando();
         }
 
         // Página de solicitações de peças
@@ -152,9 +196,9 @@ document.addEventListener('visibilitychange', () => {
 document.addEventListener('DOMContentLoaded', function () {
     try {
         if (window.location.pathname === '/dashboard') {
-            carregarDetalhesEquipe().then(() => {
+            carregarPainelInicial().then(() => {
                 setTimeout(() => verificarEtapaEmAndamento(), 500);
-            }).catch(e => console.error('[INIT] Erro carregarDetalhesEquipe:', e));
+            }).catch(e => console.error('[INIT] Erro carregarPainelInicial:', e));
             obterPrecoInstalacaoWarehouse().catch(e => console.error('[INIT] Erro obterPrecoInstalacaoWarehouse:', e));
             configurarListenersModals();
             configurarCarregamentoLazy(); // Sistema de carregamento lazy
@@ -253,13 +297,14 @@ function carregarDadosPorAba(abaId = null) {
 
     switch (aba) {
         case 'garagem-tab':
-            if (!dadosCarregados.garagem) {
-                carregarGaragem();
-                dadosCarregados.garagem = true;
-            }
             if (!dadosCarregados.equipe) {
+                // Traz a garagem junto
                 recarregarDadosEquipe();
                 dadosCarregados.equipe = true;
+                dadosCarregados.garagem = true;
+            } else if (!dadosCarregados.garagem) {
+                carregarGaragem();
+                dadosCarregados.garagem = true;
             }
             break;
 
@@ -452,27 +497,57 @@ async function obterPrecoInstalacaoWarehouse() {
     return precoInstalacaoWarehouse;
 }
 
-async function recarregarDadosEquipe() {
-    try {
-        const equipeId = obterEquipeIdDaSession();
-        if (!equipeId) return;
+// ============= PAINEL DA EQUIPE =============
+// /api/equipes/<id>/dashboard?fields=... devolve várias seções do dashboard numa
+// requisição (equipe, garagem, armazém, aguardando, etapas, histórico...)
 
-        const resp = await fetch(`/api/equipes/${equipeId}`, {
-            headers: obterHeaders()
-        });
+const SECOES_EQUIPE = ['equipe', 'aguardando_pecas', 'aguardando_carros'];
+const SECOES_GARAGEM = ['garagem', 'armazem'];
 
-        if (resp.ok) {
-            equipeAtual = await resp.json();
-            renderizarDetalhesEquipe();
-            // Recarregar também a garagem para mostrar peças atualizadas
-            carregarGaragem();
-        }
+async function buscarPainelEquipe(secoes) {
+    const equipeId = obterEquipeIdDaSession();
+    if (!equipeId) return null;
+
+    const params = new URLSearchParams({ fields: secoes.join(',') });
+    const resp = await fetch(`/api/equipes/${equipeId}/dashboard?${params}`, {
+        headers: obterHeaders()
+    });
+    if (!resp.ok) {
+        const erro = new Error(`Erro ao carregar painel (${resp.status})`);
+        erro.status = resp.status;
+        throw erro;
+    }
+    return resp.json();
+}
+
+function aplicarPainelEquipe(painel) {
+    if (painel.equipe) {
+        equipeAtual = painel.equipe;
+        renderizarDetalhesEquipe(painel);
+    }
+    if (painel.garagem) {
+        aplicarGaragem(painel.garagem, painel.armazem);
+    }
+}
+
+async function carregarPainelInicial() {
+    // Primeira tela do dashboard numa requisição só; o lazy-load da garagem não repete
+    dadosCarregados.garagem = true;
+    dadosCarregados.equipe = true;
+    await carregarDetalhesEquipe([...SECOES_EQUIPE, ...SECOES_GARAGEM]);
+}
+
+async function recarregarDadosEquipe() {
+    try {
+        // Garagem junto para mostrar peças atualizadas
+        const painel = await buscarPainelEquipe([...SECOES_EQUIPE, ...SECOES_GARAGEM]);
+        if (painel) aplicarPainelEquipe(painel);
     } catch (e) {
         console.log('Erro ao recarregar dados da equipe:', e);
     }
 }
 
-async function carregarDetalhesEquipe() {
+async function carregarDetalhesEquipe(secoes = SECOES_EQUIPE) {
     try {
         const equipeId = obterEquipeIdDaSession();
         if (!equipeId) {
@@ -480,20 +555,13 @@ async function carregarDetalhesEquipe() {
             return;
         }
 
-        const resp = await fetch(`/api/equipes/${equipeId}`, {
-            headers: obterHeaders()
-        });
-
-        if (!resp.ok) {
-            if (resp.status === 401 || resp.status === 403) {
-                window.location.href = '/login';
-            }
+        aplicarPainelEquipe(await buscarPainelEquipe(secoes));
+    } catch (e) {
+        if (e.status === 401 || e.status === 403) {
+            window.location.href = '/login';
             return;
         }
-
-        equipeAtual = await resp.json();
-        renderizarDetalhesEquipe();
-    } catch (e) {
+        if (e.status) return;
         console.log('Erro ao carregar detalhes:', e);
         mostrarToast('Erro ao carregar detalhes', 'error');
     }
@@ -529,13 +597,23 @@ async function carregarPecasLoja() {
     }
 }
 
-async function carregarHistorico() {
+let _cursorHistorico = null;
+
+async function carregarHistorico(maisAntigos = false) {
     try {
-        const resp = await fetch('/api/historico/compras', {
-            headers: obterHeaders()
-        });
-        const historico = await resp.json();
-        renderizarHistorico(historico);
+        let dados;
+        if (maisAntigos && _cursorHistorico) {
+            const params = new URLSearchParams({ limite: 20, cursor: _cursorHistorico });
+            const resp = await fetch(`/api/historico/compras?${params}`, {
+                headers: obterHeaders()
+            });
+            dados = await resp.json();
+        } else {
+            // Primeira página vem do painel da equipe
+            dados = (await buscarPainelEquipe(['historico'])).historico;
+        }
+        _cursorHistorico = dados.proximo_cursor || null;
+        renderizarHistorico(dados.historico || [], maisAntigos);
     } catch (e) {
         mostrarToast('Erro ao carregar histórico', 'error');
     }
@@ -543,117 +621,52 @@ async function carregarHistorico() {
 
 async function carregarGaragem() {
     try {
-        const equipeId = obterEquipeIdDaSession();
-        if (!equipeId) return;
-
-        const resp = await fetch(`/api/garagem/${equipeId}`, {
-            headers: obterHeaders()
-        });
-
-        if (!resp.ok) {
-            throw new Error('Erro ao carregar garagem');
-        }
-
-        let garagem = await resp.json();
-        
-        // Validar e garantir estrutura mínima
-        if (!garagem) garagem = {};
-        if (!Array.isArray(garagem.carros)) garagem.carros = [];
-        
-        console.log('[GARAGEM] Dados recebidos:', {
-            temCarros: !!garagem.carros,
-            numCarros: garagem.carros?.length || 0,
-            estrutura: Object.keys(garagem)
-        });
-        const respArmazem = await fetch(`/api/armazem/${equipeId}`, {
-            headers: obterHeaders()
-        });
+        const painel = await buscarPainelEquipe(SECOES_GARAGEM);
+        if (painel) aplicarGaragem(painel.garagem, painel.armazem);
+    } catch (e) {
+        console.log('Erro ao carregar garagem:', e);
+        _cacheGaragem = null;
+        mostrarToast('Erro ao carregar garagem', 'error');
+    }
+}
 
-        let armazem = { pecas_guardadas: [], total: 0 };
-        if (respArmazem.ok) {
-            armazem = await respArmazem.json();
+function aplicarGaragem(garagem, armazem) {
+    // Validar e garantir estrutura mínima
+    if (!garagem) garagem = {};
+    if (!Array.isArray(garagem.carros)) garagem.carros = [];
+    if (!armazem) armazem = { pecas_guardadas: [], total: 0 };
 
-            if (armazem.pecas_guardadas && armazem.pecas_guardadas.length > 0) {
-                console.log('[DEBUG] Peças no armazém:', armazem.pecas_guardadas);
-                armazem.total = armazem.pecas_guardadas.length;
-            }
-        }
+    // Solicitações pendentes (mudança de carro e peças) da equipe vêm com a garagem
+    const solicitacoesPendentes = garagem.solicitacoes_carros_pendentes || [];
+    const solicitacoesPecasPendentes = garagem.solicitacoes_pecas_pendentes || [];
 
-        // Carregar solicitações pendentes de mudança de carro
-        let solicitacoesPendentes = [];
-        let solicitacoesPecasPendentes = [];
-        try {
-            const respSolicitacoes = await fetch(`/api/admin/solicitacoes-carros`);
-            if (respSolicitacoes.ok) {
-                const todasSolicitacoes = await respSolicitacoes.json();
-                // Filtrar apenas solicitações pendentes desta equipe
-                solicitacoesPendentes = todasSolicitacoes.filter(sol =>
-                    sol.equipe_id === equipeId && sol.status === 'pendente'
-                );
-            }
-        } catch (e) {
-            console.log('Erro ao carregar solicitações de carros:', e);
-        }
+    // Garantir que todos os carros têm um array de peças
+    garagem = {
+        carros: garagem.carros.map(carro => ({
+            ...carro,
+            pecas: carro.pecas || []
+        }))
+    };
 
-        // Carregar solicitações pendentes de peças
-        try {
-            const respSolicitacoesPecas = await fetch(`/api/admin/solicitacoes-pecas`);
-            if (respSolicitacoesPecas.ok) {
-                const todasSolicitacoesPecas = await respSolicitacoesPecas.json();
-                console.log(`[DEBUG] Total solicitações de peças: ${todasSolicitacoesPecas.length}, equipeId: ${equipeId}`);
-                // Filtrar apenas solicitações pendentes desta equipe
-                solicitacoesPecasPendentes = todasSolicitacoesPecas.filter(sol => {
-                    const match = String(sol.equipe_id) === String(equipeId) && sol.status === 'pendente';
-                    if (match) {
-                        console.log(`[DEBUG] Solicitação pendente encontrada: ${sol.peca_nome} (${sol.peca_tipo})`);
-                    }
-                    return match;
-                });
-                console.log(`[DEBUG] Solicitações de peças pendentes filtradas: ${solicitacoesPecasPendentes.length}`);
-            }
-        } catch (e) {
-            console.log('Erro ao carregar solicitações de peças:', e);
-        }
-        // Armazenar garagem em window para uso em outras funções
-        window.garagemAtual = garagem || {};
-        
-        // Garantir que carros é um array
-        if (!Array.isArray(garagem?.carros)) {
-            console.warn('[GARAGEM] carros não é um array:', garagem?.carros);
-            garagem = { ...garagem, carros: [] };
-            window.garagemAtual.carros = [];
-        }
-        
-        // Adicionar armazém aos dados da garagem
-        window.garagemAtual.armazem = armazem;
-
-        // Garantir que todos os carros têm um array de peças
-        if (garagem && garagem.carros && Array.isArray(garagem.carros)) {
-            garagem.carros = garagem.carros.map(carro => ({
-                ...carro,
-                pecas: carro.pecas || []
-            }));
-        }
+    // Armazenar garagem em window para uso em outras funções
+    window.garagemAtual = garagem;
+    // Adicionar armazém aos dados da garagem
+    window.garagemAtual.armazem = armazem;
 
-        const payload = { garagem, armazem, solicitacoesPendentes, solicitacoesPecasPendentes };
-        const hash = JSON.stringify(payload);
-        if (_cacheGaragem === hash) return;
-        _cacheGaragem = hash;
+    const payload = { garagem, armazem, solicitacoesPendentes, solicitacoesPecasPendentes };
+    const hash = JSON.stringify(payload);
+    if (_cacheGaragem === hash) return;
+    _cacheGaragem = hash;
 
-        renderizarGaragem(garagem, armazem, solicitacoesPendentes, solicitacoesPecasPendentes);
-        atualizarUICarrinho();
-        atualizarUICarrinhoArmazem();
-        carregarProximaEtapa();
-    } catch (e) {
-        console.log('Erro ao carregar garagem:', e);
-        _cacheGaragem = null;
-        mostrarToast('Erro ao carregar garagem', 'error');
-    }
+    renderizarGaragem(garagem, armazem, solicitacoesPendentes, solicitacoesPecasPendentes);
+    atualizarUICarrinho();
+    atualizarUICarrinhoArmazem();
+    carregarProximaEtapa();
 }
 
 // ============= RENDERIZAÇÃO =============
 
-function renderizarDetalhesEquipe() {
+function renderizarDetalhesEquipe(painel = null) {
     if (!equipeAtual) return;
 
     const container = document.getElementById('equipeDetalhes');
@@ -699,20 +712,53 @@ function renderizarDetalhesEquipe() {
     // Limpar cache para forçar atualização (evita ficar em "Carregando" após re-render)
     _cachePecasAguardando = null;
     _cacheCarrosAguardando = null;
-    // Carregar peças e carros aguardando
-    carregarPecasAguardando();
-    carregarCarrosAguardando();
+    // Peças e carros aguardando: do painel que trouxe a equipe, ou buscar
+    if (painel && painel.aguardando_pecas && painel.aguardando_carros) {
+        exibirPecasAguardando(painel.aguardando_pecas);
+        exibirCarrosAguardando(painel.aguardando_carros);
+    } else {
+        carregarAguardando();
+    }
+}
+
+async function carregarAguardando() {
+    if (window.location.pathname !== '/dashboard') {
+        carregarPecasAguardando();
+        carregarCarrosAguardando();
+        return;
+    }
+    // No dashboard as duas listas vêm numa requisição do painel da equipe
+    try {
+        const painel = await buscarPainelEquipe(['aguardando_pecas', 'aguardando_carros']);
+        if (!painel) return;
+        exibirPecasAguardando(painel.aguardando_pecas);
+        exibirCarrosAguardando(painel.aguardando_carros);
+    } catch (e) {
+        console.log('Erro ao carregar peças e carros aguardando:', e);
+        _cachePecasAguardando = null;
+        _cacheCarrosAguardando = null;
+    }
+}
+
+function exibirPecasAguardando(pecasAguardando) {
+    const hash = JSON.stringify(pecasAguardando);
+    if (_cachePecasAguardando === hash) return;
+    _cachePecasAguardando = hash;
+    renderizarPecasAguardando(pecasAguardando);
+}
+
+function exibirCarrosAguardando(carrosAguardando) {
+    const hash = JSON.stringify(carrosAguardando);
+    if (_cacheCarrosAguardando === hash) return;
+    _cacheCarrosAguardando = hash;
+    renderizarCarrosAguardando(carrosAguardando);
 }
 
 async function carregarPecasAguardando() {
     try {
         const resp = await fetch('/api/aguardando-pecas', { headers: obterHeaders() });
         if (!resp.ok) throw new Error('Erro ao carregar peças');
-        const pecasAguardando = await resp.json();
-        const hash = JSON.stringify(pecasAguardando);
-        if (_cachePecasAguardando === hash) return;
-        _cachePecasAguardando = hash;
-        renderizarPecasAguardando(pecasAguardando);
+        exibirPecasAguardando(await resp.json());
     } catch (e) {
         console.log('Erro ao carregar peças aguardando:', e);
         _cachePecasAguardando = null;
@@ -767,11 +813,7 @@ async function carregarCarrosAguardando() {
     try {
         const resp = await fetch('/api/aguardando-carros', { headers: obterHeaders() });
         if (!resp.ok) throw new Error('Erro ao carregar carros');
-        const carrosAguardando = await resp.json();
-        const hash = JSON.stringify(carrosAguardando);
-        if (_cacheCarrosAguardando === hash) return;
-        _cacheCarrosAguardando = hash;
-        renderizarCarrosAguardando(carrosAguardando);
+        exibirCarrosAguardando(await resp.json());
     } catch (e) {
         console.log('Erro ao carregar carros aguardando:', e);
         _cacheCarrosAguardando = null;
@@ -1318,11 +1360,15 @@ function renderizarGaragem(garagem, armazem = { pecas_guardadas: [], total: 0 },
     container.appendChild(secaoArmazem);
 }
 
-function renderizarHistorico(historico) {
+function renderizarHistorico(historico, anexar = false) {
     const container = document.getElementById('historicoList');
-    container.innerHTML = '';
+    if (anexar) {
+        container.querySelector('.historico-carregar-mais')?.remove();
+    } else {
+        container.innerHTML = '';
+    }
 
-    if (historico.length === 0) {
+    if (historico.length === 0 && !anexar) {
         container.innerHTML = '<p class="text-muted">Nenhuma transação realizada</p>';
         return;
     }
@@ -1406,6 +1452,14 @@ function renderizarHistorico(historico) {
         }
         container.appendChild(div);
     });
+
+    if (_cursorHistorico) {
+        const botao = document.createElement('button');
+        botao.className = 'btn btn-outline-secondary btn-sm w-100 historico-carregar-mais';
+        botao.textContent = 'Carregar mais';
+        botao.onclick = () => carregarHistorico(true);
+        container.appendChild(botao);
+    }
 }
 
 // ============= MODAL DE CONFIRMAÇÃO =============
@@ -2397,9 +2451,8 @@ async function monitorarTransacaoPix(transacaoId) {
                     bootstrap.Modal.getInstance(document.getElementById('pixModal')).hide();
                     mostrarToast('✅ Compra realizada com sucesso!', 'success');
 
-                    // Recarregar dados
-                    carregarDetalhesEquipe();
-                    carregarGaragem();
+                    // Recarregar dados (equipe e garagem numa requisição)
+                    recarregarDadosEquipe();
                     carregarHistorico();
                 }, 2000);
             } else if (transacao.status === 'pendente') {
@@ -2535,9 +2588,8 @@ async function confirmarPagamentoManual() {
             limparCarrinho();
             atualizarPainelCarrinho();
 
-            // Recarregar dados
-            if (typeof carregarDetalhesEquipe === 'function') carregarDetalhesEquipe();
-            if (typeof carregarGaragem === 'function') carregarGaragem();
+            // Recarregar dados (equipe e garagem numa requisição)
+            recarregarDadosEquipe();
             if (typeof carregarHistorico === 'function') carregarHistorico();
 
             // Mostrar modal de compra finalizada
@@ -4393,12 +4445,7 @@ async function enviarCarrinhoParaArmazem() {
             }
 
             // Recarregar detalhes da equipe e garagem
-            if (typeof carregarDetalhesEquipe === 'function') {
-                await carregarDetalhesEquipe();
-            }
-            if (typeof carregarGaragem === 'function') {
-                await carregarGaragem();
-            }
+            await recarregarDadosEquipe();
 
             // Mostrar modal de compra finalizada
             setTimeout(() => {
@@ -4507,13 +4554,8 @@ function iniciarPollingPixCarrinho(transacaoId) {
                     limparCarrinho();
                     atualizarPainelCarrinho();
 
-                    // Recarregar dados
-                    if (typeof carregarDetalhesEquipe === 'function') {
-                        carregarDetalhesEquipe();
-                    }
-                    if (typeof carregarGaragem === 'function') {
-                        carregarGaragem();
-                    }
+                    // Recarregar dados (equipe e garagem numa requisição)
+                    recarregarDadosEquipe();
 
                     // Mostrar modal de compra finalizada
                     setTimeout(() => {
@@ -5359,45 +5401,46 @@ async function cadastrarEtapa() {
     }
 }
 
+let _listaEtapasCadastro = null;
+
 async function carregarEtapasCadastro() {
     try {
-        const resp = await fetch('/api/admin/listar-etapas', {
-            headers: obterHeaders()
-        });
-
-        const etapas = await resp.json();
-
         const lista = document.getElementById('listaEtapasCadastro');
         if (!lista) return;
-
-        // Verificar se é um array
-        if (!Array.isArray(etapas)) {
-            lista.innerHTML = '<p class="text-danger">Erro ao carregar etapas</p>';
-            return;
-        }
-
-        if (etapas.length === 0) {
-            lista.innerHTML = '<p class="text-muted">Nenhuma etapa cadastrada</p>';
-        } else {
-            lista.innerHTML = etapas.map(e => {
-                const dataHora = new Date(`${e.data_etapa}T${e.hora_etapa}`);
-                const dataStr = dataHora.toLocaleDateString('pt-BR');
-                const horaStr = dataHora.toLocaleTimeString('pt-BR', { hour: '2-digit', minute: '2-digit' });
-                
-                return `
-                    <div class="p-2 mb-2 border rounded">
-                        <strong>${e.nome || `Etapa ${e.numero}`}</strong> <span class="badge bg-info">Série ${e.serie}</span>
-                        <br>
-                        <small class="text-muted">📅 ${dataStr} às ${horaStr}</small>
-                        <br>
-                        <small class="text-muted">${e.descricao || '-'}</small>
-                    </div>
-                `;
-            }).join('');
-        }
+        _listaEtapasCadastro = window.criarListaPaginada('/api/admin/listar-etapas', { ordenar: 'data' });
+        await _listaEtapasCadastro.carregar();
+        renderizarEtapasCadastro();
     } catch (e) {
         console.error('[CARREGAR ETAPAS] Erro:', e);
+        const lista = document.getElementById('listaEtapasCadastro');
+        if (lista) lista.innerHTML = '<p class="text-danger">Erro ao carregar etapas</p>';
+    }
+}
+
+function renderizarEtapasCadastro() {
+    const lista = document.getElementById('listaEtapasCadastro');
+    const etapas = _listaEtapasCadastro.itens;
+
+    if (etapas.length === 0) {
+        lista.innerHTML = '<p class="text-muted">Nenhuma etapa cadastrada</p>';
+    } else {
+        lista.innerHTML = etapas.map(e => {
+            const dataHora = new Date(`${e.data_etapa}T${e.hora_etapa}`);
+            const dataStr = dataHora.toLocaleDateString('pt-BR');
+            const horaStr = dataHora.toLocaleTimeString('pt-BR', { hour: '2-digit', minute: '2-digit' });
+            
+            return `
+                <div class="p-2 mb-2 border rounded">
+                    <strong>${e.nome || `Etapa ${e.numero}`}</strong> <span class="badge bg-info">Série ${e.serie}</span>
+                    <br>
+                    <small class="text-muted">📅 ${dataStr} às ${horaStr}</small>
+                    <br>
+                    <small class="text-muted">${e.descricao || '-'}</small>
+                </div>
+            `;
+        }).join('');
     }
+    window.renderizarCarregarMais(lista, _listaEtapasCadastro, renderizarEtapasCadastro);
 }
 
 // =================== ADMIN - ALOCAÇÃO DE PILOTOS (centralizado) ===================
@@ -0,0 +1,92 @@
+"""Testes do planejamento de alocação automática de pilotos (sem banco)."""
+from datetime import datetime, timedelta
+
+from src.alocacao_pilotos import planejar_alocacao, ORIGEM_CANDIDATO, ORIGEM_RESERVA
+
+T0 = datetime(2026, 3, 1, 10, 0, 0)
+
+
+def _participacao(equipe_id, minuto, piloto_id=None, tipo='precisa_piloto'):
+    return {
+        'equipe_id': equipe_id,
+        'equipe_nome': equipe_id.upper(),
+        'piloto_id': piloto_id,
+        'tipo_participacao': tipo,
+        'data_inscricao': T0 + timedelta(minutes=minuto),
+    }
+
+
+def _candidatura(cid, equipe_id, piloto_id, minuto):
+    return {
+        'candidato_id': cid,
+        'equipe_id': equipe_id,
+        'piloto_id': piloto_id,
+        'piloto_nome': piloto_id.upper(),
+        'data_inscricao': T0 + timedelta(minutes=minuto),
+    }
+
+
+def _por_equipe(plano):
+    return {a['equipe_id']: (a['piloto_id'], a['origem']) for a in plano['alocacoes']}
+
+
+def test_candidaturas_respeitam_ordem_de_inscricao():
+    participacoes = [_participacao('e1', 0), _participacao('e2', 1)]
+    candidaturas = [
+        _candidatura('c2', 'e1', 'p2', 5),
+        _candidatura('c1', 'e1', 'p1', 2),
+        _candidatura('c3', 'e2', 'p3', 3),
+    ]
+    plano = planejar_alocacao(participacoes, candidaturas)
+    assert _por_equipe(plano) == {'e1': ('p1', ORIGEM_CANDIDATO), 'e2': ('p3', ORIGEM_CANDIDATO)}
+    assert {a['candidato_id'] for a in plano['alocacoes']} == {'c1', 'c3'}
+    assert plano['pilotos_sem_equipe'] == [{'piloto_id': 'p2', 'piloto_nome': 'P2'}]
+    assert plano['equipes_sem_piloto'] == []
+
+
+def test_piloto_nunca_em_duas_equipes():
+    participacoes = [_participacao('e1', 0), _participacao('e2', 1)]
+    candidaturas = [
+        _candidatura('c1', 'e1', 'p1', 1),
+        _candidatura('c2', 'e2', 'p1', 2),
+    ]
+    plano = planejar_alocacao(participacoes, candidaturas)
+    assert _por_equipe(plano) == {'e1': ('p1', ORIGEM_CANDIDATO)}
+    assert plano['equipes_sem_piloto'] == [{'equipe_id': 'e2', 'equipe_nome': 'E2'}]
+
+
+def test_reserva_completa_vagas_restantes():
+    participacoes = [_participacao('e1', 0), _participacao('e2', 1), _participacao('e3', 2)]
+    candidaturas = [
+        _candidatura('c1', 'e1', 'p1', 1),
+        _candidatura('c2', 'e1', 'p2', 2),
+        _candidatura('c3', 'e1', 'p3', 3),
+    ]
+    plano = planejar_alocacao(participacoes, candidaturas)
+    assert _por_equipe(plano) == {
+        'e1': ('p1', ORIGEM_CANDIDATO),
+        'e2': ('p2', ORIGEM_RESERVA),
+        'e3': ('p3', ORIGEM_RESERVA),
+    }
+    # Reserva não marca a candidatura de outra equipe como designada
+    assert [a['candidato_id'] for a in plano['alocacoes'] if a['origem'] == ORIGEM_RESERVA] == [None, None]
+
+
+def test_ignora_pilotos_ja_alocados_e_equipes_completas():
+    participacoes = [
+        _participacao('e1', 0, piloto_id='p1'),
+        _participacao('e2', 1),
+        _participacao('e3', 2, tipo='equipe_completa'),
+    ]
+    candidaturas = [
+        _candidatura('c1', 'e2', 'p1', 1),
+        _candidatura('c2', 'e3', 'p2', 2),
+    ]
+    plano = planejar_alocacao(participacoes, candidaturas)
+    assert _por_equipe(plano) == {'e2': ('p2', ORIGEM_RESERVA)}
+
+
+def test_sem_candidaturas():
+    plano = planejar_alocacao([_participacao('e1', 0)], [])
+    assert plano['alocacoes'] == []
+    assert plano['equipes_sem_piloto'] == [{'equipe_id': 'e1', 'equipe_nome': 'E1'}]
@@ -0,0 +1,116 @@
+"""Arquivamento de solicitações, PIX e comissões finalizadas (*_historico)."""
+import uuid
+
+import pytest
+
+from src.arquivamento import POLITICAS, RETENCAO_PADRAO_DIAS, consulta_candidatas, ler_retencao
+
+
+def test_ler_retencao_e_consulta_candidatas():
+    assert ler_retencao() == RETENCAO_PADRAO_DIAS
+    assert ler_retencao({'financeiro': '30'}) == {'solicitacoes': 3, 'financeiro': 30}
+    for invalida in ({'pix': 1}, {'financeiro': -1}, {'solicitacoes': 'tres'}):
+        with pytest.raises(ValueError):
+            ler_retencao(invalida)
+
+    sql, params = consulta_candidatas(POLITICAS['solicitacoes_pecas'], 3, 100)
+    assert 'status IN (%s, %s)' in sql and 'ORDER BY data_atualizacao' in sql
+    assert params == ['instalado', 'reprovado', 3, 100]
+    sql, params = consulta_candidatas(POLITICAS['comissoes'], 90, 10)
+    assert 'status' not in sql and params == [90, 10]
+
+
+@pytest.fixture
+def equipe_com_historico(client):
+    """Equipe com solicitações, PIX e comissão antigos e recentes; devolve (equipe, ids)"""
+    from app import api
+    db = api.db
+    equipe = api.gerenciador.criar_equipe(f"Arquivo {uuid.uuid4().hex[:10]}", 500.0)
+    ids = {nome: str(uuid.uuid4()) for nome in (
+        'instalada_antiga', 'instalada_recente', 'guardada_antiga', 'pendente_antiga',
+        'pix_aprovado_antigo', 'pix_pendente_antigo', 'comissao_antiga')}
+    conn = db._get_conn()
+    cursor = conn.cursor()
+    for nome, status, dias in (('instalada_antiga', 'instalado', 10), ('instalada_recente', 'instalado', 0),
+                               ('guardada_antiga', 'guardada', 10), ('pendente_antiga', 'pendente', 10)):
+        cursor.execute(
+            "INSERT INTO solicitacoes_pecas (id, equipe_id, tipo_peca, status, data_solicitacao, data_atualizacao) "
+            "VALUES (%s, %s, 'motor', %s, NOW() - INTERVAL %s DAY, NOW() - INTERVAL %s DAY)",
+            (ids[nome], equipe.id, status, dias, dias))
+    for nome, status in (('pix_aprovado_antigo', 'aprovado'), ('pix_pendente_antigo', 'pendente')):
+        cursor.execute(
+            "INSERT INTO transacoes_pix (id, equipe_id, equipe_nome, tipo_item, item_nome, valor_item, valor_total, "
+            "status, data_criacao) VALUES (%s, %s, %s, 'peca', 'Motor', 10, 10, %s, NOW() - INTERVAL 100 DAY)",
+            (ids[nome], equipe.id, equipe.nome, status))
+    cursor.execute(
+        "INSERT INTO comissoes (id, tipo, valor_comissao, equipe_id, equipe_nome, data_transacao) "
+        "VALUES (%s, 'teste_arquivo', 7, %s, %s, NOW() - INTERVAL 100 DAY)",
+        (ids['comissao_antiga'], equipe.id, equipe.nome))
+    conn.commit()
+    conn.close()
+
+    yield equipe, ids
+    conn = db._get_conn()
+    cursor = conn.cursor()
+    for politica in POLITICAS.values():
+        for tabela in (politica.tabela, politica.tabela_historico):
+            cursor.execute(f'DELETE FROM {tabela} WHERE equipe_id = %s', (equipe.id,))
+    conn.commit()
+    conn.close()
+    db.deletar_equipe(equipe.id)
+
+
+def _ids(db, tabela, equipe_id):
+    conn = db._get_conn()
+    cursor = conn.cursor()
+    cursor.execute(f'SELECT id FROM {tabela} WHERE equipe_id = %s', (equipe_id,))
+    ids = {row[0] for row in cursor.fetchall()}
+    conn.close()
+    return ids
+
+
+def test_arquiva_so_finalizadas_antigas_em_lotes(client, equipe_com_historico):
+    from app import api
+    db = api.db
+    equipe, ids = equipe_com_historico
+    resumo_antes = db.obter_resumo_comissoes('teste_arquivo')
+
+    movidas = db.arquivar_finalizados(lote=1)
+    assert movidas['solicitacoes_pecas'] >= 1 and movidas['transacoes_pix'] >= 1 and movidas['comissoes'] >= 1
+
+    vivas = {ids['instalada_recente'], ids['guardada_antiga'], ids['pendente_antiga']}
+    assert _ids(db, 'solicitacoes_pecas', equipe.id) == vivas
+    assert _ids(db, 'solicitacoes_pecas_historico', equipe.id) == {ids['instalada_antiga']}
+    assert _ids(db, 'transacoes_pix', equipe.id) == {ids['pix_pendente_antigo']}
+    assert _ids(db, 'transacoes_pix_historico', equipe.id) == {ids['pix_aprovado_antigo']}
+    assert _ids(db, 'comissoes', equipe.id) == set()
+    assert {s['id'] for s in db.carregar_solicitacoes_pecas(equipe.id)} == vivas
+
+    # Segunda execução não encontra mais nada desta equipe
+    db.arquivar_finalizados()
+    assert _ids(db, 'solicitacoes_pecas_historico', equipe.id) == {ids['instalada_antiga']}
+    assert db.obter_resumo_comissoes('teste_arquivo') == resumo_antes
+
+
+def test_historico_consulta_o_arquivo(client_admin, equipe_com_historico):
+    from app import api
+    equipe, ids = equipe_com_historico
+    api.db.arquivar_finalizados()
+
+    historico = {row['id'] for row in api.db.listar_historico_compras(equipe.id, 50)}
+    assert {ids['instalada_antiga'], ids['instalada_recente'], ids['pix_aprovado_antigo']} <= historico
+
+    r = client_admin.get(f'/api/admin/solicitacoes-pecas?limite=50&equipe_id={equipe.id}&arquivo=1')
+    assert r.status_code == 200
+    assert [item['id'] for item in r.get_json()['itens']] == [ids['instalada_antiga']]
+    r = client_admin.get(f'/api/admin/transacoes-pix?limite=50&equipe_id={equipe.id}&arquivo=1')
+    assert [item['id'] for item in r.get_json()['itens']] == [ids['pix_aprovado_antigo']]
+    assert client_admin.get('/api/admin/equipes?limite=10&arquivo=1').status_code == 400
+
+
+def test_rota_enfileira_job_e_valida_retencao(client_admin):
+    r = client_admin.post('/api/admin/arquivamento', json={'retencao': {'financeiro': -1}})
+    assert r.status_code == 400
+    r = client_admin.post('/api/admin/arquivamento', json={'lote': 100})
+    assert r.status_code == 202
+    assert client_admin.get(r.get_json()['acompanhar']).status_code == 200
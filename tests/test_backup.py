@@ -0,0 +1,124 @@
+"""Testes do backup NDJSON em blocos (sem banco)."""
+import gzip
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.backup import (
+    MODO_ATUALIZACAO, MODO_COMPLETO, MODO_CRIACAO, escolher_coluna_marca, gerar_backup, ler_manifesto,
+    restaurar_backup, ultimo_backup,
+)
+
+
+def _linhas_pix(n, inicio=datetime(2026, 3, 1, 20, 0, 0)):
+    for i in range(n):
+        yield {
+            'id': f'pix-{i}',
+            'valor': Decimal('10.50'),
+            'hora': timedelta(hours=20, minutes=30),
+            'qr_code': b'\x89PNG',
+            'data_criacao': inicio + timedelta(minutes=i),
+        }
+
+
+class BancoFalso:
+    def __init__(self, tabelas):
+        self.tabelas = tabelas
+        self.consultas = []
+
+    def iterar(self, tabela, coluna, desde):
+        self.consultas.append((tabela, desde))
+        for linha in self.tabelas[tabela]():
+            if desde is None or linha[coluna].strftime('%Y-%m-%d %H:%M:%S') >= desde:
+                yield linha
+
+
+def test_blocos_gzip_e_manifesto(tmp_path):
+    banco = BancoFalso({'transacoes_pix': lambda: _linhas_pix(25), 'etapas': lambda: iter([{'id': 'e1'}])})
+    manifesto = gerar_backup(str(tmp_path / 'b1'), {'transacoes_pix': 'data_criacao', 'etapas': None},
+                             banco.iterar, linhas_por_bloco=10)
+
+    pix = manifesto['tabelas']['transacoes_pix']
+    assert pix['linhas'] == 25
+    assert [b['linhas'] for b in pix['blocos']] == [10, 10, 5]
+    assert pix['marca'] == '2026-03-01 20:24:00'
+    with gzip.open(tmp_path / 'b1' / pix['blocos'][0]['arquivo'], 'rt', encoding='utf-8') as f:
+        primeira = json.loads(f.readline())
+    assert primeira['valor'] == '10.50'
+    assert primeira['hora'] == '20:30:00'
+    assert ler_manifesto(str(tmp_path / 'b1'))['tabelas']['etapas']['linhas'] == 1
+
+
+def test_restauracao_em_lotes_preserva_valores(tmp_path):
+    banco = BancoFalso({'transacoes_pix': lambda: _linhas_pix(7)})
+    gerar_backup(str(tmp_path / 'b1'), {'transacoes_pix': 'data_criacao'}, banco.iterar, linhas_por_bloco=3)
+    lotes = []
+
+    restauradas = restaurar_backup(str(tmp_path / 'b1'), lambda t, c, linhas: lotes.append((t, c, linhas)),
+                                   tamanho_lote=4)
+
+    assert restauradas == {'transacoes_pix': 7}
+    assert [len(l[2]) for l in lotes] == [4, 3]
+    tabela, colunas, linhas = lotes[0]
+    assert colunas == ['id', 'valor', 'hora', 'qr_code', 'data_criacao']
+    assert linhas[0] == ('pix-0', '10.50', '20:30:00', b'\x89PNG', '2026-03-01 20:00:00')
+
+
+def test_incremental_parte_da_marca_do_anterior(tmp_path):
+    linhas = {'n': 5}
+    banco = BancoFalso({'transacoes_pix': lambda: _linhas_pix(linhas['n'])})
+    gerar_backup(str(tmp_path / '20260301_1'), {'transacoes_pix': 'data_criacao'}, banco.iterar)
+    linhas['n'] = 8
+    base = ler_manifesto(ultimo_backup(str(tmp_path)))
+
+    manifesto = gerar_backup(str(tmp_path / '20260301_2'), {'transacoes_pix': 'data_criacao'}, banco.iterar, base)
+
+    assert banco.consultas[-1] == ('transacoes_pix', '2026-03-01 20:04:00')
+    # A linha da marca volta (>=) e as 3 novas
+    assert manifesto['tabelas']['transacoes_pix']['linhas'] == 4
+    assert manifesto['incremental_de'].endswith('20260301_1')
+    assert ultimo_backup(str(tmp_path)).endswith('20260301_2')
+
+
+def test_marca_de_criacao_so_em_tabelas_de_insercao():
+    assert escolher_coluna_marca('etapas', ['id', 'data_criacao', 'data_atualizacao']) == 'data_atualizacao'
+    assert escolher_coluna_marca('movimentacoes_saldo', ['id', 'data_movimentacao']) == 'data_movimentacao'
+    assert escolher_coluna_marca('batalhas', ['id', 'data']) == 'data'
+    # Mutável sem data_atualizacao: um UPDATE não mexe na data_criacao
+    assert escolher_coluna_marca('transacoes_pix', ['id', 'status', 'data_criacao']) is None
+    assert escolher_coluna_marca('equipes', ['id', 'doricoins', 'data_criacao']) is None
+
+
+def test_incremental_exporta_completas_as_tabelas_sem_marca(tmp_path):
+    equipes = {'e1': 100}
+    banco = BancoFalso({
+        'movimentacoes_saldo': lambda: _linhas_pix(3),
+        'equipes': lambda: iter([{'id': k, 'doricoins': v} for k, v in equipes.items()]),
+    })
+    tabelas = {'movimentacoes_saldo': 'data_criacao', 'equipes': None}
+    completo = gerar_backup(str(tmp_path / 'b1'), tabelas, banco.iterar)
+    equipes['e1'] = 40
+
+    manifesto = gerar_backup(str(tmp_path / 'b2'), tabelas, banco.iterar, completo)
+
+    assert manifesto['tabelas']['movimentacoes_saldo']['modo'] == MODO_CRIACAO
+    assert manifesto['tabelas']['movimentacoes_saldo']['desde'] == '2026-03-01 20:02:00'
+    equipe = manifesto['tabelas']['equipes']
+    assert (equipe['modo'], equipe['desde'], equipe['linhas']) == (MODO_COMPLETO, None, 1)
+    lotes = []
+    restaurar_backup(str(tmp_path / 'b2'), lambda t, c, linhas: lotes.append((t, linhas)), tabelas=['equipes'])
+    assert lotes == [('equipes', [('e1', 40)])]
+
+
+def test_marca_de_outra_coluna_no_anterior_nao_vale(tmp_path):
+    """Backup antigo marcado por data_criacao numa tabela que agora usa data_atualizacao"""
+    banco = BancoFalso({'etapas': lambda: iter([{'id': 'e1', 'data_criacao': datetime(2026, 1, 1),
+                                                 'data_atualizacao': datetime(2026, 3, 1)}])})
+    base = {'pasta': 'antigo', 'tabelas': {'etapas': {'coluna_marca': 'data_criacao',
+                                                      'marca': '2026-02-01 00:00:00'}}}
+
+    manifesto = gerar_backup(str(tmp_path / 'b2'), {'etapas': 'data_atualizacao'}, banco.iterar, base)
+
+    assert banco.consultas == [('etapas', None)]
+    assert manifesto['tabelas']['etapas']['modo'] == MODO_ATUALIZACAO
+    assert manifesto['tabelas']['etapas']['marca'] == '2026-03-01 00:00:00'
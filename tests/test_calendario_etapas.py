@@ -0,0 +1,69 @@
+"""Testes do calendário de etapas em memória (sem banco)."""
+from datetime import date, datetime, timedelta
+
+from src.calendario_etapas import CalendarioEtapas
+
+
+class BancoFalso:
+    def __init__(self):
+        self.cargas = []
+        self.em_andamento = [{'id': 'e2', 'serie': 'A'}]
+
+    def carregar(self, hoje):
+        self.cargas.append(hoje)
+        return {
+            'hoje': [{'id': 'e1', 'serie': 'A', 'hora_etapa': '10:00'},
+                     {'id': 'e3', 'serie': 'B', 'hora_etapa': '20:00'}],
+            'em_andamento': list(self.em_andamento),
+            'agendadas': [{'id': 'e1', 'serie': 'A'}, {'id': 'e3', 'serie': 'B'}, {'id': 'e4', 'serie': 'A'}],
+        }
+
+
+class Relogio:
+    def __init__(self, agora):
+        self.agora = agora
+
+    def __call__(self):
+        return self.agora
+
+
+def test_consultas_servidas_de_uma_carga():
+    banco, relogio = BancoFalso(), Relogio(datetime(2026, 3, 1, 19, 0))
+    calendario = CalendarioEtapas(banco.carregar, ttl=30, agora=relogio)
+
+    for _ in range(100):
+        assert calendario.etapa_hoje()['id'] == 'e1'
+        assert calendario.em_andamento()['id'] == 'e2'
+        assert calendario.em_andamento('B') is None
+        assert calendario.proxima('A')['id'] == 'e1'
+        assert calendario.proxima('C') is None
+
+    assert banco.cargas == [date(2026, 3, 1)]
+
+
+def test_expira_na_meia_noite_antes_do_ttl():
+    banco, relogio = BancoFalso(), Relogio(datetime(2026, 3, 1, 23, 59, 50))
+    calendario = CalendarioEtapas(banco.carregar, ttl=3600, agora=relogio)
+    calendario.etapa_hoje()
+
+    relogio.agora += timedelta(seconds=9)
+    calendario.etapa_hoje()
+    relogio.agora += timedelta(seconds=2)
+    calendario.etapa_hoje()
+
+    assert banco.cargas == [date(2026, 3, 1), date(2026, 3, 2)]
+
+
+def test_ttl_e_invalidacao():
+    banco, relogio = BancoFalso(), Relogio(datetime(2026, 3, 1, 12, 0))
+    calendario = CalendarioEtapas(banco.carregar, ttl=30, agora=relogio)
+    calendario.em_andamento()
+
+    banco.em_andamento = []
+    assert calendario.em_andamento()['id'] == 'e2'
+    calendario.invalidar()
+    assert calendario.em_andamento() is None
+
+    relogio.agora += timedelta(seconds=31)
+    calendario.em_andamento()
+    assert len(banco.cargas) == 3
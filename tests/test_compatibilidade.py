@@ -0,0 +1,44 @@
+"""Testes do índice de compatibilidade de peças por modelo (sem banco)."""
+from src.compatibilidade import (
+    UNIVERSAL, IndiceCompatibilidade, linhas_compatibilidade, listar_modelos_compativeis,
+)
+
+
+def test_linhas_normalizadas():
+    assert linhas_compatibilidade('p1', None) == [('p1', UNIVERSAL)]
+    assert linhas_compatibilidade('p1', '{"compatibilidades": ["universal"]}') == [('p1', UNIVERSAL)]
+    assert linhas_compatibilidade('p1', '{"compatibilidades": ["M-AE86", "m-s13", "M-AE86"]}') == [
+        ('p1', 'M-AE86'), ('p1', 'm-s13'),
+    ]
+    assert linhas_compatibilidade('p1', 'm-ae86, m-s13') == [('p1', 'm-ae86'), ('p1', 'm-s13')]
+    assert listar_modelos_compativeis('{json quebrado') == []
+
+
+def test_indice_de_linhas_da_tabela():
+    indice = IndiceCompatibilidade([
+        ('motor-ae86', 'M-AE86'),
+        ('cambio-universal', UNIVERSAL),
+        ('susp', 'm-ae86'),
+        ('susp', 'm-s13'),
+    ])
+    assert len(indice) == 3
+    assert indice.compativel('motor-ae86', 'm-ae86')
+    assert not indice.compativel('motor-ae86', 'm-s13')
+    assert not indice.compativel('motor-ae86', None)
+    assert indice.compativel('cambio-universal', None)
+    assert not indice.compativel('desconhecida', 'm-ae86')
+    assert indice.pecas_compativeis('M-AE86') == {'motor-ae86', 'cambio-universal', 'susp'}
+    assert indice.pecas_compativeis('m-s13') == {'cambio-universal', 'susp'}
+    assert indice.pecas_compativeis(None) == {'cambio-universal'}
+    assert indice.modelos('susp') == ['m-ae86', 'm-s13']
+    assert indice.modelos('cambio-universal') == []
+
+
+def test_indice_de_pecas_igual_ao_da_tabela():
+    pecas = [('a', '{"compatibilidades": ["m1"]}'), ('b', None), ('c', 'm1, m2')]
+    linhas = [linha for peca_id, valor in pecas for linha in linhas_compatibilidade(peca_id, valor)]
+    direto = IndiceCompatibilidade.de_pecas(pecas)
+    da_tabela = IndiceCompatibilidade(linhas)
+    for modelo in ('m1', 'm2', 'm3', None):
+        assert direto.pecas_compativeis(modelo) == da_tabela.pecas_compativeis(modelo)
+    assert all(direto.conhece(peca_id) for peca_id in 'abc')
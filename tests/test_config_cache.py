@@ -0,0 +1,79 @@
+"""Testes do cache de configurações com carimbo de versão (sem banco)."""
+from src.config_cache import CacheConfiguracoes
+
+
+class BancoFalso:
+    def __init__(self):
+        self.versao = 1
+        self.valores = {'comissao_peca': '10', 'preco_instalacao_warehouse': '50'}
+        self.cargas = 0
+        self.leituras_versao = 0
+
+    def carregar(self):
+        self.cargas += 1
+        return self.versao, dict(self.valores)
+
+    def ler_versao(self):
+        self.leituras_versao += 1
+        return self.versao
+
+    def escrever(self, chave, valor):
+        self.valores[chave] = valor
+        self.versao += 1
+        return self.versao
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def _cache(banco, relogio, intervalo=5):
+    return CacheConfiguracoes(banco.carregar, banco.ler_versao, intervalo, relogio)
+
+
+def test_carga_unica_e_leituras_sem_banco():
+    banco, relogio = BancoFalso(), Relogio()
+    cache = _cache(banco, relogio)
+    for _ in range(100):
+        assert cache.obter('preco_instalacao_warehouse') == '50'
+    assert cache.obter('inexistente') is None
+    assert banco.cargas == 1
+    assert banco.leituras_versao == 0
+
+
+def test_escrita_local_nao_recarrega():
+    banco, relogio = BancoFalso(), Relogio()
+    cache = _cache(banco, relogio)
+    cache.obter('comissao_peca')
+    cache.registrar_escrita('comissao_peca', '15', banco.escrever('comissao_peca', '15'))
+    assert cache.obter('comissao_peca') == '15'
+    relogio.agora = 10
+    assert cache.obter('comissao_peca') == '15'
+    assert banco.cargas == 1
+
+
+def test_escrita_de_outro_worker_aparece_apos_intervalo():
+    banco, relogio = BancoFalso(), Relogio()
+    cache = _cache(banco, relogio)
+    cache.obter('comissao_peca')
+    banco.escrever('comissao_peca', '20')
+    relogio.agora = 1
+    assert cache.obter('comissao_peca') == '10'
+    relogio.agora = 6
+    assert cache.obter('comissao_peca') == '20'
+    assert banco.cargas == 2
+
+
+def test_versao_fora_de_sequencia_descarta_cache():
+    banco, relogio = BancoFalso(), Relogio()
+    cache = _cache(banco, relogio)
+    cache.obter('comissao_peca')
+    banco.escrever('comissao_carro', '30')  # outro worker
+    cache.registrar_escrita('comissao_peca', '12', banco.escrever('comissao_peca', '12'))
+    assert cache.obter('comissao_carro') == '30'
+    assert cache.obter('comissao_peca') == '12'
+    assert banco.cargas == 2
@@ -0,0 +1,114 @@
+"""Painel agregado da equipe (/api/equipes/<id>/dashboard) e seleção de seções."""
+import uuid
+
+import pytest
+
+from src.dashboard import SECOES, ler_secoes
+
+
+def test_ler_secoes():
+    assert ler_secoes(None) == SECOES
+    assert ler_secoes('') == SECOES
+    assert ler_secoes('garagem, saldo-pix,garagem') == ('garagem', 'saldo_pix')
+    with pytest.raises(ValueError):
+        ler_secoes('garagem,senha')
+
+
+@pytest.fixture
+def equipe_com_carros(client):
+    """Equipe nova; adicionar(n) cria n carros com 5 peças, uma peça no armazém e uma solicitação"""
+    from app import api
+    db = api.db
+    equipe = api.gerenciador.criar_equipe(f"Painel {uuid.uuid4().hex[:10]}", 500.0)
+
+    def adicionar(n):
+        conn = db._get_conn()
+        cursor = conn.cursor()
+        for _ in range(n):
+            carro_id = str(uuid.uuid4())
+            cursor.execute('SELECT COALESCE(MAX(numero_carro), 0) + 1 FROM carros')
+            numero = cursor.fetchone()[0]
+            cursor.execute(
+                'INSERT INTO carros (id, numero_carro, marca, modelo, equipe_id, status) VALUES (%s, %s, %s, %s, %s, %s)',
+                (carro_id, numero, 'Nissan', 'Silvia', equipe.id, 'repouso'))
+            for tipo in ('motor', 'cambio', 'suspensao', 'kit_angulo', 'diferencial'):
+                cursor.execute(
+                    'INSERT INTO pecas (id, carro_id, nome, tipo, durabilidade_maxima, durabilidade_atual, instalado, equipe_id) '
+                    'VALUES (%s, %s, %s, %s, 100, 80, 1, %s)',
+                    (str(uuid.uuid4()), carro_id, tipo.upper(), tipo, equipe.id))
+            cursor.execute(
+                'INSERT INTO pecas (id, nome, tipo, durabilidade_maxima, durabilidade_atual, instalado, equipe_id) '
+                'VALUES (%s, %s, %s, 100, 50, 0, %s)',
+                (str(uuid.uuid4()), 'MOTOR USADO', 'motor', equipe.id))
+            cursor.execute(
+                "INSERT INTO solicitacoes_pecas (id, equipe_id, carro_id, tipo_peca, status, data_solicitacao) "
+                "VALUES (%s, %s, %s, 'motor', 'pendente', CURRENT_TIMESTAMP)",
+                (str(uuid.uuid4()), equipe.id, carro_id))
+        conn.commit()
+        conn.close()
+
+    yield equipe, adicionar
+    conn = db._get_conn()
+    cursor = conn.cursor()
+    cursor.execute('DELETE FROM solicitacoes_pecas WHERE equipe_id = %s', (equipe.id,))
+    cursor.execute('DELETE FROM pecas WHERE equipe_id = %s', (equipe.id,))
+    cursor.execute('DELETE FROM carros WHERE equipe_id = %s', (equipe.id,))
+    conn.commit()
+    conn.close()
+    db.deletar_equipe(equipe.id)
+
+
+def _comandos_sql(resposta):
+    """Número de comandos SQL da requisição (header Server-Timing)"""
+    for valor in resposta.headers.getlist('Server-Timing'):
+        if valor.startswith('db;'):
+            return int(valor.split('desc="')[1].split(' sql')[0])
+    pytest.skip('Métricas de banco desabilitadas')
+
+
+def test_painel_igual_as_rotas_avulsas(client, equipe_com_carros):
+    equipe, adicionar = equipe_com_carros
+    adicionar(2)
+    headers = {'X-Equipe-ID': equipe.id}
+    r = client.get(f'/api/equipes/{equipe.id}/dashboard', headers=headers)
+    assert r.status_code == 200
+    painel = r.get_json()
+    assert list(painel) == list(SECOES)
+
+    garagem = client.get(f'/api/garagem/{equipe.id}', headers=headers).get_json()
+    por_id = lambda carros: sorted(carros, key=lambda c: c['id'])
+    assert por_id(painel['garagem']['carros']) == por_id(garagem['carros'])
+    assert len(painel['garagem']['solicitacoes_pecas_pendentes']) == 2
+    assert painel['armazem'] == client.get(f'/api/armazem/{equipe.id}', headers=headers).get_json()
+    assert painel['armazem']['total'] == 2
+    assert painel['equipe'] == client.get(f'/api/equipes/{equipe.id}', headers=headers).get_json()
+    assert painel['saldo_pix'] == client.get(f'/api/equipes/{equipe.id}/saldo-pix', headers=headers).get_json()
+    assert painel['aguardando_pecas'] == client.get('/api/aguardando-pecas', headers=headers).get_json()
+    assert painel['etapas'] == client.get(f'/api/equipes/{equipe.id}/etapas').get_json()['etapas']
+    assert painel['historico'] == client.get('/api/historico/compras', headers=headers).get_json()
+
+
+def test_painel_consultas_nao_crescem_com_carros(client, equipe_com_carros):
+    equipe, adicionar = equipe_com_carros
+    url = f'/api/equipes/{equipe.id}/dashboard'
+    headers = {'X-Equipe-ID': equipe.id}
+    adicionar(1)
+    client.get(url, headers=headers)  # índice de compatibilidade carregado
+    poucos = _comandos_sql(client.get(url, headers=headers))
+    adicionar(4)
+    muitos = _comandos_sql(client.get(url, headers=headers))
+    assert muitos == poucos
+
+
+def test_painel_fields_e_acesso(client, equipe_com_carros):
+    equipe, _ = equipe_com_carros
+    url = f'/api/equipes/{equipe.id}/dashboard'
+    headers = {'X-Equipe-ID': equipe.id}
+
+    r = client.get(f'{url}?fields=saldo-pix,carro_ativo', headers=headers)
+    assert r.status_code == 200
+    assert set(r.get_json()) == {'saldo_pix', 'carro_ativo'}
+    assert r.get_json()['carro_ativo'] is None
+    assert client.get(f'{url}?fields=senha', headers=headers).status_code == 400
+    assert client.get(url).status_code == 401
+    assert client.get(url, headers={'X-Equipe-ID': str(uuid.uuid4())}).status_code == 403
@@ -26,3 +26,25 @@ class TestDatabaseManagerConnection:
         from src.database import DatabaseManager
         with pytest.raises(ValueError, match="inválida"):
             DatabaseManager("invalid://x/y")
+
+
+class TestProjecoesEquipe:
+    """Projeções de uma linha devem bater com o grafo completo (exigem banco)."""
+
+    def test_projecoes_batem_com_carregar_equipe(self, client):
+        import uuid
+        from app import api
+        nome = f"Projecao {uuid.uuid4().hex[:8]}"
+        equipe = api.gerenciador.criar_equipe(nome, 321.0, senha="s3nha", serie="B")
+        try:
+            completa = api.db.carregar_equipe(equipe.id)
+            assert api.db.obter_saldo_equipe(equipe.id) == completa.doricoins == 321.0
+            assert api.db.obter_nome_equipe(equipe.id) == nome
+            assert api.db.obter_serie_equipe(equipe.id) == "B"
+            assert api.db.obter_credenciais_equipe(equipe.id)["senha"] == completa.senha
+            assert api.db.obter_carro_ativo_resumo(equipe.id) is None  # garagem vazia
+            assert api.db.equipe_nome_existe(nome)
+            assert api.gerenciador.criar_equipe(nome).id == equipe.id
+            assert api.db.obter_resumo_equipe("nao-existe") is None
+        finally:
+            api.db.deletar_equipe(equipe.id)
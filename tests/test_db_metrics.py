@@ -0,0 +1,81 @@
+"""Testes da instrumentação de consultas (não precisam de banco)."""
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from src import db_metrics
+from src.db_metrics import (
+    normalizar_sql, CursorInstrumentado, MetricasAgregadas, configurar_metricas,
+)
+
+
+class _CursorFalso:
+    def __init__(self, linhas):
+        self._linhas = linhas
+        self.rowcount = len(linhas)
+
+    def execute(self, query, args=None):
+        return len(self._linhas)
+
+    def fetchall(self):
+        return list(self._linhas)
+
+    def fetchone(self):
+        return self._linhas[0] if self._linhas else None
+
+
+def test_normalizar_sql():
+    sql = "SELECT *  FROM equipes\n WHERE id = %s AND nome = 'abc' AND x IN (%s, %s, %s) LIMIT 10"
+    assert normalizar_sql(sql) == "SELECT * FROM equipes WHERE id = ? AND nome = ? AND x IN (?+) LIMIT ?"
+
+
+def test_metricas_por_requisicao_e_server_timing():
+    app = flask.Flask(__name__)
+    configurar_metricas(app)
+
+    @app.route('/rota')
+    def rota():
+        db_metrics.registrar_conexao()
+        cursor = CursorInstrumentado(_CursorFalso([(1,), (2,), (3,)]))
+        cursor.execute("SELECT id FROM equipes WHERE serie = %s", ('A',))
+        cursor.fetchall()
+        m = db_metrics.metricas_atuais()
+        return flask.jsonify(m.para_dict())
+
+    r = app.test_client().get('/rota')
+    dados = r.get_json()
+    assert dados['conexoes'] == 1
+    assert dados['comandos'] == 1
+    assert dados['linhas'] == 3
+    assert dados['mais_lentos'][0]['sql'] == "SELECT id FROM equipes WHERE serie = ?"
+    assert any(h.startswith('db;dur=') for h in r.headers.getlist('Server-Timing'))
+
+
+def test_prometheus_texto():
+    agregado = MetricasAgregadas()
+    m = db_metrics.MetricasRequisicao()
+    m.conexoes, m.comandos, m.linhas, m.tempo_db = 2, 5, 40, 0.25
+    agregado.registrar_requisicao('get_garagem', m, 0.5)
+    agregado.registrar_sql('SELECT ? FROM "x"', 0.1, lenta=True)
+    texto = agregado.prometheus()
+    assert 'granpix_db_statements_total{endpoint="get_garagem"} 5' in texto
+    assert 'granpix_http_requests_total{endpoint="get_garagem"} 1' in texto
+    assert 'granpix_db_slow_statements_total 1' in texto
+    assert 'sql="SELECT ? FROM \\"x\\""' in texto
+
+
+def test_requisicao_lenta_loga_comandos_mais_lentos(monkeypatch, caplog):
+    monkeypatch.setattr(db_metrics, 'SLOW_REQUEST_MS', 0.001)
+    app = flask.Flask(__name__)
+    configurar_metricas(app)
+
+    @app.route('/lenta')
+    def lenta():
+        CursorInstrumentado(_CursorFalso([(1,)])).execute("SELECT * FROM batalhas WHERE etapa_id = %s", ('x',))
+        return 'ok'
+
+    with caplog.at_level('WARNING', logger='granpix.db.slow'):
+        app.test_client().get('/lenta')
+    registro = next(r for r in caplog.records if r.getMessage().startswith('Requisição lenta'))
+    assert 'GET /lenta' in registro.getMessage()
+    assert "SELECT * FROM batalhas WHERE etapa_id = ?" in registro.getMessage()
@@ -0,0 +1,112 @@
+"""Testes da sessão de banco por requisição e de transacao() (sem banco real)."""
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from src.db_sessao import SessaoDB
+
+
+class _CursorFalso:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, args=None):
+        if 'ERRO' in query:
+            raise RuntimeError('falha sql')
+        self.conn.comandos.append(query)
+        return 1
+
+
+class _ConexaoFalsa:
+    def __init__(self):
+        self.comandos = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.fechada = False
+
+    def cursor(self, dictionary=False, **kw):
+        return _CursorFalso(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.fechada = True
+
+
+@pytest.fixture
+def sessao():
+    abertas = []
+
+    def abrir():
+        conn = _ConexaoFalsa()
+        abertas.append(conn)
+        return conn
+
+    s = SessaoDB(abrir, 'teste')
+    s.abertas = abertas
+    return s
+
+
+def test_requisicao_reutiliza_conexao(sessao):
+    app = flask.Flask(__name__)
+    with app.app_context():
+        a = sessao.obter()
+        b = sessao.obter()
+        assert a is b
+        a.close()  # no-op
+        assert not sessao.abertas[0].fechada
+        sessao.liberar()
+    assert len(sessao.abertas) == 1
+    assert sessao.abertas[0].fechada
+
+
+def test_fora_de_requisicao_nao_compartilha(sessao):
+    assert sessao.obter() is None
+
+
+def test_transacao_adia_commit(sessao):
+    app = flask.Flask(__name__)
+    with app.app_context():
+        with sessao.transacao():
+            conn = sessao.obter()
+            conn.cursor().execute('UPDATE a')
+            conn.commit()
+            assert sessao.abertas[0].commits == 0
+        assert sessao.abertas[0].commits == 1
+
+
+def test_transacao_rollback_em_excecao_e_abortar(sessao):
+    app = flask.Flask(__name__)
+    with app.app_context():
+        with pytest.raises(ValueError):
+            with sessao.transacao():
+                sessao.obter().cursor().execute('UPDATE a')
+                raise ValueError()
+        commits = sessao.abertas[0].commits
+        with sessao.transacao() as tx:
+            tx.abortar()
+        assert sessao.abertas[0].commits == commits
+
+
+def test_transacao_condenada_por_falha_sql(sessao):
+    app = flask.Flask(__name__)
+    with app.app_context():
+        with sessao.transacao() as tx:
+            conn = sessao.obter()
+            with pytest.raises(RuntimeError):
+                conn.cursor().execute('ERRO')
+            conn.commit()
+        assert tx.abortada
+        assert sessao.abertas[0].commits == 0
+
+
+def test_transacao_fora_de_requisicao_usa_conexao_temporaria(sessao):
+    with sessao.transacao():
+        assert sessao.obter() is not None
+    assert sessao.abertas[0].commits == 1
+    assert sessao.abertas[0].fechada
+    assert sessao.obter() is None
@@ -0,0 +1,106 @@
+"""Testes do backend SQLite (tradução do dialeto MariaDB e conexão por thread)."""
+from datetime import date, timedelta
+
+from src.dialeto import BancoSQLite, copiar_tabela, traduzir
+
+
+def test_create_table_separa_indices_e_opcoes():
+    comandos = traduzir('''
+        CREATE TABLE IF NOT EXISTS volta (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            id_equipe VARCHAR(64) NOT NULL COMMENT 'equipe, dona da volta',
+            data_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            UNIQUE KEY unique_equipe (id_equipe),
+            INDEX idx_equipe (id_equipe)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    ''', False)
+
+    tabela, unico, indice, gatilho = comandos
+    assert 'INTEGER PRIMARY KEY AUTOINCREMENT' in tabela
+    assert 'ENGINE' not in tabela and 'COMMENT' not in tabela and 'INDEX' not in tabela
+    assert 'id_equipe VARCHAR(64) COLLATE NOCASE NOT NULL' in tabela
+    assert unico == 'CREATE UNIQUE INDEX IF NOT EXISTS volta__unique_equipe ON volta (id_equipe)'
+    assert indice == 'CREATE INDEX IF NOT EXISTS volta__idx_equipe ON volta (id_equipe)'
+    assert gatilho.startswith('CREATE TRIGGER IF NOT EXISTS volta__data_atualizacao_ao_atualizar')
+
+
+def test_copiar_tabela_sem_foreign_keys():
+    esquema = [
+        ('table', "CREATE TABLE volta (\n    id VARCHAR(64) COLLATE NOCASE PRIMARY KEY,\n"
+                  "    id_equipe VARCHAR(64) NOT NULL,\n    obs TEXT DEFAULT 'a, b',\n"
+                  "    FOREIGN KEY (id_equipe) REFERENCES equipes(id)\n)"),
+        ('index', None),
+        ('index', 'CREATE INDEX volta__idx_equipe ON volta (id_equipe)'),
+    ]
+    tabela, indice = copiar_tabela(esquema, 'volta', 'volta_historico')
+    assert tabela.startswith('CREATE TABLE IF NOT EXISTS volta_historico (')
+    assert "obs TEXT DEFAULT 'a, b'" in tabela and 'FOREIGN KEY' not in tabela
+    assert indice == 'CREATE INDEX IF NOT EXISTS volta_historico__idx_equipe ON volta_historico (id_equipe)'
+
+
+def test_dml_placeholders_upsert_e_intervalo():
+    (upsert,) = traduzir('INSERT INTO t (id, n) VALUES (%s, %s) ON DUPLICATE KEY UPDATE n = n + VALUES(n)')
+    assert upsert == 'INSERT INTO t (id, n) VALUES (?, ?)  ON CONFLICT DO UPDATE SET  n = n + excluded.n'
+
+    (selecao,) = traduzir('INSERT INTO t (id) SELECT id FROM (SELECT id FROM u) r ON DUPLICATE KEY UPDATE id = id')
+    assert 'FROM (SELECT id FROM u) r WHERE true' in selecao
+
+    (intervalo,) = traduzir("SELECT 1 FROM jobs WHERE batimento < NOW() - INTERVAL %s SECOND AND nome LIKE 'a%%'")
+    assert "batimento < datetime(NOW(), '-' || (?) || ' seconds')" in intervalo
+    assert "LIKE 'a%'" in intervalo
+    assert traduzir('SELECT id FROM t WHERE id = %s FOR UPDATE') == ('SELECT id FROM t WHERE id = ?',)
+    assert traduzir('ALTER TABLE t MODIFY COLUMN c INT NULL', False) == ()
+
+
+def test_conexao_sqlite_no_formato_do_pymysql(tmp_path):
+    banco = BancoSQLite(str(tmp_path / 'g.db'))
+    conn = banco.abrir()
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE etapas (
+            id VARCHAR(64) PRIMARY KEY, nome VARCHAR(64), data_etapa DATE, hora_etapa TIME, vitorias INT DEFAULT 0
+        ) ENGINE=InnoDB
+    ''')
+    for _ in range(2):
+        cursor.execute('INSERT INTO etapas (id, nome, data_etapa, hora_etapa, vitorias) VALUES (%s, %s, %s, %s, 1) '
+                       'ON DUPLICATE KEY UPDATE vitorias = vitorias + VALUES(vitorias)',
+                       ('e1', 'Etapa', date(2026, 3, 1), '10:30'))
+    conn.commit()
+
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute('SELECT * FROM etapas WHERE nome = %s', ('ETAPA',))
+    assert cursor.fetchone() == {'id': 'e1', 'nome': 'Etapa', 'data_etapa': date(2026, 3, 1),
+                                 'hora_etapa': timedelta(hours=10, minutes=30), 'vitorias': 2}
+    conn.close()
+
+
+def test_funcoes_do_mariadb_usadas_nas_listagens(tmp_path):
+    conn = BancoSQLite(str(tmp_path / 'g.db')).abrir()
+    cursor = conn.cursor()
+    cursor.execute("SELECT CONCAT(%s, ' ', %s), CONCAT('a', NULL), CONCAT('n', 2.0, 'x', 1.5)", ('Toyota', 'AE86'))
+    assert cursor.fetchone() == ('Toyota AE86', None, 'n2x1.5')
+    cursor.execute("SELECT TIMESTAMP('2026-03-01', '10:30:00'), TIMESTAMP('2026-03-01'), "
+                   "TIMESTAMP('2026-03-01', NULL), TIMESTAMP('lixo', '10:30')")
+    assert cursor.fetchone() == ('2026-03-01 10:30:00', '2026-03-01 00:00:00', None, None)
+    conn.close()
+
+
+def test_close_sem_commit_desfaz_so_na_ultima_conexao_da_thread(tmp_path):
+    banco = BancoSQLite(str(tmp_path / 'g.db'))
+    conn = banco.abrir()
+    conn.cursor().execute('CREATE TABLE t (id INT)')
+    externa = banco.abrir()
+    externa.cursor().execute('INSERT INTO t (id) VALUES (%s)', (1,))
+
+    interna = banco.abrir()
+    interna.close()
+    externa.close()
+    cursor = conn.cursor()
+    cursor.execute('SELECT COUNT(*) FROM t')
+    assert cursor.fetchone() == (1,)
+
+    conn.close()
+    conn = banco.abrir()
+    cursor = conn.cursor()
+    cursor.execute('SELECT COUNT(*) FROM t')
+    assert cursor.fetchone() == (0,)
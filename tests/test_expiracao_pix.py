@@ -0,0 +1,141 @@
+"""Varredura de transações PIX pendentes abandonadas (job 'expirar_pix')."""
+import uuid
+
+import pytest
+
+from src.expiracao_pix import (
+    CONFIRMAR, EXPIRADO, ClienteStatusLocal, ClienteStatusMercadoPago, criar_cliente_status, decidir,
+    varrer_pendentes,
+)
+
+
+def test_decidir_e_criar_cliente_status():
+    assert decidir('approved') == CONFIRMAR
+    assert decidir('rejected') == 'recusado'
+    assert decidir('refunded') == 'cancelado'
+    assert decidir('pending') == EXPIRADO
+    assert decidir('not_found') == EXPIRADO
+    assert decidir(None) is None
+
+    assert isinstance(criar_cliente_status('mercado_pago'), ClienteStatusMercadoPago)
+    assert isinstance(criar_cliente_status('local'), ClienteStatusLocal)
+    with pytest.raises(ValueError):
+        criar_cliente_status('stripe')
+
+
+@pytest.fixture
+def equipe_com_pendentes(client):
+    """Equipe com PIX pendentes vencidos (um por resposta do stub) e um recente; devolve (equipe, ids)"""
+    from app import api
+    db = api.db
+    equipe = api.gerenciador.criar_equipe(f"Pix {uuid.uuid4().hex[:10]}", 500.0)
+    sufixo = uuid.uuid4().hex[:8]
+    transacoes = {
+        'aprovada': (f'mp-ok-{sufixo}', 120),
+        'recusada': (f'mp-rej-{sufixo}', 120),
+        'sem_resposta': (f'mp-off-{sufixo}', 120),
+        'abandonada': (f'mp-pend-{sufixo}', 120),
+        'sem_qr': (None, 120),
+        'recente': (f'mp-novo-{sufixo}', 0),
+    }
+    ids = {nome: str(uuid.uuid4()) for nome in transacoes}
+    conn = db._get_conn()
+    cursor = conn.cursor()
+    for nome, (mercado_pago_id, minutos) in transacoes.items():
+        cursor.execute(
+            "INSERT INTO transacoes_pix (id, mercado_pago_id, equipe_id, equipe_nome, tipo_item, item_nome, "
+            "valor_item, valor_total, status, data_criacao) "
+            "VALUES (%s, %s, %s, %s, 'peca', 'Motor', 10, 10, 'pendente', NOW() - INTERVAL %s MINUTE)",
+            (ids[nome], mercado_pago_id, equipe.id, equipe.nome, minutos))
+    conn.commit()
+    conn.close()
+    cliente = ClienteStatusLocal({
+        transacoes['aprovada'][0]: 'approved',
+        transacoes['recusada'][0]: 'rejected',
+        transacoes['sem_resposta'][0]: None,
+    })
+
+    yield equipe, ids, cliente
+    conn = db._get_conn()
+    cursor = conn.cursor()
+    cursor.execute('DELETE FROM transacoes_pix WHERE equipe_id = %s', (equipe.id,))
+    conn.commit()
+    conn.close()
+    db.deletar_equipe(equipe.id)
+
+
+def _status(db, equipe_id):
+    conn = db._get_conn()
+    cursor = conn.cursor()
+    cursor.execute('SELECT id, status FROM transacoes_pix WHERE equipe_id = %s', (equipe_id,))
+    status = {row[0]: row[1] for row in cursor.fetchall()}
+    conn.close()
+    return status
+
+
+def test_varredura_reconcilia_em_lotes(client, equipe_com_pendentes):
+    from app import api
+    db = api.db
+    equipe, ids, cliente = equipe_com_pendentes
+
+    contagens = varrer_pendentes(db, cliente, ttl_minutos=60, lote=2)
+    assert contagens[CONFIRMAR] >= 1 and contagens['recusado'] >= 1 and contagens[EXPIRADO] >= 2
+
+    status = _status(db, equipe.id)
+    assert status[ids['aprovada']] == 'aprovado'
+    assert status[ids['recusada']] == 'recusado'
+    assert status[ids['sem_resposta']] == 'pendente'
+    assert status[ids['abandonada']] == EXPIRADO
+    assert status[ids['sem_qr']] == EXPIRADO
+    assert status[ids['recente']] == 'pendente'
+
+    # Só a sem resposta continua na fila; uma expirada não volta a ser encerrada
+    assert [t['id'] for t in db.listar_pix_pendentes_vencidos(60, 100) if t['id'] in ids.values()] == \
+        [ids['sem_resposta']]
+    assert db.encerrar_transacoes_pix([ids['abandonada']], 'cancelado') == 0
+
+
+def test_rota_enfileira_job_e_valida_parametros(client_admin):
+    r = client_admin.post('/api/admin/pix/expirar-pendentes', json={'ttl_minutos': 0})
+    assert r.status_code == 400
+    r = client_admin.post('/api/admin/pix/expirar-pendentes', json={'lote': 'muitos'})
+    assert r.status_code == 400
+    r = client_admin.post('/api/admin/pix/expirar-pendentes', json={'ttl_minutos': 1440, 'lote': 10})
+    assert r.status_code == 202
+    assert client_admin.get(r.get_json()['acompanhar']).status_code == 200
+
+
+def test_confirmacao_repetida_aplica_o_pagamento_uma_vez(client):
+    """Webhook e varredura confirmando a mesma transação: uma só solicitação de ativação"""
+    from app import api
+    db = api.db
+    equipe = api.gerenciador.criar_equipe(f"Pix {uuid.uuid4().hex[:10]}", 500.0)
+    transacao_id, mercado_pago_id = str(uuid.uuid4()), f'mp-dup-{uuid.uuid4().hex[:8]}'
+    conn = db._get_conn()
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO transacoes_pix (id, mercado_pago_id, equipe_id, equipe_nome, tipo_item, item_id, item_nome, "
+        "valor_item, valor_total, status) VALUES (%s, %s, %s, %s, 'carro_ativacao', %s, 'Ativação', 10, 10, 'pendente')",
+        (transacao_id, mercado_pago_id, equipe.id, equipe.nome, equipe.carro.id if equipe.carro else None))
+    conn.commit()
+    conn.close()
+    try:
+        primeira = db.confirmar_transacao_pix(mercado_pago_id)
+        segunda = db.confirmar_transacao_pix(mercado_pago_id)
+        assert primeira['sucesso'] is True
+        assert segunda['sucesso'] is False and segunda['ja_confirmada']
+
+        conn = db._get_conn()
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM solicitacoes_carros WHERE equipe_id = %s', (equipe.id,))
+        assert cursor.fetchone()[0] == 1
+        conn.close()
+        assert _status(db, equipe.id)[transacao_id] == 'aprovado'
+    finally:
+        conn = db._get_conn()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM solicitacoes_carros WHERE equipe_id = %s', (equipe.id,))
+        cursor.execute('DELETE FROM transacoes_pix WHERE equipe_id = %s', (equipe.id,))
+        conn.commit()
+        conn.close()
+        db.deletar_equipe(equipe.id)
@@ -0,0 +1,133 @@
+"""Finalização de etapa: placar -> pontos do campeonato (job 'finalizar_etapa')."""
+import time
+import uuid
+
+import pytest
+
+from src.models import Piloto
+from src.placar import pontos_por_colocacao
+
+
+@pytest.fixture
+def etapa(client):
+    """Campeonato com uma etapa de hoje; devolve (campeonato_id, etapa_id)"""
+    from app import api
+    db = api.db
+    campeonato_id, etapa_id = str(uuid.uuid4()), str(uuid.uuid4())
+    assert db.criar_campeonato(campeonato_id, f'Final {uuid.uuid4().hex[:8]}', '', 'A', 1)
+    assert db.cadastrar_etapa(etapa_id, campeonato_id, 1, 'Etapa final', '', '2026-01-10', '20:00:00', 'A')
+    yield campeonato_id, etapa_id
+    db.deletar_campeonato(campeonato_id)
+
+
+def _progresso(*args):
+    pass
+
+
+def test_pontos_ja_atribuidos_terminam_sem_nova_tentativa(etapa):
+    from app import _job_finalizar_etapa, api
+    campeonato_id, etapa_id = etapa
+    conn = api.db._get_conn()
+    cursor = conn.cursor()
+    cursor.execute('UPDATE etapas SET pontos_atribuidos = TRUE WHERE id = %s', (etapa_id,))
+    conn.commit()
+    conn.close()
+
+    # Falha de regra: resultado com sucesso=False (o executor não repete)
+    resultado = _job_finalizar_etapa({'etapa_id': etapa_id}, _progresso)
+    assert resultado['sucesso'] is False and 'já atribuídos' in resultado['erro']
+    assert 'retentavel' not in resultado
+
+
+def test_falha_do_banco_levanta_para_nova_tentativa(etapa, monkeypatch):
+    from app import _job_finalizar_etapa, api
+    campeonato_id, etapa_id = etapa
+    monkeypatch.setattr(api.db, 'atribuir_pontos_etapa', lambda *args: {
+        'sucesso': False, 'erro': 'Lost connection to MySQL server', 'retentavel': True})
+    with pytest.raises(RuntimeError):
+        _job_finalizar_etapa({'etapa_id': etapa_id}, _progresso)
+
+
+@pytest.fixture
+def etapa_com_equipes(etapa):
+    """Etapa com duas equipes inscritas (uma com piloto alocado, outra só com piloto da equipe)"""
+    from app import api
+    db = api.db
+    campeonato_id, etapa_id = etapa
+    equipes = [api.gerenciador.criar_equipe(f'Final {uuid.uuid4().hex[:8]}', 0.0) for _ in range(2)]
+    pilotos = [Piloto(str(uuid.uuid4()), f'Piloto {equipe.nome}', equipe.id) for equipe in equipes]
+    for piloto in pilotos:
+        assert db.salvar_piloto(piloto)
+    conn = db._get_conn()
+    cursor = conn.cursor()
+    for equipe, piloto_id in ((equipes[0], pilotos[0].id), (equipes[1], None)):
+        cursor.execute('INSERT INTO participacoes_etapas (id, etapa_id, equipe_id, piloto_id) VALUES (%s, %s, %s, %s)',
+                       (str(uuid.uuid4()), etapa_id, equipe.id, piloto_id))
+    conn.commit()
+    conn.close()
+
+    yield campeonato_id, etapa_id, [e.id for e in equipes]
+    conn = db._get_conn()
+    cursor = conn.cursor()
+    for tabela in ('batalhas', 'vitorias_etapa', 'participacoes_etapas'):
+        cursor.execute(f'DELETE FROM {tabela} WHERE etapa_id = %s', (etapa_id,))
+    cursor.execute('DELETE FROM pontuacoes_campeonato WHERE campeonato_id = %s', (campeonato_id,))
+    conn.commit()
+    conn.close()
+    for equipe in equipes:
+        db.deletar_equipe(equipe.id)
+
+
+def _finalizar(client_admin, etapa_id):
+    r = client_admin.post(f'/api/admin/etapas/{etapa_id}/finalizar')
+    assert r.status_code == 202
+    for _ in range(100):
+        job = client_admin.get(r.get_json()['acompanhar']).get_json()
+        if job['status'] in ('concluido', 'falhou'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError('job finalizar_etapa não terminou')
+
+
+def _pontos_atribuidos(etapa_id):
+    from app import api
+    conn = api.db._get_conn()
+    cursor = conn.cursor()
+    cursor.execute('SELECT pontos_atribuidos FROM etapas WHERE id = %s', (etapa_id,))
+    valor = cursor.fetchone()[0]
+    conn.close()
+    return bool(valor)
+
+
+def test_batalhas_reportadas_viram_pontos_ao_finalizar(client_admin, etapa_com_equipes):
+    from app import api
+    campeonato_id, etapa_id, (a, b) = etapa_com_equipes
+    url = f'/api/admin/etapas/{etapa_id}/batalhas'
+
+    assert client_admin.post(url, json={'vencedora_id': a, 'perdedora_id': b, 'partida_id': 'm1'}).status_code == 201
+    assert client_admin.post(url, json={'vencedora_id': b, 'perdedora_id': a, 'partida_id': 'm2'}).status_code == 201
+    # Reporte corrigido da mesma partida substitui o anterior, sem contar duas vezes
+    assert client_admin.post(url, json={'vencedora_id': a, 'perdedora_id': b, 'partida_id': 'm2'}).status_code == 201
+    assert client_admin.post(url, json={'vencedora_id': a, 'perdedora_id': str(uuid.uuid4())}).status_code == 400
+    assert [(c[0], c[2]) for c in api.db.calcular_colocacoes_etapa(etapa_id)['colocacoes']] == [(a, 2), (b, 0)]
+
+    job = _finalizar(client_admin, etapa_id)
+    assert job['status'] == 'concluido' and job['resultado']['sucesso'] is True
+    pontos = {p['equipe_id']: p['pontos'] for p in api.db.obter_pontuacoes_campeonato(campeonato_id)}
+    assert pontos[a] == pontos_por_colocacao(1) and pontos[b] == pontos_por_colocacao(2)
+
+    # Etapa finalizada não aceita novos resultados
+    assert client_admin.post(url, json={'vencedora_id': b, 'perdedora_id': a}).status_code == 400
+
+
+def test_etapa_sem_batalhas_nao_trava_a_pontuacao(client_admin, etapa_com_equipes):
+    campeonato_id, etapa_id, (a, b) = etapa_com_equipes
+    job = _finalizar(client_admin, etapa_id)
+    assert job['status'] == 'concluido' and job['resultado']['sucesso'] is False
+    assert 'sem batalhas' in job['resultado']['erro']
+    assert not _pontos_atribuidos(etapa_id)
+
+    # Depois de registrar as batalhas a etapa ainda pode ser pontuada
+    client_admin.post(f'/api/admin/etapas/{etapa_id}/batalhas', json={'vencedora_id': b, 'perdedora_id': a})
+    assert _finalizar(client_admin, etapa_id)['resultado']['sucesso'] is True
+    assert _pontos_atribuidos(etapa_id)
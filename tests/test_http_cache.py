@@ -0,0 +1,95 @@
+"""Testes da política de cache HTTP (não precisam de banco)."""
+import gzip
+from datetime import datetime
+
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from src.http_cache import (
+    configurar_cache_http, definir_ultima_modificacao, politica_cache, CONDICIONAL, SEM_ARMAZENAMENTO,
+    _escolher_codificacao,
+)
+
+
+@pytest.fixture
+def app_cache(tmp_path):
+    (tmp_path / 'script.js').write_text('console.log(1);')
+    app = flask.Flask(__name__, static_folder=str(tmp_path))
+    configurar_cache_http(app)
+
+    @app.route('/catalogo')
+    @politica_cache(CONDICIONAL)
+    def catalogo():
+        return flask.jsonify([{'id': i, 'nome': f'Peça {i}'} for i in range(200)])
+
+    @app.route('/saldo')
+    @politica_cache(SEM_ARMAZENAMENTO)
+    def saldo():
+        return flask.jsonify({'saldo': 10})
+
+    @app.route('/padrao')
+    def padrao():
+        return flask.jsonify({'ok': True})
+
+    @app.route('/etapas')
+    @politica_cache(CONDICIONAL)
+    def etapas():
+        definir_ultima_modificacao(datetime(2024, 3, 1, 12, 0, 0))
+        return flask.jsonify([])
+
+    @app.route('/pagina')
+    def pagina():
+        # Um v= fixo no template é substituído pelo hash do conteúdo
+        return flask.url_for('static', filename='script.js', v=1708537200)
+
+    return app.test_client()
+
+
+class TestPoliticaCache:
+
+    def test_condicional_responde_304_com_etag(self, app_cache):
+        r = app_cache.get('/catalogo')
+        assert r.status_code == 200
+        etag = r.headers['ETag']
+        assert r.headers['Cache-Control'] == 'no-cache'
+        r2 = app_cache.get('/catalogo', headers={'If-None-Match': etag})
+        assert r2.status_code == 304
+        assert r2.data == b''
+
+    def test_condicional_com_last_modified(self, app_cache):
+        r = app_cache.get('/etapas')
+        assert r.headers['Last-Modified'] == 'Fri, 01 Mar 2024 12:00:00 GMT'
+        r2 = app_cache.get('/etapas', headers={'If-Modified-Since': r.headers['Last-Modified']})
+        assert r2.status_code == 304
+
+    def test_static_imutavel_so_com_hash_atual(self, app_cache):
+        url = app_cache.get('/pagina').get_data(as_text=True)
+        assert 'v=1708537200' not in url
+        assert 'immutable' in app_cache.get(url).headers['Cache-Control']
+        assert app_cache.get('/static/script.js?v=1708537200').headers['Cache-Control'] == 'no-cache'
+
+    def test_saldo_sem_armazenamento(self, app_cache):
+        r = app_cache.get('/saldo')
+        assert 'no-store' in r.headers['Cache-Control']
+        assert 'ETag' not in r.headers
+
+    def test_padrao_revalida(self, app_cache):
+        r = app_cache.get('/padrao')
+        assert r.headers['Cache-Control'] == 'no-cache'
+
+    def test_gzip_acima_do_limite(self, app_cache):
+        r = app_cache.get('/catalogo', headers={'Accept-Encoding': 'gzip'})
+        assert r.headers.get('Content-Encoding') == 'gzip'
+        assert b'"nome"' in gzip.decompress(r.data)
+        assert 'Accept-Encoding' in r.headers.get('Vary', '')
+
+    def test_resposta_pequena_nao_comprime(self, app_cache):
+        r = app_cache.get('/padrao', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in r.headers
+
+
+def test_escolher_codificacao():
+    assert _escolher_codificacao('gzip, deflate') == 'gzip'
+    assert _escolher_codificacao('gzip;q=0, deflate') is None
+    assert _escolher_codificacao('') is None
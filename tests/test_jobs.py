@@ -0,0 +1,172 @@
+"""Testes do executor de jobs do admin (repositório em memória, sem banco)."""
+import threading
+import time
+
+import pytest
+
+from src.jobs import ExecutorJobs, PENDENTE, EXECUTANDO, CONCLUIDO, FALHOU
+
+
+class RepositorioFalso:
+    """Mesmas transições do DatabaseManager (seção JOBS), em memória"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def criar_job(self, job_id, tipo, parametros, max_tentativas=1, criado_por=None):
+        self.jobs[job_id] = {'id': job_id, 'tipo': tipo, 'parametros': parametros, 'status': PENDENTE,
+                             'tentativas': 0, 'max_tentativas': max_tentativas, 'progresso': [],
+                             'resultado': None, 'erro': None, 'parado': False}
+        return True
+
+    def reservar_job(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job['status'] != PENDENTE:
+                return None
+            job['status'] = EXECUTANDO
+            job['tentativas'] += 1
+            return dict(job)
+
+    def atualizar_progresso_job(self, job_id, atual, total=None, mensagem=None):
+        self.jobs[job_id]['progresso'].append((atual, total, mensagem))
+
+    def finalizar_job(self, job_id, status, resultado=None, erro=None):
+        self.jobs[job_id].update(status=status, resultado=resultado, erro=erro)
+
+    def devolver_job(self, job_id, erro):
+        self.jobs[job_id].update(status=PENDENTE, erro=erro)
+
+    def registrar_batimento_jobs(self, job_ids):
+        pass
+
+    def recuperar_jobs_orfaos(self, tolerancia_segundos):
+        # 'parado' simula batimento antigo (processo que caiu)
+        for job in self.jobs.values():
+            if job['status'] == EXECUTANDO and job['parado']:
+                job['status'] = FALHOU if job['tentativas'] >= job['max_tentativas'] else PENDENTE
+        return [j['id'] for j in self.jobs.values() if j['status'] == PENDENTE]
+
+
+def _aguardar(repo, job_id, timeout=5.0):
+    limite = time.monotonic() + timeout
+    while repo.jobs[job_id]['status'] not in (CONCLUIDO, FALHOU):
+        assert time.monotonic() < limite, repo.jobs[job_id]
+        time.sleep(0.01)
+    return repo.jobs[job_id]
+
+
+def _executor(repo):
+    return ExecutorJobs(repo, max_workers=2, espera_retentativa=0)
+
+
+def test_enfileira_executa_e_registra_progresso_e_resultado():
+    repo = RepositorioFalso()
+    executor = _executor(repo)
+
+    def handler(parametros, progresso):
+        for i in range(1, 4):
+            progresso(i, 3, f'item {i}')
+        return {'total': parametros['n'] * 2}
+
+    executor.registrar('dobrar', handler)
+    job = _aguardar(repo, executor.enfileirar('dobrar', {'n': 21}))
+    executor.parar(aguardar=True)
+
+    assert job['status'] == CONCLUIDO
+    assert job['resultado'] == {'total': 42}
+    assert job['progresso'][-1] == (3, 3, 'item 3')
+    assert job['tentativas'] == 1
+
+
+def test_repete_ate_max_tentativas():
+    repo = RepositorioFalso()
+    executor = _executor(repo)
+    chamadas = []
+
+    def instavel(parametros, progresso):
+        chamadas.append(1)
+        if len(chamadas) < 3:
+            raise RuntimeError('503 do serviço externo')
+        return 'ok'
+
+    executor.registrar('instavel', instavel, max_tentativas=3)
+    job = _aguardar(repo, executor.enfileirar('instavel'))
+    executor.parar(aguardar=True)
+
+    assert job['status'] == CONCLUIDO
+    assert job['tentativas'] == 3
+
+
+def test_falha_definitiva_guarda_erro():
+    repo = RepositorioFalso()
+    executor = _executor(repo)
+
+    def sempre_falha(parametros, progresso):
+        raise ValueError('coluna inexistente')
+
+    executor.registrar('quebrado', sempre_falha, max_tentativas=2)
+    job = _aguardar(repo, executor.enfileirar('quebrado'))
+    executor.parar(aguardar=True)
+
+    assert job['status'] == FALHOU
+    assert job['tentativas'] == 2
+    assert 'coluna inexistente' in job['erro']
+
+
+def test_job_ja_reservado_nao_executa_duas_vezes():
+    repo = RepositorioFalso()
+    executor = _executor(repo)
+    chamadas = []
+    executor.registrar('unico', lambda p, progresso: chamadas.append(1))
+    repo.criar_job('j1', 'unico', {}, 1)
+
+    executor.executar('j1')
+    executor.executar('j1')
+
+    assert len(chamadas) == 1
+    assert repo.jobs['j1']['status'] == CONCLUIDO
+
+
+def test_recuperacao_apos_queda_do_processo():
+    repo = RepositorioFalso()
+    # Job que estava rodando num processo que caiu (ainda com tentativas) e um que esgotou
+    repo.criar_job('interrompido', 'exportar', {}, 2)
+    repo.jobs['interrompido'].update(status=EXECUTANDO, tentativas=1, parado=True)
+    repo.criar_job('esgotado', 'exportar', {}, 1)
+    repo.jobs['esgotado'].update(status=EXECUTANDO, tentativas=1, parado=True)
+
+    executor = _executor(repo)
+    executor.registrar('exportar', lambda p, progresso: 'exportado')
+    assert executor.recuperar_orfaos() == 1
+    job = _aguardar(repo, 'interrompido')
+    executor.parar(aguardar=True)
+
+    assert job['status'] == CONCLUIDO
+    assert job['tentativas'] == 2
+    assert repo.jobs['esgotado']['status'] == FALHOU
+
+
+def test_tipo_desconhecido_e_recusado():
+    executor = _executor(RepositorioFalso())
+    with pytest.raises(ValueError):
+        executor.enfileirar('nao_registrado')
+
+
+def test_agendado_enfileira_a_cada_intervalo():
+    repo = RepositorioFalso()
+    executor = _executor(repo)
+    executor.registrar('arquivar', lambda p, progresso: p)
+    executor.agendar('arquivar', 60, {'lote': 10})
+    inicio = time.monotonic()
+
+    assert executor.disparar_agendados(inicio + 30) == 0
+    assert executor.disparar_agendados(inicio + 61) == 1
+    assert executor.disparar_agendados(inicio + 90) == 0
+    assert executor.disparar_agendados(inicio + 122) == 1
+    for job_id in list(repo.jobs):
+        assert _aguardar(repo, job_id)['resultado'] == {'lote': 10}
+    executor.parar(aguardar=True)
+    with pytest.raises(ValueError):
+        executor.agendar('nao_registrado', 60)
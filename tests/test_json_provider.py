@@ -0,0 +1,81 @@
+"""Testes do provider JSON e da resposta em streaming (não precisam de banco)."""
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from src.json_provider import GranpixJSONProvider, resposta_json_stream, formatar_timedelta
+
+
+@pytest.fixture
+def app_json():
+    app = flask.Flask(__name__)
+    app.json = GranpixJSONProvider(app)
+    return app
+
+
+def test_tipos_do_mariadb(app_json):
+    with app_json.test_request_context():
+        r = flask.jsonify({
+            'valor': Decimal('10.50'),
+            'data_etapa': date(2026, 3, 1),
+            'data_criacao': datetime(2026, 3, 1, 19, 30, 5),
+            'hora_etapa': timedelta(hours=9, minutes=5),
+        })
+    dados = json.loads(r.get_data())
+    assert dados == {
+        'valor': 10.5,
+        'data_etapa': '2026-03-01',
+        'data_criacao': '2026-03-01T19:30:05',
+        'hora_etapa': '09:05:00',
+    }
+
+
+def test_ordem_das_chaves_preservada(app_json):
+    with app_json.test_request_context():
+        r = flask.jsonify({'b': 1, 'a': 2})
+    assert r.get_data() == b'{"b":1,"a":2}'
+
+
+def test_formatar_timedelta():
+    assert formatar_timedelta(timedelta(0)) == '00:00:00'
+    assert formatar_timedelta(timedelta(hours=26, seconds=7)) == '26:00:07'
+
+
+def test_stream_lista_e_rodape(app_json):
+    linhas = ({'id': i, 'valor': Decimal(i)} for i in range(3))
+    with app_json.test_request_context():
+        r = resposta_json_stream(app_json, linhas, chave='itens', rodape=lambda: {'total': 3})
+        corpo = b''.join(r.iter_encoded())
+    assert json.loads(corpo) == {
+        'itens': [{'id': 0, 'valor': 0.0}, {'id': 1, 'valor': 1.0}, {'id': 2, 'valor': 2.0}],
+        'total': 3,
+    }
+
+
+def test_stream_lista_vazia(app_json):
+    with app_json.test_request_context():
+        r = resposta_json_stream(app_json, iter([]))
+        assert b''.join(r.iter_encoded()) == b'[]'
+
+
+def _linhas_com_falha(antes):
+    for i in range(antes):
+        yield {'id': i}
+    raise RuntimeError('conexão perdida')
+
+
+def test_stream_erro_antes_da_primeira_linha_sobe_para_a_rota(app_json):
+    with app_json.test_request_context():
+        with pytest.raises(RuntimeError):
+            resposta_json_stream(app_json, _linhas_com_falha(0), chave='itens')
+
+
+def test_stream_erro_no_meio_fecha_com_erro(app_json):
+    with app_json.test_request_context():
+        r = resposta_json_stream(app_json, _linhas_com_falha(2), chave='itens', rodape=lambda: {'total': 2})
+        corpo = json.loads(b''.join(r.iter_encoded()))
+    assert corpo == {'itens': [{'id': 0}, {'id': 1}], 'erro': 'conexão perdida'}
@@ -0,0 +1,202 @@
+"""Testes da montagem das listagens admin paginadas (sem banco)."""
+import uuid
+from datetime import datetime
+
+import pytest
+
+from src.listas_admin import LISTAS, montar_consulta, montar_resposta
+from src.paginacao import codificar_cursor, decodificar_cursor
+
+
+def test_primeira_pagina_sem_filtros():
+    consulta = montar_consulta(LISTAS['comissoes'], {'limite': '10'})
+    assert 'data_transacao AS _ordem0' in consulta.sql
+    assert 'ORDER BY data_transacao DESC, id DESC LIMIT %s' in consulta.sql
+    assert consulta.params == [11]
+    assert consulta.primeira_pagina and not consulta.filtrada
+
+
+def test_filtros_da_whitelist_viram_parametros():
+    args = {'limite': '5', 'status': 'pendente', 'busca': '50%_off', 'coluna_maliciosa': 'x'}
+    consulta = montar_consulta(LISTAS['solicitacoes_pecas'], args)
+    assert 'sp.status = %s' in consulta.sql
+    assert 'e.nome LIKE %s' in consulta.sql
+    assert 'coluna_maliciosa' not in consulta.sql
+    assert consulta.params == ['pendente', '%50\\%\\_off%', 6]
+    assert consulta.params_contagem == ['pendente', '%50\\%\\_off%']
+    assert consulta.filtrada
+
+
+@pytest.mark.parametrize('args', [
+    {'ordenar': 'senha'},
+    {'direcao': 'lado'},
+    {'cursor': 'lixo'},
+    {'cursor': codificar_cursor(('nome', 'asc', 'Equipe', 'id'))},  # cursor de outra ordenação
+])
+def test_parametros_invalidos(args):
+    with pytest.raises(ValueError):
+        montar_consulta(LISTAS['equipes'], {**args, 'ordenar': args.get('ordenar', 'saldo')})
+
+
+def test_cursor_continua_depois_do_ultimo_item():
+    lista = LISTAS['equipes']
+    primeira = montar_consulta(lista, {'limite': '2', 'ordenar': 'saldo', 'direcao': 'desc'})
+    linhas = [
+        {'id': 'a', 'nome': 'A', 'serie': 'A', 'doricoins': 30.0, 'carro_marca': None, 'carro_modelo': None,
+         '_ordem0': 30.0, '_id': 'a'},
+        {'id': 'b', 'nome': 'B', 'serie': None, 'doricoins': 20.0, 'carro_marca': 'Toyota', 'carro_modelo': 'AE86',
+         '_ordem0': 20.0, '_id': 'b'},
+        {'id': 'c', 'nome': 'C', 'serie': 'B', 'doricoins': 10.0, 'carro_marca': None, 'carro_modelo': None,
+         '_ordem0': 10.0, '_id': 'c'},
+    ]
+    resposta = montar_resposta(lista, primeira, linhas, 3, True)
+    assert [e['id'] for e in resposta['itens']] == ['a', 'b']
+    assert resposta['itens'][1] == {'id': 'b', 'nome': 'B', 'serie': 'A', 'saldo': 20.0, 'carro': 'Toyota AE86'}
+    assert resposta['total'] == 3 and resposta['total_estimado']
+    assert decodificar_cursor(resposta['proximo_cursor'], 4) == ['saldo', 'desc', [20.0], 'b']
+
+    seguinte = montar_consulta(lista, {'limite': '2', 'ordenar': 'saldo', 'direcao': 'desc',
+                                       'cursor': resposta['proximo_cursor']})
+    assert '((e.doricoins < %s OR e.doricoins IS NULL) OR (e.doricoins = %s AND e.id < %s))' in seguinte.sql
+    assert seguinte.params == [20.0, 20.0, 'b', 3]
+    assert not seguinte.primeira_pagina
+
+
+def test_cursor_de_data_e_ultima_pagina():
+    lista = LISTAS['comissoes']
+    consulta = montar_consulta(lista, {'limite': '1'})
+    data = datetime(2025, 5, 1, 20, 0, 0)
+    linha = {'id': 'x', 'tipo': 'compra_peca', 'valor_comissao': 10.0, 'equipe_id': 'e', 'equipe_nome': 'E',
+             'descricao': '', 'data_transacao': data, '_ordem0': data, '_id': 'x'}
+    resposta = montar_resposta(lista, consulta, [linha, dict(linha, id='y', _id='y')], None, False)
+    assert decodificar_cursor(resposta['proximo_cursor'], 4)[2] == ['2025-05-01 20:00:00']
+    assert resposta['itens'][0]['data'] == '2025-05-01T20:00:00'
+    assert montar_resposta(lista, consulta, [linha], None, False)['proximo_cursor'] is None
+
+
+def test_cursor_nulo_segue_so_pelas_linhas_nulas():
+    lista = LISTAS['equipes']
+    depois_do_nulo = codificar_cursor(('saldo', 'desc', [None], 'b'))
+    consulta = montar_consulta(lista, {'ordenar': 'saldo', 'direcao': 'desc', 'cursor': depois_do_nulo})
+    assert 'AND (e.doricoins IS NULL AND e.id < %s) ORDER BY' in consulta.sql
+    assert consulta.params == ['b', 21]
+
+    crescente = codificar_cursor(('saldo', 'asc', [None], 'b'))
+    consulta = montar_consulta(lista, {'ordenar': 'saldo', 'direcao': 'asc', 'cursor': crescente})
+    assert '(e.doricoins IS NOT NULL OR (e.doricoins IS NULL AND e.id > %s))' in consulta.sql
+
+
+def test_etapas_comparam_data_e_hora_como_tupla():
+    cursor = codificar_cursor(('data', 'asc', ['2026-01-10', '20:00:00'], 'e1'))
+    consulta = montar_consulta(LISTAS['etapas'], {'cursor': cursor})
+    assert ('(data_etapa > %s OR (data_etapa = %s AND hora_etapa > %s) '
+            'OR (data_etapa = %s AND hora_etapa = %s AND id > %s))') in consulta.sql
+    assert 'ORDER BY data_etapa ASC, hora_etapa ASC, id ASC' in consulta.sql
+    assert consulta.params == ['2026-01-10', '2026-01-10', '20:00:00', '2026-01-10', '20:00:00', 'e1', 21]
+    # Cursor com número de valores diferente das colunas da ordenação
+    with pytest.raises(ValueError):
+        montar_consulta(LISTAS['etapas'], {'cursor': codificar_cursor(('data', 'asc', ['2026-01-10'], 'e1'))})
+
+
+@pytest.mark.parametrize('nome, args, indice', [
+    ('comissoes', {}, 'idx_data'),
+    ('etapas', {}, 'idx_data_etapa'),
+    ('transacoes_pix', {'status': 'pendente'}, 'idx_status_data'),
+    ('solicitacoes_pecas', {'status': 'pendente'}, 'idx_status_data'),
+])
+def test_pagina_usa_o_indice_da_ordenacao(client, nome, args, indice):
+    """Sem expressão na coluna de ordenação o índice atende o WHERE e o ORDER BY (sem filesort)"""
+    from app import api
+    consulta = montar_consulta(LISTAS[nome], args)
+    conn = api.db._get_conn()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        if api.db.is_mysql:
+            cursor.execute('EXPLAIN ' + consulta.sql, consulta.params)
+            plano = cursor.fetchall()[0]
+            assert plano['key'] == indice and 'filesort' not in (plano['Extra'] or '')
+        else:
+            cursor.execute('EXPLAIN QUERY PLAN ' + consulta.sql, consulta.params)
+            plano = [linha['detail'] for linha in cursor.fetchall()]
+            assert f'USING INDEX {LISTAS[nome].tabela}__{indice}' in plano[0]
+            # Só o desempate por id fica para ordenar (o índice do SQLite termina no rowid)
+            assert 'USE TEMP B-TREE FOR ORDER BY' not in plano
+    finally:
+        conn.close()
+
+
+def test_pagina_atravessa_valores_nulos(client_admin):
+    """Uma linha com NULL na coluna de ordenação não corta as páginas seguintes"""
+    from app import api
+    prefixo = f'Nulas {uuid.uuid4().hex[:8]}'
+    equipes = [api.gerenciador.criar_equipe(f'{prefixo} {i}', saldo) for i, saldo in enumerate((30.0, 20.0, 10.0))]
+    conn = api.db._get_conn()
+    cursor = conn.cursor()
+    cursor.execute('UPDATE equipes SET doricoins = NULL, data_criacao = NULL WHERE id = %s', (equipes[1].id,))
+    conn.commit()
+    conn.close()
+    try:
+        for ordenar, direcao in ((o, d) for o in ('saldo', 'data') for d in ('asc', 'desc')):
+            vistos, cursor_pagina = [], ''
+            for _ in range(len(equipes) + 1):
+                r = client_admin.get(f'/api/admin/equipes?limite=1&ordenar={ordenar}&direcao={direcao}'
+                                     f'&busca={prefixo}&cursor={cursor_pagina}')
+                assert r.status_code == 200
+                dados = r.get_json()
+                vistos += [item['id'] for item in dados['itens']]
+                cursor_pagina = dados['proximo_cursor']
+                if not cursor_pagina:
+                    break
+            assert sorted(vistos) == sorted(e.id for e in equipes)
+    finally:
+        for equipe in equipes:
+            api.db.deletar_equipe(equipe.id)
+
+
+def test_busca_de_modelos_por_marca_e_modelo(client_admin):
+    """busca compara CONCAT(marca, ' ', modelo) (no SQLite, função registrada pelo dialeto)"""
+    from app import api
+    modelo_id, sufixo = str(uuid.uuid4()), uuid.uuid4().hex[:8]
+    conn = api.db._get_conn()
+    cursor = conn.cursor()
+    cursor.execute('INSERT INTO modelos_carro_loja (id, marca, modelo, classe, preco) VALUES (%s, %s, %s, %s, %s)',
+                   (modelo_id, 'Toyota', f'AE86 {sufixo}', 'A', 1000.0))
+    conn.commit()
+    conn.close()
+    try:
+        r = client_admin.get(f'/api/admin/carros?limite=5&busca=Toyota AE86 {sufixo}')
+        assert r.status_code == 200
+        assert [m['id'] for m in r.get_json()['itens']] == [modelo_id]
+        r = client_admin.get('/api/admin/carros?limite=5&busca=x')
+        assert r.status_code == 200
+    finally:
+        conn = api.db._get_conn()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM modelos_carro_loja WHERE id = %s', (modelo_id,))
+        conn.commit()
+        conn.close()
+
+
+def test_pagina_padrao_de_etapas_por_data_e_hora(client_admin):
+    from app import api
+    campeonato_id = str(uuid.uuid4())
+    etapas = [str(uuid.uuid4()) for _ in range(3)]
+    assert api.db.criar_campeonato(campeonato_id, f'Lista {uuid.uuid4().hex[:8]}', '', 'A', 1)
+    for numero, (etapa_id, data, hora) in enumerate(
+            zip(etapas, ('2026-02-01', '2026-02-01', '2026-01-15'), ('21:00:00', '19:00:00', '23:00:00')), 1):
+        assert api.db.cadastrar_etapa(etapa_id, campeonato_id, numero, f'Etapa {numero}', '', data, hora, 'A')
+    try:
+        vistos, cursor_pagina = [], ''
+        for _ in range(len(etapas) + 1):
+            r = client_admin.get(f'/api/admin/listar-etapas?limite=2&campeonato_id={campeonato_id}'
+                                 f'&cursor={cursor_pagina}')
+            assert r.status_code == 200
+            dados = r.get_json()
+            vistos += [etapa['id'] for etapa in dados['itens']]
+            cursor_pagina = dados['proximo_cursor']
+            if not cursor_pagina:
+                break
+        assert vistos == [etapas[2], etapas[1], etapas[0]]
+        assert client_admin.get('/api/admin/listar-etapas?limite=5').status_code == 200
+    finally:
+        api.db.deletar_campeonato(campeonato_id)
@@ -0,0 +1,63 @@
+"""Testes do logging do GRANPIX (níveis por módulo, amostragem, formato JSON)."""
+import json
+import logging
+
+from src import log
+
+
+class _Coletor(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.registros = []
+
+    def emit(self, record):
+        self.registros.append(record)
+
+
+def _logger_isolado(nome):
+    logger = logging.getLogger(f'granpix.teste.{nome}')
+    logger.handlers[:] = []
+    coletor = _Coletor()
+    logger.addHandler(coletor)
+    logger.propagate = False
+    return logger, coletor
+
+
+def test_obter_logger_prefixa_granpix():
+    assert log.obter_logger('db').name == 'granpix.db'
+    assert log.obter_logger('granpix.app').name == 'granpix.app'
+
+
+def test_niveis_por_modulo():
+    niveis = log._niveis_por_modulo('db=DEBUG, granpix.app=warning,invalido,')
+    assert niveis == {'granpix.db': 'DEBUG', 'granpix.app': 'WARNING'}
+
+
+def test_log_amostrado_desligado_sem_debug():
+    logger, coletor = _logger_isolado('sem_debug')
+    logger.setLevel(logging.INFO)
+    for i in range(100):
+        log.log_amostrado(logger, 'teste.sem_debug', 'item %s', i)
+    assert coletor.registros == []
+
+
+def test_log_amostrado_registra_um_a_cada_n(monkeypatch):
+    monkeypatch.setattr(log, 'AMOSTRAGEM', 10)
+    logger, coletor = _logger_isolado('amostra')
+    logger.setLevel(logging.DEBUG)
+    for i in range(25):
+        log.log_amostrado(logger, 'teste.amostra', 'item %s', i)
+    mensagens = [r.getMessage() for r in coletor.registros]
+    assert len(mensagens) == 3
+    assert mensagens[0].startswith('item 0 [amostra 1/10')
+    assert mensagens[2].startswith('item 20 ')
+
+
+def test_formatador_json():
+    registro = logging.LogRecord('granpix.db', logging.WARNING, __file__, 1, 'lento: %s ms', (12,), None)
+    registro.endpoint = 'get_pecas'
+    dados = json.loads(log.FormatadorJSON().format(registro))
+    assert dados['msg'] == 'lento: 12 ms'
+    assert dados['nivel'] == 'WARNING'
+    assert dados['logger'] == 'granpix.db'
+    assert dados['endpoint'] == 'get_pecas'
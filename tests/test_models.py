@@ -0,0 +1,47 @@
+"""Testes dos modelos de domínio (slots e visões derivadas do Carro)."""
+import copy
+
+import pytest
+
+from src.models import Carro, Equipe, Peca, Piloto
+
+
+def _peca(tipo, durabilidade=100.0):
+    return Peca(id=f'{tipo}-1', nome=tipo.upper(), tipo=tipo, durabilidade_maxima=100.0,
+                durabilidade_atual=durabilidade)
+
+
+def _carro(**kwargs):
+    return Carro(id='c1', numero_carro=7, marca='Nissan', modelo='Silvia', motor=_peca('motor'),
+                 cambio=_peca('cambio'), kit_angulo=None, suspensao=_peca('suspensao'),
+                 diferenciais=[_peca('diferencial')], **kwargs)
+
+
+def test_modelos_sem_dict_por_instancia():
+    carro = _carro()
+    for objeto in (carro, carro.motor, Piloto('p1', 'Piloto', 'e1'), Equipe('e1', 'Equipe', carro)):
+        assert not hasattr(objeto, '__dict__')
+    with pytest.raises(AttributeError):
+        carro.atributo_inexistente = 1
+
+
+def test_pecas_instaladas_derivada_no_primeiro_acesso():
+    carro = _carro()
+    assert carro._pecas_instaladas is None
+    assert [p['tipo'] for p in carro.pecas_instaladas] == ['motor', 'cambio', 'suspensao', 'diferencial']
+    assert carro.motor_id == 'motor-1' and carro.kit_angulo_id == '' and carro.diferencial_id == 'diferencial-1'
+
+    carro.pecas_instaladas.append({'nome': 'Turbo', 'tipo': 'motor'})
+    assert carro.pecas_instaladas[-1]['nome'] == 'Turbo'
+    assert copy.deepcopy(carro).pecas_instaladas == carro.pecas_instaladas
+    assert _carro(pecas_instaladas=[]).pecas_instaladas == []
+
+
+def test_desgaste_remove_quebradas_de_pecas_instaladas():
+    carro = _carro()
+    carro.motor.durabilidade_atual = 0.1
+    quebradas, d20 = carro.sofrer_desgaste_batalha(50.0)
+
+    assert 'MOTOR' in quebradas and set(d20) == {'MOTOR', 'CAMBIO', 'SUSPENSAO', 'DIFERENCIAL'}
+    assert 'MOTOR' not in [p['nome'] for p in carro.pecas_instaladas]
+    assert carro.batidas_totais == 1
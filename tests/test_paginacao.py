@@ -0,0 +1,78 @@
+"""Testes da paginação por cursor (keyset)."""
+from datetime import datetime
+
+import pytest
+
+from src.paginacao import (
+    codificar_cursor, condicao_ramo_depois_de, decodificar_cursor, ler_limite, montar_pagina,
+)
+
+
+def test_cursor_ida_e_volta():
+    cursor = codificar_cursor((datetime(2025, 3, 1, 12, 30, 5), 'solicitacao', 'abc'))
+    assert '=' not in cursor
+    assert decodificar_cursor(cursor, 3) == ['2025-03-01 12:30:05', 'solicitacao', 'abc']
+    assert decodificar_cursor(None, 3) is None
+    assert decodificar_cursor('', 3) is None
+
+
+@pytest.mark.parametrize('cursor', ['%%%', 'bmFvLWpzb24', codificar_cursor(('a', 'b'))])
+def test_cursor_invalido(cursor):
+    with pytest.raises(ValueError):
+        decodificar_cursor(cursor, 3)
+
+
+def test_ler_limite():
+    assert ler_limite(None) == 20
+    assert ler_limite('abc') == 20
+    assert ler_limite('0') == 1
+    assert ler_limite('500') == 100
+    assert ler_limite('35') == 35
+
+
+def test_montar_pagina_so_gera_cursor_com_sobra():
+    linhas = [{'id': str(i), 'ts': f'2025-01-{10 - i:02d}'} for i in range(4)]
+    chave = lambda r: (r['ts'], r['id'])
+    pagina, cursor = montar_pagina(linhas, 3, chave)
+    assert [r['id'] for r in pagina] == ['0', '1', '2']
+    assert decodificar_cursor(cursor, 2) == ['2025-01-08', '2']
+    assert montar_pagina(linhas, 4, chave) == (linhas, None)
+
+
+def _simular_union(itens, limite, cursor):
+    """Aplica a condição de cada ramo em Python como o SQL faria, e a ordem global"""
+    chave = decodificar_cursor(cursor, 3)
+    selecionados = []
+    for origem in ('pix_payment', 'solicitacao'):
+        sql, params = condicao_ramo_depois_de('ts', 'id', origem, chave)
+        for item in (i for i in itens if i['tipo'] == origem):
+            if not sql:
+                ok = True
+            elif ' OR ' in sql:
+                ok = item['ts'] < params[0] or (item['ts'] == params[1] and item['id'] < params[2])
+            elif '<=' in sql:
+                ok = item['ts'] <= params[0]
+            else:
+                ok = item['ts'] < params[0]
+            if ok:
+                selecionados.append(item)
+    selecionados.sort(key=lambda r: (r['ts'], r['tipo'], r['id']), reverse=True)
+    return montar_pagina(selecionados[:limite + 1], limite, lambda r: (r['ts'], r['tipo'], r['id']))
+
+
+def test_paginas_do_union_cobrem_tudo_sem_repetir():
+    # Vários itens no mesmo segundo, nas duas origens
+    itens = []
+    for n in range(23):
+        ts = f'2025-01-01 10:00:{n // 4:02d}'
+        tipo = 'pix_payment' if n % 3 == 0 else 'solicitacao'
+        itens.append({'id': f'id-{n:02d}', 'ts': ts, 'tipo': tipo})
+    esperado = sorted(itens, key=lambda r: (r['ts'], r['tipo'], r['id']), reverse=True)
+
+    vistos, cursor = [], None
+    while True:
+        pagina, cursor = _simular_union(itens, 5, cursor)
+        vistos.extend(pagina)
+        if cursor is None:
+            break
+    assert vistos == esperado
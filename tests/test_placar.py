@@ -0,0 +1,22 @@
+"""Testes da pontuação por colocação e do ranking por vitórias (sem banco)."""
+import sqlite3
+
+from src.placar import classificar, pontos_por_colocacao, sql_pontos_por_colocacao
+
+
+def test_tabela_de_pontos():
+    assert [pontos_por_colocacao(c) for c in (1, 2, 3, 4, 5, 8, 9, 16, 17, 32, 33)] == \
+        [100, 88, 76, 64, 48, 48, 32, 32, 16, 16, 0]
+
+
+def test_case_sql_bate_com_a_tabela():
+    # CASE/BETWEEN são SQL padrão: o sqlite basta para avaliar a expressão
+    conn = sqlite3.connect(':memory:')
+    for colocacao in range(1, 40):
+        valor = conn.execute(f'SELECT {sql_pontos_por_colocacao(str(colocacao))}').fetchone()[0]
+        assert valor == pontos_por_colocacao(colocacao), colocacao
+
+
+def test_empatadas_dividem_colocacao():
+    colocacoes = classificar([('a', 1), ('b', 3), ('c', 3), ('d', 0)])
+    assert colocacoes == [('b', 1, 3), ('c', 1, 3), ('a', 3, 1), ('d', 4, 0)]
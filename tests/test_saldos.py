@@ -0,0 +1,79 @@
+"""Extrato de saldos sob concorrência (exigem banco; client fixture faz skip se indisponível)."""
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+@pytest.fixture
+def criar_equipe(client):
+    from app import api
+    criadas = []
+
+    def _criar(saldo):
+        equipe = api.gerenciador.criar_equipe(f"Saldo {uuid.uuid4().hex[:10]}", saldo)
+        criadas.append(equipe.id)
+        return equipe
+
+    yield _criar
+    for equipe_id in criadas:
+        api.db.deletar_equipe(equipe_id)
+
+
+def test_mil_debitos_paralelos_sem_perda(criar_equipe):
+    """1.000 débitos de 1,00 contra saldo 600: exatamente 600 passam e o saldo zera."""
+    from app import api
+    db = api.db
+    equipe = criar_equipe(600.0)
+    referencia = uuid.uuid4().hex
+
+    def debitar(_):
+        return db.movimentar_saldo(equipe.id, -1.0, 'teste_concorrencia', referencia)
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        resultados = list(pool.map(debitar, range(1000)))
+
+    aprovados = [saldo for saldo in resultados if saldo is not None]
+    assert len(aprovados) == 600
+    assert db.obter_saldo_equipe(equipe.id) == 0.0
+    # Cada saldo intermediário aparece uma única vez: nenhuma atualização se perdeu
+    assert sorted(aprovados) == [float(i) for i in range(600)]
+
+    extrato = db.listar_movimentacoes_saldo(equipe.id, 'doricoins', limite=2000)
+    assert sum(1 for m in extrato if m['referencia'] == referencia) == 600
+    assert sum(m['valor'] for m in extrato) == pytest.approx(0.0)
+
+
+def test_transferencias_cruzadas_conservam_saldo(criar_equipe):
+    """A->B e B->A em paralelo (ordem de travamento fixa): soma dos saldos se mantém."""
+    from app import api
+    db = api.db
+    a, b = criar_equipe(100.0), criar_equipe(100.0)
+
+    def transferir(i):
+        origem, destino = (a.id, b.id) if i % 2 else (b.id, a.id)
+        return db.transferir_saldo(origem, destino, 1.0, 1.0, 'teste_concorrencia')
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        resultados = list(pool.map(transferir, range(400)))
+
+    assert all(r is not None for r in resultados)
+    assert db.obter_saldo_equipe(a.id) + db.obter_saldo_equipe(b.id) == 200.0
+    assert db.transferir_saldo(a.id, b.id, 10_000.0, 10_000.0, 'teste_concorrencia') is None
+
+
+
+def test_compra_de_carro_desfaz_debito_se_o_carro_nao_grava(criar_equipe, monkeypatch):
+    """salvar_carro falhando dentro da transação: sem débito, sem movimentação e compra recusada."""
+    from app import api
+    db = api.db
+    equipe = criar_equipe(1000.0)
+    modelo = api.loja_carros.adicionar_modelo('Teste', f'Falha {uuid.uuid4().hex[:6]}', 'A', 300.0, '')
+    monkeypatch.setattr(db, 'salvar_carro', lambda *args, **kwargs: False)
+    try:
+        assert api.comprar_carro(equipe.id, modelo.id) is False
+    finally:
+        api.loja_carros.modelos.remove(modelo)
+    assert db.obter_saldo_equipe(equipe.id) == 1000.0
+    motivos = [m['motivo'] for m in db.listar_movimentacoes_saldo(equipe.id, 'doricoins', limite=10)]
+    assert 'compra_carro' not in motivos
@@ -0,0 +1,79 @@
+"""Testes do pool de hash de senhas (sem banco)."""
+import threading
+import time
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from src.senhas import PoolSenhas, SenhasSaturadas, normalizar_metodo, precisa_rehash
+
+BARATO = 'pbkdf2:sha256:1000'
+
+
+def test_verificar_e_rehash_quando_o_metodo_muda():
+    pool = PoolSenhas(processos=0, metodo=BARATO)
+    antigo = generate_password_hash('s3nha', 'pbkdf2:sha256:2000')
+
+    assert pool.verificar(antigo, 'errada') == (False, None)
+    ok, novo = pool.verificar(antigo, 's3nha')
+    assert ok and novo.startswith(BARATO + '$')
+    assert pool.verificar(novo, 's3nha') == (True, None)
+    assert pool.verificar('', 's3nha') == (False, None)
+
+
+def test_metodo_normalizado_com_padroes_do_werkzeug():
+    assert normalizar_metodo(None) == normalizar_metodo('scrypt') == 'scrypt:32768:8:1'
+    assert normalizar_metodo('pbkdf2:sha256').startswith('pbkdf2:sha256:')
+    assert not precisa_rehash(generate_password_hash('x', 'scrypt'), 'scrypt:32768:8:1')
+
+
+def test_fila_cheia_levanta_saturadas():
+    pool = PoolSenhas(processos=0, fila=1, metodo=BARATO)
+    ocupado, liberar = threading.Event(), threading.Event()
+
+    def segurar():
+        ocupado.set()
+        liberar.wait(5)
+
+    thread = threading.Thread(target=pool._executar, args=(segurar,))
+    thread.start()
+    ocupado.wait(5)
+    try:
+        with pytest.raises(SenhasSaturadas):
+            pool.gerar_hash('s3nha')
+    finally:
+        liberar.set()
+        thread.join()
+    assert pool.gerar_hash('s3nha').startswith(BARATO)
+
+
+def test_pool_de_processos():
+    pool = PoolSenhas(processos=1, metodo=BARATO)
+    try:
+        ok, novo = pool.verificar(pool.gerar_hash('s3nha'), 's3nha')
+        assert ok and novo is None
+    finally:
+        pool.encerrar()
+
+
+def test_hash_com_tempo_esgotado_segura_a_vaga_ate_terminar():
+    """Sem resposta a tempo o trabalho continua no pool e não libera a fila para mais trabalho"""
+    pool = PoolSenhas(processos=1, fila=2, metodo=BARATO, timeout=0.05)
+    try:
+        for _ in range(2):
+            with pytest.raises(SenhasSaturadas, match='Tempo esgotado'):
+                pool._executar(time.sleep, 0.5)
+        with pytest.raises(SenhasSaturadas, match='Muitos logins'):
+            pool.gerar_hash('s3nha')
+
+        pool.timeout = 10.0
+        limite = time.monotonic() + 10
+        while True:
+            try:
+                assert pool.gerar_hash('s3nha').startswith(BARATO)
+                break
+            except SenhasSaturadas:
+                assert time.monotonic() < limite
+                time.sleep(0.05)
+    finally:
+        pool.encerrar()
@@ -0,0 +1,92 @@
+"""Testes do planejamento de aprovação em lote e da leitura de compatibilidade (sem banco)."""
+from src.compatibilidade import interpretar_compatibilidade, peca_compativel
+from src.solicitacoes_lote import planejar_lote_pecas
+
+
+def _solicitacao(sid, peca_id='pl-motor', tipo='motor', equipe_id='e1', carro_id='c1',
+                 status='pendente', compatibilidade=None):
+    return {
+        'id': sid, 'equipe_id': equipe_id, 'equipe_nome': equipe_id.upper(), 'peca_id': peca_id,
+        'carro_id': carro_id, 'status': status, 'peca_nome': peca_id, 'peca_tipo': tipo,
+        'preco': 100.0, 'compatibilidade': compatibilidade,
+    }
+
+
+CARROS = {
+    'c1': {'id': 'c1', 'equipe_id': 'e1', 'modelo_id': 'M-AE86'},
+    'c2': {'id': 'c2', 'equipe_id': 'e2', 'modelo_id': 'm-s13'},
+}
+
+
+def _resultados(plano):
+    return {r['solicitacao_id']: r['sucesso'] for r in plano['resultados']}
+
+
+def test_interpretar_compatibilidade_formatos():
+    assert interpretar_compatibilidade(None) is None
+    assert interpretar_compatibilidade('universal') is None
+    assert interpretar_compatibilidade('{"compatibilidades": ["universal"]}') is None
+    assert interpretar_compatibilidade('{"compatibilidades": ["M-AE86", "m-s13"]}') == {'m-ae86', 'm-s13'}
+    assert interpretar_compatibilidade('m-ae86, m-s13') == {'m-ae86', 'm-s13'}
+    assert interpretar_compatibilidade('{json quebrado') is None
+    assert peca_compativel(frozenset({'m-ae86'}), 'M-AE86')
+    assert not peca_compativel(frozenset({'m-ae86'}), None)
+
+
+def test_instala_usando_estoque_e_troca_peca_atual():
+    solicitacoes = {'s1': _solicitacao('s1')}
+    instaladas = {'c1': [{'id': 'antigo', 'tipo': 'motor'}, {'id': 'susp', 'tipo': 'suspensao'}]}
+    armazem = {('pl-motor', 'e1'): ['estoque-1']}
+    plano = planejar_lote_pecas([{'solicitacao_id': 's1', 'status': 'instalado'}],
+                                solicitacoes, CARROS, instaladas, armazem)
+    assert _resultados(plano) == {'s1': True}
+    assert plano['desinstalar'] == ['antigo']
+    assert plano['instalar'] == [('c1', 'e1', 'estoque-1')]
+    assert plano['criar'] == []
+    assert plano['status'] == [('instalado', 'c1', 's1')]
+    assert len(plano['comissoes']) == 1
+
+
+def test_sem_estoque_cria_peca_instalada():
+    plano = planejar_lote_pecas([{'solicitacao_id': 's1', 'status': 'instalado'}],
+                                {'s1': _solicitacao('s1')}, CARROS, {}, {})
+    assert plano['criar'][0]['carro_id'] == 'c1'
+    assert plano['criar'][0]['tipo'] == 'motor'
+
+
+def test_limite_por_tipo_dentro_do_lote():
+    solicitacoes = {'s1': _solicitacao('s1'), 's2': _solicitacao('s2')}
+    itens = [{'solicitacao_id': 's1', 'status': 'instalado'}, {'solicitacao_id': 's2', 'status': 'instalado'}]
+    plano = planejar_lote_pecas(itens, solicitacoes, CARROS, {}, {})
+    assert _resultados(plano) == {'s1': True, 's2': False}
+
+
+def test_diferencial_sem_limite():
+    solicitacoes = {
+        's1': _solicitacao('s1', peca_id='pl-dif', tipo='diferencial'),
+        's2': _solicitacao('s2', peca_id='pl-dif', tipo='diferencial'),
+    }
+    itens = [{'solicitacao_id': 's1', 'status': 'instalado'}, {'solicitacao_id': 's2', 'status': 'instalado'}]
+    plano = planejar_lote_pecas(itens, solicitacoes, CARROS, {}, {})
+    assert _resultados(plano) == {'s1': True, 's2': True}
+
+
+def test_validacoes_por_item():
+    solicitacoes = {
+        'incompativel': _solicitacao('incompativel', compatibilidade='{"compatibilidades": ["m-s13"]}'),
+        'outra_equipe': _solicitacao('outra_equipe', carro_id='c2'),
+        'ja_instalada': _solicitacao('ja_instalada', status='instalado'),
+        'guardar': _solicitacao('guardar'),
+    }
+    itens = [
+        {'solicitacao_id': 'incompativel', 'status': 'instalado'},
+        {'solicitacao_id': 'outra_equipe', 'status': 'instalado'},
+        {'solicitacao_id': 'ja_instalada', 'status': 'instalado'},
+        {'solicitacao_id': 'inexistente', 'status': 'instalado'},
+        {'solicitacao_id': 'guardar', 'status': 'guardada'},
+        {'solicitacao_id': 'guardar', 'status': 'reprovado'},
+    ]
+    plano = planejar_lote_pecas(itens, solicitacoes, CARROS, {}, {})
+    assert [r['sucesso'] for r in plano['resultados']] == [False, False, False, False, True, False]
+    assert plano['status'] == [('guardada', None, 'guardar')]
+    assert plano['instalar'] == plano['criar'] == []